@@ -15,6 +15,16 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Execution history window for risk/success statistics, and how long one
+# rollup read is reused (it is refreshed as executions finish)
+HISTORY_WINDOW_DAYS = 90
+HISTORY_CACHE_SECONDS = 60.0
+
+_HISTORY_TOTALS = (
+    "executions", "failures", "step_runs", "passed_steps", "total_steps",
+    "success_ratio_total", "duration_count", "duration_total",
+)
+
 
 class RiskPriority(Enum):
     """Priority levels based on RPN (Risk Priority Number)"""
@@ -95,6 +105,7 @@ class AnalysisAgent(BaseAgent):
             logger.info("AnalysisAgent initialized with database access for historical data")
         else:
             logger.info("AnalysisAgent using stub mode for historical data (no database)")
+        self._history_cache: Optional[Tuple[float, Dict]] = None  # (monotonic time, history)
     
     @property
     def capabilities(self) -> List[AgentCapability]:
@@ -452,61 +463,82 @@ class AnalysisAgent(BaseAgent):
             "failure_rates": {},
             "bug_frequency": {},
             "time_to_fix": {},
-            "change_frequency": {}
+            "change_frequency": {},
+            "scenario_failure_rates": {}
         }
+        scenario_types = set(s.get("scenario_type", "functional") for s in scenarios)
         
-        # If no database, return default values
-        if not self.db:
-            scenario_types = set(s.get("scenario_type", "functional") for s in scenarios)
+        def _use_defaults():
             for scenario_type in scenario_types:
                 historical["failure_rates"][scenario_type] = 0.3  # 30% default
                 historical["bug_frequency"][scenario_type] = 0
                 historical["time_to_fix"][scenario_type] = 24.0
-            return historical
         
-        # Query Phase 2 executions table (using existing test_executions table)
-        scenario_types = [s.get("scenario_type", "functional") for s in scenarios]
+        # If no database, return default values
+        if not self.db:
+            _use_defaults()
+            return historical
         
         try:
-            # Use SQLAlchemy query (SQLite-compatible syntax)
-            from sqlalchemy import text
-            query = text("""
-                SELECT 
-                    'functional' as scenario_type,
-                    SUM(CASE WHEN result = 'failed' THEN 1 ELSE 0 END) as failure_count,
-                    COUNT(*) as total_count,
-                    AVG((julianday(updated_at) - julianday(created_at)) * 24) as avg_fix_time
-                FROM test_executions
-                WHERE created_at > datetime('now', '-90 days')
-                GROUP BY scenario_type
-            """)
-            
-            result = self.db.execute(query)
-            rows = result.fetchall()
-            
-            for row in rows:
-                scenario_type = row[0] if len(row) > 0 else "functional"
-                failure_count = row[1] if len(row) > 1 else 0
-                total_count = row[2] if len(row) > 2 else 1
-                avg_fix_time = float(row[3]) if len(row) > 3 and row[3] else 24.0
-                
-                historical["failure_rates"][scenario_type] = (
-                    failure_count / total_count if total_count > 0 else 0.0
-                )
-                historical["bug_frequency"][scenario_type] = failure_count
-                historical["time_to_fix"][scenario_type] = avg_fix_time
-                
+            history = self._load_execution_history()
         except Exception as e:
             logger.warning(f"Could not load historical data: {e}, using defaults")
-            # Use default values
-            scenario_types = set(s.get("scenario_type", "functional") for s in scenarios)
-            for scenario_type in scenario_types:
-                historical["failure_rates"][scenario_type] = 0.3  # 30% default
+            _use_defaults()
+            return historical
+        
+        for scenario_type in scenario_types:
+            totals = history["by_type"].get(scenario_type) or history["overall"]
+            if not totals["executions"]:
+                historical["failure_rates"][scenario_type] = 0.3
                 historical["bug_frequency"][scenario_type] = 0
                 historical["time_to_fix"][scenario_type] = 24.0
+                continue
+            historical["failure_rates"][scenario_type] = totals["failures"] / totals["executions"]
+            historical["bug_frequency"][scenario_type] = totals["failures"]
+            historical["time_to_fix"][scenario_type] = (
+                totals["duration_total"] / totals["duration_count"] / 3600
+                if totals["duration_count"] else 24.0
+            )
+        
+        # Scenarios linked to a test case get that test case's own failure rate
+        for scenario in scenarios:
+            totals = history["by_test_case"].get(scenario.get("test_case_id"))
+            if totals and totals["executions"]:
+                historical["scenario_failure_rates"][scenario.get("scenario_id")] = (
+                    totals["failures"] / totals["executions"]
+                )
         
         return historical
     
+    def _load_execution_history(self) -> Dict:
+        """
+        Execution totals for the history window, grouped three ways.
+        
+        One query against the execution_stats_daily rollup serves every
+        scenario of a run; the result is reused for HISTORY_CACHE_SECONDS.
+        
+        Returns:
+            {"by_test_case": {test_case_id: totals}, "by_type": {test_type: totals},
+            "overall": totals}
+        """
+        now = time.monotonic()
+        if self._history_cache and now - self._history_cache[0] < HISTORY_CACHE_SECONDS:
+            return self._history_cache[1]
+        
+        from app.crud.test_execution import get_execution_history
+        by_test_case = get_execution_history(self.db, days=HISTORY_WINDOW_DAYS)
+        
+        by_type: Dict[str, Dict] = defaultdict(lambda: dict.fromkeys(_HISTORY_TOTALS, 0))
+        overall = dict.fromkeys(_HISTORY_TOTALS, 0)
+        for totals in by_test_case.values():
+            for bucket in (by_type[totals["test_type"]], overall):
+                for field in _HISTORY_TOTALS:
+                    bucket[field] += totals[field]
+        
+        history = {"by_test_case": by_test_case, "by_type": dict(by_type), "overall": overall}
+        self._history_cache = (now, history)
+        return history
+    
     async def _calculate_risk_scores(
         self, scenarios: List[Dict], historical_data: Dict, page_context: Dict
     ) -> Dict[str, RiskScore]:
@@ -519,23 +551,23 @@ class AnalysisAgent(BaseAgent):
         if self.use_llm and self.llm_client and self.llm_client.enabled:
             try:
                 # Call LLM for risk assessment using Azure OpenAI
-                response = await asyncio.to_thread(
-                    self.llm_client.client.chat.completions.create,
-                    model=self.llm_client.deployment,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are an expert risk analyst for software testing. Analyze test scenarios and provide FMEA-based risk assessments. Always respond with valid JSON."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    temperature=0.2,  # Lower temperature for more consistent scoring
-                    max_tokens=3000,
-                    response_format={"type": "json_object"}
-                )
+                async with self.llm_semaphore():  # Per-provider LLM concurrency limit
+                    response = await self.llm_client.async_client.chat.completions.create(
+                        model=self.llm_client.deployment,
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": "You are an expert risk analyst for software testing. Analyze test scenarios and provide FMEA-based risk assessments. Always respond with valid JSON."
+                            },
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ],
+                        temperature=0.2,  # Lower temperature for more consistent scoring
+                        max_tokens=3000,
+                        response_format={"type": "json_object"}
+                    )
                 
                 # Parse LLM response (structured JSON)
                 llm_output = json.loads(response.choices[0].message.content)
@@ -563,8 +595,9 @@ class AnalysisAgent(BaseAgent):
                          if s.get("scenario_id") == scenario_id), 
                         "functional"
                     )
-                    historical_failure_rate = historical_data["failure_rates"].get(
-                        scenario_type, 0.3
+                    historical_failure_rate = historical_data.get("scenario_failure_rates", {}).get(
+                        scenario_id,
+                        historical_data["failure_rates"].get(scenario_type, 0.3)
                     )
                     
                     # Adjust occurrence: if historical failure rate is high, boost occurrence
@@ -1045,14 +1078,26 @@ Respond with valid JSON only."""
         
         # Mode 3: Historical data (for non-critical scenarios)
         else:
+            history = None
+            if self.db:
+                try:
+                    history = self._load_execution_history()
+                except Exception as e:
+                    logger.warning(f"Could not load historical success rates: {e}, using defaults")
             for scenario in scenarios:
-                historical = await self._get_historical_success_rate(scenario)
+                historical = await self._get_historical_success_rate(scenario, history)
                 execution_success.append(historical)
         
         return execution_success
     
-    async def _get_historical_success_rate(self, scenario: Dict) -> Dict:
-        """Get historical success rate from Phase 2 executions"""
+    async def _get_historical_success_rate(self, scenario: Dict, history: Optional[Dict] = None) -> Dict:
+        """
+        Get historical success rate from Phase 2 executions.
+        
+        Uses the scenario's own test case when it has executions, else its
+        type, else every execution in the window. Pass the run's
+        _load_execution_history() result as `history` to avoid re-reading it.
+        """
         scenario_id = scenario.get("scenario_id")
         scenario_type = scenario.get("scenario_type", "functional")
         
@@ -1067,34 +1112,26 @@ Respond with valid JSON only."""
                 "source": "historical_data_stub"
             }
         
+        success_rate = 0.85
+        avg_passed = 17
+        avg_total = 20
         try:
-            from sqlalchemy import text
-            query = text("""
-                SELECT 
-                    AVG(CAST(passed_steps AS FLOAT) / NULLIF(total_steps, 0)) as avg_success_rate,
-                    AVG(passed_steps) as avg_passed,
-                    AVG(total_steps) as avg_total
-                FROM test_executions
-                WHERE created_at > datetime('now', '-90 days')
-                  AND total_steps > 0
-            """)
-            result = self.db.execute(query)
-            row = result.fetchone()
-            
-            if row and row[0]:
-                success_rate = float(row[0])
-                avg_passed = int(row[1] or 0)
-                avg_total = int(row[2] or 0)
-            else:
-                success_rate = 0.85
-                avg_passed = 17
-                avg_total = 20
+            if history is None:
+                history = self._load_execution_history()
+            candidates = (
+                history["by_test_case"].get(scenario.get("test_case_id")),
+                history["by_type"].get(scenario_type),
+                history["overall"],
+            )
+            totals = next((t for t in candidates if t and t["step_runs"]), None)
+            if totals and totals["success_ratio_total"]:
+                runs = totals["step_runs"]
+                success_rate = totals["success_ratio_total"] / runs
+                avg_passed = int(totals["passed_steps"] / runs)
+                avg_total = int(totals["total_steps"] / runs)
         
         except Exception as e:
             logger.warning(f"Could not load historical success rate: {e}, using defaults")
-            success_rate = 0.85
-            avg_passed = 17
-            avg_total = 20
         
         return {
             "scenario_id": scenario_id,
@@ -10,15 +10,33 @@ Design Philosophy:
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Any
 from datetime import datetime, timezone
 from enum import Enum
 import asyncio
 import logging
 import uuid
+import weakref
 
 logger = logging.getLogger(__name__)
 
+# Max in-flight LLM calls per provider (shared by all agents on an event loop).
+# Override per agent with config["llm_max_concurrency"].
+DEFAULT_LLM_CONCURRENCY: Dict[str, int] = {
+    "azure": 8,
+    "openai": 8,
+    "openrouter": 4,
+    "google": 4,
+    "cerebras": 4,
+    "local_vllm": 2,
+}
+DEFAULT_LLM_CONCURRENCY_FALLBACK = 4
+
+# event loop -> {(provider, limit): semaphore}; asyncio primitives are loop-bound
+_llm_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, int], asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 class AgentCapability:
     """
@@ -410,6 +428,74 @@ class BaseAgent(ABC):
             except Exception as e:
                 logger.error(f"Message loop error for agent {self.agent_id}: {e}")
     
+    # ========== BOUNDED LLM CONCURRENCY ==========
+    
+    @property
+    def llm_concurrency(self) -> int:
+        """Max concurrent LLM calls for this agent's provider."""
+        configured = self.config.get("llm_max_concurrency")
+        if configured:
+            return max(1, int(configured))
+        provider = (self.config.get("llm_provider") or "azure").lower()
+        return DEFAULT_LLM_CONCURRENCY.get(provider, DEFAULT_LLM_CONCURRENCY_FALLBACK)
+    
+    def llm_semaphore(self) -> asyncio.Semaphore:
+        """
+        Semaphore limiting in-flight LLM calls to this agent's provider.
+        
+        Shared by every agent on the running event loop that uses the same
+        provider and limit, so parallel agents respect one rate limit.
+        Use as ``async with self.llm_semaphore(): ...`` around a provider call.
+        """
+        loop = asyncio.get_running_loop()
+        provider = (self.config.get("llm_provider") or "azure").lower()
+        per_loop = _llm_semaphores.setdefault(loop, {})
+        key = (provider, self.llm_concurrency)
+        if key not in per_loop:
+            per_loop[key] = asyncio.Semaphore(key[1])
+        return per_loop[key]
+    
+    async def gather_bounded(
+        self,
+        items: Sequence[Any],
+        worker: Callable[[int, Any], Awaitable[Any]],
+        cancel_check: Optional[Callable[[], bool]] = None,
+        on_result: Optional[Callable[[int, Any], None]] = None,
+    ) -> List[Any]:
+        """
+        Run ``worker(index, item)`` for every item under llm_semaphore().
+        
+        Args:
+            items: Work items (e.g. scenarios)
+            worker: Async callable producing the result for one item
+            cancel_check: Checked before each item starts; items not started
+                once it returns True get a None result
+            on_result: Called with (index, result) as each item finishes
+                (completion order), e.g. to emit progress
+        
+        Returns:
+            Results in the original item order
+        """
+        semaphore = self.llm_semaphore()
+        results: List[Any] = [None] * len(items)
+        
+        async def _run(index: int, item: Any) -> None:
+            async with semaphore:
+                if callable(cancel_check) and cancel_check():
+                    return
+                results[index] = await worker(index, item)
+            if on_result:
+                on_result(index, results[index])
+        
+        tasks = [asyncio.ensure_future(_run(i, item)) for i, item in enumerate(items)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for t in tasks:
+                t.cancel()
+            raise
+        return results
+    
     def get_metrics(self) -> Dict[str, Any]:
         """
         Get agent metrics for monitoring.
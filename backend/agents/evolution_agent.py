@@ -176,101 +176,146 @@ class EvolutionAgent(BaseAgent):
             
             logger.info(f"EvolutionAgent: Generating test steps for {len(scenarios)} scenarios...")
             _emit_progress(0.03, f"Preparing generation for {len(scenarios)} scenarios...", scenarios_total=len(scenarios), scenarios_processed=0)
-            for idx, scenario in enumerate(scenarios, 1):
-                if callable(cancel_check) and cancel_check():
-                    logger.info(f"EvolutionAgent: Cancellation requested before scenario {idx}/{len(scenarios)}. Returning partial result.")
-                    break
 
+            # Resolve cache hits and the observed-flow scenario up front (no LLM),
+            # then generate the rest concurrently under the provider's LLM limit.
+            # Scenarios repeated within this run are generated once: the copies
+            # are served from the first one's result, as a cache hit would be.
+            # scenario index -> (steps_result, from_cache)
+            resolved: Dict[int, Tuple[Dict, bool]] = {}
+            cache_keys: Dict[int, str] = {}
+            pending: List[int] = []
+            pending_by_key: Dict[str, int] = {}
+            # scenario index -> index of the pending scenario with the same cache key
+            duplicates: Dict[int, int] = {}
+            for idx, scenario in enumerate(scenarios):
                 scenario_id = scenario.get("scenario_id", "UNKNOWN")
-                scenario_title = scenario.get("title", "Unknown")[:50]  # Truncate long titles
-                
-                logger.info(f"EvolutionAgent: Processing scenario {idx}/{len(scenarios)}: {scenario_id} - {scenario_title}")
-                _emit_progress(
-                    min(0.95, max(0.05, idx / max(1, len(scenarios)))),
-                    f"Processing scenario {idx}/{len(scenarios)}: {scenario_id}",
-                    scenarios_total=len(scenarios),
-                    scenarios_processed=idx - 1,
-                    current_scenario_id=scenario_id,
-                )
                 
                 # Check cache first (if enabled)
                 cache_key = self._generate_cache_key(scenario, page_context)
+                cache_keys[idx] = cache_key
                 if self.cache_enabled and cache_key in self.steps_cache:
                     logger.info(f"EvolutionAgent: Cache hit for scenario {scenario_id}")
-                    cached_result = self.steps_cache[cache_key]
-                    generated_test_cases.append({
-                        "scenario_id": scenario_id,
-                        "steps": cached_result["steps"],
-                        "confidence": cached_result["confidence"],
-                        "from_cache": True
-                    })
-                    logger.debug(f"EvolutionAgent: Cached scenario {scenario_id} has {len(cached_result['steps'])} steps")
-                    _emit_progress(
-                        min(0.95, idx / max(1, len(scenarios))),
-                        f"Generated scenario {idx}/{len(scenarios)} from cache",
-                        scenarios_total=len(scenarios),
-                        scenarios_processed=idx,
-                        current_scenario_id=scenario_id,
-                    )
+                    resolved[idx] = (self.steps_cache[cache_key], True)
                     continue
                 
-                # Generate test steps using LLM or template
                 # When we have observed flow_steps and this scenario is the end-to-end one, use flow_steps so steps match the crawl (no Gmail/login hallucination)
                 scenario_tags = scenario.get("tags") or []
                 is_end_to_end = ("end-to-end" in scenario_tags or "user-requirement" in scenario_tags)
-                steps_result = None
                 if flow_steps and not flow_steps_used_for_scenario and is_end_to_end:
                     steps_result = self._flow_steps_to_test_steps(flow_steps, page_context, login_credentials)
                     if steps_result and steps_result.get("steps"):
                         flow_steps_used_for_scenario = True
                         logger.info(f"EvolutionAgent: Using observed flow_steps for end-to-end scenario {scenario_id} ({len(steps_result['steps'])} steps)")
+                        resolved[idx] = (steps_result, False)
+                        continue
                 
-                if not steps_result:
-                    logger.debug(f"EvolutionAgent: Generating steps for scenario {scenario_id} using {'LLM' if (self.use_llm and self.llm_client) else 'template'}")
-                    if self.use_llm and self.llm_client:
-                        logger.info(
-                            "EvolutionAgent: Using LLM provider/model for step generation: %s/%s",
-                            self.config.get("llm_provider", "azure"),
-                            self.config.get("llm_model", "ChatGPT-UAT"),
-                        )
-                        steps_result = await self._generate_test_steps_with_llm(
+                if self.cache_enabled and cache_key in pending_by_key:
+                    logger.info(f"EvolutionAgent: Scenario {scenario_id} repeats an earlier scenario in this run")
+                    duplicates[idx] = pending_by_key[cache_key]
+                    continue
+                pending_by_key[cache_key] = idx
+                pending.append(idx)
+
+            use_llm = bool(self.use_llm and self.llm_client)
+            if use_llm and pending:
+                logger.info(
+                    "EvolutionAgent: Using LLM provider/model for step generation: %s/%s (concurrency %d)",
+                    self.config.get("llm_provider", "azure"),
+                    self.config.get("llm_model", "ChatGPT-UAT"),
+                    self.llm_concurrency,
+                )
+            processed = len(resolved)
+            if processed:
+                _emit_progress(
+                    min(0.95, max(0.05, processed / max(1, len(scenarios)))),
+                    f"Generated {processed}/{len(scenarios)} scenarios from cache or observed flow",
+                    scenarios_total=len(scenarios),
+                    scenarios_processed=processed,
+                )
+
+            async def _generate(_: int, idx: int) -> Optional[Dict]:
+                scenario = scenarios[idx]
+                scenario_id = scenario.get("scenario_id", "UNKNOWN")
+                scenario_title = scenario.get("title", "Unknown")[:50]  # Truncate long titles
+                logger.info(f"EvolutionAgent: Processing scenario {idx + 1}/{len(scenarios)}: {scenario_id} - {scenario_title}")
+                _emit_progress(
+                    min(0.95, max(0.05, processed / max(1, len(scenarios)))),
+                    f"Processing scenario {idx + 1}/{len(scenarios)}: {scenario_id}",
+                    scenarios_total=len(scenarios),
+                    scenarios_processed=processed,
+                    current_scenario_id=scenario_id,
+                )
+                logger.debug(f"EvolutionAgent: Generating steps for scenario {scenario_id} using {'LLM' if use_llm else 'template'}")
+                try:
+                    if use_llm:
+                        return await self._generate_test_steps_with_llm(
                             scenario, risk_scores, prioritization, page_context, test_data, user_instruction, login_credentials
                         )
-                    else:
-                        steps_result = self._generate_test_steps_from_template(
-                            scenario, page_context
-                        )
-                
+                    return self._generate_test_steps_from_template(scenario, page_context)
+                except asyncio.CancelledError:
+                    # The batch was aborted; this scenario did not fail on its own
+                    logger.info(f"EvolutionAgent: Generation cancelled for scenario {scenario_id}")
+                    raise
+
+            # Positions in pending whose generation ran to completion
+            finished: set = set()
+
+            def _on_generated(position: int, steps_result: Optional[Dict]) -> None:
+                nonlocal processed
+                finished.add(position)
+                idx = pending[position]
+                scenario_id = scenarios[idx].get("scenario_id", "UNKNOWN")
+                processed += 1
+                if not steps_result:
+                    logger.warning(f"EvolutionAgent: Failed to generate steps for scenario {scenario_id}")
+                    return
+                steps_count = len(steps_result.get("steps", []))
+                logger.info(f"EvolutionAgent: Generated {steps_count} steps for scenario {scenario_id} "
+                           f"(confidence: {steps_result.get('confidence', 0.85):.2f}, "
+                           f"tokens: {steps_result.get('tokens_used', 0)})")
+                _emit_progress(
+                    min(0.95, processed / max(1, len(scenarios))),
+                    f"Generated {steps_count} steps for scenario {idx + 1}/{len(scenarios)}",
+                    scenarios_total=len(scenarios),
+                    scenarios_processed=processed,
+                    current_scenario_id=scenario_id,
+                )
+
+            generated = await self.gather_bounded(
+                pending, _generate, cancel_check=cancel_check, on_result=_on_generated
+            )
+            for idx, steps_result in zip(pending, generated):
                 if steps_result:
-                    steps_count = len(steps_result.get("steps", []))
-                    logger.info(f"EvolutionAgent: Generated {steps_count} steps for scenario {scenario_id} "
-                               f"(confidence: {steps_result.get('confidence', 0.85):.2f}, "
-                               f"tokens: {steps_result.get('tokens_used', 0)})")
-                    generated_test_cases.append({
-                        "scenario_id": scenario_id,
+                    resolved[idx] = (steps_result, False)
+            skipped = len(pending) - len(finished)
+            if skipped:
+                logger.info(f"EvolutionAgent: Skipped {skipped} scenarios after cancellation request")
+            for idx, original in duplicates.items():
+                if original in resolved:
+                    resolved[idx] = (resolved[original][0], True)
+
+            # Assemble in the original scenario order
+            for idx in sorted(resolved):
+                steps_result, from_cache = resolved[idx]
+                scenario_id = scenarios[idx].get("scenario_id", "UNKNOWN")
+                generated_test_cases.append({
+                    "scenario_id": scenario_id,
+                    "steps": steps_result["steps"],
+                    "confidence": steps_result.get("confidence", 0.85),
+                    "from_cache": from_cache
+                })
+                if from_cache:
+                    continue
+                total_tokens += steps_result.get("tokens_used", 0)
+                
+                # Cache the result
+                if self.cache_enabled:
+                    self.steps_cache[cache_keys[idx]] = {
                         "steps": steps_result["steps"],
                         "confidence": steps_result.get("confidence", 0.85),
-                        "from_cache": False
-                    })
-                    total_tokens += steps_result.get("tokens_used", 0)
-                    
-                    # Cache the result
-                    if self.cache_enabled:
-                        self.steps_cache[cache_key] = {
-                            "steps": steps_result["steps"],
-                            "confidence": steps_result.get("confidence", 0.85),
-                            "cached_at": datetime.now(timezone.utc).isoformat()
-                        }
-
-                    _emit_progress(
-                        min(0.95, idx / max(1, len(scenarios))),
-                        f"Generated {steps_count} steps for scenario {idx}/{len(scenarios)}",
-                        scenarios_total=len(scenarios),
-                        scenarios_processed=idx,
-                        current_scenario_id=scenario_id,
-                    )
-                else:
-                    logger.warning(f"EvolutionAgent: Failed to generate steps for scenario {scenario_id}")
+                        "cached_at": datetime.now(timezone.utc).isoformat()
+                    }
             
             # Store test cases in database (if database session available)
             db_test_case_ids = []
@@ -369,9 +414,8 @@ class EvolutionAgent(BaseAgent):
             prompt_builder = self.prompt_variants.get(self.current_variant, self._build_prompt_variant_1)
             prompt = prompt_builder(scenario, risk_scores, prioritization, page_context, test_data, user_instruction, login_credentials)
             
-            # Call LLM (Azure OpenAI create is synchronous, not async)
-            response = await asyncio.to_thread(
-                self.llm_client.client.chat.completions.create,
+            # Call LLM (pooled async SDK client, no worker thread)
+            response = await self.llm_client.async_client.chat.completions.create(
                 model=self.llm_client.deployment,
                 messages=[
                     {"role": "system", "content": "You are an expert test automation engineer. Generate executable test steps as an array of strings."},
@@ -4,7 +4,6 @@ Follows BDD, ISTQB, WCAG 2.1, OWASP security standards
 """
 from agents.base_agent import BaseAgent, AgentCapability, TaskContext, TaskResult
 from typing import Dict, List, Tuple, Optional, Any
-import asyncio
 import time
 import re
 import json
@@ -935,13 +934,13 @@ class RequirementsAgent(BaseAgent):
             )
             
             # Call Azure OpenAI
-            response = await asyncio.to_thread(
-                self.llm_client.client.chat.completions.create,
-                model=self.llm_client.deployment,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert test analyst specializing in BDD (Behavior-Driven Development) test scenarios.
+            async with self.llm_semaphore():  # Per-provider LLM concurrency limit
+                response = await self.llm_client.async_client.chat.completions.create(
+                    model=self.llm_client.deployment,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": """You are an expert test analyst specializing in BDD (Behavior-Driven Development) test scenarios.
 Generate comprehensive test scenarios following these standards:
 - BDD (Gherkin): Given/When/Then format
 - ISTQB: Equivalence partitioning, boundary value analysis
@@ -949,16 +948,16 @@ Generate comprehensive test scenarios following these standards:
 - OWASP Top 10: Security testing (XSS, SQL injection, CSRF)
 
 Always respond with valid JSON containing high-quality test scenarios."""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.4,  # Balance creativity with consistency
-                max_tokens=3000,
-                response_format={"type": "json_object"}
-            )
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=0.4,  # Balance creativity with consistency
+                    max_tokens=3000,
+                    response_format={"type": "json_object"}
+                )
             
             # Parse response
             result = json.loads(response.choices[0].message.content)
@@ -1,9 +1,10 @@
-from typing import Generator, Optional
+from typing import Generator, Optional, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from sqlalchemy.orm import Session
 from app.core.security import decode_token
+from app.core.user_cache import CachedUser, user_cache
 from app.crud.user import get_user
 from app.db.session import SessionLocal
 from app.models.user import User
@@ -20,38 +21,68 @@ def get_db() -> Generator:
         db.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
-    """Get current authenticated user."""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+def _token_claims(token: str) -> Tuple[int, int]:
+    """(user id, token version) from a bearer token; tokens without "ver" are version 0."""
     payload = decode_token(token)
     
     if payload is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     user_id_str: Optional[str] = payload.get("sub")
     if user_id_str is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     try:
-        user_id: int = int(user_id_str)
-    except ValueError:
-        raise credentials_exception
-    
+        return int(user_id_str), int(payload.get("ver", 0))
+    except (TypeError, ValueError):
+        raise _credentials_exception()
+
+
+def _load_user(db: Session, user_id: int, token_version: int) -> User:
+    """Fetch the user and cache it, rejecting tokens issued before the last revocation."""
     user = get_user(db, user_id=user_id)
-    if user is None:
-        raise credentials_exception
-    
+    if user is None or (user.token_version or 0) != token_version:
+        raise _credentials_exception()
+    user_cache.put(user)
     return user
 
 
+def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    """Get current authenticated user (attached to db; no users query while cached)."""
+    user_id, token_version = _token_claims(token)
+    cached = user_cache.get(user_id, token_version)
+    if cached is not None:
+        return db.merge(cached.to_user(), load=False)
+    return _load_user(db, user_id, token_version)
+
+
+def get_current_identity(token: str = Depends(oauth2_scheme)) -> CachedUser:
+    """
+    Identity and role of the authenticated user, for endpoints that need
+    nothing else: a cached user opens no database session at all.
+    """
+    user_id, token_version = _token_claims(token)
+    cached = user_cache.get(user_id, token_version)
+    if cached is not None:
+        return cached
+    db = SessionLocal()
+    try:
+        return CachedUser.from_user(_load_user(db, user_id, token_version))
+    finally:
+        db.close()
+
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -1,12 +1,14 @@
 """Test execution API endpoints."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
 import json
 import asyncio
 
 from app.api import deps
+from app.core.user_cache import CachedUser
 from app.models.user import User
 from app.models.test_execution import ExecutionStatus, ExecutionResult
 from app.schemas.test_execution import (
@@ -27,8 +29,16 @@ from app.services.stagehand_factory import get_stagehand_adapter
 from app.services.stagehand_adapter import StagehandAdapter
 from app.services.queue_manager import get_queue_manager
 from app.services.execution_queue import get_execution_queue
+from app.services.durable_execution_queue import InlineCredentialsRejected
 from app.services.resume_guard import validate_resume_point
 from app.services.execution_cancel_store import register_cancel, request_cancel, clear_cancel
+from app.services.execution_progress import execution_snapshot_events
+from app.services.progress_tracker import (
+    format_sse,
+    get_execution_progress_tracker,
+    parse_last_event_id,
+    ProgressTracker,
+)
 
 router = APIRouter()
 
@@ -249,14 +259,20 @@ async def run_test_with_playwright(
     
     # Add to execution queue (Sprint 3 Day 2)
     queue = get_execution_queue()
-    queue_position = queue.add_to_queue(
-        execution_id=execution_id,
-        test_case_id=test_case_id,
-        user_id=current_user.id,
-        priority=execution.priority,
-        http_credentials=http_credentials,
-        login_credentials=login_credentials,
-    )
+    try:
+        queue_position = queue.add_to_queue(
+            execution_id=execution_id,
+            test_case_id=test_case_id,
+            user_id=current_user.id,
+            priority=execution.priority,
+            http_credentials=http_credentials,
+            login_credentials=login_credentials,
+        )
+    except InlineCredentialsRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     # Update queue position in database
     execution.queue_position = queue_position
@@ -267,7 +283,7 @@ async def run_test_with_playwright(
     # No need to manually start execution - it's now handled by the queue
     
     # Determine message based on queue status
-    if queue_position == 0 and queue.is_under_limit():
+    if queue_position == 1 and queue.is_under_limit():
         message = f"Test execution starting now for test case '{test_case.title}'"
     else:
         message = f"Test execution queued (position {queue_position}) for test case '{test_case.title}'"
@@ -469,6 +485,104 @@ def get_execution(
     return execution
 
 
+async def _execution_event_stream(
+    execution_id: int,
+    progress_tracker: ProgressTracker,
+    snapshot: List[dict],
+    from_step: int,
+    last_event_id: int,
+    follow: bool,
+):
+    """
+    Yield SSE bytes: the database catch-up first, then live tracker events.
+
+    Live step events at or before the last step already sent are skipped, so
+    a step is never reported twice when the snapshot and buffer overlap.
+    """
+    sent_through = from_step
+    try:
+        for item in snapshot:
+            sent_through = max(sent_through, item["data"].get("step") or 0)
+            yield format_sse(item["event"], item["data"]).encode("utf-8")
+        if not follow:
+            return
+        async for event in progress_tracker.subscribe(
+            str(execution_id),
+            last_event_id=last_event_id,
+            timeout_seconds=900.0,
+            keepalive_interval=15.0,
+        ):
+            ev_type = event.get("event", "message")
+            if ev_type == "_keepalive":
+                yield ": keepalive\n\n".encode("utf-8")
+                continue
+            data = event.get("data", {})
+            step = data.get("step")
+            if step is not None and ev_type != "execution_finished" and step <= sent_through:
+                continue
+            yield format_sse(ev_type, data, event.get("id")).encode("utf-8")
+    except asyncio.CancelledError:
+        pass
+
+
+@router.get(
+    "/{execution_id}/stream",
+    response_class=StreamingResponse,
+    responses={200: {"description": "SSE stream of step-level progress", "content": {"text/event-stream": {}}}},
+)
+def stream_execution_progress(
+    execution_id: int,
+    from_step: int = Query(0, ge=0, description="Only send steps after this step number"),
+    last_event_id: Optional[str] = Query(None, description="Resume after this event id"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(deps.get_current_user),
+    db: Session = Depends(deps.get_db),
+):
+    """
+    Stream execution progress via Server-Sent Events.
+
+    **Authentication required**
+
+    Events: `execution_started`, `step_started`, `tier_fallback`,
+    `screenshot_ready`, `step_finished`, `execution_finished` (the stream
+    ends after it). Steps already recorded after `from_step` are sent first
+    from the database; live events carry an `id`, and reconnecting with
+    `Last-Event-ID` resumes from the in-memory buffer instead.
+    Non-admin users can only stream their own executions.
+    """
+    execution = crud_executions.get_execution(db, execution_id)
+
+    if not execution:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Execution not found"
+        )
+
+    if current_user.role != "admin" and execution.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to view this execution"
+        )
+
+    progress_tracker = get_execution_progress_tracker()
+    resume_after = parse_last_event_id(last_event_id_header or last_event_id)
+    finished = execution.status in crud_executions.TERMINAL_STATUSES
+    # A reconnect with an event id is served from the live buffer alone
+    snapshot = [] if resume_after and not finished else execution_snapshot_events(db, execution, from_step)
+
+    return StreamingResponse(
+        _execution_event_stream(
+            execution_id, progress_tracker, snapshot, from_step, resume_after, follow=not finished
+        ),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @router.delete("/{execution_id}/cancel", status_code=status.HTTP_204_NO_CONTENT)
 def cancel_execution_endpoint(
     execution_id: int,
@@ -481,7 +595,8 @@ def cancel_execution_endpoint(
     **Authentication required**
 
     Pending executions are dequeued and marked cancelled immediately.
-    Running executions set an in-memory cancel flag polled by the worker.
+    Running executions set a cancel flag polled by the worker (in memory,
+    and on the execution row for out-of-process workers).
     Terminal states return 204 idempotently.
     """
     execution = crud_executions.get_execution(db, execution_id)
@@ -515,6 +630,10 @@ def cancel_execution_endpoint(
     if execution.status == ExecutionStatus.RUNNING:
         register_cancel(execution_id)
         request_cancel(execution_id)
+        # Durable queue: the run may live in another worker process, which
+        # picks this flag up on its next heartbeat.
+        execution.cancel_requested = True
+        db.commit()
         return None
 
     return None
@@ -559,7 +678,8 @@ def delete_execution(
 
 @router.get("/queue/status")
 def get_queue_status(
-    current_user: User = Depends(deps.get_current_user)
+    limit: Optional[int] = Query(None, ge=1, description="Max queued items to list"),
+    current_user: CachedUser = Depends(deps.get_current_identity)
 ):
     """
     Get current queue status.
@@ -573,16 +693,16 @@ def get_queue_status(
     - `queued_count`: Number of executions waiting in queue
     - `max_concurrent`: Maximum concurrent executions allowed
     - `is_under_limit`: Whether more executions can start
-    - `queue`: List of queued executions
+    - `queue`: List of queued executions in dispatch order, with exact `queue_position`
     - `active`: List of active executions
     """
     queue = get_execution_queue()
-    return queue.get_queue_status()
+    return queue.get_queue_status(limit=limit)
 
 
 @router.get("/queue/statistics")
 def get_queue_statistics(
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CachedUser = Depends(deps.get_current_identity)
 ):
     """
     Get queue manager statistics.
@@ -597,7 +717,7 @@ def get_queue_statistics(
 
 @router.post("/queue/clear")
 def clear_queue(
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CachedUser = Depends(deps.get_current_identity)
 ):
     """
     Clear all queued executions.
@@ -625,7 +745,7 @@ def clear_queue(
 
 @router.get("/queue/active")
 def get_active_executions(
-    current_user: User = Depends(deps.get_current_user)
+    current_user: CachedUser = Depends(deps.get_current_identity)
 ):
     """
     Get list of active (running) executions.
@@ -1,12 +1,12 @@
 """Knowledge Base API endpoints."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Form, Query
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.models.user import User
-from app.models.kb_document import FileType
+from app.models.kb_document import ExtractionStatus, FileType
 from app.schemas.kb_document import (
     KBCategoryCreate,
     KBCategoryUpdate,
@@ -114,6 +114,7 @@ def update_category(
 
 @router.post("/upload", response_model=KBUploadResponse, status_code=status.HTTP_201_CREATED)
 async def upload_document(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="File to upload (PDF, DOCX, TXT, MD)"),
     title: str = Form(..., description="Document title"),
     category_id: int = Form(..., description="Category ID"),
@@ -127,7 +128,10 @@ async def upload_document(
     **Authentication required**
     
     Accepts PDF, DOCX, TXT, or MD files up to 25MB.
-    Automatically extracts text content for search.
+    Automatically extracts and indexes text content for search.
+    TXT/MD content is available immediately; PDF/DOCX extraction runs in
+    the background (poll GET /kb/{document_id} for `extraction_status`
+    and `extraction_progress`).
     
     **Form Data:**
     - `file`: The file to upload
@@ -154,8 +158,9 @@ async def upload_document(
             detail=f"Failed to save file: {str(e)}"
         )
     
-    # Extract text content
-    content = await file_service.extract_text(file_path, file_type)
+    # Plain text is cheap to read inline; PDF/DOCX parsing is a background job
+    extract_inline = file_type in (FileType.TXT, FileType.MD)
+    content = await file_service.extract_text(file_path, file_type) if extract_inline else None
     
     # Create document record
     document_create = KBDocumentCreate(
@@ -166,11 +171,19 @@ async def upload_document(
         file_path=file_path,
         file_type=file_type,
         file_size=file_size,
-        content=content
+        content=content,
+        extraction_status=ExtractionStatus.COMPLETED if extract_inline else ExtractionStatus.PENDING,
+        extraction_progress=100 if extract_inline else 0
     )
     
     document = crud.create_document(db, document_create, current_user.id)
     
+    if extract_inline:
+        # Chunk (and embed) the content for passage retrieval
+        await file_service.index_document(db, document)
+    else:
+        background_tasks.add_task(file_service.process_document, document.id)
+    
     return KBUploadResponse(
         id=document.id,
         title=document.title,
@@ -178,7 +191,8 @@ async def upload_document(
         file_type=document.file_type,
         file_size=document.file_size,
         category_id=document.category_id,
-        message="File uploaded successfully"
+        extraction_status=document.extraction_status,
+        message="File uploaded successfully" if extract_inline else "File uploaded; text extraction in progress"
     )
 
 
@@ -20,13 +20,16 @@ from app.schemas.execution_settings import (
     ExecutionStrategyInfo,
     TierDistributionStats,
     StrategyEffectivenessStats,
+    TierTimeoutStats,
+    RaceSpeculationStats,
     XPathCache as XPathCacheSchema,
     XPathCacheStatsResponse,
     XPathCacheListResponse,
     XPathCacheClearResponse,
 )
 from app.services.user_settings_service import user_settings_service
-from app.services.xpath_cache_service import XPathCacheService
+from app.services.xpath_cache_service import XPathCacheService, invalidate_memory_cache
+from app.services.tier_timeouts import get_tier_timeout_model
 from app.crud import execution_settings as crud_execution_settings
 
 router = APIRouter()
@@ -459,6 +462,35 @@ async def get_available_strategies(
                 "Higher cost than Option A",
                 "More complex execution flow"
             ]
+        },
+        {
+            "name": "race",
+            "display_name": "Race: Speculative Tier 2",
+            "description": "Option C, but Tier 2 resolves its XPath while Tier 1 runs so a Tier 1 failure falls back instantly.",
+            "success_rate_min": 97,
+            "success_rate_max": 99,
+            "cost_level": "high",
+            "speed_level": "fast",
+            "performance_level": "high",
+            "recommended": False,
+            "tier_flow": [1, 2, 3],
+            "fallback_chain": ["Tier 1: Playwright + Tier 2 XPath lookup (parallel)", "Tier 2: Hybrid", "Tier 3: Stagehand AI"],
+            "recommended_for": "Latency-sensitive suites where Tier 1 often fails and LLM cost matters less",
+            "use_cases": [
+                "Pages whose selectors change often",
+                "Long suites where Tier 1 timeouts dominate run time",
+                "Comparing speculation cost vs. latency saved (race-speculation analytics)"
+            ],
+            "pros": [
+                "Same success rate as Option C",
+                "Tier 2 starts with its XPath already resolved",
+                "Speculation is read-only (observe) until Tier 1 has failed"
+            ],
+            "cons": [
+                "Pays for an XPath extraction even when Tier 1 succeeds",
+                "Uncached steps make one extra LLM call each",
+                "Highest cost of all strategies"
+            ]
         }
     ]
     
@@ -512,6 +544,53 @@ async def get_strategy_effectiveness(
         )
 
 
+@router.get("/analytics/tier-timeouts", response_model=List[TierTimeoutStats])
+async def get_tier_timeouts(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the adaptive per-tier timeouts this server currently applies.
+
+    One entry per (domain, action, tier) latency histogram, with its p50/p99
+    and the resulting timeout under the current user's
+    timeout_per_tier_seconds. Entries with adaptive=false do not have enough
+    samples yet and use the user's timeout unchanged.
+    """
+    try:
+        settings = crud_execution_settings.get_or_create_execution_settings(db, current_user.id)
+        model = get_tier_timeout_model()
+        model.ensure_seeded(db)
+        return model.snapshot(max_ms=settings.timeout_per_tier_seconds * 1000)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get tier timeouts: {str(e)}"
+        )
+
+
+@router.get("/analytics/race-speculation", response_model=RaceSpeculationStats)
+async def get_race_speculation(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the cost of the race strategy's speculative Tier 2 extractions.
+
+    Compares the LLM extraction calls, time, tokens and estimated cost spent
+    speculatively (including extractions wasted because Tier 1 succeeded)
+    against the fallback latency saved when Tier 1 failed and Tier 2 found its
+    XPath already resolved.
+    """
+    try:
+        return crud_execution_settings.get_race_speculation_stats(db, user_id=current_user.id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get race speculation stats: {str(e)}"
+        )
+
+
 # ============================================================================
 # Sprint 10.16: XPath Cache Management Endpoints
 # ============================================================================
@@ -593,8 +672,10 @@ async def delete_xpath_cache_entry(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"XPath cache entry {entry_id} not found",
         )
+    cache_key = entry.cache_key
     db.delete(entry)
     db.commit()
+    invalidate_memory_cache(cache_key)
 
 
 @router.delete("/xpath-cache", response_model=XPathCacheClearResponse)
@@ -619,6 +700,7 @@ async def clear_xpath_cache(
         else:
             deleted = db.query(XPathCacheModel).delete()
             db.commit()
+            invalidate_memory_cache()
             message = f"Cleared all {deleted} XPath cache entries"
         return XPathCacheClearResponse(deleted=deleted, message=message)
     except Exception as e:
@@ -73,7 +73,8 @@ async def generate_test_cases(
             db=db,
             use_kb_context=request.use_kb_context,
             max_kb_docs=request.max_kb_docs,
-            user_id=current_user.id  # Pass user ID to load generation settings
+            user_id=current_user.id,  # Pass user ID to load generation settings
+            kb_token_budget=request.kb_token_budget
         )
         
         return result
@@ -147,8 +147,10 @@ async def run_suite(
     Returns a suite execution ID and list of individual test execution IDs.
     
     Options:
-    - stop_on_failure: Stop running subsequent tests if one fails
-    - parallel: Run tests in parallel (not yet implemented)
+    - stop_on_failure: Stop running subsequent tests if one fails (parallel runs)
+    - parallel: Queue every runnable test at once, honouring item dependencies;
+      otherwise all tests are merged into one execution with a shared browser
+    - max_parallel: Cap on this suite's concurrently queued/running tests
     """
     # Check ownership
     suite = crud_test_suite.get_test_suite(db, suite_id)
@@ -157,6 +159,19 @@ async def run_suite(
     if suite.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to run this suite")
     
+    if execution_request.parallel:
+        # One execution per test case, fanned out over the execution queue
+        return await execute_test_suite(
+            db=db,
+            suite_id=suite_id,
+            user_id=current_user.id,
+            browser=execution_request.browser,
+            environment=execution_request.environment,
+            stop_on_failure=execution_request.stop_on_failure,
+            parallel=True,
+            max_parallel=execution_request.max_parallel
+        )
+    
     # Execute suite using merged approach (single browser session)
     # This merges all test cases into ONE execution with shared browser
     from app.services.suite_execution_service import execute_test_suite_merged
@@ -423,8 +423,7 @@ async def _enrich_steps_with_instruction(
     )
 
     try:
-        response = await asyncio.to_thread(
-            llm_client.client.chat.completions.create,
+        response = await llm_client.async_client.chat.completions.create(
             model=llm_client.deployment,
             messages=[
                 {
@@ -533,8 +532,7 @@ async def _review_and_clean_steps(
     )
 
     try:
-        response = await asyncio.to_thread(
-            llm_client.client.chat.completions.create,
+        response = await llm_client.async_client.chat.completions.create(
             model=llm_client.deployment,
             messages=[
                 {
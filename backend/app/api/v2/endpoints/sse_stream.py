@@ -2,23 +2,25 @@
 API v2: Server-Sent Events (SSE) Stream Endpoint
 
 GET /api/v2/workflows/{workflow_id}/stream
-Streams real-time progress events for a workflow.
+Streams real-time progress events for a workflow. Each message carries an
+`id:`; reconnecting clients resume after the Last-Event-ID header (sent
+automatically by EventSource) or the `last_event_id` query parameter.
 """
 import asyncio
-import json
-from fastapi import APIRouter, Depends, Request
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Request
 from fastapi.responses import StreamingResponse
-from app.services.progress_tracker import get_progress_tracker, ProgressTracker
+from app.services.progress_tracker import format_sse, get_progress_tracker, parse_last_event_id, ProgressTracker
 
 router = APIRouter()
 
 
-def _sse_format(event_type: str, data: dict) -> str:
-    """Format one SSE message: event type + data line + double newline."""
-    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
-
-
-async def _event_generator(workflow_id: str, progress_tracker: ProgressTracker, request: Request):
+async def _event_generator(
+    workflow_id: str,
+    progress_tracker: ProgressTracker,
+    request: Request,
+    last_event_id: int = 0,
+):
     """Async generator that yields SSE-formatted bytes.
 
     NOTE: We intentionally do NOT call request.is_disconnected() here.
@@ -26,10 +28,14 @@ async def _event_generator(workflow_id: str, progress_tracker: ProgressTracker,
     Starlette/uvicorn ASGI lifecycle and can stall the stream after a few
     events.  Natural termination happens via terminal events or the 300s
     timeout; uvicorn raises CancelledError on a broken-pipe disconnect.
+
+    The workflow's buffer is left in place for other subscribers and later
+    reconnects; the tracker evicts it once idle.
     """
     try:
         async for event in progress_tracker.subscribe(
             workflow_id,
+            last_event_id=last_event_id,
             timeout_seconds=300.0,
             keepalive_interval=15.0,
         ):
@@ -42,11 +48,9 @@ async def _event_generator(workflow_id: str, progress_tracker: ProgressTracker,
                 "data": event.get("data", {}),
                 "timestamp": event.get("timestamp", ""),
             }
-            yield _sse_format(ev_type, payload).encode("utf-8")
+            yield format_sse(ev_type, payload, event.get("id")).encode("utf-8")
     except asyncio.CancelledError:
         pass
-    finally:
-        await progress_tracker.cleanup(workflow_id)
 
 
 @router.get(
@@ -69,6 +73,11 @@ async def _event_generator(workflow_id: str, progress_tracker: ProgressTracker,
     - `workflow_completed`: All agents complete
     - `workflow_failed`: Workflow failed with error
 
+    **Reconnects:** every event has an `id`. Buffered events after the
+    `Last-Event-ID` header (or `last_event_id` query parameter) are replayed
+    first, so a reconnecting client misses nothing still in the buffer.
+    Several clients may stream the same workflow.
+
     **Usage:**
     ```javascript
     const eventSource = new EventSource('/api/v2/workflows/{workflow_id}/stream');
@@ -85,11 +94,14 @@ async def _event_generator(workflow_id: str, progress_tracker: ProgressTracker,
 async def stream_workflow_progress(
     request: Request,
     workflow_id: str,
+    last_event_id: Optional[str] = Query(None, description="Resume after this event id"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
     progress_tracker: ProgressTracker = Depends(get_progress_tracker),
 ):
     """Stream workflow progress via Server-Sent Events."""
+    resume_after = parse_last_event_id(last_event_id_header or last_event_id)
     return StreamingResponse(
-        _event_generator(workflow_id, progress_tracker, request),
+        _event_generator(workflow_id, progress_tracker, request, resume_after),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -34,7 +34,7 @@ async def get_workflow_status(
     workflow_id: str = Path(..., description="Workflow identifier")
 ) -> WorkflowStatusResponse:
     """Get workflow status by ID."""
-    state = get_state(workflow_id)
+    state = get_state(workflow_id, include_result=False)
     if not state:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -126,7 +126,7 @@ async def cancel_workflow(
     workflow_id: str = Path(..., description="Workflow identifier")
 ):
     """Cancel a running workflow. Returns 204 on success, 404 if not found."""
-    state = get_state(workflow_id)
+    state = get_state(workflow_id, include_result=False)
     if not state:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -15,6 +15,9 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
+    # Authenticated users cached per process so requests skip the users query
+    AUTH_USER_CACHE_TTL_SECONDS: float = 30.0  # 0 = always query
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 1024
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -58,8 +61,23 @@ class Settings(BaseSettings):
     
     # Queue System (for Sprint 3 Day 2)
     MAX_CONCURRENT_EXECUTIONS: int = 5  # Maximum concurrent test executions
-    QUEUE_CHECK_INTERVAL: int = 2  # How often to check queue (seconds)
+    QUEUE_CHECK_INTERVAL: int = 2  # Fallback dispatcher wake-up (seconds); enqueue/completion wake it immediately
     EXECUTION_TIMEOUT: int = 300  # Execution timeout (seconds)
+    # "memory" = in-process queue; "database" = durable test_executions queue shared by
+    # the API and any number of `python -m app.worker` processes (leases + heartbeats)
+    EXECUTION_QUEUE_BACKEND: str = "memory"
+    RUN_QUEUE_WORKER_IN_API: bool = True  # False = API only enqueues; run app.worker separately
+    QUEUE_LEASE_SECONDS: int = 60  # Claimed runs are reclaimed if not heartbeated for this long
+    QUEUE_MAX_CLAIMS: int = 3  # Fail a run after its worker lease expired this many times
+    # Write-behind buffer for step rows / tier logs / session snapshots during a run
+    EXECUTION_WRITE_FLUSH_INTERVAL_SECONDS: float = 1.0  # Bulk insert buffered rows this often
+    EXECUTION_WRITE_BATCH_SIZE: int = 50  # ...or as soon as this many rows are waiting
+
+    # Warm browser pool shared across queued executions
+    BROWSER_POOL_ENABLED: bool = True
+    BROWSER_POOL_SIZE: int = 0  # 0 = one browser per MAX_CONCURRENT_EXECUTIONS slot
+    BROWSER_POOL_MAX_USES: int = 50  # Recycle a browser after N executions (0 = never)
+    BROWSER_POOL_MAX_RSS_MB: int = 1500  # Recycle when browser RSS exceeds this (0 = never; needs psutil)
 
     # API v2: AnalysisAgent real-time test execution (Phase3 Architecture)
     # When True, POST /generate-tests and POST /analysis run critical scenarios for scoring.
@@ -120,6 +138,59 @@ class Settings(BaseSettings):
     LLM_LOG_DIR: str = "logs/llm"
     LLM_LOG_MAX_FILES: int = 200
     LLM_LOG_FULL_PROMPT: bool = False
+    # USD per 1K tokens used to estimate LLM spend in analytics (0 = cost not estimated)
+    LLM_COST_PER_1K_PROMPT_TOKENS: float = 0.0
+    LLM_COST_PER_1K_COMPLETION_TOKENS: float = 0.0
+
+    # LLM response cache (content-addressed; only temperature=0 calls unless forced per call)
+    LLM_RESPONSE_CACHE_ENABLED: bool = False
+    LLM_RESPONSE_CACHE_PATH: str = "cache/llm_responses.sqlite3"  # SQLite tier shared by local processes ("" = memory only)
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 512  # In-memory LRU size per process
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 86400  # 24 hours
+
+    # Knowledge Base retrieval: documents are split into overlapping chunks at upload
+    # and searched through SQLite FTS5 / Postgres tsvector
+    KB_CHUNK_SIZE_CHARS: int = 1500
+    KB_CHUNK_OVERLAP_CHARS: int = 200
+    KB_SEARCH_TOP_K: int = 8  # Passages returned per query
+    KB_CONTEXT_TOKEN_BUDGET: int = 3000  # Default KB token budget in generation prompts
+    KB_CONTEXT_CACHE_MAX_ENTRIES: int = 128  # Assembled contexts kept per process
+    KB_EXTRACTION_WORKERS: int = 0  # PDF/DOCX extraction processes (0 = min(4, CPU count))
+    # Optional local sentence-transformers model used to rerank full-text hits
+    # (e.g. "all-MiniLM-L6-v2"); "" = full-text ranking only
+    KB_EMBEDDING_MODEL: str = ""
+
+    # 3-Tier learned routing: start a step at the tier that last succeeded once
+    # Tier 1 has failed this many times in a row for it (tier_execution_logs),
+    # and retry Tier 1 every PROBE_INTERVAL routed runs
+    TIER_ROUTING_ENABLED: bool = True
+    TIER_ROUTING_MIN_TIER1_FAILURES: int = 2
+    TIER_ROUTING_PROBE_INTERVAL: int = 5
+    # Adaptive tier timeouts: p99 latency per (domain, action, tier) x safety factor,
+    # clamped between TIER_TIMEOUT_MIN_SECONDS and the user's timeout_per_tier_seconds
+    TIER_TIMEOUT_ADAPTIVE_ENABLED: bool = True
+    TIER_TIMEOUT_SAFETY_FACTOR: float = 3.0
+    TIER_TIMEOUT_MIN_SECONDS: float = 0.5
+    TIER_TIMEOUT_MIN_SAMPLES: int = 20  # Successful attempts before a key's timeout adapts
+    # Tier 2 observe() memoization: candidates kept per DOM fingerprint and matched
+    # locally (description word overlap >= MIN_SCORE) before a new observe()
+    OBSERVE_MEMO_ENABLED: bool = True
+    OBSERVE_MEMO_MAX_PAGES: int = 256
+    OBSERVE_MEMO_MIN_SCORE: float = 0.75
+
+    # Workflow progress events (SSE): recent events kept per workflow for
+    # Last-Event-ID replay; workflows idle this long are dropped
+    PROGRESS_BUFFER_SIZE: int = 1000
+    PROGRESS_IDLE_TTL_SECONDS: int = 1800
+    # Optional Redis URL (pip install redis) so SSE can run in another process
+    # than the orchestration worker; "" = in-process only
+    PROGRESS_PUBSUB_URL: str = ""
+
+    # API v2 workflow state/results: "memory" (per process) or "database"
+    # (workflow_records table, shared by replicas and kept across restarts)
+    WORKFLOW_STORE_BACKEND: str = "memory"
+    WORKFLOW_STORE_MAX_ENTRIES: int = 500  # memory backend LRU size
+    WORKFLOW_STORE_TTL_SECONDS: int = 604800  # drop workflows not updated for 7 days
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,93 @@
+"""
+Short-lived in-process cache of authenticated users.
+
+get_current_user runs on every authenticated request; with the cache a
+request whose user was seen in the last AUTH_USER_CACHE_TTL_SECONDS resolves
+without a users query. Entries are tied to the token version: bumping
+users.token_version (password change, deactivation) makes older tokens miss
+the cache and fail the database check. crud.user invalidates entries on
+update; other processes pick up changes once their entry expires.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Identity and role of an authenticated user (no password hash)."""
+
+    id: int
+    email: str
+    username: str
+    role: str
+    is_active: bool
+    token_version: int
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(**{f.name: getattr(user, f.name) for f in fields(cls)})
+
+    def to_user(self) -> User:
+        """Detached, clean User for Session.merge(..., load=False); other columns load on access."""
+        user = User(**{f.name: getattr(self, f.name) for f in fields(self)})
+        make_transient_to_detached(user)
+        return user
+
+
+class UserCache:
+    """LRU of CachedUser keyed by (user id, token version) with a TTL."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.AUTH_USER_CACHE_TTL_SECONDS
+        self.max_entries = max_entries or settings.AUTH_USER_CACHE_MAX_ENTRIES
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[int, int], Tuple[float, CachedUser]]" = OrderedDict()
+
+    def get(self, user_id: int, token_version: int) -> Optional[CachedUser]:
+        if self.ttl_seconds <= 0:
+            return None
+        key = (user_id, token_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, user: User) -> CachedUser:
+        cached = CachedUser.from_user(user)
+        if self.ttl_seconds <= 0:
+            return cached
+        with self._lock:
+            key = (cached.id, cached.token_version)
+            self._entries[key] = (time.monotonic(), cached)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return cached
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop every cached version of a user."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
@@ -24,11 +24,13 @@ def create_test_suite(
     db.flush()  # Get suite.id
     
     # Create suite items with execution order
+    dependencies = suite_data.dependencies or {}
     for order, test_case_id in enumerate(suite_data.test_case_ids, start=1):
         suite_item = TestSuiteItem(
             suite_id=suite.id,
             test_case_id=test_case_id,
-            execution_order=order
+            execution_order=order,
+            depends_on=dependencies.get(test_case_id) or None
         )
         db.add(suite_item)
     
@@ -79,7 +81,7 @@ def update_test_suite(
         return None
     
     # Update basic fields
-    update_data = suite_update.model_dump(exclude_unset=True, exclude={'test_case_ids'})
+    update_data = suite_update.model_dump(exclude_unset=True, exclude={'test_case_ids', 'dependencies'})
     for field, value in update_data.items():
         setattr(suite, field, value)
     
@@ -89,13 +91,19 @@ def update_test_suite(
         db.query(TestSuiteItem).filter(TestSuiteItem.suite_id == suite_id).delete()
         
         # Create new items
+        dependencies = suite_update.dependencies or {}
         for order, test_case_id in enumerate(suite_update.test_case_ids, start=1):
             suite_item = TestSuiteItem(
                 suite_id=suite_id,
                 test_case_id=test_case_id,
-                execution_order=order
+                execution_order=order,
+                depends_on=dependencies.get(test_case_id) or None
             )
             db.add(suite_item)
+    elif suite_update.dependencies is not None:
+        # Replace dependencies of the existing items
+        for item in db.query(TestSuiteItem).filter(TestSuiteItem.suite_id == suite_id):
+            item.depends_on = suite_update.dependencies.get(item.test_case_id) or None
     
     db.commit()
     
@@ -304,6 +304,63 @@ def get_strategy_effectiveness_stats(
     return results
 
 
+def get_race_speculation_stats(
+    db: Session,
+    user_id: Optional[int] = None
+) -> dict:
+    """
+    Get speculative extraction cost vs. latency saved for the race strategy.
+    
+    Args:
+        db: Database session
+        user_id: Optional user ID to filter by
+        
+    Returns:
+        Dictionary with speculation outcome counts, timings, tokens and cost
+    """
+    query = db.query(
+        TierExecutionLog.speculation,
+        func.count(TierExecutionLog.id),
+        func.sum(TierExecutionLog.speculation_time_ms),
+        func.sum(TierExecutionLog.speculation_saved_ms),
+        func.sum(TierExecutionLog.speculation_tokens),
+        func.sum(TierExecutionLog.speculation_cost_usd),
+    ).filter(TierExecutionLog.speculation.isnot(None))
+    
+    if user_id:
+        from app.models.test_execution import TestExecution
+        query = query.join(TestExecution).filter(TestExecution.user_id == user_id)
+    
+    rows = query.group_by(TierExecutionLog.speculation).all()
+    
+    counts = {outcome: 0 for outcome in ("used", "wasted", "failed", "cache_hit")}
+    times = {outcome: 0.0 for outcome in counts}
+    tokens = {outcome: 0 for outcome in counts}
+    costs = {outcome: 0.0 for outcome in counts}
+    saved = 0.0
+    for outcome, count, time_ms, saved_ms, token_count, cost_usd in rows:
+        if outcome not in counts:
+            continue
+        counts[outcome] = count
+        times[outcome] = time_ms or 0.0
+        tokens[outcome] = int(token_count or 0)
+        costs[outcome] = cost_usd or 0.0
+        saved += saved_ms or 0.0
+    
+    return {
+        "total_steps": sum(counts.values()),
+        **counts,
+        "extraction_calls": counts["used"] + counts["wasted"] + counts["failed"],
+        "extraction_time_ms": round(sum(times.values()), 2),
+        "wasted_time_ms": round(times["wasted"], 2),
+        "extraction_tokens": sum(tokens.values()),
+        "wasted_tokens": tokens["wasted"],
+        "extraction_cost_usd": round(sum(costs.values()), 6),
+        "wasted_cost_usd": round(costs["wasted"], 6),
+        "latency_saved_ms": round(saved, 2),
+    }
+
+
 def _estimate_cost(tier1_count: int, tier2_count: int, tier3_count: int, total: int) -> str:
     """
     Estimate cost level based on tier distribution.
@@ -1,8 +1,10 @@
 """CRUD operations for Knowledge Base documents."""
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, or_
-from app.models.kb_document import KBDocument, KBCategory, FileType
+from app.db.base import utc_now
+from app.db.kb_search import matching_document_ids
+from app.models.kb_document import KBDocument, KBChunk, KBCategory, FileType
 from app.schemas.kb_document import (
     KBCategoryCreate,
     KBCategoryUpdate,
@@ -109,7 +111,8 @@ def get_documents(
         user_id: Filter by user (None for all users)
         category_id: Filter by category
         file_type: Filter by file type
-        search_query: Search in title, description, and content
+        search_query: Search in title, description, and content (content
+            through the kb_chunks full-text index)
         skip: Number of records to skip
         limit: Maximum records to return
     """
@@ -126,14 +129,7 @@ def get_documents(
         query = query.filter(KBDocument.file_type == file_type)
     
     if search_query:
-        search_pattern = f"%{search_query}%"
-        query = query.filter(
-            or_(
-                KBDocument.title.ilike(search_pattern),
-                KBDocument.description.ilike(search_pattern),
-                KBDocument.content.ilike(search_pattern)
-            )
-        )
+        query = query.filter(_search_filter(db, search_query))
     
     # Order by most recent first
     query = query.order_by(KBDocument.created_at.desc())
@@ -161,18 +157,21 @@ def get_document_count(
         query = query.filter(KBDocument.file_type == file_type)
     
     if search_query:
-        search_pattern = f"%{search_query}%"
-        query = query.filter(
-            or_(
-                KBDocument.title.ilike(search_pattern),
-                KBDocument.description.ilike(search_pattern),
-                KBDocument.content.ilike(search_pattern)
-            )
-        )
+        query = query.filter(_search_filter(db, search_query))
     
     return query.count()
 
 
+def _search_filter(db: Session, search_query: str):
+    """Title/description substring match, or content match via the chunk index."""
+    search_pattern = f"%{search_query}%"
+    return or_(
+        KBDocument.title.ilike(search_pattern),
+        KBDocument.description.ilike(search_pattern),
+        KBDocument.id.in_(matching_document_ids(db, search_query))
+    )
+
+
 def update_document(
     db: Session,
     document_id: int,
@@ -219,6 +218,81 @@ def increment_reference_count(db: Session, document_id: int) -> Optional[KBDocum
     return db_document
 
 
+# ============================================================================
+# Chunk CRUD
+# ============================================================================
+
+def replace_document_chunks(
+    db: Session,
+    document_id: int,
+    chunks: List[Dict[str, Any]]
+) -> List[KBChunk]:
+    """
+    Replace a document's chunks.
+    
+    Args:
+        db: Database session
+        document_id: Document the chunks belong to
+        chunks: Dicts with start_char, content, token_count and optional
+            embedding, in order
+    """
+    db.query(KBChunk).filter(KBChunk.document_id == document_id).delete(synchronize_session=False)
+    
+    db_chunks = [
+        KBChunk(
+            document_id=document_id,
+            chunk_index=index,
+            start_char=chunk["start_char"],
+            content=chunk["content"],
+            token_count=chunk.get("token_count", 0),
+            embedding=chunk.get("embedding")
+        )
+        for index, chunk in enumerate(chunks)
+    ]
+    db.add_all(db_chunks)
+    # Chunks are part of the document: bump updated_at so cached KB contexts expire
+    db.query(KBDocument).filter(KBDocument.id == document_id).update(
+        {KBDocument.updated_at: utc_now()}, synchronize_session=False
+    )
+    db.commit()
+    return db_chunks
+
+
+def get_leading_chunks(db: Session, document_ids: List[int], per_document: int) -> List[KBChunk]:
+    """Get the first chunks of each document, ordered by document then position."""
+    if not document_ids:
+        return []
+    return db.query(KBChunk).filter(
+        KBChunk.document_id.in_(document_ids),
+        KBChunk.chunk_index < per_document
+    ).order_by(KBChunk.document_id, KBChunk.chunk_index).all()
+
+
+def get_kb_fingerprint(db: Session, category_id: Optional[int] = None) -> tuple:
+    """
+    Cheap summary that changes whenever documents are added, removed, edited
+    or re-indexed (used to key KB context caches).
+    """
+    query = db.query(
+        func.count(KBDocument.id),
+        func.max(KBDocument.id),
+        func.max(KBDocument.updated_at)
+    )
+    if category_id is not None:
+        query = query.filter(KBDocument.category_id == category_id)
+    count, max_id, last_update = query.one()
+    return (count, max_id, str(last_update))
+
+
+def get_chunks(db: Session, chunk_ids: List[int]) -> List[KBChunk]:
+    """Get chunks (with their documents) by ID, in no particular order."""
+    if not chunk_ids:
+        return []
+    return db.query(KBChunk).options(
+        joinedload(KBChunk.document).joinedload(KBDocument.category)
+    ).filter(KBChunk.id.in_(chunk_ids)).all()
+
+
 # ============================================================================
 # Statistics
 # ============================================================================
@@ -5,6 +5,7 @@ from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_, or_
 
+from app.crud.test_execution import purge_execution_stats
 from app.models.test_case import TestCase, TestType, TestStatus, Priority, ReadinessStatus
 from app.schemas.test_case import TestCaseCreate, TestCaseUpdate
 
@@ -222,6 +223,7 @@ def delete_test_case(db: Session, test_case_id: int) -> bool:
     if not db_test_case:
         return False
     
+    purge_execution_stats(db, test_case_id)
     db.delete(db_test_case)
     db.commit()
     return True
@@ -1,10 +1,19 @@
 """CRUD operations for test executions."""
-from typing import List, Optional, Dict, Any
+from collections import defaultdict
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from datetime import datetime, timedelta
-
-from app.models.test_execution import TestExecution, TestExecutionStep, ExecutionStatus, ExecutionResult
+from sqlalchemy import Float, case, cast, desc, func, literal, or_
+from datetime import date, datetime, time, timedelta
+
+from app.models.test_case import TestCase
+from app.models.test_execution import (
+    TestExecution,
+    TestExecutionStep,
+    ExecutionStatus,
+    ExecutionResult,
+    ExecutionStatsDaily,
+)
 from app.schemas.test_execution import (
     TestExecutionCreate,
     TestExecutionUpdate,
@@ -69,6 +78,7 @@ def complete_execution(
     """Mark execution as completed with results."""
     execution = db.query(TestExecution).filter(TestExecution.id == execution_id).first()
     if execution:
+        previous = execution_stats_bucket(execution)
         execution.status = ExecutionStatus.COMPLETED
         execution.result = result
         execution.completed_at = datetime.utcnow()
@@ -84,6 +94,7 @@ def complete_execution(
             duration = (execution.completed_at - execution.started_at).total_seconds()
             execution.duration_seconds = duration
         
+        record_execution_stats(db, execution, previous)
         db.commit()
         db.refresh(execution)
         print(f"[DEBUG] Completed execution {execution_id} with result {result}, {passed_steps}/{total_steps} passed")
@@ -102,6 +113,7 @@ def cancel_execution(
     """Mark execution as cancelled with partial progress."""
     execution = db.query(TestExecution).filter(TestExecution.id == execution_id).first()
     if execution:
+        previous = execution_stats_bucket(execution)
         execution.status = ExecutionStatus.CANCELLED
         execution.result = None
         execution.completed_at = datetime.utcnow()
@@ -114,6 +126,7 @@ def cancel_execution(
             duration = (execution.completed_at - execution.started_at).total_seconds()
             execution.duration_seconds = duration
 
+        record_execution_stats(db, execution, previous)
         db.commit()
         db.refresh(execution)
     return execution
@@ -127,6 +140,7 @@ def fail_execution(
     """Mark execution as failed with error message."""
     execution = db.query(TestExecution).filter(TestExecution.id == execution_id).first()
     if execution:
+        previous = execution_stats_bucket(execution)
         execution.status = ExecutionStatus.FAILED
         execution.result = ExecutionResult.ERROR
         execution.completed_at = datetime.utcnow()
@@ -137,6 +151,7 @@ def fail_execution(
             duration = (execution.completed_at - execution.started_at).total_seconds()
             execution.duration_seconds = duration
         
+        record_execution_stats(db, execution, previous)
         db.commit()
         db.refresh(execution)
     return execution
@@ -230,10 +245,12 @@ def update_execution(db: Session, execution_id: int, updates: TestExecutionUpdat
     execution = db.query(TestExecution).filter(TestExecution.id == execution_id).first()
     
     if execution:
+        previous = execution_stats_bucket(execution)
         update_data = updates.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(execution, field, value)
         
+        record_execution_stats(db, execution, previous)
         db.commit()
         db.refresh(execution)
     
@@ -245,6 +262,7 @@ def delete_execution(db: Session, execution_id: int) -> bool:
     execution = db.query(TestExecution).filter(TestExecution.id == execution_id).first()
     
     if execution:
+        _move_execution_stats(db, execution_stats_bucket(execution), None)
         db.delete(execution)
         db.commit()
         return True
@@ -334,90 +352,109 @@ def update_execution_step(
 # Statistics
 # ============================================================================
 
+def _stats_dimensions(model) -> Tuple[Any, ...]:
+    """Columns the dashboard breaks counts down by (shared by live and rollup queries)."""
+    return model.test_case_id, model.browser, model.environment, model.status, model.result
+
+
 def get_execution_statistics(db: Session, user_id: Optional[int] = None) -> Dict[str, Any]:
     """
     Get execution statistics.
     
+    Finished runs created before yesterday come from the execution_stats_daily
+    rollup; everything else (yesterday, today and runs still in flight) comes
+    from one GROUP BY over test_executions. Cost grows with days and distinct
+    test cases, not with execution history. The 7/30 day windows count whole
+    days from the rollup.
+    
     Args:
         db: Database session
         user_id: Filter by user (None for all users, requires admin)
     """
-    query = db.query(TestExecution)
-    
-    if user_id is not None:
-        query = query.filter(TestExecution.user_id == user_id)
-    
-    # Total executions
-    total_executions = query.count()
-    
-    # By status
-    by_status = {}
-    for status in ExecutionStatus:
-        count = query.filter(TestExecution.status == status).count()
-        by_status[status.value] = count
+    now = datetime.utcnow()
+    live_start = datetime.combine(now.date() - timedelta(days=1), time.min)
+    cutoff_24h = now - timedelta(hours=24)
+    cutoff_7d = now - timedelta(days=7)
+    cutoff_30d = now - timedelta(days=30)
+    
+    def _window(column, cutoff, weight=1):
+        return func.sum(case((column >= cutoff, weight), else_=0))
+    
+    live = db.query(
+        *_stats_dimensions(TestExecution),
+        func.count(TestExecution.id),
+        func.count(TestExecution.duration_seconds),
+        func.sum(TestExecution.duration_seconds),
+        _window(TestExecution.created_at, cutoff_24h),
+        _window(TestExecution.created_at, cutoff_7d),
+        _window(TestExecution.created_at, cutoff_30d),
+    ).filter(
+        or_(
+            TestExecution.created_at >= live_start,
+            TestExecution.status.notin_(TERMINAL_STATUSES),
+        )
+    )
     
-    # By result
-    by_result = {}
-    for result in ExecutionResult:
-        count = query.filter(TestExecution.result == result).count()
-        by_result[result.value] = count
+    rollup = db.query(
+        *_stats_dimensions(ExecutionStatsDaily),
+        func.sum(ExecutionStatsDaily.execution_count),
+        func.sum(ExecutionStatsDaily.duration_count),
+        func.sum(ExecutionStatsDaily.duration_total),
+        literal(0),  # Rollup days are all older than 24h
+        _window(ExecutionStatsDaily.day, cutoff_7d.date(), ExecutionStatsDaily.execution_count),
+        _window(ExecutionStatsDaily.day, cutoff_30d.date(), ExecutionStatsDaily.execution_count),
+    ).filter(ExecutionStatsDaily.day < live_start.date())
     
-    # By browser
-    browsers = db.query(TestExecution.browser, func.count(TestExecution.id)).filter(
-        TestExecution.browser.isnot(None)
-    )
     if user_id is not None:
-        browsers = browsers.filter(TestExecution.user_id == user_id)
-    by_browser = dict(browsers.group_by(TestExecution.browser).all())
+        live = live.filter(TestExecution.user_id == user_id)
+        rollup = rollup.filter(ExecutionStatsDaily.user_id == user_id)
     
-    # By environment
-    environments = db.query(TestExecution.environment, func.count(TestExecution.id)).filter(
-        TestExecution.environment.isnot(None)
+    rows = (
+        live.group_by(*_stats_dimensions(TestExecution)).all()
+        + rollup.group_by(*_stats_dimensions(ExecutionStatsDaily)).all()
     )
-    if user_id is not None:
-        environments = environments.filter(TestExecution.user_id == user_id)
-    by_environment = dict(environments.group_by(TestExecution.environment).all())
+    
+    by_status = {status.value: 0 for status in ExecutionStatus}
+    by_result = {result.value: 0 for result in ExecutionResult}
+    by_browser: Dict[str, int] = defaultdict(int)
+    by_environment: Dict[str, int] = defaultdict(int)
+    by_test_case: Dict[int, int] = defaultdict(int)
+    total_executions = duration_count = 0
+    total_duration_seconds = 0.0
+    executions_last_24h = executions_last_7d = executions_last_30d = 0
+    
+    for (test_case_id, browser, environment, status, result,
+         count, with_duration, duration_sum, last_24h, last_7d, last_30d) in rows:
+        count = int(count or 0)
+        if not count:
+            continue
+        total_executions += count
+        by_test_case[test_case_id] += count
+        status_value, result_value = _enum_value(status), _enum_value(result)
+        if status_value in by_status:
+            by_status[status_value] += count
+        if result_value in by_result:
+            by_result[result_value] += count
+        if browser:
+            by_browser[browser] += count
+        if environment:
+            by_environment[environment] += count
+        duration_count += int(with_duration or 0)
+        total_duration_seconds += float(duration_sum or 0.0)
+        executions_last_24h += int(last_24h or 0)
+        executions_last_7d += int(last_7d or 0)
+        executions_last_30d += int(last_30d or 0)
     
     # Pass rate (completed executions with pass result)
-    completed_count = query.filter(TestExecution.status == ExecutionStatus.COMPLETED).count()
-    passed_count = query.filter(TestExecution.result == ExecutionResult.PASS).count()
+    completed_count = by_status[ExecutionStatus.COMPLETED.value]
+    passed_count = by_result[ExecutionResult.PASS.value]
     pass_rate = (passed_count / completed_count * 100) if completed_count > 0 else 0.0
     
-    # Average duration
-    avg_duration = db.query(func.avg(TestExecution.duration_seconds)).filter(
-        TestExecution.duration_seconds.isnot(None)
-    )
-    if user_id is not None:
-        avg_duration = avg_duration.filter(TestExecution.user_id == user_id)
-    avg_duration = avg_duration.scalar() or 0.0
-    
-    # Total duration in hours
-    total_duration = db.query(func.sum(TestExecution.duration_seconds)).filter(
-        TestExecution.duration_seconds.isnot(None)
-    )
-    if user_id is not None:
-        total_duration = total_duration.filter(TestExecution.user_id == user_id)
-    total_duration_seconds = total_duration.scalar() or 0.0
+    avg_duration = total_duration_seconds / duration_count if duration_count else 0.0
     total_duration_hours = total_duration_seconds / 3600
     
-    # Executions by time period
-    now = datetime.utcnow()
-    executions_last_24h = query.filter(TestExecution.created_at >= now - timedelta(hours=24)).count()
-    executions_last_7d = query.filter(TestExecution.created_at >= now - timedelta(days=7)).count()
-    executions_last_30d = query.filter(TestExecution.created_at >= now - timedelta(days=30)).count()
-    
     # Most executed tests (top 5)
-    most_executed = db.query(
-        TestExecution.test_case_id,
-        func.count(TestExecution.id).label('execution_count')
-    )
-    if user_id is not None:
-        most_executed = most_executed.filter(TestExecution.user_id == user_id)
-    
-    most_executed = most_executed.group_by(TestExecution.test_case_id).order_by(
-        desc('execution_count')
-    ).limit(5).all()
-    
+    most_executed = sorted(by_test_case.items(), key=lambda item: (-item[1], item[0]))[:5]
     most_executed_tests = [
         {"test_case_id": test_id, "execution_count": count}
         for test_id, count in most_executed
@@ -427,8 +464,8 @@ def get_execution_statistics(db: Session, user_id: Optional[int] = None) -> Dict
         "total_executions": total_executions,
         "by_status": by_status,
         "by_result": by_result,
-        "by_browser": by_browser,
-        "by_environment": by_environment,
+        "by_browser": dict(by_browser),
+        "by_environment": dict(by_environment),
         "pass_rate": round(pass_rate, 2),
         "average_duration_seconds": round(avg_duration, 2) if avg_duration else None,
         "total_duration_hours": round(total_duration_hours, 2),
@@ -439,6 +476,224 @@ def get_execution_statistics(db: Session, user_id: Optional[int] = None) -> Dict
     }
 
 
+# ============================================================================
+# Statistics rollup (execution_stats_daily)
+# ============================================================================
+
+TERMINAL_STATUSES = (ExecutionStatus.COMPLETED, ExecutionStatus.FAILED, ExecutionStatus.CANCELLED)
+
+_BUCKET_FIELDS = ("day", "user_id", "test_case_id", "browser", "environment", "status", "result")
+
+# (bucket key, (duration_seconds, passed_steps, total_steps))
+StatsBucket = Tuple[Tuple[Any, ...], Tuple[Optional[float], int, int]]
+
+
+def _enum_value(value: Any) -> str:
+    """Enum member, raw string or None -> stored string ("" for None)."""
+    if value is None:
+        return ""
+    return getattr(value, "value", value)
+
+
+def execution_stats_bucket(execution: TestExecution) -> Optional[StatsBucket]:
+    """
+    Rollup bucket an execution currently counts towards.
+    
+    Returns None while the execution is still pending/running. Take this
+    before changing a finished execution and pass it to
+    record_execution_stats() so the run moves buckets instead of being
+    counted twice.
+    """
+    if execution.status not in TERMINAL_STATUSES:
+        return None
+    created = execution.created_at or datetime.utcnow()
+    key = (
+        created.date(),
+        execution.user_id,
+        execution.test_case_id,
+        execution.browser or "",
+        execution.environment or "",
+        _enum_value(execution.status),
+        _enum_value(execution.result),
+    )
+    return key, (execution.duration_seconds, execution.passed_steps or 0, execution.total_steps or 0)
+
+
+def record_execution_stats(
+    db: Session,
+    execution: TestExecution,
+    previous: Optional[StatsBucket] = None
+) -> None:
+    """
+    Apply an execution's status change to the daily rollup (caller commits).
+    
+    Args:
+        db: Database session (same transaction as the execution update)
+        execution: Execution after the change
+        previous: execution_stats_bucket() taken before the change
+    """
+    _move_execution_stats(db, previous, execution_stats_bucket(execution))
+
+
+def _move_execution_stats(db: Session, previous: Optional[StatsBucket], current: Optional[StatsBucket]) -> None:
+    if previous == current:
+        return
+    if previous is not None:
+        _bump_stats_bucket(db, *previous, sign=-1)
+    if current is not None:
+        _bump_stats_bucket(db, *current, sign=1)
+
+
+def _bump_stats_bucket(
+    db: Session,
+    key: Tuple[Any, ...],
+    metrics: Tuple[Optional[float], int, int],
+    sign: int
+) -> None:
+    """Atomically add (sign=1) or remove (sign=-1) one execution from a bucket."""
+    duration, passed_steps, total_steps = metrics
+    match = [getattr(ExecutionStatsDaily, field) == value for field, value in zip(_BUCKET_FIELDS, key)]
+    has_duration = duration is not None
+    has_steps = total_steps > 0
+    increments = {
+        "execution_count": 1,
+        "duration_count": 1 if has_duration else 0,
+        "duration_total": duration or 0.0,
+        "step_runs": 1 if has_steps else 0,
+        "passed_steps_total": passed_steps if has_steps else 0,
+        "total_steps_total": total_steps if has_steps else 0,
+        "success_ratio_total": passed_steps / total_steps if has_steps else 0.0,
+    }
+    values = {
+        getattr(ExecutionStatsDaily, field): getattr(ExecutionStatsDaily, field) + sign * amount
+        for field, amount in increments.items()
+    }
+    if db.query(ExecutionStatsDaily).filter(*match).update(values, synchronize_session=False) or sign < 0:
+        return
+    try:
+        with db.begin_nested():
+            db.add(ExecutionStatsDaily(**dict(zip(_BUCKET_FIELDS, key)), **increments))
+    except IntegrityError:
+        # Another transaction created the bucket first
+        db.query(ExecutionStatsDaily).filter(*match).update(values, synchronize_session=False)
+
+
+def purge_execution_stats(db: Session, test_case_id: int) -> int:
+    """Drop a test case's rollup rows (its executions are deleted with it; caller commits)."""
+    return db.query(ExecutionStatsDaily).filter(
+        ExecutionStatsDaily.test_case_id == test_case_id
+    ).delete(synchronize_session=False)
+
+
+def rebuild_execution_stats(db: Session) -> int:
+    """
+    Recompute execution_stats_daily from test_executions (backfill / repair).
+    
+    Returns:
+        Number of rollup rows written
+    """
+    db.query(ExecutionStatsDaily).delete(synchronize_session=False)
+    has_steps = TestExecution.total_steps > 0
+    grouped = db.query(
+        func.date(TestExecution.created_at),
+        TestExecution.user_id,
+        TestExecution.test_case_id,
+        func.coalesce(TestExecution.browser, ""),
+        func.coalesce(TestExecution.environment, ""),
+        TestExecution.status,
+        TestExecution.result,
+        func.count(TestExecution.id),
+        func.count(TestExecution.duration_seconds),
+        func.coalesce(func.sum(TestExecution.duration_seconds), 0.0),
+        func.sum(case((has_steps, 1), else_=0)),
+        func.sum(case((has_steps, TestExecution.passed_steps), else_=0)),
+        func.sum(case((has_steps, TestExecution.total_steps), else_=0)),
+        func.sum(case((has_steps, cast(TestExecution.passed_steps, Float) / TestExecution.total_steps), else_=0.0)),
+    ).filter(
+        TestExecution.status.in_(TERMINAL_STATUSES)
+    ).group_by(
+        func.date(TestExecution.created_at),
+        TestExecution.user_id,
+        TestExecution.test_case_id,
+        func.coalesce(TestExecution.browser, ""),
+        func.coalesce(TestExecution.environment, ""),
+        TestExecution.status,
+        TestExecution.result,
+    )
+    
+    rows = []
+    for (day, user_id, test_case_id, browser, environment, status, result, count, with_duration, duration_sum,
+         step_runs, passed_steps, total_steps, success_ratio) in grouped:
+        if isinstance(day, str):  # SQLite returns DATE() as text
+            day = date.fromisoformat(day)
+        key = (day, user_id, test_case_id, browser, environment, _enum_value(status), _enum_value(result))
+        rows.append({
+            **dict(zip(_BUCKET_FIELDS, key)),
+            "execution_count": count,
+            "duration_count": with_duration,
+            "duration_total": float(duration_sum or 0.0),
+            "step_runs": int(step_runs or 0),
+            "passed_steps_total": int(passed_steps or 0),
+            "total_steps_total": int(total_steps or 0),
+            "success_ratio_total": float(success_ratio or 0.0),
+        })
+    
+    db.bulk_insert_mappings(ExecutionStatsDaily, rows)
+    db.commit()
+    return len(rows)
+
+
+def get_execution_history(db: Session, days: int = 90) -> Dict[int, Dict[str, Any]]:
+    """
+    Per-test-case outcome totals over the last `days` whole days.
+    
+    One GROUP BY over execution_stats_daily (joined to test_cases for the
+    test type), so the cost is independent of execution history and the
+    cutoff is a plain date comparison on any database.
+    
+    Returns:
+        {test_case_id: {"test_type", "executions", "failures", "step_runs",
+        "passed_steps", "total_steps", "success_ratio_total",
+        "duration_count", "duration_total"}}
+    """
+    cutoff = datetime.utcnow().date() - timedelta(days=days)
+    failed = ExecutionStatsDaily.result.in_((ExecutionResult.FAIL.value, ExecutionResult.ERROR.value))
+    rows = db.query(
+        ExecutionStatsDaily.test_case_id,
+        TestCase.test_type,
+        func.sum(ExecutionStatsDaily.execution_count),
+        func.sum(case((failed, ExecutionStatsDaily.execution_count), else_=0)),
+        func.sum(ExecutionStatsDaily.step_runs),
+        func.sum(ExecutionStatsDaily.passed_steps_total),
+        func.sum(ExecutionStatsDaily.total_steps_total),
+        func.sum(ExecutionStatsDaily.success_ratio_total),
+        func.sum(ExecutionStatsDaily.duration_count),
+        func.sum(ExecutionStatsDaily.duration_total),
+    ).outerjoin(
+        TestCase, TestCase.id == ExecutionStatsDaily.test_case_id
+    ).filter(
+        ExecutionStatsDaily.day >= cutoff
+    ).group_by(
+        ExecutionStatsDaily.test_case_id, TestCase.test_type
+    ).all()
+    
+    return {
+        test_case_id: {
+            "test_type": _enum_value(test_type) or None,
+            "executions": int(executions or 0),
+            "failures": int(failures or 0),
+            "step_runs": int(step_runs or 0),
+            "passed_steps": int(passed_steps or 0),
+            "total_steps": int(total_steps or 0),
+            "success_ratio_total": float(success_ratio or 0.0),
+            "duration_count": int(duration_count or 0),
+            "duration_total": float(duration_total or 0.0),
+        }
+        for (test_case_id, test_type, executions, failures, step_runs, passed_steps,
+             total_steps, success_ratio, duration_count, duration_total) in rows
+    }
+
+
 # ============================================================================
 # Utility Functions
 # ============================================================================
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash, verify_password
+from app.core.user_cache import user_cache
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -54,13 +55,17 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[
         return None
     
     update_data = user_update.model_dump(exclude_unset=True)
+    revoke_tokens = "password" in update_data or (db_user.is_active and update_data.get("is_active") is False)
     if "password" in update_data:
         update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
     
     for field, value in update_data.items():
         setattr(db_user, field, value)
+    if revoke_tokens:
+        db_user.token_version = (db_user.token_version or 0) + 1
     
     db.commit()
+    user_cache.invalidate(user_id)
     db.refresh(db_user)
     return db_user
 
@@ -72,7 +77,9 @@ def update_user_password(db: Session, user_id: int, new_password: str) -> Option
         return None
     
     db_user.hashed_password = get_password_hash(new_password)
+    db_user.token_version = (db_user.token_version or 0) + 1  # Sign out existing tokens
     db.commit()
+    user_cache.invalidate(user_id)
     db.refresh(db_user)
     return db_user
 
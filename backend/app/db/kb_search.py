@@ -0,0 +1,210 @@
+"""
+Full-text index over Knowledge Base chunks.
+
+SQLite uses an FTS5 external-content table (kb_chunks_fts) kept in sync with
+kb_chunks by triggers; Postgres uses a GIN expression index on
+to_tsvector('english', content). Any other backend (or a SQLite build without
+FTS5) falls back to ILIKE matching with term-frequency scoring.
+"""
+import logging
+import re
+import weakref
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models.kb_document import KBChunk, KBDocument
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "kb_chunks_fts"
+PG_INDEX = "ix_kb_chunks_content_tsv"
+MAX_QUERY_TERMS = 32
+
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by can do does for from has have how if in into is it its "
+    "may must no not of on or should so such that the their then there these they this to was "
+    "were what when where which while who will with would you your".split()
+)
+
+_SQLITE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    f"USING fts5(content, content='kb_chunks', content_rowid='id')",
+    f"""CREATE TRIGGER IF NOT EXISTS kb_chunks_fts_ai AFTER INSERT ON kb_chunks BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS kb_chunks_fts_ad AFTER DELETE ON kb_chunks BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS kb_chunks_fts_au AFTER UPDATE ON kb_chunks BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content);
+    END""",
+]
+
+# Engines on which the SQLite FTS table has been seen
+_fts_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def search_terms(query: str) -> List[str]:
+    """Lower-cased, de-duplicated word tokens of a query, minus stopwords."""
+    terms = []
+    for term in re.findall(r"\w+", (query or "").lower()):
+        if len(term) > 1 and term not in _STOPWORDS and term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def ensure_kb_search_index(engine: Engine) -> bool:
+    """
+    Create the native full-text index for kb_chunks if the backend has one.
+
+    Idempotent; run by the add_kb_chunk_search_index migration. Returns True
+    when SQLite FTS5 or the Postgres GIN index is available, False when
+    searches will use the ILIKE fallback.
+    """
+    dialect = engine.dialect.name
+    try:
+        if dialect == "sqlite":
+            with engine.begin() as conn:
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": FTS_TABLE},
+                ).first()
+                for statement in _SQLITE_FTS_DDL:
+                    conn.execute(text(statement))
+                if not exists:
+                    # Index chunks written before the FTS table existed
+                    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        elif dialect == "postgresql":
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON kb_chunks "
+                    f"USING GIN (to_tsvector('english', content))"
+                ))
+        else:
+            return False
+    except Exception as e:
+        logger.warning("KB full-text index unavailable on %s, using ILIKE search: %s", dialect, e)
+        return False
+    if dialect == "sqlite":
+        _fts_engines.add(engine)
+    return True
+
+
+def search_chunks(
+    db: Session,
+    query: str,
+    category_id: Optional[int] = None,
+    limit: int = 8,
+) -> List[Tuple[int, float]]:
+    """
+    Rank chunks against a free-text query (any term may match).
+
+    Returns (chunk_id, score) pairs, best first. Scores are only comparable
+    within one result list.
+    """
+    terms = search_terms(query)
+    if not terms or limit <= 0:
+        return []
+
+    dialect = _native_dialect(db)
+    params = {"limit": limit}
+    category_filter = ""
+    if category_id is not None:
+        category_filter = "AND d.category_id = :category_id"
+        params["category_id"] = category_id
+
+    if dialect == "sqlite":
+        params["match"] = " OR ".join(f'"{term}"' for term in terms)
+        rows = db.execute(text(
+            f"SELECT c.id, -bm25({FTS_TABLE}) AS score "
+            f"FROM {FTS_TABLE} JOIN kb_chunks c ON c.id = {FTS_TABLE}.rowid "
+            f"JOIN kb_documents d ON d.id = c.document_id "
+            f"WHERE {FTS_TABLE} MATCH :match {category_filter} "
+            f"ORDER BY bm25({FTS_TABLE}) LIMIT :limit"
+        ), params).all()
+        return [(row[0], float(row[1])) for row in rows]
+
+    if dialect == "postgresql":
+        params["match"] = " | ".join(terms)
+        rows = db.execute(text(
+            "SELECT c.id, ts_rank_cd(to_tsvector('english', c.content), q) AS score "
+            "FROM kb_chunks c JOIN kb_documents d ON d.id = c.document_id, "
+            "to_tsquery('english', :match) q "
+            f"WHERE to_tsvector('english', c.content) @@ q {category_filter} "
+            "ORDER BY score DESC LIMIT :limit"
+        ), params).all()
+        return [(row[0], float(row[1])) for row in rows]
+
+    return _like_search(db, terms, category_id, limit)
+
+
+def matching_document_ids(db: Session, query: str) -> Set[int]:
+    """IDs of documents with at least one chunk containing every query term."""
+    terms = search_terms(query)
+    if not terms:
+        return set()
+
+    dialect = _native_dialect(db)
+    if dialect == "sqlite":
+        rows = db.execute(text(
+            f"SELECT DISTINCT c.document_id FROM {FTS_TABLE} "
+            f"JOIN kb_chunks c ON c.id = {FTS_TABLE}.rowid WHERE {FTS_TABLE} MATCH :match"
+        ), {"match": " ".join(f'"{term}"' for term in terms)}).all()
+    elif dialect == "postgresql":
+        rows = db.execute(text(
+            "SELECT DISTINCT document_id FROM kb_chunks "
+            "WHERE to_tsvector('english', content) @@ to_tsquery('english', :match)"
+        ), {"match": " & ".join(terms)}).all()
+    else:
+        chunk_query = db.query(KBChunk.document_id).distinct()
+        for term in terms:
+            chunk_query = chunk_query.filter(KBChunk.content.ilike(f"%{term}%"))
+        rows = chunk_query.all()
+    return {row[0] for row in rows}
+
+
+# Private helpers
+
+def _native_dialect(db: Session) -> Optional[str]:
+    """Dialect name when native full-text search is usable, else None (ILIKE fallback)."""
+    engine = db.get_bind().engine
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        return dialect  # to_tsvector works without the index, just slower
+    if dialect != "sqlite":
+        return None
+    if engine not in _fts_engines:
+        exists = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        ).first()
+        if not exists:
+            return None
+        _fts_engines.add(engine)
+    return dialect
+
+
+def _like_search(
+    db: Session,
+    terms: List[str],
+    category_id: Optional[int],
+    limit: int,
+) -> List[Tuple[int, float]]:
+    """Scan-based fallback: score chunks by how often the query terms occur."""
+    chunk_query = db.query(KBChunk.id, KBChunk.content).filter(
+        or_(*[KBChunk.content.ilike(f"%{term}%") for term in terms])
+    )
+    if category_id is not None:
+        chunk_query = chunk_query.join(KBDocument).filter(KBDocument.category_id == category_id)
+
+    scored = []
+    for chunk_id, content in chunk_query.all():
+        lowered = content.lower()
+        score = sum(lowered.count(term) for term in terms)
+        scored.append((chunk_id, float(score)))
+    scored.sort(key=lambda hit: (-hit[1], hit[0]))
+    return scored[:limit]
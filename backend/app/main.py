@@ -66,10 +66,12 @@ finally:
     db.close()
 
 # Start queue manager (Sprint 3 Day 2)
-start_queue_manager(
-    max_concurrent=settings.MAX_CONCURRENT_EXECUTIONS,
-    check_interval=settings.QUEUE_CHECK_INTERVAL
-)
+# With RUN_QUEUE_WORKER_IN_API=False executions run in `python -m app.worker` processes
+if settings.RUN_QUEUE_WORKER_IN_API:
+    start_queue_manager(
+        max_concurrent=settings.MAX_CONCURRENT_EXECUTIONS,
+        check_interval=settings.QUEUE_CHECK_INTERVAL
+    )
 
 # Start in-process scheduler (cross-platform, no OS cron dependency)
 scheduler_service.start()
@@ -173,7 +175,7 @@ def _setup_server_file_logging():
 
 @app.on_event("startup")
 async def startup_event():
-    """Startup event to ensure Windows event loop policy is set and to log loop type."""
+    """Startup event: Windows event loop policy, loop type log and progress pub/sub listeners."""
     _setup_server_file_logging()
     if sys.platform == 'win32':
         asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
@@ -185,6 +187,21 @@ async def startup_event():
             print(f"[STARTUP] WARNING: event loop is {kind}, not ProactorEventLoop. "
                   "Browser/Playwright may fail. Run with: python start_server.py (no reload on Windows)")
 
+    # Buffer events other processes publish before anyone subscribes (Last-Event-ID replay)
+    from app.services.progress_tracker import get_execution_progress_tracker, get_progress_tracker
+    get_progress_tracker().start()
+    get_execution_progress_tracker().start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the KB text extraction worker processes and the progress pub/sub listener."""
+    from app.services.kb_extraction import shutdown_extraction_pool
+    from app.services.progress_tracker import get_execution_progress_tracker, get_progress_tracker
+    shutdown_extraction_pool()
+    await get_progress_tracker().close()
+    await get_execution_progress_tracker().close()
+
 
 @app.get("/")
 def root():
@@ -1,8 +1,8 @@
 # Models Package
 from app.models.user import User
 from app.models.test_case import TestCase, TestType, Priority, TestStatus, ReadinessStatus
-from app.models.kb_document import KBDocument, KBCategory, FileType
-from app.models.test_execution import TestExecution, TestExecutionStep, ExecutionStatus, ExecutionResult
+from app.models.kb_document import KBDocument, KBChunk, KBCategory, FileType, ExtractionStatus
+from app.models.test_execution import TestExecution, TestExecutionStep, ExecutionStatus, ExecutionResult, ExecutionStatsDaily
 from app.models.password_reset import PasswordResetToken
 from app.models.user_session import UserSession
 from app.models.test_template import TestTemplate
@@ -16,12 +16,13 @@ from app.models.browser_profile import BrowserProfile
 from app.models.email_credential import EmailCredential
 from app.models.step_library_module import StepLibraryModule
 from app.models.test_category import TestCategory
+from app.models.workflow_record import WorkflowRecord
 
 __all__ = [
     "User",
     "TestCase", "TestType", "Priority", "TestStatus", "ReadinessStatus",
-    "KBDocument", "KBCategory", "FileType",
-    "TestExecution", "TestExecutionStep", "ExecutionStatus", "ExecutionResult",
+    "KBDocument", "KBChunk", "KBCategory", "FileType", "ExtractionStatus",
+    "TestExecution", "TestExecutionStep", "ExecutionStatus", "ExecutionResult", "ExecutionStatsDaily",
     "PasswordResetToken",
     "UserSession",
     "TestTemplate",
@@ -35,5 +36,6 @@ __all__ = [
     "EmailCredential",
     "StepLibraryModule",
     "TestCategory",
+    "WorkflowRecord",
 ]
 
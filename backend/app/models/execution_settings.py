@@ -23,7 +23,7 @@ class ExecutionSettings(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
     
     # Fallback Strategy Selection
-    # Options: 'option_a', 'option_b', 'option_c'
+    # Options: 'option_a', 'option_b', 'option_c', 'race'
     fallback_strategy = Column(String(20), nullable=False, default="option_c")
     
     # Performance Tuning
@@ -61,6 +61,10 @@ class XPathCache(Base):
     # Cached data
     xpath = Column(String(1000), nullable=False)
     selector_type = Column(String(50), default="xpath")
+    # Structural hash of the target element and its ancestors (see xpath_fingerprint)
+    element_fingerprint = Column(String(32), nullable=True)
+    # DOM fingerprint of the page state the XPath was cached on (see observe_memo)
+    page_fingerprint = Column(String(32), nullable=True)
     
     # Validation & Self-Healing
     last_validated = Column(DateTime(timezone=True), nullable=True)
@@ -94,6 +98,19 @@ class TierExecutionLog(Base):
     # Execution context
     execution_id = Column(Integer, ForeignKey("test_executions.id", ondelete="CASCADE"), nullable=False, index=True)
     step_index = Column(Integer, nullable=False)
+    # Normalized page URL + instruction (XPath cache key); history for tier routing
+    route_key = Column(String(64), nullable=True, index=True)
+    # Latency histogram dimensions for adaptive tier timeouts
+    page_domain = Column(String(255), nullable=True)
+    action = Column(String(50), nullable=True)
+    
+    # Race strategy: outcome of the speculative Tier 2 XPath extraction
+    # ("used", "wasted", "failed", "cache_hit") and its cost vs. latency saved
+    speculation = Column(String(20), nullable=True)
+    speculation_time_ms = Column(Float, nullable=True)
+    speculation_saved_ms = Column(Float, nullable=True)
+    speculation_tokens = Column(Integer, nullable=True)
+    speculation_cost_usd = Column(Float, nullable=True)
     
     # Strategy & Result
     fallback_strategy = Column(String(20), nullable=False)
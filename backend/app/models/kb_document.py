@@ -1,5 +1,5 @@
 """Knowledge Base document models."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, LargeBinary, UniqueConstraint, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -15,6 +15,14 @@ class FileType(str, enum.Enum):
     MD = "md"
 
 
+class ExtractionStatus(str, enum.Enum):
+    """Progress of text extraction for an uploaded document."""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class KBCategory(Base):
     """Knowledge Base category model."""
     
@@ -51,6 +59,12 @@ class KBDocument(Base):
     
     # Content
     content = Column(Text, nullable=True)  # Extracted text content
+    extraction_status = Column(
+        SQLEnum(ExtractionStatus, values_callable=lambda x: [e.value for e in x]),
+        nullable=False,
+        default=ExtractionStatus.COMPLETED,
+    )
+    extraction_progress = Column(Integer, nullable=False, default=100)  # Percent of pages extracted
     
     # Metadata
     referenced_count = Column(Integer, default=0)  # How many times referenced
@@ -64,6 +78,43 @@ class KBDocument(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     user = relationship("User", back_populates="kb_documents")
     
+    chunks = relationship(
+        "KBChunk",
+        back_populates="document",
+        cascade="all, delete-orphan",
+        order_by="KBChunk.chunk_index",
+    )
+    
     def __repr__(self):
         return f"<KBDocument(id={self.id}, title='{self.title}', type={self.file_type})>"
 
+
+class KBChunk(Base):
+    """
+    Overlapping passage of a KB document's extracted text.
+    
+    Chunks are the unit of retrieval: they are full-text indexed
+    (kb_chunks_fts on SQLite, a tsvector GIN index on Postgres) and may
+    carry a normalised embedding used to rerank full-text hits.
+    """
+    
+    __tablename__ = "kb_chunks"
+    __table_args__ = (
+        UniqueConstraint("document_id", "chunk_index", name="uq_kb_chunks_document_index"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(
+        Integer, ForeignKey("kb_documents.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    chunk_index = Column(Integer, nullable=False)  # Position within the document
+    start_char = Column(Integer, nullable=False, default=0)  # Offset into KBDocument.content
+    content = Column(Text, nullable=False)
+    token_count = Column(Integer, nullable=False, default=0)  # Precomputed for context budgeting
+    embedding = Column(LargeBinary, nullable=True)  # float32 vector (KB_EMBEDDING_MODEL)
+    
+    document = relationship("KBDocument", back_populates="chunks")
+    
+    def __repr__(self):
+        return f"<KBChunk(document_id={self.document_id}, chunk_index={self.chunk_index})>"
+
@@ -1,5 +1,5 @@
 """Test execution models."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum, Float, Boolean
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, Enum as SQLEnum, Float, Boolean, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -69,6 +69,14 @@ class TestExecution(Base):
     queued_at = Column(DateTime, nullable=True)  # When execution was queued
     priority = Column(Integer, default=5)  # Priority (1=high, 5=medium, 10=low)
     queue_position = Column(Integer, nullable=True)  # Position in queue
+
+    # Durable queue leases (EXECUTION_QUEUE_BACKEND=database)
+    lease_owner = Column(String(128), nullable=True, index=True)  # Worker id holding the run
+    lease_expires_at = Column(DateTime, nullable=True, index=True)  # Reclaimable after this
+    heartbeat_at = Column(DateTime, nullable=True)  # Last worker heartbeat
+    claim_count = Column(Integer, default=0)  # Times a worker has claimed this run
+    pinned_to_worker = Column(Boolean, default=False)  # Holds in-memory credentials of lease_owner
+    cancel_requested = Column(Boolean, default=False)  # Cross-process cooperative cancel flag
     
     # Relationships
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -86,6 +94,51 @@ class TestExecution(Base):
         return f"<TestExecution(id={self.id}, test_case_id={self.test_case_id}, status={self.status}, result={self.result})>"
 
 
+class ExecutionStatsDaily(Base):
+    """
+    Daily rollup of finished executions - backs /executions/stats and the
+    AnalysisAgent's historical success/failure rates.
+
+    One row per (created day, user, test case, browser, environment, status,
+    result). Maintained incrementally by app.crud.test_execution when a run
+    reaches a terminal status, so the dashboard never scans test_executions.
+    """
+
+    __tablename__ = "execution_stats_daily"
+    __table_args__ = (
+        UniqueConstraint(
+            "day", "user_id", "test_case_id", "browser", "environment", "status", "result",
+            name="uq_execution_stats_daily_bucket",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Bucket (no FKs: rollup rows are purged explicitly with their test case)
+    day = Column(Date, nullable=False, index=True)  # UTC date of TestExecution.created_at
+    user_id = Column(Integer, nullable=False, index=True)
+    test_case_id = Column(Integer, nullable=False, index=True)
+    browser = Column(String(50), nullable=False, default="")  # "" when unset
+    environment = Column(String(50), nullable=False, default="")  # "" when unset
+    status = Column(String(20), nullable=False)  # ExecutionStatus value (terminal only)
+    result = Column(String(20), nullable=False, default="")  # ExecutionResult value, "" when unset
+
+    # Aggregates
+    execution_count = Column(Integer, nullable=False, default=0)
+    duration_count = Column(Integer, nullable=False, default=0)  # Runs with a duration
+    duration_total = Column(Float, nullable=False, default=0.0)  # Sum of duration_seconds
+    step_runs = Column(Integer, nullable=False, default=0)  # Runs with total_steps > 0
+    passed_steps_total = Column(Integer, nullable=False, default=0)  # Sum over step_runs
+    total_steps_total = Column(Integer, nullable=False, default=0)  # Sum over step_runs
+    success_ratio_total = Column(Float, nullable=False, default=0.0)  # Sum of passed/total over step_runs
+
+    def __repr__(self):
+        return (
+            f"<ExecutionStatsDaily(day={self.day}, test_case_id={self.test_case_id}, "
+            f"status={self.status}, result={self.result}, count={self.execution_count})>"
+        )
+
+
 class TestExecutionStep(Base):
     """Test execution step model - tracks individual step results."""
     
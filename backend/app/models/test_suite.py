@@ -33,6 +33,7 @@ class TestSuiteItem(Base):
     suite_id = Column(Integer, ForeignKey("test_suites.id", ondelete="CASCADE"), nullable=False)
     test_case_id = Column(Integer, ForeignKey("test_cases.id", ondelete="CASCADE"), nullable=False)
     execution_order = Column(Integer, nullable=False)  # Order in which tests should run
+    depends_on = Column(JSON, nullable=True)  # test_case_ids in this suite that must pass first
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
@@ -0,0 +1,28 @@
+"""WorkflowRecord model - persisted API v2 workflow state and results."""
+from sqlalchemy import Boolean, Column, DateTime, LargeBinary, String, Text
+
+from app.db.base import Base, utc_now
+
+
+class WorkflowRecord(Base):
+    """
+    State of one agent workflow, shared by every API process/replica.
+
+    `state` holds the small status fields polled by GET /workflows/{id};
+    the (potentially large) result payload is stored zlib-compressed in
+    `result` and only loaded for /results. Rows idle past
+    WORKFLOW_STORE_TTL_SECONDS are purged by app.services.workflow_store.
+    """
+
+    __tablename__ = "workflow_records"
+
+    workflow_id = Column(String(100), primary_key=True)
+    status = Column(String(32), nullable=False, default="pending", index=True)
+    state = Column(Text, nullable=False, default="{}")  # JSON, without "result"
+    result = Column(LargeBinary, nullable=True)  # zlib-compressed JSON
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, nullable=False, default=utc_now)
+    updated_at = Column(DateTime, nullable=False, default=utc_now, onupdate=utc_now, index=True)
+
+    def __repr__(self) -> str:
+        return f"<WorkflowRecord(workflow_id='{self.workflow_id}', status='{self.status}')>"
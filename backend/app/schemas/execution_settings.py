@@ -9,14 +9,14 @@ from pydantic import BaseModel, Field, validator
 
 
 # Fallback strategy types
-FallbackStrategy = Literal["option_a", "option_b", "option_c"]
+FallbackStrategy = Literal["option_a", "option_b", "option_c", "race"]
 
 
 class ExecutionSettingsBase(BaseModel):
     """Base schema for execution settings"""
     fallback_strategy: FallbackStrategy = Field(
         default="option_c",
-        description="Fallback strategy: option_a (Tier1→Tier2), option_b (Tier1→Tier3), option_c (Tier1→Tier2→Tier3)"
+        description="Fallback strategy: option_a (Tier1→Tier2), option_b (Tier1→Tier3), option_c (Tier1→Tier2→Tier3), race (option_c with Tier 2 XPath resolved during Tier 1)"
     )
     max_retry_per_tier: int = Field(default=1, ge=0, le=3, description="Maximum retries per tier (0-3)")
     timeout_per_tier_seconds: int = Field(default=30, ge=10, le=120, description="Timeout per tier in seconds")
@@ -100,6 +100,35 @@ class StrategyEffectivenessStats(BaseModel):
     cost_estimate: str  # "low", "medium", "high"
 
 
+class TierTimeoutStats(BaseModel):
+    """Latency histogram of one (domain, action, tier) and the timeout it yields."""
+    domain: str
+    action: str
+    tier: int
+    samples: float
+    p50_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    timeout_ms: int
+    adaptive: bool  # False = not enough samples yet (user timeout applies)
+
+
+class RaceSpeculationStats(BaseModel):
+    """Cost of the race strategy's speculative Tier 2 extractions vs. latency saved."""
+    total_steps: int
+    used: int  # Tier 1 failed; Tier 2 started with the XPath already resolved
+    wasted: int  # Tier 1 succeeded; the extraction was thrown away
+    failed: int  # Extraction found nothing (Tier 2 extracted again)
+    cache_hit: int  # XPath already cached; nothing speculated
+    extraction_calls: int  # LLM observe calls spent on speculation
+    extraction_time_ms: float
+    wasted_time_ms: float
+    extraction_tokens: int  # LLM tokens of all speculative extractions
+    wasted_tokens: int  # ... of extractions thrown away because Tier 1 succeeded
+    extraction_cost_usd: float  # Estimated at LLM_COST_PER_1K_*_TOKENS
+    wasted_cost_usd: float
+    latency_saved_ms: float
+
+
 # XPath Cache Schemas
 class XPathCacheBase(BaseModel):
     """Base schema for XPath cache"""
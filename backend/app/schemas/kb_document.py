@@ -2,7 +2,7 @@
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from datetime import datetime
-from app.models.kb_document import FileType
+from app.models.kb_document import ExtractionStatus, FileType
 
 
 # ============================================================================
@@ -55,6 +55,8 @@ class KBDocumentCreate(KBDocumentBase):
     file_type: FileType
     file_size: int
     content: Optional[str] = None
+    extraction_status: ExtractionStatus = ExtractionStatus.COMPLETED
+    extraction_progress: int = 100
 
 
 class KBDocumentUpdate(BaseModel):
@@ -72,6 +74,8 @@ class KBDocumentResponse(KBDocumentBase):
     file_type: FileType
     file_size: int
     content: Optional[str] = None
+    extraction_status: ExtractionStatus = ExtractionStatus.COMPLETED
+    extraction_progress: int = 100
     referenced_count: int
     created_at: datetime
     updated_at: datetime
@@ -89,6 +93,7 @@ class KBDocumentListItem(BaseModel):
     filename: str
     file_type: FileType
     file_size: int
+    extraction_status: ExtractionStatus = ExtractionStatus.COMPLETED
     referenced_count: int
     created_at: datetime
     updated_at: datetime
@@ -117,6 +122,7 @@ class KBUploadResponse(BaseModel):
     file_type: FileType
     file_size: int
     category_id: int
+    extraction_status: ExtractionStatus = ExtractionStatus.COMPLETED
     message: str = "File uploaded successfully"
     
     model_config = ConfigDict(from_attributes=True)
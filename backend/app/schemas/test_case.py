@@ -178,6 +178,12 @@ class TestGenerationRequest(BaseModel):
         le=20, 
         description="Maximum number of KB documents to include in context (1-20)"
     )
+    kb_token_budget: Optional[int] = Field(
+        None,
+        ge=200,
+        le=100000,
+        description="Tokens the KB context may use in the prompt; size it to the target model's context window (default: server KB_CONTEXT_TOKEN_BUDGET)"
+    )
     
     @field_validator('requirement')
     @classmethod
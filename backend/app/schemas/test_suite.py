@@ -2,7 +2,7 @@
 Test Suite Schema and CRUD Operations
 Allows grouping test cases into suites for batch execution
 """
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -17,6 +17,9 @@ class TestSuiteBase(BaseModel):
 class TestSuiteCreate(TestSuiteBase):
     """Schema for creating a test suite."""
     test_case_ids: List[int] = Field(..., min_length=1, description="List of test case IDs in execution order")
+    dependencies: Optional[Dict[int, List[int]]] = Field(
+        None, description="test_case_id -> test_case_ids in this suite that must pass before it runs"
+    )
 
 
 class TestSuiteUpdate(BaseModel):
@@ -25,6 +28,7 @@ class TestSuiteUpdate(BaseModel):
     description: Optional[str] = None
     tags: Optional[List[str]] = None
     test_case_ids: Optional[List[int]] = Field(None, min_length=1)
+    dependencies: Optional[Dict[int, List[int]]] = None
 
 
 class TestSuiteItemResponse(BaseModel):
@@ -32,6 +36,7 @@ class TestSuiteItemResponse(BaseModel):
     id: int
     test_case_id: int
     execution_order: int
+    depends_on: Optional[List[int]] = None
     
     class Config:
         from_attributes = True
@@ -63,7 +68,10 @@ class SuiteExecutionRequest(BaseModel):
     environment: str = Field(default="dev", max_length=50)
     triggered_by: str = Field(default="manual", max_length=50)
     stop_on_failure: bool = Field(default=False, description="Stop execution if a test fails")
-    parallel: bool = Field(default=False, description="Run tests in parallel (future feature)")
+    parallel: bool = Field(default=False, description="Queue every runnable test at once instead of one by one")
+    max_parallel: Optional[int] = Field(
+        default=None, ge=1, description="Max tests of this suite running at once (default: queue limit)"
+    )
 
 
 class SuiteExecutionResponse(BaseModel):
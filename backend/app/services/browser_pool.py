@@ -0,0 +1,388 @@
+"""
+Browser Pool - Keeps warm Chromium processes shared across queued executions.
+
+Each pooled browser lives on its own long-running event loop thread (Playwright
+objects are bound to the loop that created them). A queued execution leases a
+browser, runs its coroutines on that browser's loop, opens an isolated
+BrowserContext via ExecutionService.create_context(), and returns the browser
+when done. Browsers are health-checked on lease and recycled after a configured
+number of uses or when their process tree exceeds an RSS threshold.
+"""
+import asyncio
+import logging
+import queue
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Coroutine, Dict, List, Optional
+
+from playwright.async_api import async_playwright, Browser, Playwright
+
+logger = logging.getLogger(__name__)
+
+# psutil is optional: without it the RSS recycle threshold is not enforced.
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    psutil = None
+    PSUTIL_AVAILABLE = False
+
+
+# Same launch flags ExecutionService.initialize() uses for a cold launch.
+CHROMIUM_LAUNCH_ARGS = [
+    '--remote-allow-origins=*',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-first-run',
+    '--no-default-browser-check',
+]
+
+
+class PooledBrowser:
+    """
+    A warm Chromium process pinned to a dedicated event loop thread.
+
+    Attributes:
+        slot: Pool slot index
+        playwright: Playwright driver owning the browser
+        browser: Launched Chromium browser
+        cdp_port: Remote debugging port (Stagehand connects over CDP)
+        uses: Number of leases served since the last (re)launch
+    """
+
+    def __init__(self, slot: int):
+        self.slot = slot
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self.cdp_port: Optional[int] = None
+        self.headless: Optional[bool] = None
+        self.uses = 0
+        self.launch_count = 0
+        self.launched_at: Optional[datetime] = None
+
+        if sys.platform == 'win32':
+            self.loop = asyncio.ProactorEventLoop()
+        else:
+            self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop,
+            name=f"browser-pool-{slot}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run_loop(self):
+        """Run this browser's event loop forever (background thread)."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on this browser's event loop and wait for the result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Optional timeout in seconds
+
+        Returns:
+            The coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def is_healthy(self) -> bool:
+        """Return True if the browser is launched and still connected."""
+        return self.browser is not None and self.browser.is_connected()
+
+    async def ensure_launched(self, headless: bool, slow_mo: int = 0) -> None:
+        """
+        Launch Chromium if it is not running, disconnected, or was launched
+        with a different headless mode.
+        """
+        if self.is_healthy() and self.headless == headless:
+            return
+
+        if self.browser is not None:
+            logger.info(f"[BrowserPool] Relaunching browser in slot {self.slot}")
+            await self.close()
+
+        # Imported lazily to avoid a circular import with execution_service.
+        from app.services.execution_service import _find_free_port
+
+        if not self.playwright:
+            self.playwright = await async_playwright().start()
+
+        self.cdp_port = _find_free_port()
+        self.browser = await self.playwright.chromium.launch(
+            headless=headless,
+            slow_mo=slow_mo,
+            args=[f'--remote-debugging-port={self.cdp_port}', *CHROMIUM_LAUNCH_ARGS],
+        )
+        self.headless = headless
+        self.uses = 0
+        self.launch_count += 1
+        self.launched_at = datetime.utcnow()
+        logger.info(
+            f"[BrowserPool] Launched browser in slot {self.slot} "
+            f"(cdp_port={self.cdp_port}, headless={headless})"
+        )
+
+    async def close(self) -> None:
+        """Close the browser and stop its Playwright driver."""
+        if self.browser:
+            try:
+                await self.browser.close()
+            except Exception as e:
+                logger.warning(f"[BrowserPool] Error closing browser in slot {self.slot}: {e}")
+            self.browser = None
+
+        if self.playwright:
+            try:
+                await self.playwright.stop()
+            except Exception as e:
+                logger.warning(f"[BrowserPool] Error stopping Playwright in slot {self.slot}: {e}")
+            self.playwright = None
+
+        self.cdp_port = None
+        self.headless = None
+
+    def rss_bytes(self) -> Optional[int]:
+        """
+        Resident memory of this browser's process tree, or None if unknown.
+
+        The browser process is located by its unique --remote-debugging-port
+        flag; renderer/GPU processes are included as its children.
+        """
+        if not PSUTIL_AVAILABLE or not self.cdp_port:
+            return None
+
+        flag = f"--remote-debugging-port={self.cdp_port}"
+        try:
+            for proc in psutil.process_iter(["cmdline"]):
+                if flag not in (proc.info.get("cmdline") or []):
+                    continue
+                total = proc.memory_info().rss
+                for child in proc.children(recursive=True):
+                    try:
+                        total += child.memory_info().rss
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        pass
+                return total
+        except Exception as e:
+            logger.debug(f"[BrowserPool] Could not read RSS for slot {self.slot}: {e}")
+        return None
+
+    def stop(self) -> None:
+        """Close the browser and stop the loop thread."""
+        try:
+            self.run(self.close(), timeout=30)
+        except Exception as e:
+            logger.warning(f"[BrowserPool] Error shutting down slot {self.slot}: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+class BrowserPool:
+    """
+    Fixed-size pool of warm browsers, one per execution worker.
+
+    Browsers are launched lazily on first lease and then kept warm, so only
+    the first execution per slot pays the Chromium launch cost.
+    """
+
+    def __init__(self, size: int = 5, max_uses: int = 50, max_rss_mb: int = 1500):
+        """
+        Initialize the browser pool.
+
+        Args:
+            size: Number of pooled browsers (should match max concurrent executions)
+            max_uses: Recycle a browser after serving this many leases (0 = never)
+            max_rss_mb: Recycle a browser whose process tree exceeds this RSS (0 = never)
+        """
+        self.size = size
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self._slots: List[PooledBrowser] = []
+        self._free: "queue.Queue[PooledBrowser]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._leased: Dict[int, PooledBrowser] = {}
+        self._recycle_count = 0
+        self._closed = False
+
+        logger.info(
+            f"BrowserPool initialized: size={size}, max_uses={max_uses}, "
+            f"max_rss_mb={max_rss_mb}"
+        )
+
+    def _next_free_slot(self, timeout: Optional[float]) -> PooledBrowser:
+        """Return an idle slot, creating a new one while under the size limit."""
+        with self._lock:
+            if self._free.empty() and len(self._slots) < self.size:
+                slot = PooledBrowser(len(self._slots))
+                self._slots.append(slot)
+                return slot
+        return self._free.get(timeout=timeout)
+
+    def acquire(
+        self,
+        headless: bool = True,
+        slow_mo: int = 0,
+        timeout: Optional[float] = None,
+    ) -> PooledBrowser:
+        """
+        Lease a warm browser, launching or relaunching it if needed.
+
+        Blocks until a slot is free. The caller must run all Playwright work
+        for the lease on PooledBrowser.loop (via PooledBrowser.run) and return
+        it with release().
+
+        Args:
+            headless: Headless mode required by the execution
+            slow_mo: Playwright slow_mo (only applied when (re)launching)
+            timeout: Max seconds to wait for a free slot (None = wait forever)
+
+        Returns:
+            PooledBrowser lease
+
+        Raises:
+            RuntimeError: If the pool has been shut down
+            queue.Empty: If no slot became free within timeout
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool is shut down")
+
+        slot = self._next_free_slot(timeout)
+        try:
+            slot.run(slot.ensure_launched(headless=headless, slow_mo=slow_mo))
+        except Exception:
+            self._free.put(slot)
+            raise
+
+        slot.uses += 1
+        with self._lock:
+            self._leased[slot.slot] = slot
+        logger.info(
+            f"[BrowserPool] Leased slot {slot.slot} (use {slot.uses}, cdp_port={slot.cdp_port})"
+        )
+        return slot
+
+    def _needs_recycle(self, slot: PooledBrowser) -> Optional[str]:
+        """Return the reason a slot should be recycled, or None if it is fine."""
+        if not slot.is_healthy():
+            return "browser disconnected"
+        if self.max_uses and slot.uses >= self.max_uses:
+            return f"reached max uses ({slot.uses})"
+        if self.max_rss_mb:
+            rss = slot.rss_bytes()
+            if rss is not None and rss > self.max_rss_mb * 1024 * 1024:
+                return f"RSS {rss // (1024 * 1024)}MB exceeds {self.max_rss_mb}MB"
+        return None
+
+    def release(self, slot: PooledBrowser) -> None:
+        """
+        Return a leased browser to the pool, recycling it if it is unhealthy,
+        over its use budget, or over the RSS threshold.
+
+        Args:
+            slot: Lease returned by acquire()
+        """
+        with self._lock:
+            self._leased.pop(slot.slot, None)
+
+        reason = self._needs_recycle(slot)
+        if reason:
+            logger.info(f"[BrowserPool] Recycling slot {slot.slot}: {reason}")
+            try:
+                slot.run(slot.close(), timeout=30)
+            except Exception as e:
+                logger.warning(f"[BrowserPool] Error recycling slot {slot.slot}: {e}")
+            with self._lock:
+                self._recycle_count += 1
+
+        if self._closed:
+            slot.stop()
+            return
+        self._free.put(slot)
+
+    def shutdown(self) -> None:
+        """Close all idle browsers; leased browsers are closed on release."""
+        self._closed = True
+        with self._lock:
+            idle = [s for s in self._slots if s.slot not in self._leased]
+        for slot in idle:
+            slot.stop()
+        logger.info("BrowserPool shut down")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get browser pool statistics.
+
+        Returns:
+            Dictionary with pool statistics
+        """
+        with self._lock:
+            slots = list(self._slots)
+            leased = set(self._leased)
+            recycle_count = self._recycle_count
+
+        return {
+            "size": self.size,
+            "max_uses": self.max_uses,
+            "max_rss_mb": self.max_rss_mb,
+            "started_slots": len(slots),
+            "leased_count": len(leased),
+            "recycle_count": recycle_count,
+            "slots": [
+                {
+                    "slot": s.slot,
+                    "leased": s.slot in leased,
+                    "healthy": s.is_healthy(),
+                    "cdp_port": s.cdp_port,
+                    "uses": s.uses,
+                    "launch_count": s.launch_count,
+                    "launched_at": s.launched_at.isoformat() if s.launched_at else None,
+                }
+                for s in slots
+            ],
+        }
+
+
+# Global pool instance
+_pool_instance: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool(
+    size: int = 5,
+    max_uses: int = 50,
+    max_rss_mb: int = 1500,
+) -> BrowserPool:
+    """
+    Get or create the global browser pool instance.
+
+    Args:
+        size: Number of pooled browsers (only used on first call)
+        max_uses: Leases per browser before recycling (only used on first call)
+        max_rss_mb: RSS recycle threshold in MB (only used on first call)
+
+    Returns:
+        BrowserPool singleton instance
+    """
+    global _pool_instance
+
+    with _pool_lock:
+        if _pool_instance is None:
+            _pool_instance = BrowserPool(size=size, max_uses=max_uses, max_rss_mb=max_rss_mb)
+            logger.info("Created global BrowserPool instance")
+
+        return _pool_instance
+
+
+def shutdown_browser_pool():
+    """Shut down the global browser pool, if one was created."""
+    global _pool_instance
+
+    with _pool_lock:
+        if _pool_instance is not None:
+            _pool_instance.shutdown()
+            _pool_instance = None
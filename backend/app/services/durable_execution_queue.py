@@ -0,0 +1,777 @@
+"""
+Durable Execution Queue - test_executions table as a multi-process work queue.
+
+Used when EXECUTION_QUEUE_BACKEND=database. A queued run is a PENDING row with
+queued_at set. Workers (the API process and/or `python -m app.worker`
+processes on any host) claim rows by writing a lease, renew it with
+heartbeats, and release it when the run finishes. Rows whose lease expires
+(crashed worker) are put back to PENDING and picked up by another worker.
+
+Claiming selects candidates with FOR UPDATE SKIP LOCKED (Postgres; ignored on
+SQLite) and then takes each row with a compare-and-set UPDATE, so the same
+code path is safe on both databases.
+
+Ephemeral credentials (inline HTTP credentials, CRM login credentials) are
+never persisted. Runs carrying them are pinned to the enqueueing process's
+worker and failed, not re-run without credentials, if that worker dies. A
+process that does not dispatch runs (the API with RUN_QUEUE_WORKER_IN_API=False)
+rejects them instead, since nothing would ever claim the pinned row.
+
+Implements the same interface as ExecutionQueue so QueueManager, the
+executions API, suites and the scheduler work unchanged.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.crud.test_execution import execution_stats_bucket, record_execution_stats
+from app.models.test_execution import TestExecution, ExecutionStatus
+from app.services.execution_queue import QueuedExecution
+
+logger = logging.getLogger(__name__)
+
+# Candidate rows fetched per claim attempt (compare-and-set picks the first free one)
+CLAIM_BATCH_SIZE = 5
+
+
+class InlineCredentialsRejected(ValueError):
+    """A run with ephemeral credentials was enqueued in a process that does not dispatch runs."""
+
+
+def default_worker_id() -> str:
+    """Return a worker id unique per process: '<hostname>:<pid>'."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class DatabaseExecutionQueue:
+    """
+    Execution queue backed by the test_executions table.
+
+    Active-execution accounting (max_concurrent, is_under_limit) is per
+    worker process; queue contents and status are shared by all processes.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 5,
+        worker_id: Optional[str] = None,
+        lease_seconds: int = 60,
+        max_claims: int = 3,
+        session_factory: Optional[Callable[[], Session]] = None,
+        dispatches: bool = True,
+    ):
+        """
+        Initialize the durable queue.
+
+        Args:
+            max_concurrent: Maximum concurrent executions for this worker process
+            worker_id: Unique id of this worker (default '<hostname>:<pid>')
+            lease_seconds: Lease length; heartbeats renew it every lease_seconds / 3
+            max_claims: Fail a run instead of re-queueing once it was claimed this often
+            session_factory: Session factory (default app.db.session.SessionLocal)
+            dispatches: Whether this process claims and runs executions; runs with
+                ephemeral credentials can only be enqueued where it does
+        """
+        if session_factory is None:
+            from app.db.session import SessionLocal
+            session_factory = SessionLocal
+
+        self.max_concurrent = max_concurrent
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.max_claims = max_claims
+        self.dispatches = dispatches
+        self._session_factory = session_factory
+
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._has_changes = False
+        self._active_executions: Dict[int, QueuedExecution] = {}
+        # execution_id -> (http_credentials, login_credentials) held in memory only
+        self._local_secrets: Dict[int, Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]] = {}
+        # Called with the execution_id when a run finishes or is dequeued unstarted
+        # in this process (other processes' runs are only seen by polling)
+        self._finish_listeners: List[Callable[[int], None]] = []
+
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._heartbeat_stop = threading.Event()
+
+        logger.info(
+            f"DatabaseExecutionQueue initialized: worker_id={self.worker_id}, "
+            f"max_concurrent={max_concurrent}, lease_seconds={lease_seconds}, "
+            f"dispatches={dispatches}"
+        )
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def add_to_queue(
+        self,
+        execution_id: int,
+        test_case_id: int,
+        user_id: int,
+        priority: int = 5,
+        http_credentials: Optional[Dict[str, Any]] = None,
+        login_credentials: Optional[Dict[str, Any]] = None,
+        queued_at: Optional[datetime] = None,
+    ) -> int:
+        """
+        Mark an execution row as queued.
+
+        Args:
+            execution_id: Database execution record ID
+            test_case_id: Test case ID
+            user_id: User who triggered the execution
+            priority: Priority level (1=high, 5=medium, 10=low)
+            http_credentials: Optional HTTP Basic Auth credentials (kept in memory)
+            login_credentials: Optional ephemeral CRM credentials (kept in memory)
+            queued_at: When the execution was first queued, for re-queued
+                executions (defaults to the row's own enqueue time, then now)
+
+        Returns:
+            Queue position (1-indexed)
+
+        Raises:
+            InlineCredentialsRejected: The run carries ephemeral credentials but this
+                process does not dispatch runs (the execution is marked FAILED)
+        """
+        now = datetime.utcnow()
+
+        db = self._session_factory()
+        try:
+            execution = db.query(TestExecution).filter(TestExecution.id == execution_id).first()
+            if not execution:
+                raise ValueError(f"Execution {execution_id} not found")
+
+            # Credentials that came from the browser profile are re-resolved at
+            # claim time, so only inline ones pin the run to this process.
+            if http_credentials and http_credentials == self._profile_http_credentials(db, execution):
+                http_credentials = None
+            pinned = bool(http_credentials or login_credentials)
+
+            previous = execution_stats_bucket(execution)
+            if pinned and not self.dispatches:
+                # Another worker would claim the run without its credentials
+                # and this process never claims it, so it cannot run at all.
+                message = (
+                    "Inline HTTP or login credentials need a queue worker in the API process "
+                    "(RUN_QUEUE_WORKER_IN_API=True); use a browser profile's credentials instead"
+                )
+                execution.status = ExecutionStatus.FAILED
+                execution.error_message = message
+                execution.queued_at = None
+                execution.completed_at = now
+                record_execution_stats(db, execution, previous)
+                db.commit()
+                raise InlineCredentialsRejected(message)
+
+            execution.status = ExecutionStatus.PENDING
+            execution.priority = priority
+            execution.queued_at = queued_at or execution.queued_at or now
+            execution.cancel_requested = False
+            execution.pinned_to_worker = pinned
+            if pinned:
+                # Reserve for this process; heartbeats keep the reservation alive
+                execution.lease_owner = self.worker_id
+                execution.lease_expires_at = now + timedelta(seconds=self.lease_seconds)
+            else:
+                execution.lease_owner = None
+                execution.lease_expires_at = None
+            record_execution_stats(db, execution, previous)
+            db.commit()
+
+            position = self._position(db, execution)
+        finally:
+            db.close()
+
+        with self._lock:
+            if pinned:
+                self._local_secrets[execution_id] = (http_credentials, login_credentials)
+            self._notify_changed()
+
+        logger.info(
+            f"Added execution {execution_id} to durable queue at position {position} "
+            f"(priority={priority}, test_case={test_case_id}, pinned={pinned})"
+        )
+        return position
+
+    def remove_from_queue(self, execution_id: int) -> bool:
+        """
+        Remove a queued execution (cancel before it starts).
+
+        The row is cancelled atomically so no worker can claim it afterwards.
+
+        Args:
+            execution_id: Execution ID to remove
+
+        Returns:
+            True if removed, False if it was not queued
+        """
+        db = self._session_factory()
+        try:
+            removed = db.query(TestExecution).filter(
+                TestExecution.id == execution_id,
+                TestExecution.status == ExecutionStatus.PENDING,
+            ).update(
+                {
+                    TestExecution.status: ExecutionStatus.CANCELLED,
+                    TestExecution.lease_owner: None,
+                    TestExecution.lease_expires_at: None,
+                    TestExecution.pinned_to_worker: False,
+                    TestExecution.queue_position: None,
+                },
+                synchronize_session=False,
+            )
+            if removed:
+                record_execution_stats(db, db.get(TestExecution, execution_id))
+            db.commit()
+        finally:
+            db.close()
+
+        with self._lock:
+            self._local_secrets.pop(execution_id, None)
+
+        if removed:
+            logger.info(f"Removed execution {execution_id} from durable queue")
+            self._notify_finished(execution_id)
+        return bool(removed)
+
+    def add_finish_listener(self, listener: Callable[[int], None]) -> None:
+        """
+        Register a callback invoked with the execution_id when a run finishes in
+        this process (mark_as_complete) or is removed from the queue.
+
+        Listeners run on the calling thread, outside the queue lock, and must
+        not block.
+        """
+        with self._lock:
+            self._finish_listeners.append(listener)
+
+    def remove_finish_listener(self, listener: Callable[[int], None]) -> None:
+        """Unregister a callback added with add_finish_listener."""
+        with self._lock:
+            if listener in self._finish_listeners:
+                self._finish_listeners.remove(listener)
+
+    def _notify_finished(self, execution_id: int) -> None:
+        with self._lock:
+            listeners = list(self._finish_listeners)
+        for listener in listeners:
+            try:
+                listener(execution_id)
+            except Exception as e:
+                logger.warning(f"Finish listener failed for execution {execution_id}: {e}")
+
+    def clear_queue(self) -> int:
+        """
+        Cancel all queued executions (not running ones).
+
+        Returns:
+            Number of executions removed from queue
+        """
+        db = self._session_factory()
+        try:
+            queued = self._queued_query(db).with_for_update(skip_locked=True).all()
+            for execution in queued:
+                execution.status = ExecutionStatus.CANCELLED
+                execution.error_message = "Removed from queue"
+                execution.lease_owner = None
+                execution.lease_expires_at = None
+                execution.pinned_to_worker = False
+                execution.queue_position = None
+                record_execution_stats(db, execution)
+            count = len(queued)
+            db.commit()
+        finally:
+            db.close()
+
+        with self._lock:
+            self._local_secrets.clear()
+        logger.warning(f"Cleared durable queue: removed {count} executions")
+        return count
+
+    # ------------------------------------------------------------------
+    # Consumer side (used by QueueManager)
+    # ------------------------------------------------------------------
+
+    def get_next_execution(self) -> Optional[QueuedExecution]:
+        """
+        Claim the next queued execution for this worker (highest priority first).
+
+        The claimed row is moved to RUNNING with a lease owned by this worker.
+
+        Returns:
+            QueuedExecution if one was claimed, None if nothing is claimable
+        """
+        db = self._session_factory()
+        try:
+            now = datetime.utcnow()
+            candidates = (
+                db.query(TestExecution.id)
+                .filter(self._claimable_filter())
+                .order_by(TestExecution.priority, TestExecution.queued_at, TestExecution.id)
+                .limit(CLAIM_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+
+            for (execution_id,) in candidates:
+                claimed = db.query(TestExecution).filter(
+                    TestExecution.id == execution_id,
+                    self._claimable_filter(),
+                ).update(
+                    {
+                        TestExecution.status: ExecutionStatus.RUNNING,
+                        TestExecution.lease_owner: self.worker_id,
+                        TestExecution.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                        TestExecution.heartbeat_at: now,
+                        TestExecution.claim_count: func.coalesce(TestExecution.claim_count, 0) + 1,
+                        TestExecution.queue_position: None,
+                    },
+                    synchronize_session=False,
+                )
+                if claimed != 1:
+                    continue  # Another worker won the race
+
+                db.commit()
+                execution = db.query(TestExecution).filter(TestExecution.id == execution_id).first()
+                logger.info(f"Worker {self.worker_id} claimed execution {execution_id}")
+                return self._to_queued_execution(db, execution)
+
+            db.commit()
+            return None
+        finally:
+            db.close()
+
+    def mark_as_active(self, execution: QueuedExecution) -> bool:
+        """
+        Mark a claimed execution as active in this worker.
+
+        Args:
+            execution: The claimed execution
+
+        Returns:
+            True if marked successfully, False if at concurrent limit
+        """
+        with self._lock:
+            if len(self._active_executions) >= self.max_concurrent:
+                return False
+            self._active_executions[execution.execution_id] = execution
+            return True
+
+    def mark_as_complete(self, execution_id: int) -> bool:
+        """
+        Release this worker's lease on a finished execution.
+
+        Args:
+            execution_id: Execution ID to release
+
+        Returns:
+            True if it was active in this worker, False otherwise
+        """
+        with self._lock:
+            was_active = self._active_executions.pop(execution_id, None) is not None
+            self._local_secrets.pop(execution_id, None)
+            self._notify_changed()
+
+        db = self._session_factory()
+        try:
+            db.query(TestExecution).filter(
+                TestExecution.id == execution_id,
+                TestExecution.lease_owner == self.worker_id,
+            ).update(
+                {
+                    TestExecution.lease_owner: None,
+                    TestExecution.lease_expires_at: None,
+                    TestExecution.pinned_to_worker: False,
+                },
+                synchronize_session=False,
+            )
+            db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to release lease for execution {execution_id}: {e}")
+        finally:
+            db.close()
+
+        self._notify_finished(execution_id)
+        return was_active
+
+    def is_under_limit(self) -> bool:
+        """Check if this worker can start more executions."""
+        with self._lock:
+            return len(self._active_executions) < self.max_concurrent
+
+    def get_active_count(self) -> int:
+        """Get number of executions running in this worker."""
+        with self._lock:
+            return len(self._active_executions)
+
+    def wait_for_changes(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a local enqueue/completion or the timeout.
+
+        Enqueues from other processes are picked up on the timeout.
+
+        Args:
+            timeout: Max seconds to wait (None = wait forever)
+
+        Returns:
+            True if woken by a local change, False on timeout
+        """
+        with self._changed:
+            if not self._has_changes:
+                self._changed.wait(timeout)
+            changed = self._has_changes
+            self._has_changes = False
+            return changed
+
+    def wake(self):
+        """Wake any thread blocked in wait_for_changes()."""
+        with self._lock:
+            self._notify_changed()
+
+    def _notify_changed(self):
+        """Record a change and wake waiters (caller must hold the lock)."""
+        self._has_changes = True
+        self._changed.notify_all()
+
+    # ------------------------------------------------------------------
+    # Leases: heartbeat, cancel propagation and reclaim
+    # ------------------------------------------------------------------
+
+    def heartbeat(self) -> List[int]:
+        """
+        Renew leases on this worker's rows and propagate cross-process cancels.
+
+        Only rows this worker is running, or pinned rows waiting for it whose
+        credentials it still holds, are renewed.
+
+        Returns:
+            Execution IDs whose lease was lost (they are cancelled locally)
+        """
+        from app.services.execution_cancel_store import request_cancel
+
+        with self._lock:
+            active_ids = list(self._active_executions)
+            reserved_ids = list(self._local_secrets) if self.dispatches else []
+
+        now = datetime.utcnow()
+        db = self._session_factory()
+        try:
+            db.query(TestExecution).filter(
+                TestExecution.lease_owner == self.worker_id,
+                or_(
+                    TestExecution.status == ExecutionStatus.RUNNING,
+                    TestExecution.id.in_(reserved_ids),
+                ),
+            ).update(
+                {
+                    TestExecution.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                    TestExecution.heartbeat_at: now,
+                },
+                synchronize_session=False,
+            )
+            db.commit()
+
+            if not active_ids:
+                return []
+
+            rows = db.query(
+                TestExecution.id, TestExecution.lease_owner, TestExecution.cancel_requested
+            ).filter(TestExecution.id.in_(active_ids)).all()
+        finally:
+            db.close()
+
+        lost = []
+        for execution_id, owner, cancel_requested in rows:
+            if owner != self.worker_id:
+                logger.warning(
+                    f"Worker {self.worker_id} lost lease on execution {execution_id} "
+                    f"(now owned by {owner}); cancelling local run"
+                )
+                lost.append(execution_id)
+                request_cancel(execution_id)
+            elif cancel_requested:
+                request_cancel(execution_id)
+        return lost
+
+    def reclaim_expired(self) -> Dict[str, int]:
+        """
+        Recover runs whose worker stopped heartbeating.
+
+        Expired rows go back to PENDING for another worker, unless they are
+        pinned to a dead worker's in-memory credentials or have used up
+        max_claims, in which case they are failed.
+
+        Returns:
+            Counts of requeued and failed executions
+        """
+        now = datetime.utcnow()
+        requeued = failed = 0
+
+        db = self._session_factory()
+        try:
+            expired = db.query(TestExecution).filter(
+                TestExecution.lease_owner.isnot(None),
+                TestExecution.lease_expires_at < now,
+                TestExecution.status.in_([ExecutionStatus.PENDING, ExecutionStatus.RUNNING]),
+            ).with_for_update(skip_locked=True).all()
+
+            for execution in expired:
+                dead_owner = execution.lease_owner
+                if execution.pinned_to_worker or (execution.claim_count or 0) >= self.max_claims:
+                    reason = (
+                        "Worker holding ephemeral credentials stopped before the run finished"
+                        if execution.pinned_to_worker
+                        else f"Worker lease expired {execution.claim_count} times"
+                    )
+                    execution.status = ExecutionStatus.FAILED
+                    execution.error_message = f"{reason} (last worker: {dead_owner})"
+                    execution.completed_at = now
+                    record_execution_stats(db, execution)
+                    failed += 1
+                else:
+                    execution.status = ExecutionStatus.PENDING
+                    execution.started_at = None
+                    requeued += 1
+                execution.lease_owner = None
+                execution.lease_expires_at = None
+                execution.pinned_to_worker = False
+                logger.warning(
+                    f"Reclaimed execution {execution.id} from expired worker {dead_owner} "
+                    f"({execution.status.value})"
+                )
+            db.commit()
+        finally:
+            db.close()
+
+        if requeued:
+            with self._lock:
+                self._notify_changed()
+        return {"requeued": requeued, "failed": failed}
+
+    def start_heartbeat(self):
+        """Start the background heartbeat / reclaim thread."""
+        if self._heartbeat_thread and self._heartbeat_thread.is_alive():
+            return
+        self._heartbeat_stop.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop,
+            name=f"queue-heartbeat-{self.worker_id}",
+            daemon=True,
+        )
+        self._heartbeat_thread.start()
+
+    def stop_heartbeat(self):
+        """Stop the heartbeat thread."""
+        self._heartbeat_stop.set()
+        if self._heartbeat_thread:
+            self._heartbeat_thread.join(timeout=5)
+
+    def _heartbeat_loop(self):
+        """Renew leases and reclaim expired rows every lease_seconds / 3."""
+        interval = max(1.0, self.lease_seconds / 3)
+        while not self._heartbeat_stop.wait(interval):
+            try:
+                self.heartbeat()
+                self.reclaim_expired()
+            except Exception as e:
+                logger.error(f"Durable queue heartbeat failed: {e}", exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def get_queue_size(self) -> int:
+        """Get number of queued (not running) executions across all workers."""
+        db = self._session_factory()
+        try:
+            return self._queued_query(db).count()
+        finally:
+            db.close()
+
+    def get_queue_position(self, execution_id: int) -> Optional[int]:
+        """
+        Get the current 1-indexed queue position of an execution.
+
+        Returns:
+            Position in queue, or None if the execution is not queued
+        """
+        db = self._session_factory()
+        try:
+            execution = self._queued_query(db).filter(TestExecution.id == execution_id).first()
+            return self._position(db, execution) if execution else None
+        finally:
+            db.close()
+
+    def get_active_executions(self) -> List[Dict]:
+        """
+        Get executions currently leased by any worker.
+
+        Returns:
+            List of active execution dictionaries
+        """
+        db = self._session_factory()
+        try:
+            return self._active_rows(db)
+        finally:
+            db.close()
+
+    def get_queue_status(self, limit: Optional[int] = None) -> Dict:
+        """
+        Get complete queue status across all workers.
+
+        Args:
+            limit: Optional max number of queued items to list (in queue order)
+
+        Returns:
+            Dictionary with queue status information
+        """
+        db = self._session_factory()
+        try:
+            queued = self._queued_query(db).order_by(
+                TestExecution.priority, TestExecution.queued_at, TestExecution.id
+            )
+            if limit is not None:
+                queued = queued.limit(limit)
+
+            queue_items = [
+                {
+                    "execution_id": execution.id,
+                    "test_case_id": execution.test_case_id,
+                    "priority": execution.priority,
+                    "queue_position": position,
+                    "queued_at": execution.queued_at.isoformat() if execution.queued_at else None,
+                }
+                for position, execution in enumerate(queued.all(), start=1)
+            ]
+            queued_count = self._queued_query(db).count()
+            active = self._active_rows(db)
+        finally:
+            db.close()
+
+        with self._lock:
+            local_active = len(self._active_executions)
+
+        return {
+            "active_count": len(active),
+            "queued_count": queued_count,
+            "max_concurrent": self.max_concurrent,
+            "is_under_limit": local_active < self.max_concurrent,
+            "queue": queue_items,
+            "active": active,
+            "backend": "database",
+            "worker_id": self.worker_id,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _claimable_filter(self):
+        """Rows this worker may claim: queued and unleased, or reserved for it."""
+        return and_(
+            TestExecution.status == ExecutionStatus.PENDING,
+            TestExecution.queued_at.isnot(None),
+            or_(
+                TestExecution.lease_owner.is_(None),
+                TestExecution.lease_owner == self.worker_id,
+            ),
+        )
+
+    def _queued_query(self, db: Session):
+        """Query of queued rows (not yet claimed by a worker)."""
+        return db.query(TestExecution).filter(
+            TestExecution.status == ExecutionStatus.PENDING,
+            TestExecution.queued_at.isnot(None),
+        )
+
+    def _position(self, db: Session, execution: TestExecution) -> int:
+        """1-indexed position of a queued row in (priority, queued_at, id) order."""
+        priority = execution.priority if execution.priority is not None else 5
+        ahead = self._queued_query(db).filter(
+            or_(
+                TestExecution.priority < priority,
+                and_(
+                    TestExecution.priority == priority,
+                    or_(
+                        TestExecution.queued_at < execution.queued_at,
+                        and_(
+                            TestExecution.queued_at == execution.queued_at,
+                            TestExecution.id < execution.id,
+                        ),
+                    ),
+                ),
+            )
+        ).count()
+        return ahead + 1
+
+    def _active_rows(self, db: Session) -> List[Dict]:
+        """Serialize leased RUNNING rows."""
+        rows = db.query(TestExecution).filter(
+            TestExecution.status == ExecutionStatus.RUNNING,
+            TestExecution.lease_owner.isnot(None),
+        ).all()
+        return [
+            {
+                "execution_id": execution.id,
+                "test_case_id": execution.test_case_id,
+                "user_id": execution.user_id,
+                "priority": execution.priority,
+                "queued_at": execution.queued_at.isoformat() if execution.queued_at else None,
+                "worker_id": execution.lease_owner,
+                "lease_expires_at": (
+                    execution.lease_expires_at.isoformat() if execution.lease_expires_at else None
+                ),
+            }
+            for execution in rows
+        ]
+
+    def _profile_http_credentials(
+        self, db: Session, execution: TestExecution
+    ) -> Optional[Dict[str, Any]]:
+        """HTTP credentials of the run's browser profile (resolvable on any worker)."""
+        if not execution.trigger_details:
+            return None
+        try:
+            profile_id = json.loads(execution.trigger_details).get("browser_profile_id")
+        except (ValueError, AttributeError):
+            return None
+        if not profile_id:
+            return None
+
+        from app.crud import browser_profile as crud_profile
+        try:
+            return crud_profile.get_http_credentials(
+                db=db, profile_id=profile_id, user_id=execution.user_id
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load profile HTTP credentials: {e}")
+            return None
+
+    def _to_queued_execution(self, db: Session, execution: TestExecution) -> QueuedExecution:
+        """Build the QueuedExecution handed to QueueManager for a claimed row."""
+        with self._lock:
+            http_credentials, login_credentials = self._local_secrets.pop(
+                execution.id, (None, None)
+            )
+        if not http_credentials:
+            http_credentials = self._profile_http_credentials(db, execution)
+
+        return QueuedExecution(
+            priority=execution.priority if execution.priority is not None else 5,
+            queued_at=execution.queued_at or datetime.utcnow(),
+            execution_id=execution.id,
+            test_case_id=execution.test_case_id,
+            user_id=execution.user_id,
+            http_credentials=http_credentials,
+            login_credentials=login_credentials,
+        )
@@ -0,0 +1,94 @@
+"""
+Step-level progress stream for v1 test executions.
+
+The queue worker passes execution_progress_callback(execution_id) to
+ExecutionService.execute_test(); every update it reports becomes an event on
+the execution ProgressTracker, keyed by str(execution_id):
+
+- execution_started
+- step_started      {step, total_steps, message}
+- tier_fallback     {step, from_tier, to_tier, error}
+- screenshot_ready  {step, screenshot_path}
+- step_finished     {step, result, duration_seconds, error, tier}
+- execution_finished {status, result, passed_steps, failed_steps, total_steps}
+
+GET /executions/{id}/stream serves these over SSE. Steps recorded before the
+client connected (or before this process saw the run) are replayed from
+test_execution_steps once, so clients no longer poll GET /executions/{id}.
+When queue workers run in separate processes (RUN_QUEUE_WORKER_IN_API=False),
+set PROGRESS_PUBSUB_URL so their events reach the API process.
+"""
+import logging
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.crud.test_execution import TERMINAL_STATUSES
+from app.models.test_execution import TestExecution, TestExecutionStep
+from app.services.progress_tracker import get_execution_progress_tracker
+
+logger = logging.getLogger(__name__)
+
+# Updates from older callers carry no "event" key; infer one from their fields
+_STATUS_EVENTS = {
+    "running": "execution_started",
+    "completed": "execution_finished",
+    "failed": "execution_finished",
+    "cancelled": "execution_finished",
+}
+
+
+def _value(member: Any) -> Any:
+    return getattr(member, "value", member)
+
+
+def execution_progress_callback(execution_id: int) -> Callable[[Dict[str, Any]], Awaitable[None]]:
+    """progress_callback for ExecutionService.execute_test that publishes stream events."""
+    tracker = get_execution_progress_tracker()
+    key = str(execution_id)
+
+    async def _callback(update: Dict[str, Any]) -> None:
+        data = {k: v for k, v in update.items() if k != "event"}
+        event_type = update.get("event") or _STATUS_EVENTS.get(update.get("status"), "step_started")
+        try:
+            await tracker.emit(key, event_type, data)
+        except Exception as e:
+            logger.debug(f"Execution {execution_id} progress event dropped: {e}")
+
+    return _callback
+
+
+def execution_snapshot_events(db: Session, execution: TestExecution, from_step: int = 0) -> List[Dict[str, Any]]:
+    """
+    Stream events reconstructed from the database (one query for the steps).
+
+    Returns step_finished events for recorded steps after from_step, plus
+    execution_finished if the run is over. Events have no id: they are a
+    catch-up, not part of the live buffer.
+    """
+    steps = db.query(TestExecutionStep).filter(
+        TestExecutionStep.execution_id == execution.id,
+        TestExecutionStep.step_number > from_step,
+    ).order_by(TestExecutionStep.step_number, TestExecutionStep.id).all()
+
+    events = []
+    for step in steps:
+        data = {"execution_id": execution.id, "step": step.step_number}
+        if step.screenshot_path:
+            events.append({"event": "screenshot_ready", "data": {**data, "screenshot_path": step.screenshot_path}})
+        events.append({"event": "step_finished", "data": {
+            **data,
+            "result": _value(step.result),
+            "duration_seconds": step.duration_seconds,
+            "error": step.error_message,
+        }})
+    if execution.status in TERMINAL_STATUSES:
+        events.append({"event": "execution_finished", "data": {
+            "execution_id": execution.id,
+            "status": _value(execution.status),
+            "result": _value(execution.result),
+            "passed_steps": execution.passed_steps,
+            "failed_steps": execution.failed_steps,
+            "total_steps": execution.total_steps,
+        }})
+    return events
@@ -2,17 +2,76 @@
 Test Execution Queue System
 
 Provides thread-safe queue for managing test executions with priority support.
+
+Queued executions are kept in a binary heap ordered by (priority, sequence)
+plus an execution_id -> entry index. Cancelling is lazy: the index entry is
+dropped, which tombstones the heap item (its sequence no longer matches the
+index), and dequeue skips tombstoned items. Each priority level also keeps an
+append-only slot list with a Fenwick tree of live flags, so queue positions
+are exact without draining the heap. Tombstoned items and slots are swept
+out once they outnumber live entries.
+
+Complexity (n = queued executions): enqueue, cancel and position lookups are
+O(log n) (plus one step per distinct priority level for positions); pop is
+amortized O(log n).
 """
+import bisect
+import heapq
+import itertools
 import threading
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Callable
 from datetime import datetime
 from dataclasses import dataclass, field
-from queue import PriorityQueue
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class _RankLane:
+    """
+    Queued executions of one priority level, in enqueue order.
+    
+    Slots are only ever appended (sequence numbers increase), and a Fenwick
+    tree over the slots counts the live ones, so a cancel clears its slot and
+    a rank query sums live slots ahead of it, both in O(log n).
+    """
+    
+    __slots__ = ("seqs", "execution_ids", "live", "_tree")
+    
+    def __init__(self):
+        self.seqs: List[int] = []
+        self.execution_ids: List[int] = []
+        self.live = 0
+        # 1-indexed Fenwick tree of live flags; _tree[0] is unused
+        self._tree: List[int] = [0]
+    
+    def append(self, seq: int, execution_id: int):
+        self.seqs.append(seq)
+        self.execution_ids.append(execution_id)
+        i = len(self._tree)
+        # Node i covers slots (i - lowbit(i), i]
+        self._tree.append(1 + self._prefix(i - 1) - self._prefix(i - (i & -i)))
+        self.live += 1
+    
+    def remove(self, seq: int):
+        i = bisect.bisect_left(self.seqs, seq) + 1
+        while i < len(self._tree):
+            self._tree[i] -= 1
+            i += i & -i
+        self.live -= 1
+    
+    def rank(self, seq: int) -> int:
+        """1-indexed position of a live slot among the live slots."""
+        return self._prefix(bisect.bisect_left(self.seqs, seq) + 1)
+    
+    def _prefix(self, i: int) -> int:
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+
 @dataclass(order=True)
 class QueuedExecution:
     """
@@ -38,8 +97,12 @@ class ExecutionQueue:
     Thread-safe queue for test executions.
     
     Manages queued executions with priority support and concurrent execution tracking.
+    Executions with equal priority are served in FIFO order.
     """
     
+    # Sweep tombstones once they outnumber live entries by this factor
+    _COMPACT_RATIO = 2
+    
     def __init__(self, max_concurrent: int = 5):
         """
         Initialize the execution queue.
@@ -48,10 +111,20 @@ class ExecutionQueue:
             max_concurrent: Maximum number of concurrent executions allowed
         """
         self.max_concurrent = max_concurrent
-        self._queue = PriorityQueue()
+        # Heap of (priority, seq, execution_id); may contain stale items
+        self._heap: List[Tuple[int, int, int]] = []
+        # execution_id -> (seq, QueuedExecution) for live queued entries
+        self._entries: Dict[int, Tuple[int, QueuedExecution]] = {}
+        # priority -> slots of that level, live and tombstoned (rank index)
+        self._lanes: Dict[int, _RankLane] = {}
+        self._seq = itertools.count()
         self._active_executions: Dict[int, QueuedExecution] = {}
         self._lock = threading.Lock()
-        self._queue_positions: Dict[int, int] = {}
+        # Signalled on enqueue / slot release so the dispatcher wakes immediately
+        self._changed = threading.Condition(self._lock)
+        self._has_changes = False
+        # Called with the execution_id whenever a run finishes or is dequeued unstarted
+        self._finish_listeners: List[Callable[[int], None]] = []
         
         logger.info(f"ExecutionQueue initialized with max_concurrent={max_concurrent}")
     
@@ -63,10 +136,14 @@ class ExecutionQueue:
         priority: int = 5,
         http_credentials: Optional[Dict[str, Any]] = None,
         login_credentials: Optional[Dict[str, Any]] = None,
+        queued_at: Optional[datetime] = None,
     ) -> int:
         """
         Add an execution to the queue.
         
+        Re-adding an execution that is already queued replaces the old entry
+        but keeps its original enqueue time.
+        
         Args:
             execution_id: Database execution record ID
             test_case_id: Test case ID
@@ -74,14 +151,19 @@ class ExecutionQueue:
             priority: Priority level (1=high, 5=medium, 10=low)
             http_credentials: Optional HTTP Basic Auth credentials
             login_credentials: Optional ephemeral CRM form-login credentials (never persisted)
+            queued_at: When the execution was first queued, for re-queued
+                executions (defaults to now)
             
         Returns:
             Queue position (1-indexed)
         """
         with self._lock:
+            existing = self._entries.get(execution_id)
+            if queued_at is None:
+                queued_at = existing[1].queued_at if existing else datetime.utcnow()
             queued_execution = QueuedExecution(
                 priority=priority,
-                queued_at=datetime.utcnow(),
+                queued_at=queued_at,
                 execution_id=execution_id,
                 test_case_id=test_case_id,
                 user_id=user_id,
@@ -89,12 +171,19 @@ class ExecutionQueue:
                 login_credentials=login_credentials,
             )
             
-            self._queue.put(queued_execution)
+            if existing:
+                self._discard(execution_id)
             
-            # Update queue positions
-            self._update_queue_positions()
+            seq = next(self._seq)
+            self._entries[execution_id] = (seq, queued_execution)
+            heapq.heappush(self._heap, (priority, seq, execution_id))
+            lane = self._lanes.get(priority)
+            if lane is None:
+                lane = self._lanes[priority] = _RankLane()
+            lane.append(seq, execution_id)
             
-            position = self._queue_positions.get(execution_id, self._queue.qsize())
+            position = self._rank(priority, seq)
+            self._notify_changed()
             
             logger.info(
                 f"Added execution {execution_id} to queue at position {position} "
@@ -111,16 +200,18 @@ class ExecutionQueue:
             QueuedExecution if available, None if queue is empty
         """
         with self._lock:
-            if self._queue.empty():
-                return None
+            while self._heap:
+                priority, seq, execution_id = heapq.heappop(self._heap)
+                entry = self._entries.get(execution_id)
+                if entry is None or entry[0] != seq:
+                    continue  # Tombstoned by a cancel/re-add
+                
+                self._discard(execution_id)
+                self._maybe_compact()
+                logger.info(f"Retrieved execution {execution_id} from queue")
+                return entry[1]
             
-            try:
-                execution = self._queue.get_nowait()
-                self._update_queue_positions()
-                logger.info(f"Retrieved execution {execution.execution_id} from queue")
-                return execution
-            except:
-                return None
+            return None
     
     def mark_as_active(self, execution: QueuedExecution) -> bool:
         """
@@ -158,21 +249,27 @@ class ExecutionQueue:
             True if removed from active, False if not found
         """
         with self._lock:
-            if execution_id in self._active_executions:
+            was_active = execution_id in self._active_executions
+            if was_active:
                 del self._active_executions[execution_id]
+                self._notify_changed()
                 logger.info(
                     f"Marked execution {execution_id} as complete "
                     f"({len(self._active_executions)}/{self.max_concurrent} active)"
                 )
-                return True
-            
-            logger.warning(f"Execution {execution_id} not found in active executions")
-            return False
+            else:
+                logger.warning(f"Execution {execution_id} not found in active executions")
+        
+        self._notify_finished(execution_id)
+        return was_active
     
     def remove_from_queue(self, execution_id: int) -> bool:
         """
         Remove an execution from the queue (cancel before it starts).
         
+        The heap item and rank slot are tombstoned, not removed; dequeue
+        skips them.
+        
         Args:
             execution_id: Execution ID to remove
             
@@ -180,25 +277,58 @@ class ExecutionQueue:
             True if removed, False if not found
         """
         with self._lock:
-            # Can't remove directly from PriorityQueue, so we recreate it
-            temp_queue = PriorityQueue()
-            found = False
-            
-            while not self._queue.empty():
-                try:
-                    execution = self._queue.get_nowait()
-                    if execution.execution_id == execution_id:
-                        found = True
-                        logger.info(f"Removed execution {execution_id} from queue")
-                    else:
-                        temp_queue.put(execution)
-                except:
-                    break
+            if execution_id not in self._entries:
+                return False
             
-            self._queue = temp_queue
-            self._update_queue_positions()
+            self._discard(execution_id)
+            self._maybe_compact()
+            logger.info(f"Removed execution {execution_id} from queue")
+        
+        self._notify_finished(execution_id)
+        return True
+    
+    def add_finish_listener(self, listener: Callable[[int], None]) -> None:
+        """
+        Register a callback invoked with the execution_id when a run finishes
+        (mark_as_complete) or is removed from the queue before starting.
+        
+        Listeners run on the calling thread, outside the queue lock, and must
+        not block (hand off with loop.call_soon_threadsafe or similar).
+        """
+        with self._lock:
+            self._finish_listeners.append(listener)
+    
+    def remove_finish_listener(self, listener: Callable[[int], None]) -> None:
+        """Unregister a callback added with add_finish_listener."""
+        with self._lock:
+            if listener in self._finish_listeners:
+                self._finish_listeners.remove(listener)
+    
+    def _notify_finished(self, execution_id: int) -> None:
+        with self._lock:
+            listeners = list(self._finish_listeners)
+        for listener in listeners:
+            try:
+                listener(execution_id)
+            except Exception as e:
+                logger.warning(f"Finish listener failed for execution {execution_id}: {e}")
+    
+    def get_queue_position(self, execution_id: int) -> Optional[int]:
+        """
+        Get the current 1-indexed queue position of an execution.
+        
+        Args:
+            execution_id: Execution ID to look up
             
-            return found
+        Returns:
+            Position in queue, or None if the execution is not queued
+        """
+        with self._lock:
+            entry = self._entries.get(execution_id)
+            if entry is None:
+                return None
+            seq, queued_execution = entry
+            return self._rank(queued_execution.priority, seq)
     
     def is_under_limit(self) -> bool:
         """
@@ -213,7 +343,7 @@ class ExecutionQueue:
     def get_queue_size(self) -> int:
         """Get number of executions in queue (not running)."""
         with self._lock:
-            return self._queue.qsize()
+            return len(self._entries)
     
     def get_active_count(self) -> int:
         """Get number of active (running) executions."""
@@ -228,94 +358,144 @@ class ExecutionQueue:
             List of active execution dictionaries
         """
         with self._lock:
-            return [
-                {
-                    "execution_id": execution_id,
-                    "test_case_id": exec_data.test_case_id,
-                    "user_id": exec_data.user_id,
-                    "priority": exec_data.priority,
-                    "queued_at": exec_data.queued_at.isoformat()
-                }
-                for execution_id, exec_data in self._active_executions.items()
-            ]
+            return self._active_snapshot()
     
-    def get_queue_status(self) -> Dict:
+    def get_queue_status(self, limit: Optional[int] = None) -> Dict:
         """
         Get complete queue status.
         
+        Args:
+            limit: Optional max number of queued items to list (in queue order)
+        
         Returns:
             Dictionary with queue status information
         """
         with self._lock:
-            # Get queue items (peek without removing)
+            in_order = (
+                execution_id
+                for priority in sorted(self._lanes)
+                for seq, execution_id in zip(
+                    self._lanes[priority].seqs, self._lanes[priority].execution_ids
+                )
+                if self._is_live(execution_id, seq)
+            )
             queue_items = []
-            temp_list = []
-            
-            while not self._queue.empty():
-                try:
-                    execution = self._queue.get_nowait()
-                    temp_list.append(execution)
-                    queue_items.append({
-                        "execution_id": execution.execution_id,
-                        "test_case_id": execution.test_case_id,
-                        "priority": execution.priority,
-                        "queue_position": len(queue_items),
-                        "queued_at": execution.queued_at.isoformat()
-                    })
-                except:
-                    break
-            
-            # Restore queue
-            for execution in temp_list:
-                self._queue.put(execution)
-            
-            # Calculate is_under_limit without calling the method (avoid deadlock)
-            is_under_limit = len(self._active_executions) < self.max_concurrent
-            
-            # Get active executions without calling the method (avoid deadlock)
-            active_executions = [
-                {
-                    "execution_id": execution_id,
-                    "test_case_id": exec_data.test_case_id,
-                    "user_id": exec_data.user_id,
-                    "priority": exec_data.priority,
-                    "queued_at": exec_data.queued_at.isoformat()
-                }
-                for execution_id, exec_data in self._active_executions.items()
-            ]
+            for position, execution_id in enumerate(itertools.islice(in_order, limit), start=1):
+                execution = self._entries[execution_id][1]
+                queue_items.append({
+                    "execution_id": execution.execution_id,
+                    "test_case_id": execution.test_case_id,
+                    "priority": execution.priority,
+                    "queue_position": position,
+                    "queued_at": execution.queued_at.isoformat()
+                })
             
             return {
                 "active_count": len(self._active_executions),
-                "queued_count": len(queue_items),
+                "queued_count": len(self._entries),
                 "max_concurrent": self.max_concurrent,
-                "is_under_limit": is_under_limit,
+                "is_under_limit": len(self._active_executions) < self.max_concurrent,
                 "queue": queue_items,
-                "active": active_executions
+                "active": self._active_snapshot()
             }
     
     def clear_queue(self) -> int:
         """
         Clear all queued executions (not active ones).
         
+        Finish listeners are notified for every cleared execution, as for a
+        cancel, so nothing keeps waiting on a run that will never start.
+        
         Returns:
             Number of executions removed from queue
         """
         with self._lock:
-            count = self._queue.qsize()
-            self._queue = PriorityQueue()
-            self._queue_positions.clear()
-            logger.warning(f"Cleared queue: removed {count} executions")
-            return count
-    
-    def _update_queue_positions(self):
-        """Update queue position tracking (internal method)."""
-        # This is a simplified version - positions may not be 100% accurate
-        # due to PriorityQueue limitations, but provides a reasonable estimate
-        self._queue_positions.clear()
-        position = 1
+            cleared = list(self._entries)
+            self._heap = []
+            self._entries.clear()
+            self._lanes.clear()
+            logger.warning(f"Cleared queue: removed {len(cleared)} executions")
+        
+        for execution_id in cleared:
+            self._notify_finished(execution_id)
+        return len(cleared)
+    
+    def wait_for_changes(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until an execution is enqueued or a slot is freed.
+        
+        Changes signalled while nobody was waiting are not lost: the next call
+        returns immediately.
         
-        # Note: Can't easily peek into PriorityQueue without removing items
-        # This is acceptable for position tracking as it's informational only
+        Args:
+            timeout: Max seconds to wait (None = wait forever)
+            
+        Returns:
+            True if woken by a change, False on timeout
+        """
+        with self._changed:
+            if not self._has_changes:
+                self._changed.wait(timeout)
+            changed = self._has_changes
+            self._has_changes = False
+            return changed
+    
+    def wake(self):
+        """Wake any thread blocked in wait_for_changes()."""
+        with self._lock:
+            self._notify_changed()
+    
+    def _notify_changed(self):
+        """Record a change and wake waiters (caller must hold the lock)."""
+        self._has_changes = True
+        self._changed.notify_all()
+    
+    def _rank(self, priority: int, seq: int) -> int:
+        """1-indexed position of a live entry (caller must hold the lock)."""
+        ahead = sum(lane.live for p, lane in self._lanes.items() if p < priority)
+        return ahead + self._lanes[priority].rank(seq)
+    
+    def _is_live(self, execution_id: int, seq: int) -> bool:
+        """Whether a heap item / rank slot is not tombstoned (caller must hold the lock)."""
+        entry = self._entries.get(execution_id)
+        return entry is not None and entry[0] == seq
+    
+    def _discard(self, execution_id: int):
+        """Tombstone a live entry in O(log n) (caller must hold the lock)."""
+        seq, queued_execution = self._entries.pop(execution_id)
+        lane = self._lanes[queued_execution.priority]
+        lane.remove(seq)
+        if not lane.live:
+            del self._lanes[queued_execution.priority]
+    
+    def _maybe_compact(self):
+        """Sweep tombstones once they dominate (caller must hold the lock)."""
+        if len(self._heap) > self._COMPACT_RATIO * len(self._entries) + 64:
+            self._heap = [
+                (entry.priority, seq, execution_id)
+                for execution_id, (seq, entry) in self._entries.items()
+            ]
+            heapq.heapify(self._heap)
+        for priority, lane in list(self._lanes.items()):
+            if len(lane.seqs) > self._COMPACT_RATIO * lane.live + 64:
+                swept = _RankLane()
+                for seq, execution_id in zip(lane.seqs, lane.execution_ids):
+                    if self._is_live(execution_id, seq):
+                        swept.append(seq, execution_id)
+                self._lanes[priority] = swept
+    
+    def _active_snapshot(self) -> List[Dict]:
+        """Serialize active executions (caller must hold the lock)."""
+        return [
+            {
+                "execution_id": execution_id,
+                "test_case_id": exec_data.test_case_id,
+                "user_id": exec_data.user_id,
+                "priority": exec_data.priority,
+                "queued_at": exec_data.queued_at.isoformat()
+            }
+            for execution_id, exec_data in self._active_executions.items()
+        ]
 
 
 # Global queue instance
@@ -323,12 +503,22 @@ _queue_instance: Optional[ExecutionQueue] = None
 _queue_lock = threading.Lock()
 
 
-def get_execution_queue(max_concurrent: int = 5) -> ExecutionQueue:
+def get_execution_queue(
+    max_concurrent: int = 5,
+    worker_id: Optional[str] = None,
+    dispatches: Optional[bool] = None,
+) -> ExecutionQueue:
     """
     Get or create the global execution queue instance.
     
+    With EXECUTION_QUEUE_BACKEND=database this is a DatabaseExecutionQueue
+    shared with other worker processes through the test_executions table.
+    
     Args:
         max_concurrent: Maximum concurrent executions (only used on first call)
+        worker_id: Worker id for the durable queue (only used on first call)
+        dispatches: Whether this process runs executions from the durable queue
+            (only used on first call; default RUN_QUEUE_WORKER_IN_API)
         
     Returns:
         ExecutionQueue singleton instance
@@ -337,8 +527,22 @@ def get_execution_queue(max_concurrent: int = 5) -> ExecutionQueue:
     
     with _queue_lock:
         if _queue_instance is None:
-            _queue_instance = ExecutionQueue(max_concurrent=max_concurrent)
-            logger.info("Created global ExecutionQueue instance")
+            from app.core.config import settings
+
+            if settings.EXECUTION_QUEUE_BACKEND == "database":
+                from app.services.durable_execution_queue import DatabaseExecutionQueue
+
+                _queue_instance = DatabaseExecutionQueue(
+                    max_concurrent=max_concurrent,
+                    worker_id=worker_id,
+                    lease_seconds=settings.QUEUE_LEASE_SECONDS,
+                    max_claims=settings.QUEUE_MAX_CLAIMS,
+                    dispatches=settings.RUN_QUEUE_WORKER_IN_API if dispatches is None else dispatches,
+                )
+                _queue_instance.start_heartbeat()
+                logger.info("Created global DatabaseExecutionQueue instance")
+            else:
+                _queue_instance = ExecutionQueue(max_concurrent=max_concurrent)
+                logger.info("Created global ExecutionQueue instance")
         
         return _queue_instance
-
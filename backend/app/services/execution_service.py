@@ -27,6 +27,7 @@ from app.crud import test_execution as crud_execution
 from app.crud import execution_feedback as crud_feedback
 from app.schemas.execution_feedback import ExecutionFeedbackCreate
 from app.services.three_tier_execution_service import ThreeTierExecutionService
+from app.services.execution_write_buffer import ExecutionWriteBuffer
 from app.services.post_click_readiness import auto_dismiss_blocking_modals
 from app.utils.http_auth_credentials import http_credentials_for_url
 from app.utils.test_data_generator import TestDataGenerator
@@ -101,9 +102,21 @@ class ExecutionService:
     Integrated with 3-Tier Execution Engine (Sprint 5.5).
     """
     
-    def __init__(self, config: ExecutionConfig = None):
-        """Initialize execution service with configuration."""
+    # Write-behind buffer for step rows / tier logs / snapshots of the running execution
+    _write_buffer: Optional[ExecutionWriteBuffer] = None
+    
+    def __init__(self, config: ExecutionConfig = None, browser_lease: Optional[Any] = None):
+        """
+        Initialize execution service with configuration.
+
+        Args:
+            config: Execution configuration
+            browser_lease: Optional warm PooledBrowser from the browser pool.
+                When set, initialize() reuses it instead of launching Chromium and
+                cleanup() only closes this execution's page and context.
+        """
         self.config = config or ExecutionConfig()
+        self.browser_lease = browser_lease
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
@@ -179,6 +192,13 @@ class ExecutionService:
 
     async def initialize(self):
         """Initialize Playwright and browser."""
+        if self.browser_lease is not None:
+            # Warm pooled browser: reuse its driver, process and CDP port.
+            self.playwright = self.browser_lease.playwright
+            self.browser = self.browser_lease.browser
+            self._cdp_port = self.browser_lease.cdp_port
+            return
+
         if not self.playwright:
             self.playwright = await async_playwright().start()
             
@@ -254,6 +274,12 @@ class ExecutionService:
         if self.context:
             await self.context.close()
             self.context = None
+
+        if self.browser_lease is not None:
+            # The pool owns the browser and driver; just drop our references.
+            self.browser = None
+            self.playwright = None
+            return
             
         if self.browser:
             await self.browser.close()
@@ -526,6 +552,13 @@ class ExecutionService:
             snap_data = await self.export_profile_session()
             if snap_data is None:
                 return
+            if self._write_buffer is not None:
+                self._write_buffer.add_snapshot(
+                    step_number=step_number,
+                    page_url=page.url,
+                    session_data=snap_data,
+                )
+                return
             save_step_session_snapshot(
                 db=db,
                 execution_id=execution_id,
@@ -554,6 +587,52 @@ class ExecutionService:
         await page.goto(snapshot.page_url or "", timeout=30000, wait_until="domcontentloaded")
         await self._apply_profile_storage(page, session_data)
 
+    async def _report_step_finished(
+        self,
+        progress_callback: Optional[Callable],
+        execution_id: int,
+        step: int,
+        result: ExecutionResult,
+        duration: float,
+        screenshot_path: Optional[str],
+        error: Optional[str] = None,
+        tier: Optional[int] = None,
+        loop_iteration: Optional[int] = None,
+    ) -> None:
+        """Send screenshot_ready / step_finished progress events for a recorded step."""
+        if not progress_callback:
+            return
+        base = {"execution_id": execution_id, "step": step}
+        if loop_iteration is not None:
+            base["loop_iteration"] = loop_iteration
+        try:
+            if screenshot_path:
+                await progress_callback({"event": "screenshot_ready", **base, "screenshot_path": screenshot_path})
+            await progress_callback({
+                "event": "step_finished",
+                **base,
+                "result": result.value,
+                "duration_seconds": round(duration, 3),
+                "error": error,
+                "tier": tier,
+            })
+        except Exception as e:
+            # Progress is best-effort; never fail the run because an observer broke
+            logger.debug(f"Progress callback failed for execution {execution_id} step {step}: {e}")
+
+    def _record_step(self, db: Session, **fields: Any) -> None:
+        """Queue a step result on the write-behind buffer (direct insert when there is none)."""
+        if self._write_buffer is not None:
+            self._write_buffer.add_step(**fields)
+        else:
+            crud_execution.create_execution_step(db=db, **fields)
+
+    async def _close_write_buffer(self) -> None:
+        """Flush buffered rows; must run before the execution is marked finished."""
+        buffer, self._write_buffer = self._write_buffer, None
+        if buffer is not None:
+            await buffer.close()
+
     def _create_skip_records(
         self,
         db: Session,
@@ -644,9 +723,11 @@ class ExecutionService:
 
             # Update status to running
             execution = crud_execution.start_execution(db, execution.id)
+            self._write_buffer = ExecutionWriteBuffer.for_session(db, execution.id)
             
             if progress_callback:
                 await progress_callback({
+                    "event": "execution_started",
                     "execution_id": execution.id,
                     "status": "running",
                     "message": "Starting test execution..."
@@ -709,8 +790,16 @@ class ExecutionService:
                 page=page,
                 user_settings=user_settings,
                 cdp_endpoint=cdp_endpoint,  # Pass CDP endpoint for shared browser context
-                user_ai_config=user_ai_config  # Pass user's AI provider settings
+                user_ai_config=user_ai_config,  # Pass user's AI provider settings
+                write_buffer=self._write_buffer,
             )
+            # Load every cached XPath for this test up front (one query) so
+            # Tier 2 lookups during the run are served from memory.
+            self.three_tier_service.prefetch_xpath_cache(steps)
+            if progress_callback:
+                async def _on_tier_fallback(info: Dict[str, Any]) -> None:
+                    await progress_callback({"event": "tier_fallback", "execution_id": execution.id, **info})
+                self.three_tier_service.on_tier_fallback = _on_tier_fallback
 
             initial_navigation_url = self._resolve_initial_navigation_url(
                 base_url=base_url,
@@ -825,6 +914,7 @@ class ExecutionService:
 
             async def _finalize_cancel() -> None:
                 nonlocal execution
+                await self._close_write_buffer()
                 execution = crud_execution.cancel_execution(
                     db=db,
                     execution_id=execution.id,
@@ -835,8 +925,12 @@ class ExecutionService:
                 )
                 if progress_callback:
                     await progress_callback({
+                        "event": "execution_finished",
                         "execution_id": execution.id,
                         "status": "cancelled",
+                        "passed_steps": passed_steps,
+                        "failed_steps": failed_steps,
+                        "total_steps": total_steps,
                         "message": "Execution cancelled by user",
                     })
                 raise ExecutionCancelledError()
@@ -918,6 +1012,7 @@ class ExecutionService:
                             try:
                                 if progress_callback:
                                     await progress_callback({
+                                        "event": "step_started",
                                         "execution_id": execution.id,
                                         "step": loop_step_idx,
                                         "total_steps": total_steps,
@@ -956,7 +1051,7 @@ class ExecutionService:
                                 )
                                 
                                 # Create step record with iteration info
-                                crud_execution.create_execution_step(
+                                self._record_step(
                                     db=db,
                                     execution_id=execution.id,
                                     step_number=loop_step_idx,
@@ -968,6 +1063,11 @@ class ExecutionService:
                                     screenshot_path=screenshot_path,
                                     duration_seconds=duration
                                 )
+                                await self._report_step_finished(
+                                    progress_callback, execution.id, loop_step_idx, step_result, duration,
+                                    screenshot_path, error=result.get("error"), tier=result.get("tier"),
+                                    loop_iteration=iteration,
+                                )
                                 
                                 if result["success"]:
                                     loop_passed += 1
@@ -1010,7 +1110,7 @@ class ExecutionService:
                                     ExecutionResult.ERROR
                                 )
                                 
-                                crud_execution.create_execution_step(
+                                self._record_step(
                                     db=db,
                                     execution_id=execution.id,
                                     step_number=loop_step_idx,
@@ -1020,6 +1120,10 @@ class ExecutionService:
                                     screenshot_path=screenshot_path,
                                     duration_seconds=duration
                                 )
+                                await self._report_step_finished(
+                                    progress_callback, execution.id, loop_step_idx, ExecutionResult.ERROR, duration,
+                                    screenshot_path, error=str(e), loop_iteration=iteration,
+                                )
                                 
                                 # Capture execution feedback
                                 await self._capture_execution_feedback(
@@ -1082,6 +1186,7 @@ class ExecutionService:
                 try:
                     if progress_callback:
                         await progress_callback({
+                            "event": "step_started",
                             "execution_id": execution.id,
                             "step": idx,
                             "total_steps": total_steps,
@@ -1119,7 +1224,7 @@ class ExecutionService:
                     )
                     
                     # Create step record
-                    crud_execution.create_execution_step(
+                    self._record_step(
                         db=db,
                         execution_id=execution.id,
                         step_number=idx,
@@ -1132,6 +1237,10 @@ class ExecutionService:
                         duration_seconds=duration,
                         ai_verification_result=result.get("ai_verification_result"),
                     )
+                    await self._report_step_finished(
+                        progress_callback, execution.id, idx, step_result, duration,
+                        screenshot_path, error=result.get("error"), tier=result.get("tier"),
+                    )
                     
                     if result["success"]:
                         passed_steps += 1
@@ -1174,7 +1283,7 @@ class ExecutionService:
                         ExecutionResult.ERROR
                     )
                     
-                    crud_execution.create_execution_step(
+                    self._record_step(
                         db=db,
                         execution_id=execution.id,
                         step_number=idx,
@@ -1184,6 +1293,10 @@ class ExecutionService:
                         screenshot_path=screenshot_path,
                         duration_seconds=duration
                     )
+                    await self._report_step_finished(
+                        progress_callback, execution.id, idx, ExecutionResult.ERROR, duration,
+                        screenshot_path, error=str(e),
+                    )
                     
                     # Capture execution feedback for exception
                     await self._capture_execution_feedback(
@@ -1214,6 +1327,7 @@ class ExecutionService:
             # Complete execution
             final_result = ExecutionResult.PASS if failed_steps == 0 else ExecutionResult.FAIL
 
+            await self._close_write_buffer()
             execution = crud_execution.complete_execution(
                 db=db,
                 execution_id=execution.id,
@@ -1228,9 +1342,13 @@ class ExecutionService:
             
             if progress_callback:
                 await progress_callback({
+                    "event": "execution_finished",
                     "execution_id": execution.id,
                     "status": "completed",
                     "result": final_result,
+                    "passed_steps": passed_steps,
+                    "failed_steps": failed_steps,
+                    "total_steps": total_steps,
                     "message": f"Execution completed: {passed_steps}/{total_steps} steps passed"
                 })
             
@@ -1238,6 +1356,7 @@ class ExecutionService:
             pass
         except Exception as e:
             # Execution failed
+            await self._close_write_buffer()
             execution = crud_execution.fail_execution(
                 db=db,
                 execution_id=execution.id,
@@ -1246,6 +1365,7 @@ class ExecutionService:
             
             if progress_callback:
                 await progress_callback({
+                    "event": "execution_finished",
                     "execution_id": execution.id,
                     "status": "failed",
                     "error": str(e),
@@ -1253,6 +1373,7 @@ class ExecutionService:
                 })
         
         finally:
+            await self._close_write_buffer()
             clear_cancel(execution.id)
             # Cleanup
             await self.cleanup()
@@ -0,0 +1,186 @@
+"""
+Write-behind buffer for the rows an execution produces while it runs.
+
+Step results, tier execution logs and step session snapshots used to be
+committed one at a time on the event loop thread, stalling the browser on
+every DB round-trip. ExecutionWriteBuffer queues them in memory and
+bulk-inserts them from a worker thread, using its own session:
+  - every EXECUTION_WRITE_FLUSH_INTERVAL_SECONDS while rows are waiting
+  - as soon as EXECUTION_WRITE_BATCH_SIZE rows are waiting
+  - on close(), which must be awaited before the execution is marked
+    completed / failed / cancelled so a finished run never misses rows
+
+A failed flush keeps its rows for the next attempt; close() gives up
+(and logs) after one retry so a DB outage cannot hang the run.
+"""
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.base import utc_now
+from app.models.execution_settings import TierExecutionLog
+from app.models.test_execution import StepSessionSnapshot, TestExecutionStep
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+DEFAULT_BATCH_SIZE = 50
+
+
+class ExecutionWriteBuffer:
+    """Per-execution write-behind queue for step rows, tier logs and snapshots."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        execution_id: int,
+        flush_interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            session_factory: Creates the session used by the flush thread
+            execution_id: Execution the buffered rows belong to
+            flush_interval: Seconds between background flushes (default from settings)
+            batch_size: Pending rows that trigger an immediate flush (default from settings)
+        """
+        self.execution_id = execution_id
+        self._session_factory = session_factory
+        self._flush_interval = flush_interval if flush_interval is not None else _setting(
+            "EXECUTION_WRITE_FLUSH_INTERVAL_SECONDS", DEFAULT_FLUSH_INTERVAL_SECONDS
+        )
+        self._batch_size = max(1, batch_size if batch_size is not None else int(_setting(
+            "EXECUTION_WRITE_BATCH_SIZE", DEFAULT_BATCH_SIZE
+        )))
+        self._pending: List[Tuple[type, Dict[str, Any]]] = []
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.rows_written = 0
+        self.flush_count = 0
+
+    @classmethod
+    def for_session(cls, db: Session, execution_id: int, **kwargs: Any) -> "ExecutionWriteBuffer":
+        """Buffer writing through a new session on the same engine as ``db``."""
+        return cls(sessionmaker(bind=db.get_bind(), autoflush=False), execution_id, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Producers (event loop thread; never touch the DB)
+    # ------------------------------------------------------------------
+
+    def add_step(self, **fields: Any) -> None:
+        """Queue a TestExecutionStep row (same fields as crud create_execution_step)."""
+        fields.setdefault("execution_id", self.execution_id)
+        fields.setdefault("created_at", utc_now())
+        self._add(TestExecutionStep, fields)
+
+    def add_tier_log(self, **fields: Any) -> None:
+        """Queue a TierExecutionLog row."""
+        fields.setdefault("execution_id", self.execution_id)
+        fields.setdefault("created_at", utc_now())
+        self._add(TierExecutionLog, fields)
+
+    def add_snapshot(self, step_number: int, page_url: Optional[str], session_data: Any) -> None:
+        """Queue a StepSessionSnapshot row (session_data dicts are JSON-encoded now)."""
+        self._add(StepSessionSnapshot, {
+            "execution_id": self.execution_id,
+            "step_number": step_number,
+            "page_url": page_url,
+            "session_data": json.dumps(session_data) if isinstance(session_data, dict) else session_data,
+            "created_at": utc_now(),
+        })
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    async def flush(self) -> int:
+        """Write every pending row now. Returns rows written (0 on failure)."""
+        async with self._flush_lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception as exc:
+                # Keep the rows (ahead of newer ones) for the next flush
+                self._pending[:0] = batch
+                logger.warning(
+                    "[WriteBuffer] Flush of %d rows for execution %s failed: %s",
+                    len(batch), self.execution_id, exc,
+                )
+                return 0
+            self.rows_written += len(batch)
+            self.flush_count += 1
+            return len(batch)
+
+    async def close(self) -> None:
+        """Stop background flushing and write everything still pending."""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            # Wait for an in-flight flush before stopping the timer
+            async with self._flush_lock:
+                timer.cancel()
+        for _attempt in range(2):
+            await self.flush()
+            if not self._pending:
+                return
+        logger.error(
+            "[WriteBuffer] Dropping %d unwritten rows for execution %s",
+            len(self._pending), self.execution_id,
+        )
+        self._pending.clear()
+
+    def _add(self, model: type, row: Dict[str, Any]) -> None:
+        self._pending.append((model, row))
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop (sync caller): rows are written on close()/flush()
+        if len(self._pending) >= self._batch_size:
+            task = loop.create_task(self.flush())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        elif self._timer is None or self._timer.done():
+            self._timer = loop.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+    def _write(self, batch: List[Tuple[type, Dict[str, Any]]]) -> None:
+        """Bulk insert a batch in one transaction (runs in a worker thread)."""
+        by_model: "OrderedDict[type, List[Dict[str, Any]]]" = OrderedDict()
+        for model, row in batch:
+            by_model.setdefault(model, []).append(row)
+
+        session = self._session_factory()
+        try:
+            for model, rows in by_model.items():
+                session.bulk_insert_mappings(model, rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
+def _setting(name: str, default: Any) -> Any:
+    try:
+        from app.core.config import settings
+
+        return getattr(settings, name, default)
+    except Exception:  # settings unavailable (tests, CLI)
+        return default
@@ -1,11 +1,20 @@
 """File upload service for Knowledge Base documents."""
+import asyncio
 import os
 import uuid
 import aiofiles
 from pathlib import Path
 from typing import Optional, Tuple
 from fastapi import UploadFile, HTTPException
-from app.models.kb_document import FileType
+from sqlalchemy.orm import Session
+from app.crud.kb_document import replace_document_chunks
+from app.models.kb_document import ExtractionStatus, FileType, KBDocument
+from app.services import kb_extraction, kb_index
+
+# Uploads are streamed in blocks of this size (never held whole in memory)
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Minimum change in extraction progress (percent) worth a database write
+PROGRESS_STEP_PERCENT = 5
 
 
 class FileUploadService:
@@ -27,7 +36,7 @@ class FileUploadService:
     
     async def save_file(self, file: UploadFile) -> Tuple[str, FileType, int]:
         """
-        Save uploaded file to disk.
+        Stream uploaded file to disk.
         
         Args:
             file: Uploaded file
@@ -46,43 +55,132 @@ class FileUploadService:
         unique_filename = f"{uuid.uuid4()}{file_extension}"
         file_path = self.upload_dir / unique_filename
         
-        # Save file
+        # Save file block by block
+        written = 0
         try:
             async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
+                while block := await file.read(UPLOAD_CHUNK_BYTES):
+                    written += len(block)
+                    if written > self.max_size:
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"File size exceeds maximum allowed size of {self.max_size / (1024*1024):.1f}MB"
+                        )
+                    await f.write(block)
+        except HTTPException:
+            file_path.unlink(missing_ok=True)
+            raise
         except Exception as e:
+            file_path.unlink(missing_ok=True)
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to save file: {str(e)}"
             )
         
-        return str(file_path), file_type, file_size
+        return str(file_path), file_type, written
     
-    async def extract_text(self, file_path: str, file_type: FileType) -> Optional[str]:
+    async def extract_text(
+        self,
+        file_path: str,
+        file_type: FileType,
+        progress: Optional[kb_extraction.ProgressCallback] = None
+    ) -> Optional[str]:
         """
         Extract text content from uploaded file.
         
+        PDF/DOCX parsing runs in the extraction process pool, so the event
+        loop stays responsive while large manuals are processed.
+        
         Args:
             file_path: Path to the file
             file_type: Type of file
+            progress: Optional callback(pages_done, total_pages)
             
         Returns:
             Extracted text content or None if extraction fails
         """
         try:
-            if file_type == FileType.TXT or file_type == FileType.MD:
-                return await self._extract_text_from_txt(file_path)
-            elif file_type == FileType.PDF:
-                return await self._extract_text_from_pdf(file_path)
-            elif file_type == FileType.DOCX:
-                return await self._extract_text_from_docx(file_path)
-            return None
+            return await kb_extraction.extract_text(file_path, file_type, progress)
         except Exception as e:
             # Log error but don't fail - content extraction is optional
             print(f"Warning: Text extraction failed for {file_path}: {str(e)}")
             return None
     
+    async def process_document(self, document_id: int, session_factory=None) -> None:
+        """
+        Background job: extract a document's text, then index it.
+        
+        Progress is written to KBDocument.extraction_progress (percent of
+        pages) so clients can poll the document while a large file is parsed.
+        
+        Args:
+            document_id: Document created with extraction_status=pending
+            session_factory: Session factory (default: app.db.session.SessionLocal)
+        """
+        if session_factory is None:
+            from app.db.session import SessionLocal
+            session_factory = SessionLocal
+        
+        db = session_factory()
+        try:
+            document = db.query(KBDocument).filter(KBDocument.id == document_id).first()
+            if not document:
+                return
+            document.extraction_status = ExtractionStatus.PROCESSING
+            db.commit()
+            
+            last_percent = 0
+            
+            def report(done: int, total: int) -> None:
+                nonlocal last_percent
+                percent = int(done * 100 / total) if total else 100
+                if percent - last_percent >= PROGRESS_STEP_PERCENT and percent < 100:
+                    last_percent = percent
+                    document.extraction_progress = percent
+                    db.commit()
+            
+            try:
+                content = await kb_extraction.extract_text(document.file_path, document.file_type, report)
+            except Exception as e:
+                print(f"Warning: Text extraction failed for {document.file_path}: {str(e)}")
+                document.extraction_status = ExtractionStatus.FAILED
+                db.commit()
+                return
+            
+            document.content = content
+            document.extraction_progress = 100
+            document.extraction_status = ExtractionStatus.COMPLETED
+            db.commit()
+            await self.index_document(db, document)
+        finally:
+            db.close()
+    
+    async def index_document(self, db: Session, document: KBDocument) -> int:
+        """
+        Build the search index (chunks, and embeddings if configured) for a document.
+        
+        Chunking and embedding run in a worker thread; only the write
+        happens on the request's session.
+        
+        Args:
+            db: Database session
+            document: Saved document with extracted content
+            
+        Returns:
+            Number of chunks indexed (0 if indexing failed)
+        """
+        if not document.content:
+            return 0
+        try:
+            chunks = await asyncio.to_thread(kb_index.build_chunks, document.content)
+            replace_document_chunks(db, document.id, chunks)
+            return len(chunks)
+        except Exception as e:
+            # Log error but don't fail - the document is still listed and can be re-indexed
+            db.rollback()
+            print(f"Warning: Indexing failed for document {document.id}: {str(e)}")
+            return 0
+    
     async def delete_file(self, file_path: str) -> bool:
         """
         Delete file from disk.
@@ -119,9 +217,15 @@ class FileUploadService:
                 detail=f"File type not allowed. Allowed types: {', '.join(self.allowed_extensions)}"
             )
         
-        # Read file content for validation
-        content = await file.read()
-        file_size = len(content)
+        # Measure size: trust the multipart parser's count when present,
+        # otherwise scan the spooled upload block by block
+        file_size = getattr(file, "size", None)
+        if not isinstance(file_size, int):
+            file_size = 0
+            while block := await file.read(UPLOAD_CHUNK_BYTES):
+                file_size += len(block)
+                if file_size > self.max_size:
+                    break
         
         # Reset file position
         await file.seek(0)
@@ -149,47 +253,3 @@ class FileUploadService:
             raise HTTPException(status_code=400, detail="Unsupported file type")
         
         return file_type, file_size
-    
-    async def _extract_text_from_txt(self, file_path: str) -> str:
-        """Extract text from TXT/MD file."""
-        async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = await f.read()
-            return content.strip()
-    
-    async def _extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file."""
-        try:
-            from PyPDF2 import PdfReader
-            
-            # PDF extraction is synchronous
-            reader = PdfReader(file_path)
-            text_parts = []
-            
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-            
-            return "\n\n".join(text_parts).strip()
-        except Exception as e:
-            print(f"PDF extraction error: {str(e)}")
-            return ""
-    
-    async def _extract_text_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file."""
-        try:
-            from docx import Document
-            
-            # DOCX extraction is synchronous
-            doc = Document(file_path)
-            text_parts = []
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_parts.append(paragraph.text)
-            
-            return "\n\n".join(text_parts).strip()
-        except Exception as e:
-            print(f"DOCX extraction error: {str(e)}")
-            return ""
-
@@ -1,14 +1,68 @@
 """Knowledge Base Context Service for Test Generation Integration."""
 import logging
+import threading
+from collections import OrderedDict
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
+from app.core.config import settings
 from app.models.kb_document import KBDocument, KBCategory
-from app.crud.kb_document import get_documents
+from app.crud.kb_document import get_documents, get_kb_fingerprint, get_leading_chunks
+from app.services.kb_index import (
+    CHARS_PER_TOKEN,
+    KBPassage,
+    chunk_text,
+    count_tokens,
+    pack_passages,
+    search_passages,
+    to_passage,
+)
 
 logger = logging.getLogger(__name__)
 
+# Passages considered when packing a token budget
+MAX_CONTEXT_CANDIDATES = 40
+# Tokens reserved for the section title and per-document header lines
+FIXED_HEADER_TOKENS = 30
+DOCUMENT_HEADER_TOKENS = 30
+
+_INSTRUCTIONS = [
+    "=== Instructions for Using KB Documents ===",
+    "- Reference specific document names when generating test steps",
+    "- Use exact field names and UI paths mentioned in the documents",
+    "- Include realistic test data from the documents",
+    "- Cite sources in format: '(per [Document Name] Section X)' or '(ref: [Document Name])'",
+    "- Validate test assertions against documented procedures",
+    ""
+]
+
+# Assembled contexts, keyed by request parameters + KB fingerprint (LRU)
+_context_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_context_cache_lock = threading.Lock()
+
+
+def _context_cache_get(key: tuple) -> Optional[str]:
+    with _context_cache_lock:
+        context = _context_cache.get(key)
+        if context is not None:
+            _context_cache.move_to_end(key)
+        return context
+
+
+def _context_cache_put(key: tuple, context: str) -> None:
+    with _context_cache_lock:
+        _context_cache[key] = context
+        _context_cache.move_to_end(key)
+        while len(_context_cache) > settings.KB_CONTEXT_CACHE_MAX_ENTRIES:
+            _context_cache.popitem(last=False)
+
+
+def clear_context_cache() -> None:
+    """Drop all cached KB contexts."""
+    with _context_cache_lock:
+        _context_cache.clear()
+
 
 class KBContextService:
     """Service for retrieving and formatting KB documents for LLM context."""
@@ -22,16 +76,27 @@ class KBContextService:
         db: Session,
         category_id: Optional[int] = None,
         max_docs: int = 10,
-        max_chars_per_doc: int = 3000
+        max_chars_per_doc: Optional[int] = None,
+        query: Optional[str] = None,
+        token_budget: Optional[int] = None
     ) -> str:
         """
-        Retrieve KB documents from a specific category and format for LLM context.
+        Retrieve KB passages and format them for LLM context within a token budget.
+        
+        With a query, the passages (document chunks) that best match it are
+        packed, highest score first, until the budget is spent. Without one,
+        or when nothing matches, the leading chunks of the most recent
+        documents are packed instead. Results are cached per process until
+        documents in the category change.
         
         Args:
             db: Database session
             category_id: KB category ID to filter by (e.g., 1=System Guide, 2=Product Info)
             max_docs: Maximum number of documents to include (default: 10)
-            max_chars_per_doc: Maximum characters per document (default: 3000)
+            max_chars_per_doc: Optional hard cap on characters per document
+            query: Requirement text to retrieve passages for (optional)
+            token_budget: Tokens the whole KB section may use in the target
+                model's prompt (default: KB_CONTEXT_TOKEN_BUDGET)
             
         Returns:
             Formatted string containing KB document content for LLM context
@@ -51,16 +116,59 @@ class KBContextService:
             Customer ID field: Unique identifier...
             ```
         """
-        # Get documents from the specified category (or all categories if None)
-        documents = get_documents(
-            db=db,
-            category_id=category_id,  # None = all categories
-            limit=max_docs
+        token_budget = token_budget or settings.KB_CONTEXT_TOKEN_BUDGET
+        cache_key = (
+            category_id, max_docs, max_chars_per_doc, query or "", token_budget,
+            get_kb_fingerprint(db, category_id)
         )
+        cached = _context_cache_get(cache_key)
+        if cached is not None:
+            return cached
         
-        if not documents:
+        context = await self._build_context(db, category_id, max_docs, max_chars_per_doc, query, token_budget)
+        _context_cache_put(cache_key, context)
+        return context
+    
+    async def _build_context(
+        self,
+        db: Session,
+        category_id: Optional[int],
+        max_docs: int,
+        max_chars_per_doc: Optional[int],
+        query: Optional[str],
+        token_budget: int
+    ) -> str:
+        """Select passages for get_category_context and format them."""
+        candidates: List[KBPassage] = []
+        if query:
+            candidates = await self.get_relevant_passages(db, query, category_id, top_k=MAX_CONTEXT_CANDIDATES)
+        if not candidates:
+            candidates = self._leading_passages(db, category_id, max_docs, token_budget)
+        
+        # Keep passages from the best max_docs documents only
+        document_order: List[int] = []
+        for passage in candidates:
+            if passage.document_id not in document_order and len(document_order) < max_docs:
+                document_order.append(passage.document_id)
+        candidates = [p for p in candidates if p.document_id in document_order]
+        
+        selected = pack_passages(
+            candidates,
+            token_budget - count_tokens("\n".join(_INSTRUCTIONS)) - FIXED_HEADER_TOKENS,
+            overhead_per_document=DOCUMENT_HEADER_TOKENS
+        )
+        if not selected:
             return ""
         
+        passages_by_doc: Dict[int, List[KBPassage]] = {}
+        for passage in selected:
+            passages_by_doc.setdefault(passage.document_id, []).append(passage)
+        documents = {
+            doc.id: doc
+            for doc in db.query(KBDocument).filter(KBDocument.id.in_(passages_by_doc)).all()
+        }
+        document_order = [doc_id for doc_id in document_order if doc_id in passages_by_doc and doc_id in documents]
+        
         # Get category name for header
         if category_id:
             category = db.query(KBCategory).filter(KBCategory.id == category_id).first()
@@ -72,14 +180,16 @@ class KBContextService:
         context_parts = [
             f"=== Knowledge Base Documents (Category: {category_name}) ===",
             "",
-            f"The following {len(documents)} document(s) contain relevant information:",
+            f"The following {len(document_order)} document(s) contain relevant information:",
             ""
         ]
         
-        for idx, doc in enumerate(documents, 1):
-            # Extract content (truncate if too long)
-            content = doc.content or "No content extracted"
-            if len(content) > max_chars_per_doc:
+        for idx, doc_id in enumerate(document_order, 1):
+            doc = documents[doc_id]
+            # Selected passages in document order, separated by an ellipsis
+            passages = sorted(passages_by_doc[doc_id], key=lambda p: p.chunk_index)
+            content = "\n...\n".join(p.content for p in passages)
+            if max_chars_per_doc and len(content) > max_chars_per_doc:
                 content = content[:max_chars_per_doc] + "... [truncated]"
             
             # Format document section
@@ -95,18 +205,59 @@ class KBContextService:
             context_parts.extend(doc_section)
         
         # Add instructions for using KB context
-        context_parts.extend([
-            "=== Instructions for Using KB Documents ===",
-            "- Reference specific document names when generating test steps",
-            "- Use exact field names and UI paths mentioned in the documents",
-            "- Include realistic test data from the documents",
-            "- Cite sources in format: '(per [Document Name] Section X)' or '(ref: [Document Name])'",
-            "- Validate test assertions against documented procedures",
-            ""
-        ])
+        context_parts.extend(_INSTRUCTIONS)
         
         return "\n".join(context_parts)
     
+    def _leading_passages(
+        self,
+        db: Session,
+        category_id: Optional[int],
+        max_docs: int,
+        token_budget: int
+    ) -> List[KBPassage]:
+        """
+        Opening chunks of the most recent documents, interleaved (every
+        document's first chunk, then every second chunk, ...).
+        """
+        documents = get_documents(
+            db=db,
+            category_id=category_id,  # None = all categories
+            limit=max_docs
+        )
+        if not documents:
+            return []
+        
+        # Enough chunks per document to fill the budget on their own
+        per_document = token_budget * CHARS_PER_TOKEN // settings.KB_CHUNK_SIZE_CHARS + 1
+        chunks_by_doc: Dict[int, list] = {}
+        for chunk in get_leading_chunks(db, [doc.id for doc in documents], per_document):
+            chunks_by_doc.setdefault(chunk.document_id, []).append(chunk)
+        
+        passages = []
+        for rank, doc in enumerate(documents):
+            if doc.id in chunks_by_doc:
+                doc_passages = [to_passage(chunk) for chunk in chunks_by_doc[doc.id]]
+            else:
+                # Not indexed (yet): chunk the stored text on the fly
+                doc_passages = [
+                    KBPassage(
+                        document_id=doc.id,
+                        document_title=doc.title,
+                        category_name=doc.category.name if doc.category else "Unknown",
+                        chunk_index=index,
+                        content=chunk["content"],
+                        score=0.0,
+                        token_count=count_tokens(chunk["content"])
+                    )
+                    for index, chunk in enumerate(chunk_text(doc.content or "")[:per_document])
+                ]
+            for passage in doc_passages:
+                passage.score = -(passage.chunk_index * len(documents) + rank)
+                passages.append(passage)
+        passages.sort(key=lambda p: -p.score)
+        return passages
+    
     async def get_relevant_documents(
         self,
         db: Session,
@@ -117,10 +268,8 @@ class KBContextService:
         """
         Retrieve KB documents relevant to a requirement.
         
-        This is a basic implementation. In future, this could use:
-        - Vector similarity search
-        - Full-text search ranking
-        - Semantic search with embeddings
+        Documents are ranked by their best-matching passage; when no passage
+        matches, the most recent documents in the category are returned.
         
         Args:
             db: Database session
@@ -131,17 +280,54 @@ class KBContextService:
         Returns:
             List of relevant KBDocument objects
         """
-        # For now, just return documents from category (if specified)
-        # Future enhancement: Add semantic search, keyword matching, etc.
+        document_ids: List[int] = []
+        for passage in await self.get_relevant_passages(db, requirement, category_id):
+            if passage.document_id not in document_ids:
+                document_ids.append(passage.document_id)
+        document_ids = document_ids[:max_docs]
         
-        documents = get_documents(
-            db=db,
-            category_id=category_id,
-            limit=max_docs
-        )
+        if not document_ids:
+            return get_documents(
+                db=db,
+                category_id=category_id,
+                limit=max_docs
+            )
         
+        documents = db.query(KBDocument).filter(KBDocument.id.in_(document_ids)).all()
+        documents.sort(key=lambda doc: document_ids.index(doc.id))
         return documents
     
+    async def get_relevant_passages(
+        self,
+        db: Session,
+        requirement: str,
+        category_id: Optional[int] = None,
+        top_k: Optional[int] = None
+    ) -> List[KBPassage]:
+        """
+        Retrieve the KB passages (document chunks) most relevant to a requirement.
+        
+        Args:
+            db: Database session
+            requirement: The test requirement text
+            category_id: Optional category filter
+            top_k: Maximum passages to return (default: KB_SEARCH_TOP_K)
+            
+        Returns:
+            List of KBPassage objects, best match first
+        """
+        try:
+            return search_passages(
+                db,
+                requirement,
+                category_id=category_id,
+                top_k=top_k or settings.KB_SEARCH_TOP_K
+            )
+        except Exception as e:
+            logger.warning("KB passage search failed: %s", e)
+            db.rollback()
+            return []
+    
     async def increment_reference_count(
         self,
         db: Session,
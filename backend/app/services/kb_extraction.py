@@ -0,0 +1,169 @@
+"""
+Text extraction for Knowledge Base files, off the event loop.
+
+PyPDF2 and python-docx are CPU-bound and hold the GIL, so extraction runs in
+a bounded ProcessPoolExecutor shared by the process. PDFs are split into page
+batches that run in parallel; the caller's progress callback is invoked as
+each batch completes with (pages_done, total_pages). TXT/MD files are read
+asynchronously in the calling process.
+
+The module-level extract_* functions are the picklable worker entry points
+and are also used directly by import_kb_files.py.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+import aiofiles
+
+from app.core.config import settings
+from app.models.kb_document import FileType
+
+logger = logging.getLogger(__name__)
+
+# Pages per worker task: small enough for useful progress, large enough to
+# amortise re-opening the PDF in each task
+PDF_PAGES_PER_TASK = 8
+
+ProgressCallback = Callable[[int, int], None]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+# ============================================================================
+# Worker functions (run in the process pool)
+# ============================================================================
+
+def count_pdf_pages(file_path: str) -> int:
+    """Number of pages in a PDF."""
+    from PyPDF2 import PdfReader
+    return len(PdfReader(file_path).pages)
+
+
+def extract_pdf_pages(file_path: str, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) of a PDF (empty string for image-only pages)."""
+    from PyPDF2 import PdfReader
+    reader = PdfReader(file_path)
+    texts = []
+    for index in range(start, min(stop, len(reader.pages))):
+        try:
+            texts.append(reader.pages[index].extract_text() or "")
+        except Exception as e:
+            # One malformed page shouldn't lose the rest of the document
+            print(f"PDF extraction error on page {index + 1} of {file_path}: {str(e)}")
+            texts.append("")
+    return texts
+
+
+def extract_docx_text(file_path: str) -> str:
+    """Text of a DOCX file, one paragraph per block."""
+    from docx import Document
+    doc = Document(file_path)
+    return "\n\n".join(p.text for p in doc.paragraphs if p.text.strip()).strip()
+
+
+def extract_text_sync(file_path: str, file_type: str) -> Optional[str]:
+    """Extract any supported file in one call (used for batch imports)."""
+    file_type = FileType(file_type)
+    if file_type in (FileType.TXT, FileType.MD):
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            return f.read().strip()
+    if file_type == FileType.PDF:
+        return _join_pages(extract_pdf_pages(file_path, 0, count_pdf_pages(file_path)))
+    if file_type == FileType.DOCX:
+        return extract_docx_text(file_path)
+    return None
+
+
+# ============================================================================
+# Async API
+# ============================================================================
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """Process pool shared by uploads and background extraction jobs."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = settings.KB_EXTRACTION_WORKERS or min(4, os.cpu_count() or 1)
+            # spawn: forking a server process with live threads/event loops is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_extraction_pool() -> None:
+    """Stop the worker processes (app shutdown)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def extract_text(
+    file_path: str,
+    file_type: FileType,
+    progress: Optional[ProgressCallback] = None,
+) -> Optional[str]:
+    """
+    Extract text from a file without blocking the event loop.
+
+    Args:
+        file_path: Path to the file
+        file_type: Type of file
+        progress: Optional callback(pages_done, total_pages); PDFs report per
+            completed page batch, other types report (1, 1) when done
+
+    Returns:
+        Extracted text content (None for unsupported types)
+
+    Raises:
+        Exception: If the file can't be read or parsed
+    """
+    if file_type in (FileType.TXT, FileType.MD):
+        async with aiofiles.open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            content = (await f.read()).strip()
+    elif file_type == FileType.PDF:
+        return await _extract_pdf(file_path, progress)
+    elif file_type == FileType.DOCX:
+        loop = asyncio.get_running_loop()
+        content = await loop.run_in_executor(get_extraction_pool(), extract_docx_text, file_path)
+    else:
+        return None
+    if progress:
+        progress(1, 1)
+    return content
+
+
+async def _extract_pdf(file_path: str, progress: Optional[ProgressCallback]) -> str:
+    """Fan page batches of a PDF out over the pool and join them in order."""
+    loop = asyncio.get_running_loop()
+    pool = get_extraction_pool()
+    total = await loop.run_in_executor(pool, count_pdf_pages, file_path)
+    if progress:
+        progress(0, total)
+
+    async def run_batch(start: int) -> tuple:
+        stop = min(start + PDF_PAGES_PER_TASK, total)
+        return start, await loop.run_in_executor(pool, extract_pdf_pages, file_path, start, stop)
+
+    pages: List[str] = [""] * total
+    done = 0
+    for batch in asyncio.as_completed([run_batch(start) for start in range(0, total, PDF_PAGES_PER_TASK)]):
+        start, texts = await batch
+        pages[start:start + len(texts)] = texts
+        done += len(texts)
+        if progress:
+            progress(done, total)
+    return _join_pages(pages)
+
+
+def _join_pages(pages: List[str]) -> str:
+    return "\n\n".join(text for text in pages if text).strip()
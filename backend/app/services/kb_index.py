@@ -0,0 +1,287 @@
+"""
+Knowledge Base passage index.
+
+Documents are split into overlapping chunks when they are uploaded. Chunks
+are full-text indexed (see app.db.kb_search) and, when KB_EMBEDDING_MODEL
+names a sentence-transformers model, also embedded. Retrieval takes the
+full-text candidates and, if embeddings are available, reranks them with
+reciprocal rank fusion of the lexical and cosine-similarity orders.
+
+Every chunk stores its token count so prompt builders can pack passages
+into a model's token budget without re-tokenising (see pack_passages).
+"""
+import logging
+import math
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.kb_document import get_chunks, replace_document_chunks
+from app.db.kb_search import search_chunks
+from app.models.kb_document import KBChunk, KBDocument
+
+logger = logging.getLogger(__name__)
+
+# Full-text candidates fetched per requested passage when reranking
+RERANK_CANDIDATE_FACTOR = 4
+# Reciprocal rank fusion constant (Cormack et al.)
+RRF_K = 60
+
+# Fallback estimate when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+
+_embedder = None
+_embedder_model: Optional[str] = None
+_embedder_lock = threading.Lock()
+_encoding = None
+_encoding_loaded = False
+
+
+@dataclass
+class KBPassage:
+    """A retrieved chunk of a KB document."""
+    document_id: int
+    document_title: str
+    category_name: str
+    chunk_index: int
+    content: str
+    score: float
+    token_count: int = 0
+
+
+def chunk_text(
+    content: str,
+    chunk_size: Optional[int] = None,
+    overlap: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Split text into overlapping chunks.
+
+    Chunk ends snap back to the last paragraph break, sentence end or
+    whitespace in the second half of the window so passages don't cut words.
+
+    Returns:
+        Dicts with start_char and content, in document order
+    """
+    chunk_size = chunk_size or settings.KB_CHUNK_SIZE_CHARS
+    overlap = settings.KB_CHUNK_OVERLAP_CHARS if overlap is None else overlap
+    overlap = max(0, min(overlap, chunk_size // 2))
+
+    content = content or ""
+    chunks = []
+    start = 0
+    while start < len(content):
+        end = min(start + chunk_size, len(content))
+        if end < len(content):
+            end = _snap_end(content, start, end)
+        piece = content[start:end].strip()
+        if piece:
+            chunks.append({"start_char": start, "content": piece})
+        if end >= len(content):
+            break
+        next_start = max(end - overlap, start + 1)
+        # Start the overlap on a word boundary
+        space = content.find(" ", next_start, end)
+        start = space + 1 if space != -1 else next_start
+    return chunks
+
+
+def count_tokens(text: str) -> int:
+    """
+    Token count of text: tiktoken's cl100k_base when installed, otherwise a
+    characters-per-token estimate. Close enough for budgeting across models.
+    """
+    global _encoding, _encoding_loaded
+    if not text:
+        return 0
+    if not _encoding_loaded:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = None
+        _encoding_loaded = True
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def pack_passages(
+    passages: Sequence[KBPassage],
+    token_budget: int,
+    overhead_per_document: int = 0,
+) -> List[KBPassage]:
+    """
+    Greedily select passages, best first, whose tokens fit the budget.
+
+    A passage that doesn't fit is skipped so smaller, lower-ranked ones can
+    still use the remaining budget. The first passage from each document
+    also pays overhead_per_document (its header in the prompt).
+
+    Returns:
+        Selected passages in their original (rank) order
+    """
+    remaining = token_budget
+    seen_documents = set()
+    selected = []
+    for passage in passages:
+        cost = passage.token_count or count_tokens(passage.content)
+        if passage.document_id not in seen_documents:
+            cost += overhead_per_document
+        if cost > remaining:
+            continue
+        remaining -= cost
+        seen_documents.add(passage.document_id)
+        selected.append(passage)
+    return selected
+
+
+def build_chunks(content: Optional[str]) -> List[Dict[str, Any]]:
+    """Chunk a document's text, count tokens, and attach embeddings when configured."""
+    chunks = chunk_text(content or "")
+    for chunk in chunks:
+        chunk["token_count"] = count_tokens(chunk["content"])
+    vectors = embed_texts([chunk["content"] for chunk in chunks]) if chunks else None
+    if vectors is not None:
+        for chunk, vector in zip(chunks, vectors):
+            chunk["embedding"] = _pack(vector)
+    return chunks
+
+
+def index_document(db: Session, document: KBDocument) -> int:
+    """(Re)build the chunks of a document. Returns the number of chunks written."""
+    chunks = build_chunks(document.content)
+    replace_document_chunks(db, document.id, chunks)
+    return len(chunks)
+
+
+def search_passages(
+    db: Session,
+    query: str,
+    category_id: Optional[int] = None,
+    top_k: Optional[int] = None,
+) -> List[KBPassage]:
+    """
+    Return the top-k passages for a query, best first.
+
+    Args:
+        db: Database session
+        query: Free text, typically the requirement being tested
+        category_id: Optional KB category filter
+        top_k: Passages to return (default: KB_SEARCH_TOP_K)
+    """
+    top_k = top_k or settings.KB_SEARCH_TOP_K
+    rerank = bool(settings.KB_EMBEDDING_MODEL)
+    limit = top_k * RERANK_CANDIDATE_FACTOR if rerank else top_k
+
+    hits = search_chunks(db, query, category_id=category_id, limit=limit)
+    if not hits:
+        return []
+
+    chunks = {chunk.id: chunk for chunk in get_chunks(db, [chunk_id for chunk_id, _ in hits])}
+    scores = {chunk_id: score for chunk_id, score in hits}
+    ranked = [chunk_id for chunk_id, _ in hits if chunk_id in chunks]
+
+    if rerank:
+        ranked, scores = _rerank(query, ranked, chunks, scores)
+
+    return [to_passage(chunks[chunk_id], scores[chunk_id]) for chunk_id in ranked[:top_k]]
+
+
+def to_passage(chunk: KBChunk, score: float = 0.0) -> KBPassage:
+    """Wrap a chunk (with its document loaded) as a KBPassage."""
+    document = chunk.document
+    return KBPassage(
+        document_id=document.id,
+        document_title=document.title,
+        category_name=document.category.name if document.category else "Unknown",
+        chunk_index=chunk.chunk_index,
+        content=chunk.content,
+        score=score,
+        token_count=chunk.token_count or 0,
+    )
+
+
+def embed_texts(texts: Sequence[str]) -> Optional[List[List[float]]]:
+    """Normalised embeddings for texts, or None when no embedder is available."""
+    embedder = _get_embedder()
+    if embedder is None:
+        return None
+    try:
+        vectors = embedder.encode(list(texts), normalize_embeddings=True, show_progress_bar=False)
+    except Exception as e:
+        logger.warning("KB embedding failed, falling back to full-text ranking: %s", e)
+        return None
+    return [list(map(float, vector)) for vector in vectors]
+
+
+# Private helpers
+
+def _snap_end(content: str, start: int, end: int) -> int:
+    """Move end back to a natural break in the second half of the window."""
+    floor = start + (end - start) // 2
+    for separator in ("\n\n", ". ", "\n", " "):
+        position = content.rfind(separator, floor, end)
+        if position != -1:
+            return position + len(separator)
+    return end
+
+
+def _get_embedder():
+    """Lazily load the configured sentence-transformers model (None if unavailable)."""
+    global _embedder, _embedder_model
+    model_name = settings.KB_EMBEDDING_MODEL
+    if not model_name:
+        return None
+    with _embedder_lock:
+        if _embedder_model != model_name:
+            _embedder_model = model_name
+            try:
+                from sentence_transformers import SentenceTransformer
+                _embedder = SentenceTransformer(model_name)
+                logger.info("KB embedding model loaded: %s", model_name)
+            except Exception as e:
+                logger.warning("KB embedding model %s unavailable: %s", model_name, e)
+                _embedder = None
+        return _embedder
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> array:
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector
+
+
+def _rerank(query, ranked, chunks, scores):
+    """Fuse full-text rank with embedding similarity rank (RRF)."""
+    query_vectors = embed_texts([query])
+    if query_vectors is None:
+        return ranked, scores
+    query_vector = query_vectors[0]
+
+    similarity = {}
+    for chunk_id in ranked:
+        blob = chunks[chunk_id].embedding
+        if blob:
+            vector = _unpack(blob)
+            if len(vector) == len(query_vector):
+                similarity[chunk_id] = math.fsum(a * b for a, b in zip(query_vector, vector))
+    if not similarity:
+        return ranked, scores
+
+    by_similarity = sorted(similarity, key=lambda chunk_id: -similarity[chunk_id])
+    semantic_rank = {chunk_id: rank for rank, chunk_id in enumerate(by_similarity, 1)}
+    fused = {}
+    for lexical_rank, chunk_id in enumerate(ranked, 1):
+        fused[chunk_id] = 1 / (RRF_K + lexical_rank)
+        if chunk_id in semantic_rank:
+            fused[chunk_id] += 1 / (RRF_K + semantic_rank[chunk_id])
+    return sorted(ranked, key=lambda chunk_id: -fused[chunk_id]), fused
@@ -0,0 +1,182 @@
+"""
+Observe memoization for Tier 2 XPath extraction.
+
+Stagehand observe() is an LLM call over the page, so steps on an unchanged
+form (fill name, fill email, fill phone) used to pay for one observe each.
+Observe results are memoized per DOM fingerprint: a hash of the page's
+interactive-element tree (tag, type, name, id, role, label, depth and
+visibility of each element), computed in the page in one evaluate() call.
+Field values are left out, so typing into a form keeps its fingerprint.
+
+Every candidate element an observe() returns is kept. A later instruction on
+the same fingerprint is first matched against the candidates' descriptions;
+only when no candidate clearly matches is a new observe() made (and its
+candidates added to the same entry).
+"""
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Returns "<element count>-<53-bit hash>" for the interactive elements on the page
+DOM_FINGERPRINT_SCRIPT = """() => {
+    const selector = 'a[href], button, input, select, textarea, [role], [onclick], [contenteditable="true"], [tabindex]';
+    const parts = [location.origin + location.pathname];
+    for (const el of document.querySelectorAll(selector)) {
+        let depth = 0;
+        for (let node = el.parentElement; node; node = node.parentElement) depth++;
+        parts.push([
+            depth, el.tagName, el.getAttribute('type') || '', el.getAttribute('name') || '', el.id || '',
+            el.getAttribute('role') || '', el.getAttribute('aria-label') || '',
+            el.disabled ? 1 : 0, el.getClientRects().length ? 1 : 0,
+        ].join(':'));
+    }
+    const text = parts.join('|');
+    let h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+    for (let i = 0; i < text.length; i++) {
+        const ch = text.charCodeAt(i);
+        h1 = Math.imul(h1 ^ ch, 2654435761);
+        h2 = Math.imul(h2 ^ ch, 1597334677);
+    }
+    h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+    h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+    const hash = 4294967296 * (2097151 & h2) + (h1 >>> 0);
+    return (parts.length - 1) + '-' + hash.toString(16);
+}"""
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Quoted values, e-mail addresses and URLs in an instruction are data, not element names
+_VALUE_RE = re.compile(r"(['\"]).*?\1|\S+@\S+|https?://\S+")
+# Words naming the action or the kind of element rather than which element
+NON_DISTINCTIVE_WORDS = frozenset({
+    "a", "an", "and", "as", "at", "by", "for", "from", "in", "into", "it", "of", "on", "or",
+    "the", "to", "with", "your", "this", "that", "its", "is", "be", "then",
+    "click", "tap", "press", "fill", "type", "enter", "input", "select", "choose", "pick",
+    "check", "uncheck", "toggle", "set", "open", "submit", "field", "box", "textbox", "text",
+    "button", "link", "element", "option", "dropdown", "menu", "form", "page", "value", "area",
+})
+
+
+async def dom_fingerprint(page: Any) -> Optional[str]:
+    """Structural fingerprint of the page's interactive elements (None if unavailable)."""
+    try:
+        fingerprint = await page.evaluate(DOM_FINGERPRINT_SCRIPT)
+    except Exception as e:
+        logger.debug(f"[Observe Memo] Could not fingerprint page: {e}")
+        return None
+    return fingerprint if isinstance(fingerprint, str) and fingerprint else None
+
+
+def _distinctive_words(text: str) -> set:
+    return {word for word in _WORD_RE.findall(text.lower()) if word not in NON_DISTINCTIVE_WORDS}
+
+
+def match_candidate(
+    instruction: str,
+    candidates: Iterable[Dict[str, Any]],
+    min_score: float,
+) -> Optional[Dict[str, Any]]:
+    """
+    Candidate whose description matches the instruction, or None.
+
+    Matching is scored both ways: the share of the description's distinctive
+    words found in the instruction and the share of the instruction's found
+    in the description (quoted values and stopwords excluded); a candidate
+    scores the lower of the two. So "Fill company name" does not match a
+    plain "Name input field". The best candidate must reach min_score and
+    beat every other one; ties mean the instruction is ambiguous.
+    """
+    wanted = _distinctive_words(_VALUE_RE.sub(" ", instruction or ""))
+    if not wanted:
+        return None
+
+    scored = []
+    for candidate in candidates:
+        described = _distinctive_words(candidate.get("description") or "")
+        overlap = len(wanted & described)
+        if overlap:
+            score = min(overlap / len(described), overlap / len(wanted))
+            scored.append((score, overlap, candidate))
+    if not scored:
+        return None
+
+    scored.sort(key=lambda item: item[:2], reverse=True)
+    best = scored[0]
+    if best[0] < min_score:
+        return None
+    if len(scored) > 1 and scored[1][:2] == best[:2]:
+        return None
+    return best[2]
+
+
+def observe_candidate(result: Any) -> Optional[Dict[str, Any]]:
+    """Selector/description/method of one observe() result (dict or ObserveResult)."""
+    def field(name: str):
+        return result.get(name) if isinstance(result, dict) else getattr(result, name, None)
+
+    selector = field("selector")
+    if not selector:
+        return None
+    return {"selector": selector, "description": field("description"), "method": field("method")}
+
+
+class ObserveMemo:
+    """Thread-safe LRU of observe() candidates per DOM fingerprint."""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        max_pages: Optional[int] = None,
+        min_score: Optional[float] = None,
+    ):
+        self.enabled = settings.OBSERVE_MEMO_ENABLED if enabled is None else enabled
+        self.max_pages = max_pages or settings.OBSERVE_MEMO_MAX_PAGES
+        self.min_score = min_score if min_score is not None else settings.OBSERVE_MEMO_MIN_SCORE
+        self._lock = threading.Lock()
+        # fingerprint -> candidates (unique selectors, first-seen order)
+        self._pages: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+
+    def match(self, fingerprint: str, instruction: str) -> Optional[Dict[str, Any]]:
+        """Memoized candidate for an instruction on this fingerprint, or None."""
+        with self._lock:
+            candidates = self._pages.get(fingerprint)
+            if candidates is None:
+                return None
+            self._pages.move_to_end(fingerprint)
+            candidates = list(candidates)
+        return match_candidate(instruction, candidates, self.min_score)
+
+    def add(self, fingerprint: str, candidates: Iterable[Dict[str, Any]]) -> None:
+        """Remember the candidates an observe() returned on this fingerprint."""
+        with self._lock:
+            stored = self._pages.setdefault(fingerprint, [])
+            known = {candidate["selector"] for candidate in stored}
+            for candidate in candidates:
+                if candidate["selector"] not in known:
+                    stored.append(candidate)
+                    known.add(candidate["selector"])
+            self._pages.move_to_end(fingerprint)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+
+_memo: Optional[ObserveMemo] = None
+_memo_lock = threading.Lock()
+
+
+def get_observe_memo() -> ObserveMemo:
+    """Return the process-wide ObserveMemo."""
+    global _memo
+    with _memo_lock:
+        if _memo is None:
+            _memo = ObserveMemo()
+        return _memo
@@ -1,39 +1,217 @@
 """
 Progress Tracker - Emits Real-Time Progress Events
 
-Emits progress events to in-memory queues per workflow. SSE endpoint subscribes
-and streams events to the frontend. Optional Redis backend can be added later.
+Each workflow has a bounded ring buffer of its most recent events. Every event
+gets a per-workflow sequence id, so any number of SSE subscribers can read the
+same stream, and a reconnecting client (Last-Event-ID) replays what it missed
+while the events are still buffered. Workflows nobody has emitted to or
+watched for PROGRESS_IDLE_TTL_SECONDS are evicted.
+
+Emitting is thread-safe: test executions run on queue worker threads with
+their own event loops, and subscribers on the API loop are woken through
+call_soon_threadsafe.
+
+With a pub/sub backend (PROGRESS_PUBSUB_URL, Redis), events are also published
+to other processes, so the SSE endpoint can serve workflows orchestrated by a
+different worker. The API starts the backend listener at startup, so events
+published before the first subscriber connects are already buffered for
+replay.
 
 Reference: Sprint 10 - Frontend Integration & Real-time Agent Progress
 """
-from typing import Dict, Any, Optional, AsyncIterator
+from typing import Dict, Any, Optional, AsyncIterator, Deque, Protocol, Tuple
+from collections import deque
 from datetime import datetime, timezone
 import asyncio
 import json
 import logging
+import threading
+import time
+import uuid
+import weakref
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 # Terminal event types: stream ends after these
 TERMINAL_EVENTS = frozenset({"workflow_completed", "workflow_failed"})
+TERMINAL_EXECUTION_EVENTS = frozenset({"execution_finished"})
+
+# Minimum seconds between idle-workflow sweeps
+EVICTION_INTERVAL_SECONDS = 60.0
+
+
+class ProgressBackend(Protocol):
+    """Cross-process transport for progress events."""
+
+    async def publish(self, workflow_id: str, event: Dict[str, Any]) -> None:
+        """Send one event to every other process."""
+        ...
+
+    def listen(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (workflow_id, event) for events published by any process."""
+        ...
+
+
+class RedisProgressBackend:
+    """Redis pub/sub transport: one channel per workflow ("workflow:<id>")."""
+
+    def __init__(self, redis_client=None, channel_prefix: str = "workflow:", url: Optional[str] = None):
+        self.redis = redis_client
+        self.channel_prefix = channel_prefix
+        self.url = url
+        # redis.asyncio connections belong to the loop that opened them
+        self._clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def from_url(cls, url: str, channel_prefix: str = "workflow:") -> "RedisProgressBackend":
+        import redis.asyncio  # noqa: F401  Optional dependency (pip install redis)
+        return cls(channel_prefix=channel_prefix, url=url)
+
+    def _client(self):
+        """Client for the running loop (one per loop when built from a URL)."""
+        if self.redis is not None:
+            return self.redis
+        import redis.asyncio as redis
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = redis.from_url(self.url)
+        return client
+
+    async def publish(self, workflow_id: str, event: Dict[str, Any]) -> None:
+        await self._client().publish(f"{self.channel_prefix}{workflow_id}", json.dumps(event, default=str))
+
+    async def listen(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        pubsub = self._client().pubsub()
+        await pubsub.psubscribe(f"{self.channel_prefix}*")
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "pmessage":
+                    continue
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                yield channel[len(self.channel_prefix):], json.loads(message["data"])
+        finally:
+            await pubsub.punsubscribe()
+            await pubsub.close()
+
+
+class _WorkflowChannel:
+    """Ring buffer of one workflow's events plus the subscribers waiting on it."""
+
+    def __init__(self, buffer_size: int):
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=buffer_size)
+        self.next_id = 1
+        self.last_activity = time.monotonic()
+        self.waiters: Dict[asyncio.Event, asyncio.AbstractEventLoop] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self.waiters)
+
+    def new_event(self, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create, number and append a locally emitted event."""
+        with self._lock:
+            event = {
+                "id": self.next_id,
+                "event": event_type,
+                "data": data,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+            self._append(event)
+        self._wake()
+        return event
+
+    def append(self, event: Dict[str, Any]) -> bool:
+        """Append an already numbered (remote) event unless it is a duplicate."""
+        with self._lock:
+            if event.get("id", 0) < self.next_id:
+                return False
+            self._append(event)
+        self._wake()
+        return True
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+        self.next_id = max(self.next_id, event["id"] + 1)
+        self.last_activity = time.monotonic()
+
+    def _wake(self) -> None:
+        for waiter, loop in list(self.waiters.items()):
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:  # Subscriber's loop already closed
+                self.waiters.pop(waiter, None)
+
+    def after(self, last_event_id: int) -> list:
+        """Buffered events newer than last_event_id (oldest first)."""
+        with self._lock:
+            return [event for event in self.events if event["id"] > last_event_id]
 
 
 class ProgressTracker:
     """
-    Emits real-time progress events. In-memory: each workflow_id has an asyncio.Queue.
-    SSE endpoint subscribes to the queue and streams to clients.
+    Emits real-time progress events into per-workflow ring buffers.
+    SSE endpoints subscribe (optionally resuming after a Last-Event-ID) and
+    stream to clients; several subscribers can follow one workflow.
     """
 
-    def __init__(self, redis_client=None):
-        self.redis = redis_client
-        self._queues: Dict[str, asyncio.Queue] = {}
-        self._lock = asyncio.Lock()
+    def __init__(
+        self,
+        redis_client=None,
+        *,
+        backend: Optional[ProgressBackend] = None,
+        buffer_size: Optional[int] = None,
+        idle_ttl_seconds: Optional[float] = None,
+        terminal_events: frozenset = TERMINAL_EVENTS,
+    ):
+        if backend is None and redis_client is not None:
+            backend = RedisProgressBackend(redis_client)
+        self.backend = backend
+        self.buffer_size = buffer_size or settings.PROGRESS_BUFFER_SIZE
+        self.idle_ttl_seconds = (
+            idle_ttl_seconds if idle_ttl_seconds is not None else settings.PROGRESS_IDLE_TTL_SECONDS
+        )
+        self.terminal_events = terminal_events
+        self._channels: Dict[str, _WorkflowChannel] = {}
+        self._lock = threading.Lock()
+        self._origin = uuid.uuid4().hex  # Skip our own events echoed back by the backend
+        self._listener: Optional[asyncio.Task] = None
+        self._last_eviction = time.monotonic()
+
+    def _get_channel(self, workflow_id: str) -> _WorkflowChannel:
+        self._evict_idle()
+        with self._lock:
+            channel = self._channels.get(workflow_id)
+            if channel is None:
+                channel = self._channels[workflow_id] = _WorkflowChannel(self.buffer_size)
+            return channel
 
-    async def _get_queue(self, workflow_id: str) -> asyncio.Queue:
-        async with self._lock:
-            if workflow_id not in self._queues:
-                self._queues[workflow_id] = asyncio.Queue()
-            return self._queues[workflow_id]
+    def has_events(self, workflow_id: str) -> bool:
+        """True if any event for this workflow is buffered in this process."""
+        with self._lock:
+            channel = self._channels.get(workflow_id)
+        return bool(channel and channel.events)
+
+    def _evict_idle(self, force: bool = False) -> None:
+        """Drop workflows with no subscribers and no events for idle_ttl_seconds."""
+        now = time.monotonic()
+        if not force and now - self._last_eviction < EVICTION_INTERVAL_SECONDS:
+            return
+        self._last_eviction = now
+        with self._lock:
+            idle = [
+                workflow_id for workflow_id, channel in self._channels.items()
+                if not channel.subscribers and now - channel.last_activity >= self.idle_ttl_seconds
+            ]
+            for workflow_id in idle:
+                del self._channels[workflow_id]
+        if idle:
+            logger.debug("ProgressTracker evicted %d idle workflow(s)", len(idle))
 
     async def emit(
         self,
@@ -42,63 +220,149 @@ class ProgressTracker:
         data: Dict[str, Any],
     ) -> None:
         """
-        Emit a progress event. Events are queued for subscribers (e.g. SSE endpoint).
+        Emit a progress event. Events are buffered for subscribers (e.g. SSE endpoint).
         """
-        event = {
-            "event": event_type,
-            "data": data,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
-        logger.debug("ProgressTracker.emit: workflow=%s event=%s", workflow_id, event_type)
-        queue = await self._get_queue(workflow_id)
-        await queue.put(event)
-        if self.redis:
+        event = self._get_channel(workflow_id).new_event(event_type, data)
+        logger.debug("ProgressTracker.emit: workflow=%s event=%s id=%s", workflow_id, event_type, event["id"])
+        if self.backend:
             try:
-                await self.redis.publish(
-                    f"workflow:{workflow_id}",
-                    json.dumps(event),
-                )
+                await self.backend.publish(workflow_id, {**event, "origin": self._origin})
             except Exception as e:
-                logger.warning("Redis publish failed: %s", e)
+                logger.warning("Progress backend publish failed: %s", e)
 
     async def subscribe(
         self,
         workflow_id: str,
         *,
+        last_event_id: int = 0,
         timeout_seconds: float = 300.0,
         keepalive_interval: float = 15.0,
     ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Subscribe to workflow events. Yields event dicts until workflow_completed,
-        workflow_failed, or timeout. Yields _keepalive when idle for keepalive_interval.
+        Subscribe to workflow events. Replays buffered events newer than
+        last_event_id, then yields new ones until workflow_completed,
+        workflow_failed, or timeout. Yields _keepalive when idle for
+        keepalive_interval.
         """
-        queue = await self._get_queue(workflow_id)
+        self._ensure_listener()
+        channel = self._get_channel(workflow_id)
+        waiter = asyncio.Event()
+        channel.waiters[waiter] = asyncio.get_running_loop()
+        # An id from before a server restart would hide every new event
+        cursor = last_event_id if last_event_id < channel.next_id else 0
         start = asyncio.get_event_loop().time()
+        try:
+            while True:
+                waiter.clear()
+                pending = channel.after(cursor)
+                if pending and pending[0]["id"] > cursor + 1 and cursor:
+                    logger.info(
+                        "ProgressTracker replay gap workflow=%s: events %d-%d no longer buffered",
+                        workflow_id, cursor + 1, pending[0]["id"] - 1,
+                    )
+                for event in pending:
+                    cursor = event["id"]
+                    yield event
+                    if event.get("event") in self.terminal_events:
+                        return
+                if pending:
+                    continue
+                try:
+                    await asyncio.wait_for(waiter.wait(), timeout=keepalive_interval)
+                except asyncio.TimeoutError:
+                    if asyncio.get_event_loop().time() - start >= timeout_seconds:
+                        logger.info("ProgressTracker subscribe timeout workflow=%s", workflow_id)
+                        return
+                    yield {"event": "_keepalive", "data": {}, "timestamp": datetime.now(timezone.utc).isoformat()}
+        finally:
+            channel.waiters.pop(waiter, None)
+            channel.last_activity = time.monotonic()
+
+    async def cleanup(self, workflow_id: str) -> None:
+        """Drop a workflow's buffer now (idle workflows are otherwise evicted automatically)."""
+        with self._lock:
+            self._channels.pop(workflow_id, None)
+
+    # ------------------------------------------------------------------
+    # Cross-process delivery
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start buffering backend events now (app startup), not at the first subscribe."""
+        self._ensure_listener()
+
+    def _ensure_listener(self) -> None:
+        """Start feeding backend events into local buffers (no-op if already running)."""
+        if self.backend is None or (self._listener is not None and not self._listener.done()):
+            return
+        self._listener = asyncio.create_task(self._consume_backend())
+
+    async def _consume_backend(self) -> None:
         while True:
             try:
-                event = await asyncio.wait_for(queue.get(), timeout=keepalive_interval)
-            except asyncio.TimeoutError:
-                if asyncio.get_event_loop().time() - start >= timeout_seconds:
-                    logger.info("ProgressTracker subscribe timeout workflow=%s", workflow_id)
-                    break
-                yield {"event": "_keepalive", "data": {}, "timestamp": datetime.now(timezone.utc).isoformat()}
-                continue
-            yield event
-            if event.get("event") in TERMINAL_EVENTS:
-                break
+                async for workflow_id, event in self.backend.listen():
+                    if event.pop("origin", None) == self._origin:
+                        continue
+                    self._get_channel(workflow_id).append(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Progress backend listener failed: %s; retrying", e)
+                await asyncio.sleep(1.0)
 
-    async def cleanup(self, workflow_id: str) -> None:
-        """Remove queue for workflow (call after stream ends to free memory)."""
-        async with self._lock:
-            self._queues.pop(workflow_id, None)
+    async def close(self) -> None:
+        """Stop the backend listener (app shutdown)."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+
+
+def format_sse(event_type: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Format one SSE message: optional id + event type + data line + double newline."""
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def parse_last_event_id(value: Optional[str]) -> int:
+    """Last-Event-ID as an int (0 = from the start of the buffer)."""
+    try:
+        return max(0, int(value)) if value else 0
+    except ValueError:
+        return 0
+
+
+def _configured_backend(channel_prefix: str) -> Optional[ProgressBackend]:
+    if not settings.PROGRESS_PUBSUB_URL:
+        return None
+    try:
+        return RedisProgressBackend.from_url(settings.PROGRESS_PUBSUB_URL, channel_prefix=channel_prefix)
+    except Exception as e:
+        logger.warning("Progress pub/sub backend unavailable (%s); using in-process events only", e)
+        return None
 
 
 _tracker: Optional[ProgressTracker] = None
+_execution_tracker: Optional[ProgressTracker] = None
 
 
 def get_progress_tracker() -> ProgressTracker:
     """Return singleton ProgressTracker (shared by orchestration and SSE)."""
     global _tracker
     if _tracker is None:
-        _tracker = ProgressTracker()
+        _tracker = ProgressTracker(backend=_configured_backend("workflow:"))
     return _tracker
+
+
+def get_execution_progress_tracker() -> ProgressTracker:
+    """Return the ProgressTracker for v1 test executions, keyed by str(execution_id)."""
+    global _execution_tracker
+    if _execution_tracker is None:
+        _execution_tracker = ProgressTracker(
+            backend=_configured_backend("execution:"),
+            terminal_events=TERMINAL_EXECUTION_EVENTS,
+        )
+    return _execution_tracker
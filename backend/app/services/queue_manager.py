@@ -7,10 +7,12 @@ import threading
 import time
 import logging
 import json
-from typing import Optional
+from collections import deque
+from typing import Deque, Optional
 from datetime import datetime
 
 from app.services.execution_queue import get_execution_queue, QueuedExecution
+from app.services.browser_pool import get_browser_pool, shutdown_browser_pool
 from app.services.stagehand_factory import get_stagehand_adapter
 from app.services.stagehand_adapter import StagehandAdapter
 from app.db.session import SessionLocal
@@ -18,9 +20,14 @@ from app.crud import test_execution as crud_execution
 from app.crud import test_case as crud_test
 from app.crud import browser_profile as crud_profile
 from app.models.test_execution import ExecutionStatus
+from app.core.config import settings
+from app.services.execution_progress import execution_progress_callback
 
 logger = logging.getLogger(__name__)
 
+# Number of recent dispatches kept for latency percentiles
+DISPATCH_LATENCY_SAMPLES = 500
+
 
 class QueueManager:
     """
@@ -39,14 +46,26 @@ class QueueManager:
         
         Args:
             max_concurrent: Maximum concurrent executions
-            check_interval: How often to check queue (seconds)
+            check_interval: Fallback wake-up interval in seconds; dispatch is
+                normally triggered immediately by enqueue/completion events
         """
         self.max_concurrent = max_concurrent
         self.check_interval = check_interval
         self.queue = get_execution_queue(max_concurrent=max_concurrent)
+        self.browser_pool = None
+        if settings.BROWSER_POOL_ENABLED:
+            self.browser_pool = get_browser_pool(
+                size=settings.BROWSER_POOL_SIZE or max_concurrent,
+                max_uses=settings.BROWSER_POOL_MAX_USES,
+                max_rss_mb=settings.BROWSER_POOL_MAX_RSS_MB,
+            )
         self._running = False
         self._worker_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        # Recent enqueue-to-start latencies (seconds) for the dispatch metric
+        self._stats_lock = threading.Lock()
+        self._dispatch_latencies: Deque[float] = deque(maxlen=DISPATCH_LATENCY_SAMPLES)
+        self._dispatch_count = 0
         
         logger.info(
             f"QueueManager initialized: max_concurrent={max_concurrent}, "
@@ -74,6 +93,7 @@ class QueueManager:
         
         self._running = False
         self._stop_event.set()
+        self.queue.wake()
         
         if self._worker_thread:
             self._worker_thread.join(timeout=5)
@@ -81,35 +101,63 @@ class QueueManager:
         logger.info("QueueManager worker stopped")
     
     def _process_queue_loop(self):
-        """Main queue processing loop (runs in background thread)."""
+        """
+        Main queue dispatch loop (runs in background thread).
+        
+        Sleeps until ExecutionQueue signals an enqueue or a freed slot, then
+        fills every free slot in one pass. check_interval is only a safety-net
+        wake-up in case a signal is ever missed.
+        """
         logger.info("Queue processing loop started")
         
         while self._running and not self._stop_event.is_set():
             try:
-                self._check_and_start_next()
+                self._dispatch_available()
             except Exception as e:
                 logger.error(f"Error in queue processing loop: {e}", exc_info=True)
             
-            # Wait before next check
-            self._stop_event.wait(self.check_interval)
+            # Wait for the next enqueue / completion (or the fallback interval)
+            self.queue.wait_for_changes(timeout=self.check_interval)
         
         logger.info("Queue processing loop stopped")
     
-    def _check_and_start_next(self):
-        """Check if we can start next execution and do so if possible."""
+    def _dispatch_available(self) -> int:
+        """
+        Start queued executions until the queue is empty or all slots are busy.
+        
+        Returns:
+            Number of executions started
+        """
+        started = 0
+        while self._running:
+            outcome = self._check_and_start_next()
+            if outcome is None:
+                break
+            if outcome:
+                started += 1
+        return started
+    
+    def _check_and_start_next(self) -> Optional[bool]:
+        """
+        Check if we can start next execution and do so if possible.
+        
+        Returns:
+            True if an execution was started, False if one was dequeued but not
+            started (cancelled or re-queued), None if there was nothing to do
+        """
         # Check if we're under the concurrent limit
         if not self.queue.is_under_limit():
             logger.debug(
                 f"At concurrent limit ({self.queue.get_active_count()}/{self.max_concurrent}), "
                 "waiting for executions to complete"
             )
-            return
+            return None
         
         # Get next execution from queue
         queued_execution = self.queue.get_next_execution()
         if not queued_execution:
             logger.debug("Queue is empty, nothing to start")
-            return
+            return None
 
         # Pre-start guard: skip executions cancelled while still queued
         db = SessionLocal()
@@ -117,7 +165,7 @@ class QueueManager:
             execution = crud_execution.get_execution(db, queued_execution.execution_id)
             if execution and execution.status == ExecutionStatus.CANCELLED:
                 logger.info(f"Skipping cancelled execution {execution.id}")
-                return
+                return False
         finally:
             db.close()
         
@@ -133,12 +181,55 @@ class QueueManager:
                 queued_execution.test_case_id,
                 queued_execution.user_id,
                 queued_execution.priority,
-                http_credentials=queued_execution.http_credentials
+                http_credentials=queued_execution.http_credentials,
+                login_credentials=queued_execution.login_credentials,
+                queued_at=queued_execution.queued_at,
             )
-            return
+            return None
+        
+        self._record_dispatch_latency(queued_execution)
         
         # Start execution in background
         self._start_execution_async(queued_execution)
+        return True
+    
+    def _record_dispatch_latency(self, queued_execution: QueuedExecution):
+        """Record enqueue-to-start latency for a dispatched execution."""
+        latency = (datetime.utcnow() - queued_execution.queued_at).total_seconds()
+        with self._stats_lock:
+            self._dispatch_latencies.append(latency)
+            self._dispatch_count += 1
+        logger.info(
+            f"Dispatching execution {queued_execution.execution_id} "
+            f"(dispatch latency {latency * 1000:.0f}ms)"
+        )
+    
+    def get_dispatch_latency_stats(self) -> dict:
+        """
+        Get enqueue-to-start latency statistics over recent dispatches.
+        
+        Returns:
+            Dictionary with count and latency figures in milliseconds
+        """
+        with self._stats_lock:
+            samples = sorted(self._dispatch_latencies)
+            total = self._dispatch_count
+        
+        if not samples:
+            return {"total_dispatched": total, "sample_size": 0}
+        
+        def percentile(p: float) -> float:
+            idx = min(len(samples) - 1, int(round(p * (len(samples) - 1))))
+            return round(samples[idx] * 1000, 1)
+        
+        return {
+            "total_dispatched": total,
+            "sample_size": len(samples),
+            "avg_ms": round(sum(samples) / len(samples) * 1000, 1),
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(samples[-1] * 1000, 1),
+        }
     
     def _start_execution_async(self, queued_execution: QueuedExecution):
         """
@@ -249,13 +340,30 @@ class QueueManager:
                             timeout=30000  # 30 seconds
                         )
                         
+                        # Lease a warm browser from the pool (Chromium only; Stagehand
+                        # needs CDP). Pooled Playwright objects are bound to the lease's
+                        # own event loop, so all coroutines for this run go through it.
+                        lease = None
+                        run_coro = loop.run_until_complete
+                        if self.browser_pool and exec_config.browser == "chromium":
+                            try:
+                                lease = self.browser_pool.acquire(
+                                    headless=exec_config.headless,
+                                    slow_mo=exec_config.slow_mo,
+                                )
+                                run_coro = lease.run
+                            except Exception as e:
+                                logger.warning(
+                                    f"Browser pool lease failed, falling back to cold launch: {e}"
+                                )
+
                         # Create ExecutionService with config
-                        service = ExecutionService(config=exec_config)
+                        service = ExecutionService(config=exec_config, browser_lease=lease)
                         
                         # No separate initialize() call needed - ExecutionService handles it internally
                         
                         try:
-                            loop.run_until_complete(
+                            run_coro(
                                 service.execute_test(
                                     db=bg_db,
                                     test_case=test_case,
@@ -268,6 +376,7 @@ class QueueManager:
                                     resume_from_execution_id=resume_from_execution_id,
                                     start_from_step=start_from_step,
                                     login_credentials=login_credentials,
+                                    progress_callback=execution_progress_callback(queued_execution.execution_id),
                                 )
                             )
 
@@ -279,7 +388,7 @@ class QueueManager:
                                 )
                                 if profile and profile.auto_sync:
                                     try:
-                                        session_snapshot = loop.run_until_complete(
+                                        session_snapshot = run_coro(
                                             service.export_profile_session()
                                         )
                                         if session_snapshot:
@@ -298,9 +407,11 @@ class QueueManager:
                         finally:
                             # Always clean up Stagehand/Playwright resources
                             try:
-                                loop.run_until_complete(service.cleanup())
+                                run_coro(service.cleanup())
                             except Exception as e:
                                 logger.warning(f"Error cleaning up Stagehand: {e}")
+                            if lease is not None:
+                                self.browser_pool.release(lease)
                         
                     except Exception as e:
                         logger.error(
@@ -312,6 +423,12 @@ class QueueManager:
                         bg_db.close()
                         ThreadSession.remove()
                 finally:
+                    # Close LLM connection pools bound to this run's loop
+                    try:
+                        from llm.client_factory import aclose_async_clients
+                        loop.run_until_complete(aclose_async_clients())
+                    except Exception as e:
+                        logger.debug(f"Error closing LLM connection pools: {e}")
                     loop.close()
             finally:
                 # Restore original signal handler
@@ -342,7 +459,9 @@ class QueueManager:
             "is_running": self._running,
             "max_concurrent": self.max_concurrent,
             "check_interval": self.check_interval,
-            "queue_status": self.queue.get_queue_status()
+            "queue_status": self.queue.get_queue_status(),
+            "dispatch_latency": self.get_dispatch_latency_stats(),
+            "browser_pool": self.browser_pool.get_statistics() if self.browser_pool else None
         }
 
 
@@ -370,9 +489,12 @@ def get_queue_manager(max_concurrent: int = 5, check_interval: int = 2) -> Queue
                 max_concurrent=max_concurrent,
                 check_interval=check_interval
             )
-            # Auto-start the queue manager
-            _manager_instance.start()
-            logger.info("Created and started global QueueManager instance")
+            # Auto-start unless executions run in separate app.worker processes
+            if settings.RUN_QUEUE_WORKER_IN_API:
+                _manager_instance.start()
+                logger.info("Created and started global QueueManager instance")
+            else:
+                logger.info("Created global QueueManager instance (dispatch disabled in API)")
         
         return _manager_instance
 
@@ -399,3 +521,5 @@ def stop_queue_manager():
         _manager_instance.stop()
         logger.info("Stopped QueueManager")
 
+    shutdown_browser_pool()
+
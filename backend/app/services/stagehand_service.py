@@ -25,7 +25,12 @@ from app.services.otp_source_router import fetch_otp_and_format_steps
 from app.services.encryption_service import EncryptionService
 from app.services.step_module_resolver import resolve_steps
 from app.core.config import settings
-from app.utils.llm_execution_context import llm_exec_ctx
+from app.utils.llm_execution_context import (
+    LLM_CALL_CANCELLED,
+    estimate_prompt_tokens,
+    llm_exec_ctx,
+    record_llm_usage,
+)
 from app.utils.llm_response_logger import (
     build_prompt_preview,
     extract_thinking_from_response,
@@ -147,6 +152,11 @@ class StagehandExecutionService:
                 prompt_tokens = usage.get("prompt_tokens")
                 completion_tokens = usage.get("completion_tokens")
                 total_tokens = usage.get("total_tokens")
+            if not response_dict and error == LLM_CALL_CANCELLED:
+                # Cut off mid-request: no usage report, but the prompt was sent
+                record_llm_usage(estimate_prompt_tokens(messages), 0, None)
+            else:
+                record_llm_usage(prompt_tokens, completion_tokens, total_tokens)
 
             caller_suffix = (function_name or "agent").lower()
             entry = {
@@ -195,6 +205,9 @@ class StagehandExecutionService:
                     **kwargs,
                 )
                 return response
+            except asyncio.CancelledError:
+                error = LLM_CALL_CANCELLED
+                raise
             except Exception as exc:
                 error = str(exc)
                 raise
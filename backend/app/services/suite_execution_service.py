@@ -1,19 +1,43 @@
 """
 Service for executing test suites
+
+Suite runs enqueue their tests on the shared execution queue and wait for
+finish notifications from it (ExecutionQueue.add_finish_listener) instead of
+polling each execution. Parallel runs keep up to max_parallel tests of the
+suite queued or running at once; sequential runs are the same scheduler with
+a cap of one. A test starts only after every test listed in its item's
+depends_on has passed.
 """
 import asyncio
 import json
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 from sqlalchemy.orm import Session
 
 from app.crud import crud_test_suite
 from app.crud import test_case as crud_test_case
 from app.crud import test_execution as crud_executions
 from app.services.execution_queue import get_execution_queue
-from app.models.test_execution import ExecutionStatus
+from app.models.test_execution import ExecutionResult, ExecutionStatus, TestExecution
 from app.schemas.test_suite import SuiteExecutionResponse
 
+# Give up on outstanding tests when none of them finished for this long
+TEST_TIMEOUT_SECONDS = 600
+# Safety-net status poll while waiting on in-process finish notifications
+RECONCILE_INTERVAL_SECONDS = 30
+
+FINISHED_STATUSES = (ExecutionStatus.COMPLETED, ExecutionStatus.FAILED, ExecutionStatus.CANCELLED)
+
+
+@dataclass
+class SuiteRunOutcome:
+    """Result of scheduling a suite's tests."""
+    execution_ids: List[int] = field(default_factory=list)
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+
 
 async def execute_test_suite(
     db: Session,
@@ -22,7 +46,8 @@ async def execute_test_suite(
     browser: str,
     environment: str,
     stop_on_failure: bool,
-    parallel: bool
+    parallel: bool,
+    max_parallel: Optional[int] = None
 ) -> SuiteExecutionResponse:
     """
     Execute all tests in a suite.
@@ -33,8 +58,10 @@ async def execute_test_suite(
         user_id: User ID
         browser: Browser to use (chromium, firefox, webkit)
         environment: Environment (dev, staging, prod)
-        stop_on_failure: Stop executing if a test fails
-        parallel: Run tests in parallel (not yet implemented)
+        stop_on_failure: Stop executing if a test fails (queued siblings are cancelled)
+        parallel: Queue every runnable test at once instead of one at a time
+        max_parallel: Cap on this suite's queued + running tests when parallel
+            (default: no cap, the queue's MAX_CONCURRENT_EXECUTIONS applies)
     
     Returns:
         SuiteExecutionResponse with suite_execution_id and list of test_execution_ids
@@ -58,10 +85,10 @@ async def execute_test_suite(
     
     # Get test cases in execution order
     ordered_items = sorted(suite.items, key=lambda x: x.execution_order)
-    test_case_ids = [item.test_case_id for item in ordered_items]
-    
-    # Start executing tests
-    queued_executions: List[int] = []
+    if parallel:
+        limit = max_parallel or max(len(ordered_items), 1)
+    else:
+        limit = 1
     
     try:
         # Update suite execution status
@@ -71,37 +98,17 @@ async def execute_test_suite(
             started_at=datetime.utcnow()
         )
         
-        if parallel:
-            # TODO: Implement parallel execution
-            # For now, fall back to sequential
-            queued_executions = await _execute_sequential(
-                db, test_case_ids, browser, environment, stop_on_failure, user_id
-            )
-        else:
-            # Sequential execution
-            queued_executions = await _execute_sequential(
-                db, test_case_ids, browser, environment, stop_on_failure, user_id
-            )
-        
-        # Update suite execution with test results
-        # Count passed/failed tests
-        passed_count = 0
-        failed_count = 0
-        
-        for exec_id in queued_executions:
-            execution = crud_executions.get_execution(db, exec_id)
-            if execution:
-                if execution.status == ExecutionStatus.COMPLETED:
-                    passed_count += 1
-                elif execution.status == ExecutionStatus.FAILED:
-                    failed_count += 1
+        outcome = await _run_suite(
+            db, ordered_items, browser, environment, stop_on_failure, user_id, limit
+        )
         
         crud_test_suite.update_suite_execution(
             db, suite_execution.id,
             status="completed",
             completed_at=datetime.utcnow(),
-            passed_tests=passed_count,
-            failed_tests=failed_count
+            passed_tests=outcome.passed,
+            failed_tests=outcome.failed,
+            skipped_tests=outcome.skipped
         )
         
     except Exception as e:
@@ -117,112 +124,277 @@ async def execute_test_suite(
         id=suite_execution.id,
         suite_id=suite_execution.suite_id,
         status=suite_execution.status,
-        message=f"Suite execution started. {len(queued_executions)} tests queued.",
+        message=(
+            f"Suite execution finished. {len(outcome.execution_ids)} tests queued: "
+            f"{outcome.passed} passed, {outcome.failed} failed, {outcome.skipped} skipped."
+        ),
         total_tests=suite_execution.total_tests,
-        queued_executions=queued_executions
+        queued_executions=outcome.execution_ids
     )
 
 
-async def _execute_sequential(
+async def _run_suite(
     db: Session,
-    test_case_ids: List[int],
+    items: list,
     browser: str,
     environment: str,
     stop_on_failure: bool,
-    user_id: int = 1
-) -> List[int]:
+    user_id: int,
+    max_parallel: int
+) -> SuiteRunOutcome:
     """
-    Execute tests sequentially by queuing them one at a time.
+    Schedule suite items on the execution queue.
     
-    Note: Shared browser session approach doesn't work in FastAPI main thread
-    due to Windows subprocess limitations. Using queue-based approach instead.
-    """
-    from app.crud import test_case as crud_test_case
+    Keeps up to max_parallel items queued or running, in execution order,
+    starting an item only once all of its dependencies passed. Items whose
+    dependency failed, was skipped, or that sit in a dependency cycle are
+    skipped. On a failure with stop_on_failure nothing new is queued and
+    still-queued siblings are cancelled; running ones are left to finish.
     
-    queued_executions = []
+    Args:
+        items: Suite items sorted by execution_order
+        max_parallel: Maximum items of this suite queued or running at once
+    
+    Returns:
+        SuiteRunOutcome with every created execution id and the result counts
+    """
     queue = get_execution_queue()
+    outcome = SuiteRunOutcome()
     
-    for index, test_case_id in enumerate(test_case_ids):
-        try:
-            # Get the test case
-            test_case = crud_test_case.get_test_case(db, test_case_id)
-            if not test_case:
-                print(f"[SUITE] Warning: Test case {test_case_id} not found, skipping")
-                continue
-            
-            # Extract base_url from test case
-            base_url = _extract_base_url(test_case)
-            print(f"[SUITE] Test {index + 1}/{len(test_case_ids)}: #{test_case_id} - {test_case.title}")
-            
-            # Create execution record
-            execution = crud_executions.create_execution(
-                db=db,
-                test_case_id=test_case_id,
-                user_id=user_id,
-                browser=browser,
-                environment=environment,
-                base_url=base_url
-            )
+    dependencies = _item_dependencies(items)
+    remaining_per_case: Dict[int, int] = {}
+    for item in items:
+        remaining_per_case[item.test_case_id] = remaining_per_case.get(item.test_case_id, 0) + 1
+    blocked_cases: Set[int] = set()  # test cases with a run that did not pass
+    
+    def settle(item, passed: bool) -> None:
+        remaining_per_case[item.test_case_id] -= 1
+        if not passed:
+            blocked_cases.add(item.test_case_id)
+    
+    pending = list(items)
+    outstanding: Dict[int, object] = {}  # execution_id -> item
+    stopping = False
+    
+    with _CompletionWaiter(queue, db) as waiter:
+        while True:
+            if not stopping:
+                for item in list(pending):
+                    if len(outstanding) >= max_parallel:
+                        break
+                    deps = dependencies[id(item)]
+                    if deps & blocked_cases:
+                        print(f"[SUITE] Skipping test #{item.test_case_id}: a dependency did not pass")
+                        pending.remove(item)
+                        outcome.skipped += 1
+                        settle(item, passed=False)
+                        continue
+                    if any(remaining_per_case[dep] for dep in deps):
+                        continue
+                    
+                    pending.remove(item)
+                    execution_id = _enqueue_test(db, queue, item.test_case_id, browser, environment, user_id)
+                    if execution_id is None:
+                        outcome.skipped += 1
+                        settle(item, passed=False)
+                        continue
+                    outcome.execution_ids.append(execution_id)
+                    outstanding[execution_id] = item
             
-            # Set queued status
-            execution.queued_at = datetime.utcnow()
-            execution.priority = 5  # Medium priority
-            execution.status = ExecutionStatus.PENDING
-            db.commit()
-            db.refresh(execution)
+            if not outstanding:
+                for item in pending:
+                    print(f"[SUITE] Skipping test #{item.test_case_id}: dependencies can never be satisfied")
+                outcome.skipped += len(pending)
+                break
             
-            # Add to execution queue
-            queue_position = queue.add_to_queue(
-                execution_id=execution.id,
-                test_case_id=test_case_id,
-                user_id=user_id,
-                priority=execution.priority
-            )
+            finished = await waiter.wait(set(outstanding), TEST_TIMEOUT_SECONDS)
+            if not finished:
+                print(
+                    f"[SUITE] No test finished within {TEST_TIMEOUT_SECONDS}s; "
+                    f"giving up on executions {sorted(outstanding)}"
+                )
+                finished = {execution_id: (None, None) for execution_id in outstanding}
             
-            # Update queue position
-            execution.queue_position = queue_position
-            db.commit()
+            for execution_id, (status, result) in finished.items():
+                item = outstanding.pop(execution_id)
+                passed = status == ExecutionStatus.COMPLETED and result == ExecutionResult.PASS
+                print(f"[SUITE] Execution {execution_id} (test #{item.test_case_id}) finished with status: {status}")
+                if status == ExecutionStatus.CANCELLED:
+                    outcome.skipped += 1
+                elif passed:
+                    outcome.passed += 1
+                else:
+                    outcome.failed += 1
+                settle(item, passed)
+                
+                if not passed and stop_on_failure and not stopping:
+                    print(f"[SUITE] Stopping suite execution due to test failure (stop_on_failure=True)")
+                    stopping = True
             
-            queued_executions.append(execution.id)
+            if stopping:
+                outcome.skipped += len(pending)
+                pending.clear()
+                for execution_id in list(outstanding):
+                    if queue.remove_from_queue(execution_id):
+                        crud_executions.cancel_execution(db, execution_id)
+                        outstanding.pop(execution_id)
+                        outcome.skipped += 1
+                        print(f"[SUITE] Cancelled queued execution {execution_id}")
+    
+    return outcome
+
+
+def _item_dependencies(items: list) -> Dict[int, Set[int]]:
+    """Map id(item) -> test_case_ids it waits for (only ids present in the suite)."""
+    suite_cases = {item.test_case_id for item in items}
+    dependencies = {}
+    for item in items:
+        declared = set(item.depends_on or [])
+        unknown = declared - suite_cases
+        if unknown:
+            print(f"[SUITE] Warning: test #{item.test_case_id} depends on tests outside the suite {sorted(unknown)}, ignoring them")
+        dependencies[id(item)] = (declared & suite_cases) - {item.test_case_id}
+    return dependencies
+
+
+def _enqueue_test(
+    db: Session,
+    queue,
+    test_case_id: int,
+    browser: str,
+    environment: str,
+    user_id: int
+) -> Optional[int]:
+    """Create a pending execution for a test case and queue it. Returns its id."""
+    try:
+        test_case = crud_test_case.get_test_case(db, test_case_id)
+        if not test_case:
+            print(f"[SUITE] Warning: Test case {test_case_id} not found, skipping")
+            return None
+        
+        # Extract base_url from test case
+        base_url = _extract_base_url(test_case)
+        print(f"[SUITE] Queuing test #{test_case_id} - {test_case.title}")
+        
+        # Create execution record
+        execution = crud_executions.create_execution(
+            db=db,
+            test_case_id=test_case_id,
+            user_id=user_id,
+            browser=browser,
+            environment=environment,
+            base_url=base_url
+        )
+        
+        # Set queued status
+        execution.queued_at = datetime.utcnow()
+        execution.priority = 5  # Medium priority
+        execution.status = ExecutionStatus.PENDING
+        db.commit()
+        db.refresh(execution)
+        
+        # Add to execution queue
+        queue_position = queue.add_to_queue(
+            execution_id=execution.id,
+            test_case_id=test_case_id,
+            user_id=user_id,
+            priority=execution.priority
+        )
+        
+        # Update queue position
+        execution.queue_position = queue_position
+        db.commit()
+        return execution.id
+    except Exception as e:
+        print(f"[SUITE] Error queuing test {test_case_id}: {e}")
+        db.rollback()
+        return None
+
+
+class _CompletionWaiter:
+    """
+    Waits for queued executions to finish.
+    
+    Finish notifications arrive on worker threads and are handed to the event
+    loop. Statuses are read in one query per wake-up; when no notification
+    arrives the outstanding executions are polled every reconcile interval
+    (QUEUE_CHECK_INTERVAL with the database queue, whose other worker
+    processes cannot notify this one).
+    """
+    
+    def __init__(self, queue, db: Session):
+        self._queue = queue
+        self._db = db
+        self._loop = asyncio.get_running_loop()
+        self._events: asyncio.Queue = asyncio.Queue()
+        self._notified: Set[int] = set()
+        self._reconcile_interval = _reconcile_interval()
+    
+    def __enter__(self) -> "_CompletionWaiter":
+        self._queue.add_finish_listener(self._on_finished)
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._queue.remove_finish_listener(self._on_finished)
+    
+    def _on_finished(self, execution_id: int) -> None:
+        # Called from queue worker threads
+        try:
+            self._loop.call_soon_threadsafe(self._events.put_nowait, execution_id)
+        except RuntimeError:
+            pass  # Event loop already closed
+    
+    async def wait(
+        self, outstanding: Set[int], timeout: float
+    ) -> Dict[int, Tuple[Optional[ExecutionStatus], Optional[ExecutionResult]]]:
+        """
+        Wait until at least one outstanding execution finished.
+        
+        Returns:
+            execution_id -> (status, result) for every finished one; empty on timeout.
+            An execution released by its worker without a final status is
+            reported with its current (non-final) status.
+        """
+        deadline = self._loop.time() + timeout
+        while True:
+            while not self._events.empty():
+                self._notified.add(self._events.get_nowait())
             
-            # For sequential execution, wait for this test to complete before queuing the next
-            is_last_test = (index == len(test_case_ids) - 1)
+            if not (self._notified & outstanding):
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    return {}
+                try:
+                    execution_id = await asyncio.wait_for(
+                        self._events.get(), min(remaining, self._reconcile_interval)
+                    )
+                    self._notified.add(execution_id)
+                    continue
+                except asyncio.TimeoutError:
+                    pass  # Reconcile by polling
             
-            if not is_last_test:
-                print(f"[SUITE] Waiting for execution {execution.id} (test {index + 1}/{len(test_case_ids)}) to complete...")
-                max_wait_time = 600  # 10 minutes max per test
-                wait_interval = 2  # Check every 2 seconds
-                elapsed = 0
-                
-                while elapsed < max_wait_time:
-                    await asyncio.sleep(wait_interval)
-                    elapsed += wait_interval
-                    
-                    # Refresh execution status
-                    db.refresh(execution)
-                    
-                    if execution.status in [ExecutionStatus.COMPLETED, ExecutionStatus.FAILED, ExecutionStatus.CANCELLED]:
-                        print(f"[SUITE] Execution {execution.id} finished with status: {execution.status}")
-                        
-                        # If stop_on_failure is True and test failed, stop queuing more tests
-                        if stop_on_failure and execution.status != ExecutionStatus.COMPLETED:
-                            print(f"[SUITE] Stopping suite execution due to test failure (stop_on_failure=True)")
-                            break
-                        
-                        # Continue to next test
-                        break
-                
-                if elapsed >= max_wait_time:
-                    print(f"[SUITE] Execution {execution.id} timed out after {max_wait_time}s")
-                    if stop_on_failure:
-                        break
-                    
-        except Exception as e:
-            print(f"[SUITE] Error executing test {test_case_id}: {e}")
-            if stop_on_failure:
-                break
+            finished = {
+                execution_id: (status, result)
+                for execution_id, status, result in self._statuses(outstanding)
+                if status in FINISHED_STATUSES or execution_id in self._notified
+            }
+            if finished:
+                self._notified -= set(finished)
+                return finished
+    
+    def _statuses(self, execution_ids: Set[int]):
+        # Column query: always reads current rows instead of the identity map
+        return self._db.query(
+            TestExecution.id, TestExecution.status, TestExecution.result
+        ).filter(TestExecution.id.in_(execution_ids)).all()
+
+
+def _reconcile_interval() -> float:
+    from app.core.config import settings
     
-    return queued_executions
+    if settings.EXECUTION_QUEUE_BACKEND == "database":
+        return settings.QUEUE_CHECK_INTERVAL
+    return RECONCILE_INTERVAL_SECONDS
 
 
 def _extract_base_url(test_case) -> str:
@@ -260,18 +432,6 @@ def _extract_base_url(test_case) -> str:
     return base_url
 
 
-async def _execute_parallel(
-    db: Session,
-    test_case_ids: List[int],
-    browser: str,
-    environment: str
-) -> List[int]:
-    """Execute tests in parallel (future feature)"""
-    # For now, just call sequential execution
-    # TODO: Implement true parallel execution
-    return await _execute_sequential(db, test_case_ids, browser, environment, False)
-
-
 async def execute_test_suite_merged(
     db: Session,
     suite_id: int,
@@ -415,35 +575,26 @@ async def execute_test_suite_merged(
         db.commit()
         db.refresh(execution)
         
-        # Add to execution queue
+        # Add to execution queue (listen first so a fast finish is not missed)
         queue = get_execution_queue()
-        queue_position = queue.add_to_queue(
-            execution_id=execution.id,
-            test_case_id=merged_test.id,
-            user_id=user_id,
-            priority=execution.priority
-        )
-        
-        execution.queue_position = queue_position
-        db.commit()
-        
-        print(f"[SUITE-MERGED] Queued merged execution {execution.id} with {len(merged_steps)} steps")
-        
-        # Wait for execution to complete
-        print(f"[SUITE-MERGED] Waiting for merged execution to complete...")
-        max_wait_time = 600  # 10 minutes
-        wait_interval = 2
-        elapsed = 0
-        
-        while elapsed < max_wait_time:
-            await asyncio.sleep(wait_interval)
-            elapsed += wait_interval
+        with _CompletionWaiter(queue, db) as waiter:
+            queue_position = queue.add_to_queue(
+                execution_id=execution.id,
+                test_case_id=merged_test.id,
+                user_id=user_id,
+                priority=execution.priority
+            )
             
-            db.refresh(execution)
+            execution.queue_position = queue_position
+            db.commit()
             
-            if execution.status in [ExecutionStatus.COMPLETED, ExecutionStatus.FAILED, ExecutionStatus.CANCELLED]:
+            print(f"[SUITE-MERGED] Queued merged execution {execution.id} with {len(merged_steps)} steps")
+            
+            # Wait for execution to complete
+            print(f"[SUITE-MERGED] Waiting for merged execution to complete...")
+            if await waiter.wait({execution.id}, TEST_TIMEOUT_SECONDS):
+                db.refresh(execution)
                 print(f"[SUITE-MERGED] Execution {execution.id} finished with status: {execution.status}")
-                break
         
         # Update suite execution with results
         if execution.status == ExecutionStatus.COMPLETED:
@@ -434,6 +434,7 @@ IMPORTANT: Return ONLY valid JSON, no additional text or explanation. Do NOT abb
         max_kb_docs: int = 10,
         user_id: Optional[int] = None,
         reqiq_project_id: Optional[str] = None,
+        kb_token_budget: Optional[int] = None,
     ) -> Dict:
         """
         Generate test cases based on a requirement.
@@ -448,6 +449,9 @@ IMPORTANT: Return ONLY valid JSON, no additional text or explanation. Do NOT abb
             use_kb_context: Whether to use KB context if available
             max_kb_docs: Maximum number of KB documents to include
             user_id: Optional user ID to load generation settings from
+            reqiq_project_id: Optional ReqIQ project to pull context from first
+            kb_token_budget: Tokens the KB context may use in the prompt
+                (default: KB_CONTEXT_TOKEN_BUDGET)
             
         Returns:
             Dict with generated test cases and metadata
@@ -497,7 +501,9 @@ IMPORTANT: Return ONLY valid JSON, no additional text or explanation. Do NOT abb
                 kb_context = await self.kb_context.get_category_context(
                     db=db,
                     category_id=category_id,  # None = all categories
-                    max_docs=max_kb_docs
+                    max_docs=max_kb_docs,
+                    query=requirement,
+                    token_budget=kb_token_budget
                 )
                 if kb_context:
                     # Count documents in context
@@ -5,7 +5,7 @@ Sprint 5.5: Main execution service with Options A, B, C
 import asyncio
 import json
 import time
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Awaitable
 from playwright.async_api import Page
 from sqlalchemy.orm import Session
 from stagehand import Stagehand
@@ -21,13 +21,28 @@ from app.services.step_progress_guard import (
     should_enforce_confirm_progress,
 )
 from app.services.xpath_extractor import XPathExtractor
+from app.services.xpath_cache_service import XPathCacheService
+from app.services.xpath_fingerprint import cache_fingerprints
+from app.services.tier_router import UNROUTED_ACTIONS, TierRouter
+from app.services.tier_timeouts import get_tier_timeout_model, step_timeout_key
+from app.services.execution_write_buffer import ExecutionWriteBuffer
 from app.services.universal_llm import VisionNotSupportedError
 from app.models.execution_settings import ExecutionSettings, TierExecutionLog
 from app.schemas.execution_settings import FallbackStrategy
-from app.utils.llm_execution_context import set_llm_context, llm_exec_ctx
+from app.utils.llm_execution_context import (
+    llm_exec_ctx,
+    llm_usage_cost_usd,
+    new_llm_usage,
+    set_llm_context,
+    track_llm_usage,
+)
 
 logger = logging.getLogger(__name__)
 
+# How long a cancelled race speculation gets to unwind, so the LLM call it
+# was in can record its tokens before they are read
+SPECULATION_CANCEL_GRACE_SECONDS = 2.0
+
 
 def _check_cancelled(cancel_check: Optional[Callable[[], bool]]) -> bool:
     if callable(cancel_check):
@@ -80,6 +95,7 @@ class ThreeTierExecutionService:
     - Option A: Tier 1 → Tier 2 (Cost-conscious, 90-95% success)
     - Option B: Tier 1 → Tier 3 (AI-first, 92-94% success)
     - Option C: Tier 1 → Tier 2 → Tier 3 (Maximum reliability, 97-99% success)
+    - Race: Option C with Tier 2's XPath extracted speculatively while Tier 1 runs
     """
     
     def __init__(
@@ -89,7 +105,8 @@ class ThreeTierExecutionService:
         stagehand: Optional[Stagehand] = None,
         user_settings: Optional[ExecutionSettings] = None,
         cdp_endpoint: Optional[str] = None,
-        user_ai_config: Optional[Dict[str, Any]] = None
+        user_ai_config: Optional[Dict[str, Any]] = None,
+        write_buffer: Optional[ExecutionWriteBuffer] = None
     ):
         """
         Initialize 3-Tier execution service.
@@ -101,6 +118,7 @@ class ThreeTierExecutionService:
             user_settings: Optional user execution settings
             cdp_endpoint: Optional CDP endpoint URL to connect Stagehand to existing browser
             user_ai_config: Optional user AI provider configuration (provider, model, temperature, max_tokens)
+            write_buffer: Optional write-behind buffer for tier logs (committed inline when None)
         """
         self.db = db
         self.page = page
@@ -108,6 +126,7 @@ class ThreeTierExecutionService:
         self.user_settings = user_settings or self._get_default_settings()
         self.cdp_endpoint = cdp_endpoint  # Store CDP endpoint for shared browser context
         self.user_ai_config = user_ai_config  # Store user's AI provider config
+        self.write_buffer = write_buffer
         
         # Initialize tier executors
         timeout_ms = self.user_settings.timeout_per_tier_seconds * 1000
@@ -118,6 +137,38 @@ class ThreeTierExecutionService:
         self.tier2_executor = None
         self.tier3_executor = None
         self.xpath_extractor = None
+        # Shared with Tier 2 so entries loaded by prefetch_xpath_cache() are used
+        self.xpath_cache_service = XPathCacheService(db)
+        # Optional async callback({"step", "from_tier", "to_tier", "error"}) when a tier falls back
+        self.on_tier_fallback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+        # Starts steps past Tier 1 when tier_execution_logs show it keeps failing there
+        self.tier_router = TierRouter(db)
+        # Per-tier timeouts from observed latencies; set for each step by _set_step_timeouts()
+        self.tier_timeouts = get_tier_timeout_model()
+        self._step_timeouts: Dict[int, int] = {}
+        # Race speculation may start Tier 2 initialization in the background
+        self._tier2_init_lock = asyncio.Lock()
+    
+    def prefetch_xpath_cache(self, steps: List[Any]) -> int:
+        """
+        Load cached XPaths for all of a test's steps in one query before it runs.
+        
+        Args:
+            steps: Step descriptions (strings) or step dicts with an "instruction"
+            
+        Returns:
+            Number of cache entries loaded
+        """
+        instructions = [
+            step.get("instruction") if isinstance(step, dict) else step
+            for step in steps
+        ]
+        try:
+            return self.xpath_cache_service.prefetch(instructions)
+        except Exception as e:
+            # Prefetch is an optimization; per-step lookups still work without it
+            logger.warning(f"[3-Tier] XPath cache prefetch failed: {e}")
+            return 0
     
     def _get_default_settings(self) -> ExecutionSettings:
         """Get default execution settings"""
@@ -131,24 +182,29 @@ class ThreeTierExecutionService:
     
     async def _ensure_tier2_initialized(self):
         """Lazy initialization of Tier 2 executor with shared browser context"""
-        if not self.tier2_executor:
-            if not self.xpath_extractor:
-                self.xpath_extractor = XPathExtractor(stagehand=self.stagehand)
-                if not self.stagehand:
-                    # Initialize with CDP endpoint and user's AI config to share browser context
-                    await self.xpath_extractor.initialize(
-                        cdp_endpoint=self.cdp_endpoint,
-                        user_config=self.user_ai_config
-                    )
-                    self.stagehand = self.xpath_extractor.stagehand
-            
-            timeout_ms = self.user_settings.timeout_per_tier_seconds * 1000
-            self.tier2_executor = Tier2HybridExecutor(
-                db=self.db,
-                xpath_extractor=self.xpath_extractor,
-                timeout_ms=timeout_ms,
-                user_ai_config=self.user_ai_config,
-            )
+        async with self._tier2_init_lock:
+            if not self.tier2_executor:
+                if not self.xpath_extractor:
+                    self.xpath_extractor = XPathExtractor(stagehand=self.stagehand)
+                    if not self.stagehand:
+                        # Initialize with CDP endpoint and user's AI config to share browser context
+                        await self.xpath_extractor.initialize(
+                            cdp_endpoint=self.cdp_endpoint,
+                            user_config=self.user_ai_config
+                        )
+                        self.stagehand = self.xpath_extractor.stagehand
+                
+                timeout_ms = self.user_settings.timeout_per_tier_seconds * 1000
+                self.tier2_executor = Tier2HybridExecutor(
+                    db=self.db,
+                    xpath_extractor=self.xpath_extractor,
+                    timeout_ms=timeout_ms,
+                    user_ai_config=self.user_ai_config,
+                    cache_service=self.xpath_cache_service,
+                )
+        self.tier2_executor.timeout_ms = self._step_timeouts.get(
+            2, self.user_settings.timeout_per_tier_seconds * 1000
+        )
     
     async def _ensure_tier3_initialized(self):
         """Lazy initialization of Tier 3 executor with shared browser context"""
@@ -167,6 +223,133 @@ class ThreeTierExecutionService:
                 stagehand=self.stagehand,
                 timeout_ms=timeout_ms
             )
+        self.tier3_executor.timeout_ms = self._step_timeouts.get(
+            3, self.user_settings.timeout_per_tier_seconds * 1000
+        )
+
+    def _set_step_timeouts(self, page_domain: Optional[str], action: str) -> None:
+        """Pick this step's per-tier timeouts (the user's timeout_per_tier_seconds is the ceiling)."""
+        max_ms = self.user_settings.timeout_per_tier_seconds * 1000
+        try:
+            self.tier_timeouts.ensure_seeded(self.db)
+            self._step_timeouts = {
+                tier: self.tier_timeouts.timeout_ms(page_domain, action, tier, max_ms)
+                for tier in (1, 2, 3)
+            }
+        except Exception as e:
+            logger.debug(f"[3-Tier] Adaptive timeouts unavailable: {e}")
+            self._step_timeouts = {tier: max_ms for tier in (1, 2, 3)}
+        self.tier1_executor.timeout_ms = self._step_timeouts[1]
+        if self._step_timeouts[1] < max_ms:
+            logger.info(f"[3-Tier] Adaptive tier timeouts for {action} on {page_domain}: {self._step_timeouts}")
+
+    async def _speculate_tier2_xpath(
+        self,
+        step: Dict[str, Any],
+        page_url: str,
+        execution_id: Optional[int],
+        step_index: Optional[int],
+        usage: Dict[str, int],
+    ) -> Dict[str, Any]:
+        """
+        Race strategy: extract the step's Tier 2 XPath while Tier 1 runs.
+
+        Only observes the page (no actions) and stores the XPath in the shared
+        XPath cache, so a Tier 2 fallback starts with a cache hit. Returns the
+        outcome ("resolved", "failed" or "cache_hit") and the extraction time;
+        the LLM tokens it spends are counted into usage.
+        """
+        instruction = step.get("instruction")
+        # Runs in its own task, so this context stays separate from Tier 1's
+        set_llm_context(
+            execution_id=execution_id,
+            step_number=step_index,
+            tier=2,
+            caller="tier2_race_speculation",
+        )
+        track_llm_usage(usage)
+        start_time = time.time()
+        try:
+            # Shielded: cancelling the speculation must not leave Tier 2 half-initialized
+            await asyncio.shield(self._ensure_tier2_initialized())
+            if self.xpath_cache_service.get_cached_xpath(page_url, instruction):
+                return {"outcome": "cache_hit", "time_ms": 0.0}
+
+            start_time = time.time()
+            extraction = await self.xpath_extractor.extract_xpath_with_page(
+                page=self.page,
+                instruction=instruction,
+            )
+            elapsed_ms = (time.time() - start_time) * 1000
+            if not extraction.get("success") or not extraction.get("xpath"):
+                return {"outcome": "failed", "time_ms": elapsed_ms}
+
+            fingerprint, page_fingerprint = await cache_fingerprints(self.page, extraction["xpath"])
+            self.xpath_cache_service.cache_xpath(
+                page_url=page_url,
+                instruction=instruction,
+                xpath=extraction["xpath"],
+                extraction_time_ms=elapsed_ms,
+                page_title=extraction.get("page_title"),
+                element_text=extraction.get("element_text"),
+                element_fingerprint=fingerprint,
+                page_fingerprint=page_fingerprint,
+            )
+            return {"outcome": "resolved", "time_ms": elapsed_ms}
+        except Exception as e:
+            logger.info(f"[3-Tier] Race: speculative XPath extraction failed: {e}")
+            return {"outcome": "failed", "time_ms": (time.time() - start_time) * 1000}
+
+    async def _finish_speculation(
+        self,
+        speculation: Optional["asyncio.Task"],
+        started: float,
+        needed: bool,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Settle a race speculation once Tier 1 is done.
+
+        When Tier 1 succeeded (needed=False) the extraction is cancelled and
+        the time and tokens it spent are recorded as wasted; the cancelled
+        task is given SPECULATION_CANCEL_GRACE_SECONDS to unwind first, so a
+        call cut off mid-request still counts its prompt. When Tier 1
+        failed, wait for it; the latency saved is the part of the extraction
+        that overlapped Tier 1.
+        """
+        if speculation is None:
+            return None
+
+        if not needed:
+            if speculation.done() and not speculation.cancelled():
+                result = speculation.result()
+                outcome = "cache_hit" if result["outcome"] == "cache_hit" else "wasted"
+                settled = {"outcome": outcome, "time_ms": result["time_ms"], "saved_ms": 0.0}
+            else:
+                speculation.cancel()
+                settled = {"outcome": "wasted", "time_ms": (time.time() - started) * 1000, "saved_ms": 0.0}
+                await asyncio.wait({speculation}, timeout=SPECULATION_CANCEL_GRACE_SECONDS)
+            return self._with_speculation_usage(settled, usage)
+
+        wait_start = time.time()
+        result = await speculation
+        waited_ms = (time.time() - wait_start) * 1000
+        if result["outcome"] == "resolved":
+            saved_ms = max(result["time_ms"] - waited_ms, 0.0)
+            logger.info(f"[3-Tier] Race: Tier 2 XPath was resolved during Tier 1 (saved {saved_ms:.0f}ms)")
+            settled = {"outcome": "used", "time_ms": result["time_ms"], "saved_ms": saved_ms}
+        else:
+            settled = {**result, "saved_ms": 0.0}
+        return self._with_speculation_usage(settled, usage)
+
+    @staticmethod
+    def _with_speculation_usage(
+        settled: Dict[str, Any],
+        usage: Optional[Dict[str, int]],
+    ) -> Dict[str, Any]:
+        """Attach the tokens and estimated cost a speculation spent."""
+        usage = usage or new_llm_usage()
+        return {**settled, "tokens": usage["total_tokens"], "cost_usd": llm_usage_cost_usd(usage)}
     
     async def execute_step(
         self,
@@ -212,8 +395,16 @@ class ThreeTierExecutionService:
 
         if should_enforce_confirm_progress(step):
             confirm_progress_snapshot = await capture_step_progress_snapshot(self.page)
+
+        # Route key and timeout histograms are taken from the page the step starts on
+        # (timeouts of navigate steps from the target URL)
+        page_url = getattr(self.page, "url", None)
+        page_domain, _ = step_timeout_key(step, page_url)
+        route_key = TierRouter.route_key(page_url, step.get("instruction"))
+        start_tier = self.tier_router.start_tier(route_key, strategy, action)
+        self._set_step_timeouts(page_domain, action)
         
-        # TIER 1: Always attempt Playwright Direct first
+        # TIER 1: Attempt Playwright Direct first unless routing learned it fails for this step
         # Sprint 10.19: context token spans entire step; reset in finally to keep context clean.
         _ctx_token = set_llm_context(
             execution_id=execution_id,
@@ -221,16 +412,42 @@ class ThreeTierExecutionService:
             tier=1,
             caller="tier1_playwright",
         )
+        speculation = None
+        speculation_started = time.time()
+        speculation_usage = new_llm_usage()
+        speculation_result = None
         try:
-            tier1_result = await self._execute_tier1(step)
-            execution_history.append(tier1_result)
+            if (
+                strategy == "race"
+                and start_tier == 1
+                and action not in UNROUTED_ACTIONS
+                and isinstance(page_url, str)
+                and step.get("instruction")
+            ):
+                # Race: Tier 2's XPath extraction runs alongside Tier 1
+                speculation = asyncio.create_task(
+                    self._speculate_tier2_xpath(step, page_url, execution_id, step_index, speculation_usage)
+                )
 
-            if tier1_result["success"] and not await self._step_made_expected_progress(step, confirm_progress_snapshot):
-                tier1_result = self._mark_no_progress_failure(tier1_result, step)
-                execution_history[-1] = tier1_result
+            if start_tier == 1:
+                tier1_result = await self._execute_tier1(step)
+                execution_history.append(tier1_result)
+
+                if tier1_result["success"] and not await self._step_made_expected_progress(step, confirm_progress_snapshot):
+                    tier1_result = self._mark_no_progress_failure(tier1_result, step)
+                    execution_history[-1] = tier1_result
+            else:
+                tier1_result = None
+                logger.info(
+                    f"[3-Tier] Routing step straight to Tier {start_tier} "
+                    f"(Tier 1 keeps failing for it)"
+                )
             
-            if tier1_result["success"]:
+            if tier1_result is not None and tier1_result["success"]:
                 # Success at Tier 1!
+                speculation_result = await self._finish_speculation(
+                    speculation, speculation_started, needed=False, usage=speculation_usage
+                )
                 total_time_ms = (time.time() - overall_start_time) * 1000
                 
                 result = {
@@ -249,16 +466,28 @@ class ThreeTierExecutionService:
                         final_tier=1,
                         success=True,
                         execution_history=execution_history,
-                        total_time_ms=total_time_ms
+                        total_time_ms=total_time_ms,
+                        route_key=route_key,
+                        page_domain=page_domain,
+                        action=action,
+                        speculation=speculation_result,
                     )
                 
                 return result
             
-            # Tier 1 failed, proceed with selected fallback strategy
-            logger.info(f"[3-Tier] Tier 1 failed, falling back to strategy {strategy}")
+            if tier1_result is not None:
+                # Tier 1 failed, proceed with selected fallback strategy
+                logger.info(f"[3-Tier] Tier 1 failed, falling back to strategy {strategy}")
+                await self._notify_tier_fallback(
+                    step_index, 1, 3 if strategy == "option_b" else 2, tier1_result.get("error")
+                )
 
             if _check_cancelled(cancel_check):
                 return _cancelled_step_result(execution_history, strategy)
+
+            speculation_result = await self._finish_speculation(
+                speculation, speculation_started, needed=True, usage=speculation_usage
+            )
             
             try:
                 if action == "verify_screenshot":
@@ -293,7 +522,7 @@ class ThreeTierExecutionService:
                     result = await self._execute_option_b(
                         step, execution_history, confirm_progress_snapshot, cancel_check
                     )
-                elif strategy == "option_c":
+                elif strategy in ("option_c", "race"):
                     set_llm_context(
                         execution_id=execution_id,
                         step_number=step_index,
@@ -301,7 +530,8 @@ class ThreeTierExecutionService:
                         caller="tier2_hybrid",
                     )
                     result = await self._execute_option_c(
-                        step, execution_history, confirm_progress_snapshot, cancel_check
+                        step, execution_history, confirm_progress_snapshot, cancel_check,
+                        skip_tier2=start_tier == 3,
                     )
                 else:
                     raise ValueError(f"Unknown fallback strategy: {strategy}")
@@ -319,12 +549,43 @@ class ThreeTierExecutionService:
                         final_tier=result["tier"],
                         success=result["success"],
                         execution_history=execution_history,
-                        total_time_ms=total_time_ms
+                        total_time_ms=total_time_ms,
+                        route_key=route_key,
+                        page_domain=page_domain,
+                        action=action,
+                        speculation=speculation_result,
                     )
                 
                 return result
                 
             except ExecutionFailedError as e:
+                if start_tier > 1 and not _check_cancelled(cancel_check):
+                    recovered = await self._execute_skipped_tier1(
+                        step, e.execution_history, confirm_progress_snapshot
+                    )
+                    if recovered is not None:
+                        total_time_ms = (time.time() - overall_start_time) * 1000
+                        if execution_id is not None and step_index is not None:
+                            await self._log_tier_execution(
+                                execution_id=execution_id,
+                                step_index=step_index,
+                                strategy=strategy,
+                                final_tier=1,
+                                success=True,
+                                execution_history=e.execution_history,
+                                total_time_ms=total_time_ms,
+                                route_key=route_key,
+                                page_domain=page_domain,
+                                action=action,
+                                speculation=speculation_result,
+                            )
+                        return {
+                            **recovered,
+                            "total_time_ms": total_time_ms,
+                            "execution_history": e.execution_history,
+                            "strategy_used": strategy,
+                        }
+
                 total_time_ms = (time.time() - overall_start_time) * 1000
                 ai_verification_result = _latest_ai_verification_result(e.execution_history)
                 
@@ -350,13 +611,64 @@ class ThreeTierExecutionService:
                         final_tier=None,
                         success=False,
                         execution_history=e.execution_history,
-                        total_time_ms=total_time_ms
+                        total_time_ms=total_time_ms,
+                        route_key=route_key,
+                        page_domain=page_domain,
+                        action=action,
+                        speculation=speculation_result,
                     )
                 
                 return result
         finally:
+            if speculation is not None and not speculation.done():
+                speculation.cancel()
             llm_exec_ctx.reset(_ctx_token)
     
+    async def _notify_tier_fallback(
+        self, step_index: Optional[int], from_tier: int, to_tier: int, error: Optional[str]
+    ) -> None:
+        """
+        Report a tier fallback to on_tier_fallback (best-effort).
+
+        step_index is 0-based; the event carries the 1-based step number used
+        by step_started / step_finished.
+        """
+        if self.on_tier_fallback is None:
+            return
+        try:
+            await self.on_tier_fallback({
+                "step": step_index + 1 if step_index is not None else None,
+                "from_tier": from_tier,
+                "to_tier": to_tier,
+                "error": error,
+            })
+        except Exception as e:
+            logger.debug(f"[3-Tier] Tier fallback callback failed: {e}")
+
+    async def _execute_skipped_tier1(
+        self,
+        step: Dict[str, Any],
+        execution_history: List[Dict[str, Any]],
+        confirm_progress_snapshot=None,
+    ) -> Optional[Dict[str, Any]]:
+        """Last resort after a routed step failed: the Tier 1 attempt routing skipped."""
+        logger.info("[3-Tier] Routed tier failed, trying skipped Tier 1")
+        _prior = llm_exec_ctx.get()
+        set_llm_context(
+            execution_id=_prior.get("execution_id"),
+            step_number=_prior.get("step_number"),
+            tier=1,
+            caller="tier1_playwright",
+        )
+        tier1_result = await self._execute_tier1(step)
+        execution_history.append(tier1_result)
+
+        if tier1_result["success"] and not await self._step_made_expected_progress(step, confirm_progress_snapshot):
+            tier1_result = self._mark_no_progress_failure(tier1_result, step)
+            execution_history[-1] = tier1_result
+
+        return tier1_result if tier1_result["success"] else None
+
     async def _execute_tier1(self, step: Dict[str, Any]) -> Dict[str, Any]:
         """Execute Tier 1 (Playwright Direct)"""
         try:
@@ -451,14 +763,20 @@ class ThreeTierExecutionService:
         execution_history: List[Dict[str, Any]],
         confirm_progress_snapshot=None,
         cancel_check: Optional[Callable[[], bool]] = None,
+        skip_tier2: bool = False,
     ) -> Dict[str, Any]:
         """
         Option C: Tier 1 → Tier 2 → Tier 3 (full cascade)
         Maximum reliability approach, 97-99% success rate
+
+        skip_tier2 goes straight to Tier 3 (learned routing).
         """
         if _check_cancelled(cancel_check):
             return _cancelled_step_result(execution_history, "option_c")
 
+        if skip_tier2:
+            return await self._execute_option_c_tier3(step, execution_history, confirm_progress_snapshot)
+
         # Try Tier 2 first
         await self._ensure_tier2_initialized()
 
@@ -481,10 +799,22 @@ class ThreeTierExecutionService:
         
         # Tier 2 failed, try Tier 3 as last resort
         logger.info(f"[3-Tier] Tier 2 failed, trying Tier 3 as last resort")
+        await self._notify_tier_fallback(
+            llm_exec_ctx.get().get("step_number"), 2, 3, tier2_result.get("error")
+        )
 
         if _check_cancelled(cancel_check):
             return _cancelled_step_result(execution_history, "option_c")
-        
+
+        return await self._execute_option_c_tier3(step, execution_history, confirm_progress_snapshot)
+
+    async def _execute_option_c_tier3(
+        self,
+        step: Dict[str, Any],
+        execution_history: List[Dict[str, Any]],
+        confirm_progress_snapshot=None,
+    ) -> Dict[str, Any]:
+        """Option C's last tier: Tier 3 (Stagehand)."""
         await self._ensure_tier3_initialized()
         
         # Update tier in context (execution_id/step_number already set by execute_step)
@@ -691,9 +1021,28 @@ class ThreeTierExecutionService:
         final_tier: Optional[int],
         success: bool,
         execution_history: List[Dict[str, Any]],
-        total_time_ms: float
+        total_time_ms: float,
+        route_key: Optional[str] = None,
+        page_domain: Optional[str] = None,
+        action: Optional[str] = None,
+        speculation: Optional[Dict[str, Any]] = None,
     ):
-        """Log tier execution for analytics"""
+        """Log tier execution for analytics (and tier routing / timeout history)"""
+        # Attempts feed the adaptive timeouts whether or not analytics are on:
+        # successes with their latency, and timeouts as censored samples when
+        # a later tier completed the step (so the tier was slow, not wrong)
+        for attempt in execution_history:
+            tier = attempt.get("tier")
+            if attempt.get("success"):
+                self.tier_timeouts.observe(page_domain, action, tier, attempt.get("execution_time_ms"))
+            elif success and attempt.get("error_type") == "timeout":
+                self.tier_timeouts.observe_timeout(
+                    page_domain,
+                    action,
+                    tier,
+                    max(self._step_timeouts.get(tier, 0), attempt.get("execution_time_ms") or 0),
+                )
+
         if not self.user_settings.track_strategy_effectiveness:
             return
         
@@ -724,9 +1073,17 @@ class ThreeTierExecutionService:
                     tiers_attempted.append(3)
             
             # Create log entry
-            log_entry = TierExecutionLog(
+            log_fields = dict(
                 execution_id=execution_id,
                 step_index=step_index,
+                route_key=route_key,
+                page_domain=page_domain,
+                action=action,
+                speculation=speculation["outcome"] if speculation else None,
+                speculation_time_ms=speculation["time_ms"] if speculation else None,
+                speculation_saved_ms=speculation["saved_ms"] if speculation else None,
+                speculation_tokens=speculation.get("tokens") if speculation else None,
+                speculation_cost_usd=speculation.get("cost_usd") if speculation else None,
                 fallback_strategy=strategy,
                 final_tier=final_tier or 0,
                 success=success,
@@ -740,7 +1097,11 @@ class ThreeTierExecutionService:
                 tier3_error=tier3_error[:500] if tier3_error else None
             )
             
-            self.db.add(log_entry)
+            if self.write_buffer is not None:
+                self.write_buffer.add_tier_log(**log_fields)
+                return
+            
+            self.db.add(TierExecutionLog(**log_fields))
             self.db.commit()
             
         except Exception as e:
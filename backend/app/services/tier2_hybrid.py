@@ -16,6 +16,12 @@ import logging
 from app.services.post_click_readiness import auto_dismiss_blocking_modals, wait_for_post_click_readiness
 from app.services.xpath_cache_service import XPathCacheService
 from app.services.xpath_extractor import XPathExtractor
+from app.services.xpath_fingerprint import (
+    FINGERPRINT_CHANGED,
+    FINGERPRINT_OK,
+    cache_fingerprints,
+    validate_fingerprints,
+)
 from app.utils.three_uat_test_credentials import is_three_hk_uat_url
 # Sprint 10.17: vision screenshot verification
 from app.services.screenshot_verification_service import ScreenshotVerificationService
@@ -170,6 +176,7 @@ class Tier2HybridExecutor:
         xpath_extractor: XPathExtractor,
         timeout_ms: int = 30000,
         user_ai_config: Optional[Dict[str, Any]] = None,
+        cache_service: Optional[XPathCacheService] = None,
     ):
         """
         Initialize Tier 2 executor.
@@ -180,12 +187,14 @@ class Tier2HybridExecutor:
             timeout_ms: Timeout in milliseconds for each action
             user_ai_config: Optional user AI provider config (provider, model, ...).
                             Used by Sprint 10.17 verify_screenshot vision calls.
+            cache_service: Optional shared XPath cache service (e.g. one already
+                           prefetched for the test); created from db when omitted.
         """
         self.db = db
         self.xpath_extractor = xpath_extractor
         self.timeout_ms = timeout_ms
         self.user_ai_config: Dict[str, Any] = user_ai_config or {}
-        self.cache_service = XPathCacheService(db)
+        self.cache_service = cache_service or XPathCacheService(db)
         self.payment_direct_enabled = os.getenv("ENABLE_PAYMENT_DIRECT_HANDLING", "true").lower() != "false"
         self.payment_gateway_ready = False
         self.payment_gateway_url = None
@@ -366,13 +375,23 @@ class Tier2HybridExecutor:
                 else:
                     # Validate cached xpath - ensure element exists and matches step intent
                     try:
-                        is_valid_cache = await self._validate_cached_xpath_for_step(
-                            page=page,
-                            xpath=xpath,
-                            action=action,
-                            instruction=instruction,
-                            value=value,
+                        fingerprint_status = await self._check_cached_xpath_fingerprints(
+                            page, page_url, cached_xpath
                         )
+                        if fingerprint_status == FINGERPRINT_CHANGED:
+                            raise ValueError("Cached XPath now resolves to a different element")
+
+                        if fingerprint_status == FINGERPRINT_OK:
+                            # Still the element it was cached for: no live probe needed
+                            is_valid_cache = True
+                        else:
+                            is_valid_cache = await self._validate_cached_xpath_for_step(
+                                page=page,
+                                xpath=xpath,
+                                action=action,
+                                instruction=instruction,
+                                value=value,
+                            )
                         if not is_valid_cache:
                             raise ValueError("Cached XPath does not match current step intent")
 
@@ -461,14 +480,17 @@ class Tier2HybridExecutor:
 
                 logger.info(f"[Tier 2] âœ… Extracted XPath in {extraction_time_ms:.2f}ms: {xpath}")
                 
-                # Step 4: Cache the XPath for future use
+                # Step 4: Cache the XPath (and its target's and page's fingerprints) for future use
+                fingerprint, page_fingerprint = await cache_fingerprints(page, xpath)
                 self.cache_service.cache_xpath(
                     page_url=page_url,
                     instruction=instruction,
                     xpath=xpath,
                     extraction_time_ms=extraction_time_ms,
                     page_title=extraction_result.get("page_title"),
-                    element_text=extraction_result.get("element_text")
+                    element_text=extraction_result.get("element_text"),
+                    element_fingerprint=fingerprint,
+                    page_fingerprint=page_fingerprint,
                 )
             
             # Step 3: Execute using Playwright with the XPath
@@ -1722,6 +1744,37 @@ class Tier2HybridExecutor:
             # Ignore pre-check issues and let Playwright click handling raise if needed.
             return
 
+    async def _check_cached_xpath_fingerprints(
+        self,
+        page: Page,
+        page_url: str,
+        cached_xpath: Dict[str, Any],
+    ) -> Optional[str]:
+        """
+        Check the page's fingerprinted cached XPaths in one round-trip.
+
+        Returns this step's status (FINGERPRINT_OK / _MISSING / _CHANGED), or
+        None when its entry has no fingerprint or the page could not be
+        checked. Other entries found changed are skipped for the rest of the
+        run, but only those cached on the page state the browser is in now:
+        on another state their positional XPaths and state-dependent text can
+        look changed before the page reaches their step.
+        """
+        fingerprint = cached_xpath.get("element_fingerprint")
+        cache_key = cached_xpath.get("cache_key")
+        if not fingerprint or not cache_key:
+            return None
+
+        entries = self.cache_service.fingerprinted_entries(page_url)
+        entries[cache_key] = (cached_xpath["xpath"], fingerprint, cached_xpath.get("page_fingerprint"))
+        page_state, statuses = await validate_fingerprints(
+            page, {key: (xpath, element) for key, (xpath, element, _state) in entries.items()}
+        )
+        for key, status in statuses.items():
+            if key != cache_key and status == FINGERPRINT_CHANGED and page_state and entries[key][2] == page_state:
+                self.cache_service.mark_stale(key)
+        return statuses.get(cache_key)
+
     async def _validate_cached_xpath_for_step(
         self,
         page: Page,
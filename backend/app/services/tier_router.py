@@ -0,0 +1,135 @@
+"""
+Learned tier routing for the 3-Tier Execution Engine.
+
+Every step execution is logged to tier_execution_logs under a route key
+(normalized page URL + instruction, the XPath cache key). When Tier 1 has
+kept failing for a route and a later tier has succeeded, the next run starts
+that step directly at the tier that last succeeded instead of spending a full
+timeout_per_tier_seconds on Tier 1 first.
+
+Every TIER_ROUTING_PROBE_INTERVAL routed runs, Tier 1 is tried again (an
+exploration probe) so a route whose selector starts working is moved back to
+Tier 1. If the routed tier fails, ThreeTierExecutionService still falls back
+to Tier 1 before giving up.
+"""
+import json
+import logging
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.execution_settings import TierExecutionLog
+from app.services.xpath_cache_service import XPathCacheService
+
+logger = logging.getLogger(__name__)
+
+# Tiers each fallback strategy can start at when Tier 1 is skipped
+STRATEGY_TIERS = {
+    "option_a": (2,),
+    "option_b": (3,),
+    "option_c": (2, 3),
+    "race": (2, 3),
+}
+
+# Steps always run the normal Tier 1-first path
+UNROUTED_ACTIONS = {"navigate", "verify_screenshot"}
+
+
+class RouteRun(NamedTuple):
+    """One logged execution of a route (newest first in histories)."""
+
+    success: bool
+    final_tier: int
+    tiers_attempted: Tuple[int, ...]
+
+
+def choose_start_tier(
+    history: Iterable[RouteRun],
+    strategy: str,
+    probe_interval: int,
+    min_tier1_failures: int,
+) -> int:
+    """
+    Tier to start a step at, given its recent runs (newest first).
+
+    Tier 1 is skipped only when its last min_tier1_failures attempts all
+    failed, a later tier has since succeeded, and fewer than probe_interval
+    runs in a row have skipped it.
+    """
+    allowed = STRATEGY_TIERS.get(strategy)
+    history = list(history)
+    if not allowed or min_tier1_failures < 1:
+        return 1
+
+    tier1_runs = [run for run in history if 1 in run.tiers_attempted]
+    if len(tier1_runs) < min_tier1_failures:
+        return 1
+    if any(run.success and run.final_tier == 1 for run in tier1_runs[:min_tier1_failures]):
+        return 1
+
+    last_success = next((run for run in history if run.success and run.final_tier in (2, 3)), None)
+    if last_success is None:
+        return 1
+
+    skipped = 0
+    for run in history:
+        if 1 in run.tiers_attempted:
+            break
+        skipped += 1
+    if skipped >= probe_interval:
+        return 1
+
+    return last_success.final_tier if last_success.final_tier in allowed else allowed[0]
+
+
+class TierRouter:
+    """Reads tier_execution_logs history to pick each step's starting tier."""
+
+    def __init__(
+        self,
+        db: Session,
+        enabled: Optional[bool] = None,
+        probe_interval: Optional[int] = None,
+        min_tier1_failures: Optional[int] = None,
+    ):
+        self.db = db
+        self.enabled = settings.TIER_ROUTING_ENABLED if enabled is None else enabled
+        self.probe_interval = probe_interval or settings.TIER_ROUTING_PROBE_INTERVAL
+        self.min_tier1_failures = min_tier1_failures or settings.TIER_ROUTING_MIN_TIER1_FAILURES
+
+    @staticmethod
+    def route_key(page_url: Optional[str], instruction: Optional[str]) -> Optional[str]:
+        """Key for a step on a page, or None when either part is missing."""
+        if not isinstance(page_url, str) or not page_url or not isinstance(instruction, str) or not instruction:
+            return None
+        return XPathCacheService.generate_cache_key(page_url, instruction)
+
+    def history(self, route_key: str) -> List[RouteRun]:
+        """Recent runs of a route, newest first (one indexed query)."""
+        # Enough runs to count a full probe interval of skips plus the Tier 1 failures before it
+        window = self.probe_interval + self.min_tier1_failures
+        rows = self.db.query(
+            TierExecutionLog.success,
+            TierExecutionLog.final_tier,
+            TierExecutionLog.tiers_attempted,
+        ).filter(
+            TierExecutionLog.route_key == route_key
+        ).order_by(TierExecutionLog.id.desc()).limit(window).all()
+        return [
+            RouteRun(bool(success), final_tier or 0, tuple(json.loads(tiers or "[]")))
+            for success, final_tier, tiers in rows
+        ]
+
+    def start_tier(self, route_key: Optional[str], strategy: str, action: str = "") -> int:
+        """Starting tier for a step (1 when routing is off, unknown, or fails)."""
+        if not self.enabled or route_key is None or action in UNROUTED_ACTIONS:
+            return 1
+        try:
+            return choose_start_tier(
+                self.history(route_key), strategy, self.probe_interval, self.min_tier1_failures
+            )
+        except Exception as e:
+            # Routing is an optimization; the normal cascade always works
+            logger.debug(f"[Tier Routing] History lookup failed: {e}")
+            return 1
@@ -0,0 +1,234 @@
+"""
+Adaptive per-tier timeouts for the 3-Tier Execution Engine.
+
+Successful tier attempts feed streaming latency histograms keyed by
+(domain, action, tier); the domain is the page's, or the target URL's for
+navigate steps. Once a key has TIER_TIMEOUT_MIN_SAMPLES
+observations, its timeout is p99 x TIER_TIMEOUT_SAFETY_FACTOR, clamped to
+[TIER_TIMEOUT_MIN_SECONDS, the user's timeout_per_tier_seconds]. A Tier 1
+click that normally takes 200 ms then fails over in well under a second
+instead of waiting the full per-tier timeout.
+
+An attempt cut off by its timeout is recorded as a censored sample at the
+timeout value (its latency was at least that), but only when a later tier
+then completed the step: the element was there and the page was just slow.
+Without these a learned timeout could only shrink: after a latency
+regression every attempt would time out and nothing would ever widen it
+again. Timeouts of steps that failed outright (a missing element times out
+on every tier) say nothing about latency and are not recorded; otherwise a
+domain with more than ~1% failing steps would ratchet its p99 up to the
+user's timeout. Fixed-duration waits ("wait 2000") are not tracked; their
+latency is the step's own duration.
+
+Histograms are per process: seeded once from recent tier_execution_logs and
+updated as steps run. Counts are halved when a histogram exceeds
+HISTOGRAM_MAX_SAMPLES so old latencies fade out. Pages without a domain
+(about:blank, data: URLs) always use the user's timeout.
+"""
+import bisect
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bucket upper bounds: 10 ms growing by 20% per bucket up to ~10 minutes
+BUCKET_BOUNDS_MS: List[float] = []
+_bound = 10.0
+while _bound < 600_000:
+    BUCKET_BOUNDS_MS.append(round(_bound, 1))
+    _bound *= 1.2
+BUCKET_BOUNDS_MS.append(600_000.0)
+
+# Decay: halve every count once a histogram holds this many samples
+HISTOGRAM_MAX_SAMPLES = 1000
+# Most recent successful tier logs read when seeding a process
+SEED_ROWS = 5000
+
+TimeoutKey = Tuple[str, str, int]
+
+# Error prefix the tier executors use when an attempt hits its timeout
+TIMEOUT_ERROR_PREFIX = "Timeout after"
+
+
+def step_timeout_key(step: Dict[str, Any], page_url: Optional[str]) -> Tuple[Optional[str], str]:
+    """
+    (domain, action) a step's latencies are tracked under.
+
+    Navigate steps use the target URL's domain; fixed-duration waits get no
+    domain, so they are neither timed adaptively nor observed.
+    """
+    action = (step.get("action") or "").lower()
+    target = step.get("value") or step.get("selector") or ""
+    if action == "wait" and str(target or "1000").strip().isdigit():
+        return None, action
+    domain = urlparse(page_url).netloc if isinstance(page_url, str) else ""
+    if action == "navigate":
+        target_url = target or step.get("instruction") or ""
+        domain = urlparse(target_url).netloc if isinstance(target_url, str) else ""
+        domain = domain or (urlparse(page_url).netloc if isinstance(page_url, str) else "")
+    return domain or None, action
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with exponential decay."""
+
+    def __init__(self):
+        self.counts = [0.0] * len(BUCKET_BOUNDS_MS)
+        self.total = 0.0
+
+    def add(self, latency_ms: float) -> None:
+        index = min(bisect.bisect_left(BUCKET_BOUNDS_MS, latency_ms), len(BUCKET_BOUNDS_MS) - 1)
+        self.counts[index] += 1
+        self.total += 1
+        if self.total > HISTOGRAM_MAX_SAMPLES:
+            self.counts = [count / 2 for count in self.counts]
+            self.total /= 2
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile (None when empty)."""
+        if self.total <= 0:
+            return None
+        threshold = q * self.total
+        seen = 0.0
+        for bound, count in zip(BUCKET_BOUNDS_MS, self.counts):
+            seen += count
+            if count and seen >= threshold:
+                return bound
+        return BUCKET_BOUNDS_MS[-1]
+
+
+class TierTimeoutModel:
+    """Latency histograms per (domain, action, tier) and the timeouts derived from them."""
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        safety_factor: Optional[float] = None,
+        min_seconds: Optional[float] = None,
+        min_samples: Optional[int] = None,
+    ):
+        self.enabled = settings.TIER_TIMEOUT_ADAPTIVE_ENABLED if enabled is None else enabled
+        self.safety_factor = safety_factor or settings.TIER_TIMEOUT_SAFETY_FACTOR
+        self.min_ms = (min_seconds if min_seconds is not None else settings.TIER_TIMEOUT_MIN_SECONDS) * 1000
+        self.min_samples = min_samples or settings.TIER_TIMEOUT_MIN_SAMPLES
+        self._lock = threading.Lock()
+        self._histograms: Dict[TimeoutKey, LatencyHistogram] = {}
+        self._seeded = False
+
+    @staticmethod
+    def _key(domain: Optional[str], action: Optional[str], tier: int) -> TimeoutKey:
+        return ((domain or "").lower(), (action or "").lower(), tier)
+
+    def observe(self, domain: Optional[str], action: Optional[str], tier: int, latency_ms: Optional[float]) -> None:
+        """Record the latency of a successful tier attempt."""
+        if not domain or latency_ms is None or latency_ms < 0 or tier not in (1, 2, 3):
+            return
+        key = self._key(domain, action, tier)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.add(latency_ms)
+
+    def observe_timeout(self, domain: Optional[str], action: Optional[str], tier: int, timeout_ms: Optional[float]) -> None:
+        """
+        Record an attempt cut off at timeout_ms (censored: it would have taken
+        at least that long). Only call this for timeouts of steps a later tier
+        then completed.
+        """
+        self.observe(domain, action, tier, timeout_ms)
+
+    def timeout_ms(self, domain: Optional[str], action: Optional[str], tier: int, max_ms: float) -> int:
+        """Timeout for a tier attempt; max_ms (the user's setting) until there is enough data."""
+        if not self.enabled or not domain:
+            return int(max_ms)
+        with self._lock:
+            histogram = self._histograms.get(self._key(domain, action, tier))
+            if histogram is None or histogram.total < self.min_samples:
+                return int(max_ms)
+            p99 = histogram.percentile(0.99)
+        return int(min(max(p99 * self.safety_factor, self.min_ms), max_ms))
+
+    def ensure_seeded(self, db: Session) -> None:
+        """Load recent history from tier_execution_logs once per process."""
+        if self._seeded or not self.enabled:
+            return
+        with self._lock:
+            if self._seeded:
+                return
+            self._seeded = True
+        try:
+            self.seed(db)
+        except Exception as e:
+            logger.warning(f"[Tier Timeouts] Could not seed latency histograms: {e}")
+
+    def seed(self, db: Session, limit: int = SEED_ROWS) -> int:
+        """Observe final-tier latencies and earlier-tier timeouts of recent successful steps."""
+        from app.models.execution_settings import TierExecutionLog
+
+        rows = db.query(
+            TierExecutionLog.page_domain,
+            TierExecutionLog.action,
+            TierExecutionLog.final_tier,
+            TierExecutionLog.tier1_time_ms,
+            TierExecutionLog.tier2_time_ms,
+            TierExecutionLog.tier3_time_ms,
+            TierExecutionLog.success,
+            TierExecutionLog.tier1_error,
+            TierExecutionLog.tier2_error,
+            TierExecutionLog.tier3_error,
+        ).filter(
+            TierExecutionLog.page_domain.isnot(None),
+        ).order_by(TierExecutionLog.id.desc()).limit(limit).all()
+
+        for domain, action, final_tier, t1, t2, t3, success, *errors in reversed(rows):
+            if not success or final_tier not in (1, 2, 3):
+                continue
+            tier_times = (t1, t2, t3)
+            for tier, error in enumerate(errors[:final_tier - 1], start=1):
+                if error and error.startswith(TIMEOUT_ERROR_PREFIX):
+                    self.observe_timeout(domain, action, tier, tier_times[tier - 1])
+            self.observe(domain, action, final_tier, tier_times[final_tier - 1])
+        logger.info(f"[Tier Timeouts] Seeded latency histograms from {len(rows)} tier logs")
+        return len(rows)
+
+    def snapshot(self, max_ms: float) -> List[Dict[str, Any]]:
+        """Current histograms and the timeouts they give under max_ms (for auditing)."""
+        with self._lock:
+            items = [
+                (key, histogram.total, histogram.percentile(0.5), histogram.percentile(0.99))
+                for key, histogram in self._histograms.items()
+            ]
+        stats = []
+        for (domain, action, tier), samples, p50, p99 in sorted(items):
+            adaptive = self.enabled and samples >= self.min_samples
+            stats.append({
+                "domain": domain,
+                "action": action,
+                "tier": tier,
+                "samples": round(samples, 1),
+                "p50_ms": p50,
+                "p99_ms": p99,
+                "timeout_ms": self.timeout_ms(domain, action, tier, max_ms),
+                "adaptive": adaptive,
+            })
+        return stats
+
+
+_model: Optional[TierTimeoutModel] = None
+_model_lock = threading.Lock()
+
+
+def get_tier_timeout_model() -> TierTimeoutModel:
+    """Return the process-wide TierTimeoutModel."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = TierTimeoutModel()
+        return _model
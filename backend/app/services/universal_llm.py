@@ -2,6 +2,7 @@
 Universal LLM service that supports multiple providers.
 Handles Google Gemini, Cerebras, and OpenRouter.
 """
+import asyncio
 import base64
 import datetime
 import httpx
@@ -10,6 +11,7 @@ import os
 import time
 from typing import List, Dict, Optional, Union
 from app.core.config import settings
+from app.utils.llm_execution_context import LLM_CALL_CANCELLED
 
 _svc_logger = logging.getLogger(__name__)
 
@@ -103,6 +105,7 @@ class UniversalLLMService:
         api_key: Optional[str] = None,
         azure_endpoint: Optional[str] = None,
         azure_api_version: Optional[str] = None,
+        cache: Optional[bool] = None,
     ) -> dict:
         """
         Call LLM API for chat completion with provider selection.
@@ -119,6 +122,9 @@ class UniversalLLMService:
             custom_endpoint: Phase 2 — optional override endpoint for local_vllm
                 models not in the hardcoded routing table.  Ignored for other
                 providers.
+            cache: Response cache control. None (default) uses the cache when
+                LLM_RESPONSE_CACHE_ENABLED is set and temperature is 0; True
+                forces it (even when sampling); False bypasses it.
             
         Returns:
             Unified API response dict with choices, usage, etc.
@@ -131,6 +137,42 @@ class UniversalLLMService:
         _t0 = time.monotonic()
         _error: Optional[str] = None
         _response: Optional[dict] = None
+
+        _cache = None
+        _cache_key: Optional[str] = None
+        _cache_status: Optional[str] = None
+        if cache is True or (cache is None and not temperature):
+            from app.utils.llm_response_cache import get_llm_response_cache
+
+            _cache = get_llm_response_cache(force=cache is True)
+        if _cache is not None:
+            _cache_key = _cache.make_key(
+                provider=provider,
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                enable_thinking=enable_thinking if provider == "local_vllm" else None,
+                custom_endpoint=custom_endpoint if provider == "local_vllm" else None,
+                azure_endpoint=azure_endpoint if provider == "azure" else None,
+                azure_api_version=azure_api_version if provider == "azure" else None,
+            )
+            cached, tier = await asyncio.to_thread(_cache.get, _cache_key)
+            if cached is not None:
+                await self._write_llm_log(
+                    messages=messages,
+                    provider=provider,
+                    model=model or "",
+                    response=cached,
+                    error=None,
+                    elapsed_ms=(time.monotonic() - _t0) * 1000,
+                    caller="chat_completion",
+                    cache_status=f"hit_{tier}",
+                    cache_stats=_cache.stats(),
+                )
+                return cached
+            _cache_status = "miss"
+
         try:
             if provider == "google":
                 _response = await self._call_google(messages, model, temperature, max_tokens)
@@ -154,6 +196,11 @@ class UniversalLLMService:
                 )
             else:  # default to openrouter
                 _response = await self._call_openrouter(messages, model, temperature, max_tokens)
+            if _cache is not None and _response and _response.get("choices"):
+                await asyncio.to_thread(_cache.put, _cache_key, _response)
+        except asyncio.CancelledError:
+            _error = LLM_CALL_CANCELLED
+            raise
         except Exception as exc:
             _error = str(exc)
             raise
@@ -166,6 +213,8 @@ class UniversalLLMService:
                 error=_error,
                 elapsed_ms=(time.monotonic() - _t0) * 1000,
                 caller="chat_completion",
+                cache_status=_cache_status,
+                cache_stats=_cache.stats() if _cache is not None else None,
             )
         return _response  # type: ignore[return-value]
 
@@ -179,10 +228,16 @@ class UniversalLLMService:
         error: Optional[str],
         elapsed_ms: float,
         caller: str,
+        cache_status: Optional[str] = None,
+        cache_stats: Optional[dict] = None,
     ) -> None:
         """Build and write one JSONL log entry for this LLM call (swallows errors)."""
         try:
-            from app.utils.llm_execution_context import llm_exec_ctx
+            from app.utils.llm_execution_context import (
+                estimate_prompt_tokens,
+                llm_exec_ctx,
+                record_llm_usage,
+            )
             from app.utils.llm_response_logger import (
                 llm_logger,
                 build_prompt_preview,
@@ -208,11 +263,19 @@ class UniversalLLMService:
                 prompt_tokens = usage.get("prompt_tokens")
                 completion_tokens = usage.get("completion_tokens")
                 total_tokens = usage.get("total_tokens")
+            if (cache_status or "").startswith("hit"):
+                pass  # Cache hits spend no tokens
+            elif not response and error == LLM_CALL_CANCELLED:
+                # Cut off mid-request: no usage report, but the prompt was sent
+                record_llm_usage(estimate_prompt_tokens(messages), 0, None)
+            else:
+                record_llm_usage(prompt_tokens, completion_tokens, total_tokens)
 
             # Brief console summary (existing logger, no change to format)
             thinking_info = f" (thinking: {thinking_tokens}tok)" if thinking_tokens else ""
+            cache_info = f" [cache {cache_status}]" if cache_status else ""
             _svc_logger.info(
-                "[LLM] provider=%s model=%s tier=%s step=%s → %.0fms %stok%s",
+                "[LLM] provider=%s model=%s tier=%s step=%s → %.0fms %stok%s%s",
                 provider,
                 model,
                 ctx.get("tier"),
@@ -220,6 +283,7 @@ class UniversalLLMService:
                 elapsed_ms,
                 total_tokens or "?",
                 thinking_info,
+                cache_info,
             )
 
             entry = {
@@ -242,6 +306,12 @@ class UniversalLLMService:
                 "success": error is None,
                 "error": error,
             }
+            if cache_status:
+                # Response cache: hit_memory / hit_disk / miss plus process-wide counters
+                entry["cache"] = cache_status
+                if cache_stats:
+                    entry["cache_hits"] = cache_stats.get("hits")
+                    entry["cache_misses"] = cache_stats.get("misses")
             await llm_logger.write(entry)
         except Exception as log_exc:  # noqa: BLE001
             _svc_logger.debug("LLM logging failed (non-fatal): %s", log_exc)
@@ -297,6 +367,9 @@ class UniversalLLMService:
                 _response = await self._call_azure_vision(image_b64, system_prompt, user_text, model, max_tokens)
             else:  # openrouter
                 _response = await self._call_openrouter_vision(image_b64, system_prompt, user_text, model, max_tokens)
+        except asyncio.CancelledError:
+            _error = LLM_CALL_CANCELLED
+            raise
         except Exception as exc:
             _error = str(exc)
             raise
@@ -1,47 +1,290 @@
 """
-In-memory workflow state store for API v2.
+Workflow state store for API v2.
 
 Stores workflow status and results so GET /workflows/{id} and GET /workflows/{id}/results
-can return current state. Uses a simple dict; can be replaced with Redis/DB later.
+can return current state. Two backends, chosen by WORKFLOW_STORE_BACKEND:
+
+- "memory": per-process dict with LRU (WORKFLOW_STORE_MAX_ENTRIES) and TTL eviction
+- "database": workflow_records table, shared by every process/replica and kept
+  across restarts; results are stored zlib-compressed and cancel flags set by
+  one process are seen by the worker running the workflow
+
+Workflows not updated for WORKFLOW_STORE_TTL_SECONDS are evicted by both.
 
 Reference: Sprint 10 - Agent Workflow API
 """
-from typing import Dict, Any, Optional
-from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Protocol, Tuple
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import json
+import logging
 import threading
+import time
+import zlib
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between sweeps for expired workflows
+PURGE_INTERVAL_SECONDS = 60.0
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class WorkflowStore(Protocol):
+    """Storage backend behind the module-level functions."""
+
+    def get(self, workflow_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]: ...
+    def set(self, workflow_id: str, state: Dict[str, Any]) -> None: ...
+    def update(self, workflow_id: str, fields: Dict[str, Any]) -> None: ...
+    def delete(self, workflow_id: str) -> bool: ...
+    def request_cancel(self, workflow_id: str) -> bool: ...
+    def is_cancel_requested(self, workflow_id: str) -> bool: ...
+
+
+class MemoryWorkflowStore:
+    """Process-local store: LRU-bounded dict whose entries expire after ttl_seconds."""
 
-_lock = threading.Lock()
-_store: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries or settings.WORKFLOW_STORE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.WORKFLOW_STORE_TTL_SECONDS
+        self._lock = threading.Lock()
+        self._store: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
 
+    def _live(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """Entry if present and unexpired (caller holds the lock)."""
+        entry = self._store.get(workflow_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl_seconds:
+            del self._store[workflow_id]
+            return None
+        return entry[1]
 
-def get_state(workflow_id: str) -> Optional[Dict[str, Any]]:
-    """Return current workflow state or None if not found."""
-    with _lock:
-        return _store.get(workflow_id)
+    def _put(self, workflow_id: str, state: Dict[str, Any]) -> None:
+        """Store as most recently used and trim (caller holds the lock)."""
+        self._store[workflow_id] = (time.monotonic(), state)
+        self._store.move_to_end(workflow_id)
+        while len(self._store) > self.max_entries:
+            evicted, _ = self._store.popitem(last=False)
+            logger.debug("Workflow store evicted %s (LRU)", evicted)
+
+    def get(self, workflow_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            state = self._live(workflow_id)
+            if state is None:
+                return None
+            self._store.move_to_end(workflow_id)
+            if include_result:
+                return dict(state)
+            return {k: v for k, v in state.items() if k != "result"}
+
+    def set(self, workflow_id: str, state: Dict[str, Any]) -> None:
+        with self._lock:
+            previous = self._live(workflow_id) or {}
+            new_state = {**state, "updated_at": _now_iso()}
+            if "cancel_requested" not in state and previous.get("cancel_requested"):
+                new_state["cancel_requested"] = True
+            self._put(workflow_id, new_state)
+
+    def update(self, workflow_id: str, fields: Dict[str, Any]) -> None:
+        with self._lock:
+            state = dict(self._live(workflow_id) or {"workflow_id": workflow_id})
+            state.update(fields)
+            state["updated_at"] = _now_iso()
+            self._put(workflow_id, state)
+
+    def delete(self, workflow_id: str) -> bool:
+        with self._lock:
+            return self._store.pop(workflow_id, None) is not None
+
+    def request_cancel(self, workflow_id: str) -> bool:
+        with self._lock:
+            state = self._live(workflow_id)
+            if state is None:
+                return False
+            self._put(workflow_id, {**state, "cancel_requested": True, "updated_at": _now_iso()})
+            return True
+
+    def is_cancel_requested(self, workflow_id: str) -> bool:
+        with self._lock:
+            state = self._live(workflow_id)
+            return bool(state and state.get("cancel_requested"))
+
+
+class DatabaseWorkflowStore:
+    """
+    workflow_records-backed store shared across processes.
+
+    Each call uses its own short session. The compressed result is only
+    read when a caller asks for it.
+    """
+
+    def __init__(self, session_factory=None, ttl_seconds: Optional[float] = None):
+        if session_factory is None:
+            from app.db.session import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.WORKFLOW_STORE_TTL_SECONDS
+        self._last_purge = 0.0
+
+    @staticmethod
+    def _pack_result(result: Any) -> Optional[bytes]:
+        if result is None:
+            return None
+        return zlib.compress(json.dumps(result, default=str).encode("utf-8"))
+
+    @staticmethod
+    def _unpack_result(blob: Optional[bytes]) -> Any:
+        if blob is None:
+            return None
+        return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    def _to_state(self, record, include_result: bool) -> Dict[str, Any]:
+        state = json.loads(record.state or "{}")
+        state["updated_at"] = state.get("updated_at") or record.updated_at.isoformat()
+        if record.cancel_requested:
+            state["cancel_requested"] = True
+        if include_result and record.result is not None:
+            state["result"] = self._unpack_result(record.result)
+        return state
+
+    def _write(self, record, state: Dict[str, Any]) -> None:
+        """Copy a state dict onto a record (result and cancel flag go to their own columns)."""
+        state = dict(state)
+        if "result" in state:
+            record.result = self._pack_result(state.pop("result"))
+        if "cancel_requested" in state:
+            record.cancel_requested = bool(state.pop("cancel_requested"))
+        state["updated_at"] = _now_iso()
+        record.status = str(state.get("status") or record.status or "pending")[:32]
+        record.state = json.dumps(state, default=str)
+        record.updated_at = datetime.now(timezone.utc)
+
+    def _purge_expired(self, db) -> None:
+        now = time.monotonic()
+        if now - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        from app.models.workflow_record import WorkflowRecord
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+        purged = db.query(WorkflowRecord).filter(
+            WorkflowRecord.updated_at < cutoff
+        ).delete(synchronize_session=False)
+        if purged:
+            logger.info("Workflow store purged %d expired workflow(s)", purged)
+
+    def get(self, workflow_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        from sqlalchemy.orm import defer
+        from app.models.workflow_record import WorkflowRecord
+        with self.session_factory() as db:
+            query = db.query(WorkflowRecord)
+            if not include_result:
+                query = query.options(defer(WorkflowRecord.result))
+            record = query.filter(WorkflowRecord.workflow_id == workflow_id).first()
+            return self._to_state(record, include_result) if record else None
+
+    def set(self, workflow_id: str, state: Dict[str, Any]) -> None:
+        from app.models.workflow_record import WorkflowRecord
+        with self.session_factory() as db:
+            self._purge_expired(db)
+            record = db.get(WorkflowRecord, workflow_id)
+            if record is None:
+                record = WorkflowRecord(workflow_id=workflow_id)
+                db.add(record)
+            record.result = None
+            self._write(record, state)
+            db.commit()
+
+    def update(self, workflow_id: str, fields: Dict[str, Any]) -> None:
+        from sqlalchemy.orm import defer
+        from app.models.workflow_record import WorkflowRecord
+        with self.session_factory() as db:
+            record = db.query(WorkflowRecord).options(defer(WorkflowRecord.result)).filter(
+                WorkflowRecord.workflow_id == workflow_id
+            ).first()
+            if record is None:
+                record = WorkflowRecord(workflow_id=workflow_id, state=json.dumps({"workflow_id": workflow_id}))
+                db.add(record)
+            state = json.loads(record.state or "{}")
+            state.update(fields)
+            self._write(record, state)
+            db.commit()
+
+    def delete(self, workflow_id: str) -> bool:
+        from app.models.workflow_record import WorkflowRecord
+        with self.session_factory() as db:
+            deleted = db.query(WorkflowRecord).filter(
+                WorkflowRecord.workflow_id == workflow_id
+            ).delete(synchronize_session=False)
+            db.commit()
+            return bool(deleted)
+
+    def request_cancel(self, workflow_id: str) -> bool:
+        from app.models.workflow_record import WorkflowRecord
+        with self.session_factory() as db:
+            updated = db.query(WorkflowRecord).filter(
+                WorkflowRecord.workflow_id == workflow_id
+            ).update(
+                {WorkflowRecord.cancel_requested: True, WorkflowRecord.updated_at: datetime.now(timezone.utc)},
+                synchronize_session=False,
+            )
+            db.commit()
+            return bool(updated)
+
+    def is_cancel_requested(self, workflow_id: str) -> bool:
+        from app.models.workflow_record import WorkflowRecord
+        with self.session_factory() as db:
+            flag = db.query(WorkflowRecord.cancel_requested).filter(
+                WorkflowRecord.workflow_id == workflow_id
+            ).scalar()
+            return bool(flag)
+
+
+_store: Optional[WorkflowStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> WorkflowStore:
+    """Return the configured store (created on first use)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if settings.WORKFLOW_STORE_BACKEND == "database":
+                _store = DatabaseWorkflowStore()
+            else:
+                _store = MemoryWorkflowStore()
+        return _store
+
+
+def configure_store(store: Optional[WorkflowStore]) -> None:
+    """Replace the store (tests / custom backends); None restores the configured default."""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def get_state(workflow_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+    """Return current workflow state or None if not found (include_result=False skips the result payload)."""
+    return get_store().get(workflow_id, include_result)
 
 
 def set_state(workflow_id: str, state: Dict[str, Any]) -> None:
-    """Set full workflow state."""
-    with _lock:
-        _store[workflow_id] = {**state, "updated_at": datetime.now(timezone.utc).isoformat()}
+    """Set full workflow state (a pending cancel request is kept unless state sets cancel_requested)."""
+    get_store().set(workflow_id, state)
 
 
 def update_state(workflow_id: str, **kwargs: Any) -> None:
     """Update specific fields of workflow state."""
-    with _lock:
-        if workflow_id not in _store:
-            _store[workflow_id] = {"workflow_id": workflow_id}
-        _store[workflow_id].update(kwargs)
-        _store[workflow_id]["updated_at"] = datetime.now(timezone.utc).isoformat()
+    get_store().update(workflow_id, kwargs)
 
 
 def delete_state(workflow_id: str) -> bool:
     """Remove workflow state. Returns True if existed."""
-    with _lock:
-        if workflow_id in _store:
-            del _store[workflow_id]
-            return True
-        return False
+    return get_store().delete(workflow_id)
 
 
 def request_cancel(workflow_id: str) -> bool:
@@ -50,16 +293,9 @@ def request_cancel(workflow_id: str) -> bool:
     Orchestration checks this between stages and stops cleanly.
     Returns True if the workflow existed (state was updated).
     """
-    with _lock:
-        if workflow_id not in _store:
-            return False
-        _store[workflow_id]["cancel_requested"] = True
-        _store[workflow_id]["updated_at"] = datetime.now(timezone.utc).isoformat()
-        return True
+    return get_store().request_cancel(workflow_id)
 
 
 def is_cancel_requested(workflow_id: str) -> bool:
     """Return True if cancellation was requested for this workflow."""
-    with _lock:
-        state = _store.get(workflow_id)
-        return bool(state and state.get("cancel_requested"))
+    return get_store().is_cancel_requested(workflow_id)
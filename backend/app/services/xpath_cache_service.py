@@ -2,13 +2,21 @@
 XPath Cache Service for Tier 2 (Hybrid Mode)
 Caches extracted XPath selectors to avoid repeated LLM calls
 Sprint 5.5: 3-Tier Execution Engine
+
+Lookups go through a process-wide LRU (keyed by generate_cache_key) in front
+of the xpath_cache table. Hit counts and successful validations are buffered
+in memory and written to the table in batches by a background flusher, so a
+cache hit costs no database round-trip.
 """
+import atexit
 import hashlib
 import json
 import re
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Set, Tuple
 from urllib.parse import urlparse, urlunparse
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
@@ -19,6 +27,172 @@ from app.schemas.execution_settings import XPathCacheCreate, XPathCacheUpdate
 
 logger = logging.getLogger(__name__)
 
+# In-process LRU in front of the xpath_cache table
+MEMORY_CACHE_MAX_ENTRIES = 2048
+# Bounds how long another worker's invalidation can go unnoticed
+MEMORY_CACHE_TTL_SECONDS = 300
+# Interval between batched hit-count / last_validated writes
+HIT_FLUSH_INTERVAL_SECONDS = 5
+# Max bound parameters per IN (...) clause when prefetching
+PREFETCH_CHUNK_SIZE = 500
+
+
+class _XPathMemoryCache:
+    """
+    Thread-safe LRU + TTL cache of xpath_cache rows, with buffered hit counts.
+
+    Values are plain dicts (no ORM objects) so they can be shared across
+    sessions and threads.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # cache_key -> (loaded_at monotonic, row dict)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # cache_key -> [pending hits, last validated at]
+        self._pending: Dict[str, List[Any]] = {}
+        self._flusher: Optional[threading.Thread] = None
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._entries.get(cache_key)
+            if item is None:
+                return None
+            loaded_at, row = item
+            if time.monotonic() - loaded_at > self.ttl_seconds:
+                del self._entries[cache_key]
+                return None
+            self._entries.move_to_end(cache_key)
+            return row
+
+    def put(self, cache_key: str, row: Dict[str, Any]):
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic(), row)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, cache_key: Optional[str] = None):
+        """Drop one key, or everything when cache_key is None (buffered hits are kept)."""
+        with self._lock:
+            if cache_key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(cache_key, None)
+
+    def record_hit(self, cache_key: str) -> int:
+        """Buffer one hit; returns the hit count including unflushed hits."""
+        with self._lock:
+            pending = self._pending.setdefault(cache_key, [0, None])
+            pending[0] += 1
+            item = self._entries.get(cache_key)
+            base = item[1]["hit_count"] if item else 0
+            total = base + pending[0]
+        self._ensure_flusher()
+        return total
+
+    def record_validated(self, cache_key: str):
+        """Buffer a successful validation (last_validated timestamp)."""
+        with self._lock:
+            self._pending.setdefault(cache_key, [0, None])[1] = datetime.utcnow()
+        self._ensure_flusher()
+
+    def drain_pending(self) -> Dict[str, List[Any]]:
+        """Take buffered writes, folding hit counts into the cached rows."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            for cache_key, (hits, _) in pending.items():
+                item = self._entries.get(cache_key)
+                if item:
+                    item[1]["hit_count"] += hits
+            return pending
+
+    def restore_pending(self, pending: Dict[str, List[Any]]):
+        """Put back writes whose flush failed."""
+        with self._lock:
+            for cache_key, (hits, validated_at) in pending.items():
+                item = self._entries.get(cache_key)
+                if item:
+                    item[1]["hit_count"] -= hits
+                current = self._pending.setdefault(cache_key, [0, None])
+                current[0] += hits
+                current[1] = current[1] or validated_at
+
+    def _ensure_flusher(self):
+        if self._flusher and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="xpath-cache-flusher", daemon=True
+            )
+            self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(HIT_FLUSH_INTERVAL_SECONDS)
+            flush_hit_counts()
+
+
+_memory_cache = _XPathMemoryCache(MEMORY_CACHE_MAX_ENTRIES, MEMORY_CACHE_TTL_SECONDS)
+
+
+def invalidate_memory_cache(cache_key: Optional[str] = None):
+    """
+    Evict an entry (or all entries) from the in-process XPath cache.
+
+    Call after deleting xpath_cache rows outside XPathCacheService.
+    """
+    _memory_cache.invalidate(cache_key)
+
+
+def flush_hit_counts(db: Optional[Session] = None) -> int:
+    """
+    Write buffered hit counts and validations to the xpath_cache table.
+
+    Args:
+        db: Session to use (default: a new SessionLocal session)
+
+    Returns:
+        Number of cache entries updated
+    """
+    pending = _memory_cache.drain_pending()
+    if not pending:
+        return 0
+
+    own_session = db is None
+    if own_session:
+        from app.db.session import SessionLocal
+        db = SessionLocal()
+    try:
+        for cache_key, (hits, validated_at) in pending.items():
+            values: Dict[Any, Any] = {}
+            if hits:
+                values[XPathCacheModel.hit_count] = XPathCacheModel.hit_count + hits
+            if validated_at:
+                values[XPathCacheModel.last_validated] = validated_at
+            if values:
+                db.query(XPathCacheModel).filter(
+                    XPathCacheModel.cache_key == cache_key
+                ).update(values, synchronize_session=False)
+        db.commit()
+        logger.debug(f"[XPath Cache] 💾 Flushed hit counts for {len(pending)} entries")
+        return len(pending)
+    except Exception as e:
+        db.rollback()
+        _memory_cache.restore_pending(pending)
+        logger.warning(f"[XPath Cache] Failed to flush hit counts: {e}")
+        return 0
+    finally:
+        if own_session:
+            db.close()
+
+
+atexit.register(flush_hit_counts)
+
 
 class XPathCacheService:
     """
@@ -37,6 +211,13 @@ class XPathCacheService:
         """
         self.db = db
         self.cache_ttl_hours = 168  # 7 days default TTL
+        # Run-scoped snapshot loaded by prefetch(): cache_key -> row
+        self._prefetched: Dict[str, Dict[str, Any]] = {}
+        # Instructions covered by prefetch(); a key missing from the snapshot
+        # for one of these is a miss without a DB query
+        self._prefetched_instructions: Set[str] = set()
+        # Keys whose cached element changed on the page this run (mark_stale())
+        self._stale_keys: Set[str] = set()
     
     @staticmethod
     def generate_cache_key(page_url: str, instruction: str) -> str:
@@ -72,6 +253,46 @@ class XPathCacheService:
 
         return urlunparse((parsed.scheme, parsed.netloc, path, "", parsed.query, ""))
     
+    def prefetch(self, instructions: Iterable[str]) -> int:
+        """
+        Load every valid cache entry for a test's step instructions in one pass.
+        
+        Entries are matched by instruction only, so rows recorded on any page
+        (including pages reached later in the run) are included. They are held
+        for the lifetime of this service, so later lookups for these
+        instructions never query the database.
+        
+        Args:
+            instructions: Step instructions of the test about to run
+            
+        Returns:
+            Number of cache entries loaded
+        """
+        wanted = sorted({i for i in instructions if i and isinstance(i, str)})
+        if not wanted:
+            return 0
+        
+        entries = []
+        for start in range(0, len(wanted), PREFETCH_CHUNK_SIZE):
+            chunk = wanted[start:start + PREFETCH_CHUNK_SIZE]
+            entries.extend(
+                self.db.query(XPathCacheModel).filter(
+                    and_(
+                        XPathCacheModel.instruction.in_(chunk),
+                        XPathCacheModel.is_valid == True
+                    )
+                ).all()
+            )
+        
+        for cache_entry in entries:
+            self._prefetched[cache_entry.cache_key] = self._to_row(cache_entry)
+        self._prefetched_instructions.update(wanted)
+        
+        logger.info(
+            f"[XPath Cache] 📦 Prefetched {len(entries)} entries for {len(wanted)} instructions"
+        )
+        return len(entries)
+    
     def get_cached_xpath(
         self,
         page_url: str,
@@ -88,40 +309,55 @@ class XPathCacheService:
             Dict with xpath and metadata if found and valid, None otherwise
         """
         cache_key = self.generate_cache_key(page_url, instruction)
+        if cache_key in self._stale_keys:
+            logger.debug(f"[XPath Cache] ❌ Cache entry known stale this run: {cache_key}")
+            return None
         
-        # Query cache
-        cache_entry = self.db.query(XPathCacheModel).filter(
-            and_(
-                XPathCacheModel.cache_key == cache_key,
-                XPathCacheModel.is_valid == True
-            )
-        ).first()
-        
-        if not cache_entry:
-            logger.debug(f"[XPath Cache] ❌ Cache miss for key: {cache_key}")
+        row = self._lookup_row(cache_key)
+        if row is None and instruction in self._prefetched_instructions:
+            logger.debug(f"[XPath Cache] ❌ Cache miss (prefetched) for key: {cache_key}")
             return None
+        if row is None:
+            # Query cache
+            cache_entry = self.db.query(XPathCacheModel).filter(
+                and_(
+                    XPathCacheModel.cache_key == cache_key,
+                    XPathCacheModel.is_valid == True
+                )
+            ).first()
+            
+            if not cache_entry:
+                logger.debug(f"[XPath Cache] ❌ Cache miss for key: {cache_key}")
+                return None
+            
+            row = self._to_row(cache_entry)
+            _memory_cache.put(cache_key, row)
         
         # Check if cache is stale
-        if self._is_cache_stale(cache_entry):
+        cache_age_hours = self._get_row_age_hours(row)
+        if cache_age_hours > self.cache_ttl_hours:
             logger.info(f"[XPath Cache] ⏰ Cache stale for key: {cache_key}")
+            self._evict(cache_key)
             return None
         
-        # Increment hit count
-        cache_entry.hit_count += 1
-        self.db.commit()
+        # Increment hit count (buffered, flushed in the background)
+        hit_count = _memory_cache.record_hit(cache_key)
         
         logger.info(
             f"[XPath Cache] ✅ Cache hit! Key: {cache_key}, "
-            f"Hits: {cache_entry.hit_count}, XPath: {cache_entry.xpath}"
+            f"Hits: {hit_count}, XPath: {row['xpath']}"
         )
         
         return {
-            "xpath": cache_entry.xpath,
-            "selector_type": cache_entry.selector_type,
-            "hit_count": cache_entry.hit_count,
-            "page_title": cache_entry.page_title,
-            "element_text": cache_entry.element_text,
-            "cache_age_hours": self._get_cache_age_hours(cache_entry)
+            "cache_key": cache_key,
+            "xpath": row["xpath"],
+            "selector_type": row["selector_type"],
+            "element_fingerprint": row.get("element_fingerprint"),
+            "page_fingerprint": row.get("page_fingerprint"),
+            "hit_count": hit_count,
+            "page_title": row["page_title"],
+            "element_text": row["element_text"],
+            "cache_age_hours": cache_age_hours
         }
     
     def cache_xpath(
@@ -132,7 +368,9 @@ class XPathCacheService:
         extraction_time_ms: Optional[float] = None,
         page_title: Optional[str] = None,
         element_text: Optional[str] = None,
-        extra_data: Optional[Dict[str, Any]] = None
+        extra_data: Optional[Dict[str, Any]] = None,
+        element_fingerprint: Optional[str] = None,
+        page_fingerprint: Optional[str] = None
     ) -> XPathCacheModel:
         """
         Cache an extracted XPath selector.
@@ -145,11 +383,14 @@ class XPathCacheService:
             page_title: Title of the page
             element_text: Text content of the element
             extra_data: Additional data as dictionary
+            element_fingerprint: Structural fingerprint of the target element
+            page_fingerprint: DOM fingerprint of the page state it was cached on
             
         Returns:
             Created XPathCacheModel instance
         """
         cache_key = self.generate_cache_key(page_url, instruction)
+        self._stale_keys.discard(cache_key)
         
         # Check if entry already exists
         existing_entry = self.db.query(XPathCacheModel).filter(
@@ -163,12 +404,15 @@ class XPathCacheService:
             existing_entry.page_title = page_title
             existing_entry.element_text = element_text
             existing_entry.extra_data = json.dumps(extra_data) if extra_data else None
+            existing_entry.element_fingerprint = element_fingerprint
+            existing_entry.page_fingerprint = page_fingerprint
             existing_entry.is_valid = True
             existing_entry.validation_failures = 0
             existing_entry.updated_at = datetime.utcnow()
             
             self.db.commit()
             self.db.refresh(existing_entry)
+            self._store_row(cache_key, self._to_row(existing_entry))
             
             logger.info(f"[XPath Cache] 🔄 Updated cache entry for key: {cache_key}")
             return existing_entry
@@ -184,6 +428,8 @@ class XPathCacheService:
             page_title=page_title,
             element_text=element_text,
             extra_data=json.dumps(extra_data) if extra_data else None,
+            element_fingerprint=element_fingerprint,
+            page_fingerprint=page_fingerprint,
             is_valid=True,
             validation_failures=0,
             hit_count=0
@@ -192,10 +438,41 @@ class XPathCacheService:
         self.db.add(cache_entry)
         self.db.commit()
         self.db.refresh(cache_entry)
+        self._store_row(cache_key, self._to_row(cache_entry))
         
         logger.info(f"[XPath Cache] ✅ Created cache entry for key: {cache_key}")
         return cache_entry
     
+    def fingerprinted_entries(self, page_url: str) -> Dict[str, Tuple[str, str, Optional[str]]]:
+        """
+        Prefetched entries for a page that carry an element fingerprint.
+        
+        Args:
+            page_url: URL of the page
+            
+        Returns:
+            cache_key -> (xpath, element_fingerprint, page_fingerprint), for
+            batch validation
+        """
+        normalized_page_url = self.normalize_cacheable_url(page_url)
+        return {
+            cache_key: (row["xpath"], row["element_fingerprint"], row.get("page_fingerprint"))
+            for cache_key, row in self._prefetched.items()
+            if row.get("element_fingerprint")
+            and cache_key not in self._stale_keys
+            and self.normalize_cacheable_url(row.get("page_url")) == normalized_page_url
+        }
+    
+    def mark_stale(self, cache_key: str):
+        """
+        Skip a cache entry for the rest of this run (its element changed on the page).
+        
+        Args:
+            cache_key: Key of the cache entry
+        """
+        self._stale_keys.add(cache_key)
+        logger.info(f"[XPath Cache] ⏭️ Skipping structurally changed entry this run: {cache_key}")
+    
     def invalidate_cache(
         self,
         page_url: str,
@@ -211,6 +488,7 @@ class XPathCacheService:
             error_message: Optional error message for logging
         """
         cache_key = self.generate_cache_key(page_url, instruction)
+        self._evict(cache_key)
         
         cache_entry = self.db.query(XPathCacheModel).filter(
             XPathCacheModel.cache_key == cache_key
@@ -229,6 +507,8 @@ class XPathCacheService:
                 )
             
             self.db.commit()
+            if cache_entry.is_valid:
+                self._store_row(cache_key, self._to_row(cache_entry))
             
             if error_message:
                 logger.info(f"[XPath Cache] ⚠️ Validation failed: {error_message}")
@@ -249,6 +529,15 @@ class XPathCacheService:
         """
         cache_key = self.generate_cache_key(page_url, instruction)
         
+        if is_valid:
+            row = self._lookup_row(cache_key)
+            if row is not None and row["validation_failures"] == 0:
+                # Nothing to reset; only last_validated changes, so buffer it
+                _memory_cache.record_validated(cache_key)
+                logger.debug(f"[XPath Cache] ✅ Validated cache entry: {cache_key}")
+                return
+        self._evict(cache_key)
+        
         cache_entry = self.db.query(XPathCacheModel).filter(
             XPathCacheModel.cache_key == cache_key
         ).first()
@@ -267,6 +556,8 @@ class XPathCacheService:
                     logger.warning(f"[XPath Cache] ❌ Invalidated cache entry: {cache_key}")
             
             self.db.commit()
+            if cache_entry.is_valid:
+                self._store_row(cache_key, self._to_row(cache_entry))
     
     def clear_invalid_entries(self) -> int:
         """
@@ -280,6 +571,8 @@ class XPathCacheService:
         ).delete()
         
         self.db.commit()
+        _memory_cache.invalidate()
+        self._prefetched.clear()
         
         logger.info(f"[XPath Cache] 🧹 Cleared {deleted_count} invalid cache entries")
         return deleted_count
@@ -302,6 +595,8 @@ class XPathCacheService:
         ).delete()
         
         self.db.commit()
+        _memory_cache.invalidate()
+        self._prefetched.clear()
         
         logger.info(f"[XPath Cache] 🧹 Cleared {deleted_count} stale cache entries (older than {max_age}h)")
         return deleted_count
@@ -313,6 +608,8 @@ class XPathCacheService:
         Returns:
             Dictionary with cache statistics
         """
+        flush_hit_counts(self.db)
+        
         total_entries = self.db.query(XPathCacheModel).count()
         valid_entries = self.db.query(XPathCacheModel).filter(
             XPathCacheModel.is_valid == True
@@ -357,3 +654,43 @@ class XPathCacheService:
         """Get cache entry age in hours"""
         age_delta = datetime.utcnow() - (cache_entry.updated_at or cache_entry.created_at)
         return age_delta.total_seconds() / 3600
+    
+    def _lookup_row(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Find a cache row in the LRU or this run's prefetched snapshot"""
+        row = _memory_cache.get(cache_key)
+        if row is None:
+            row = self._prefetched.get(cache_key)
+            if row is not None:
+                _memory_cache.put(cache_key, row)
+        return row
+    
+    def _store_row(self, cache_key: str, row: Dict[str, Any]):
+        """Record a freshly written cache row in the LRU and prefetched snapshot"""
+        _memory_cache.put(cache_key, row)
+        if self._prefetched_instructions:
+            self._prefetched[cache_key] = row
+    
+    def _evict(self, cache_key: str):
+        """Drop a cache key from the LRU and prefetched snapshot"""
+        _memory_cache.invalidate(cache_key)
+        self._prefetched.pop(cache_key, None)
+    
+    def _get_row_age_hours(self, row: Dict[str, Any]) -> float:
+        """Get age in hours of an in-memory cache row"""
+        return (datetime.utcnow() - row["updated_at"]).total_seconds() / 3600
+    
+    @staticmethod
+    def _to_row(cache_entry: XPathCacheModel) -> Dict[str, Any]:
+        """Snapshot a cache entry for the in-process LRU"""
+        return {
+            "page_url": cache_entry.page_url,
+            "xpath": cache_entry.xpath,
+            "selector_type": cache_entry.selector_type,
+            "element_fingerprint": cache_entry.element_fingerprint,
+            "page_fingerprint": cache_entry.page_fingerprint,
+            "hit_count": cache_entry.hit_count or 0,
+            "page_title": cache_entry.page_title,
+            "element_text": cache_entry.element_text,
+            "validation_failures": cache_entry.validation_failures or 0,
+            "updated_at": cache_entry.updated_at or cache_entry.created_at or datetime.utcnow(),
+        }
@@ -10,6 +10,8 @@ from playwright.async_api import Page
 from stagehand import Stagehand
 import logging
 
+from app.services.observe_memo import dom_fingerprint, get_observe_memo, observe_candidate
+
 logger = logging.getLogger(__name__)
 
 
@@ -154,6 +156,8 @@ class XPathExtractor:
         Extract XPath selector using an existing Playwright Page.
         
         This method creates a temporary Stagehand instance with the provided page.
+        Candidates from earlier observe() calls on a page with the same DOM
+        fingerprint are matched first (see observe_memo); a match skips observe().
         
         Args:
             page: Playwright Page object
@@ -171,6 +175,30 @@ class XPathExtractor:
             
             logger.info(f"[XPath Extractor] Extracting XPath on {page_url} for: {instruction}")
             
+            memo = get_observe_memo()
+            fingerprint = await dom_fingerprint(page) if memo.enabled else None
+            memoized = memo.match(fingerprint, instruction) if fingerprint else None
+            if memoized:
+                xpath = memoized["selector"]
+                if xpath.startswith('xpath='):
+                    xpath = xpath[6:]
+                extraction_time_ms = (time.time() - start_time) * 1000
+                logger.info(
+                    f"[XPath Extractor] ♻️ Matched memoized observe() candidate in {extraction_time_ms:.2f}ms: {xpath}"
+                )
+                return {
+                    "xpath": xpath,
+                    "selector_type": "xpath",
+                    "extraction_time_ms": extraction_time_ms,
+                    "element_text": memoized.get("description"),
+                    "element_html": None,
+                    "page_title": page_title,
+                    "page_url": page_url,
+                    "dom_fingerprint": fingerprint,
+                    "memo_hit": True,
+                    "success": True
+                }
+            
             # Use observe with the page context
             # Note: This requires Stagehand to be initialized with a page
             if not self.stagehand:
@@ -185,6 +213,11 @@ class XPathExtractor:
             if not result or (isinstance(result, list) and len(result) == 0):
                 raise ValueError(f"observe() returned no results for: {instruction}")
             
+            if fingerprint:
+                # Keep every candidate so later steps on this page can skip observe()
+                candidates = [observe_candidate(item) for item in (result if isinstance(result, list) else [result])]
+                memo.add(fingerprint, [candidate for candidate in candidates if candidate])
+            
             # observe() returns a list of ObserveResult objects, take first one
             if isinstance(result, list):
                 result = result[0]
@@ -215,6 +248,8 @@ class XPathExtractor:
                 "element_html": element_html,
                 "page_title": page_title,
                 "page_url": page_url,
+                "dom_fingerprint": fingerprint,
+                "memo_hit": False,
                 "success": True
             }
             
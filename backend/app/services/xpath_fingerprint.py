@@ -0,0 +1,133 @@
+"""
+Structural fingerprints of cached XPath targets.
+
+When Tier 2 caches an XPath it also stores a compact fingerprint of the
+element it resolved to: the element's tag, type, name, role, placeholder and
+normalized text (not for selects) plus the tag/role chain of its ancestors.
+Ids, classes, values and digits are left out because they change between
+page loads.
+
+Each entry also stores the page state it was cached on: the DOM fingerprint
+of the page's interactive elements (see observe_memo).
+
+On a later cache hit, one evaluate() call resolves every fingerprinted cached
+XPath for the page, reports each as "ok", "missing" (nothing at the XPath
+yet) or "changed" (the XPath now lands on a different element), and returns
+the current page state. A changed entry is known stale: it is skipped
+straight away instead of being found out through a failed or timed-out
+action. Other steps' entries are only marked stale when they were cached on
+the page state the browser is in now; on any other state their positional
+XPaths and state-dependent text can look changed before the page gets there.
+"""
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.observe_memo import DOM_FINGERPRINT_SCRIPT
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_OK = "ok"
+FINGERPRINT_MISSING = "missing"
+FINGERPRINT_CHANGED = "changed"
+
+# Ancestor levels included in an element fingerprint
+ANCESTOR_DEPTH = 5
+
+_FINGERPRINT_FUNCTION = """
+    const resolve = (xpath) => {
+        try {
+            return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        } catch (e) {
+            return null;
+        }
+    };
+    const fingerprint = (el) => {
+        const attr = (node, name) => (node.getAttribute && node.getAttribute(name)) || '';
+        // A select's text is its option list, which is often filled in late
+        const text = el.tagName === 'SELECT' ? '' : (el.innerText || el.textContent || '').replace(/[0-9]+/g, '').replace(/\\s+/g, ' ').trim().toLowerCase().slice(0, 40);
+        const parts = [el.tagName, attr(el, 'type'), attr(el, 'name'), attr(el, 'role'), attr(el, 'placeholder'), text];
+        let node = el.parentElement;
+        for (let level = 0; node && level < %(depth)d; level++, node = node.parentElement) {
+            parts.push(node.tagName + '[' + attr(node, 'role') + ']');
+        }
+        const value = parts.join('|');
+        let h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+        for (let i = 0; i < value.length; i++) {
+            const ch = value.charCodeAt(i);
+            h1 = Math.imul(h1 ^ ch, 2654435761);
+            h2 = Math.imul(h2 ^ ch, 1597334677);
+        }
+        h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+        h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+        return (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(16);
+    };
+""" % {"depth": ANCESTOR_DEPTH}
+
+# (xpath) -> {element: fingerprint of the element it resolves to or null, page: DOM fingerprint}
+CACHE_FINGERPRINTS_SCRIPT = "(xpath) => {" + _FINGERPRINT_FUNCTION + """
+    const el = resolve(xpath);
+    return {element: el ? fingerprint(el) : null, page: (""" + DOM_FINGERPRINT_SCRIPT + """)()};
+}"""
+
+# ({key: [xpath, fingerprint]}) -> {page: DOM fingerprint, statuses: {key: "ok" | "missing" | "changed"}}
+VALIDATE_FINGERPRINTS_SCRIPT = "(entries) => {" + _FINGERPRINT_FUNCTION + """
+    const statuses = {};
+    for (const [key, [xpath, expected]] of Object.entries(entries)) {
+        const el = resolve(xpath);
+        statuses[key] = !el ? 'missing' : (fingerprint(el) === expected ? 'ok' : 'changed');
+    }
+    return {page: (""" + DOM_FINGERPRINT_SCRIPT + """)(), statuses};
+}"""
+
+
+def _fingerprint_or_none(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) and value else None
+
+
+async def cache_fingerprints(page: Any, xpath: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Fingerprints to store with a cached XPath, in one round-trip.
+
+    Returns:
+        (fingerprint of the element the XPath resolves to, DOM fingerprint of
+        the page); either is None if absent or unavailable
+    """
+    try:
+        result = await page.evaluate(CACHE_FINGERPRINTS_SCRIPT, xpath)
+    except Exception as e:
+        logger.debug(f"[XPath Fingerprint] Could not fingerprint {xpath}: {e}")
+        return None, None
+    if not isinstance(result, dict):
+        return None, None
+    return _fingerprint_or_none(result.get("element")), _fingerprint_or_none(result.get("page"))
+
+
+async def validate_fingerprints(
+    page: Any,
+    entries: Dict[str, Tuple[str, str]],
+) -> Tuple[Optional[str], Dict[str, str]]:
+    """
+    Check cached XPaths against their stored fingerprints in one round-trip.
+
+    Args:
+        page: Playwright Page object
+        entries: cache_key -> (xpath, stored fingerprint)
+
+    Returns:
+        (DOM fingerprint of the page, cache_key -> FINGERPRINT_OK /
+        FINGERPRINT_MISSING / FINGERPRINT_CHANGED); (None, {}) when the page
+        could not be checked
+    """
+    if not entries:
+        return None, {}
+    try:
+        result = await page.evaluate(
+            VALIDATE_FINGERPRINTS_SCRIPT,
+            {key: [xpath, fingerprint] for key, (xpath, fingerprint) in entries.items()},
+        )
+    except Exception as e:
+        logger.debug(f"[XPath Fingerprint] Could not validate cached XPaths: {e}")
+        return None, {}
+    if not isinstance(result, dict) or not isinstance(result.get("statuses"), dict):
+        return None, {}
+    return _fingerprint_or_none(result.get("page")), result["statuses"]
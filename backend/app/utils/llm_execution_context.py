@@ -58,3 +58,63 @@ def set_llm_context(
         "caller": caller,
     }
     return llm_exec_ctx.set(ctx)
+
+
+# ---------------------------------------------------------------------------
+# Token usage accounting: an accumulator dict that LLM log writers add to.
+# None (the default) means nobody is counting.
+# ---------------------------------------------------------------------------
+llm_usage_ctx: ContextVar[Optional[dict]] = ContextVar("llm_usage_ctx", default=None)
+
+# Error recorded for a call whose task was cancelled mid-request
+LLM_CALL_CANCELLED = "cancelled"
+# Rough prompt size per token, for calls that never got a usage report
+CHARS_PER_TOKEN = 4
+
+
+def new_llm_usage() -> dict:
+    """Empty token usage accumulator."""
+    return {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+
+def track_llm_usage(usage: dict):
+    """Count the tokens of LLM calls made by the current async task into ``usage``.
+
+    The caller keeps a reference to ``usage``, so it can read what was spent
+    even after the task is cancelled. Returns the reset token.
+    """
+    return llm_usage_ctx.set(usage)
+
+
+def record_llm_usage(
+    prompt_tokens: Optional[int],
+    completion_tokens: Optional[int],
+    total_tokens: Optional[int],
+) -> None:
+    """Add one LLM call's tokens to the current accumulator (no-op when not tracking)."""
+    usage = llm_usage_ctx.get()
+    if usage is None:
+        return
+    prompt_tokens = prompt_tokens or 0
+    completion_tokens = completion_tokens or 0
+    usage["calls"] += 1
+    usage["prompt_tokens"] += prompt_tokens
+    usage["completion_tokens"] += completion_tokens
+    usage["total_tokens"] += total_tokens or (prompt_tokens + completion_tokens)
+
+
+def estimate_prompt_tokens(messages: list) -> int:
+    """Approximate prompt tokens of ``messages`` (a cancelled call's prompt is still billed)."""
+    chars = sum(len(str(message.get("content", ""))) for message in messages)
+    return chars // CHARS_PER_TOKEN
+
+
+def llm_usage_cost_usd(usage: dict) -> float:
+    """Estimated cost of an accumulator's tokens at LLM_COST_PER_1K_*_TOKENS (0 when unset)."""
+    from app.core.config import settings
+
+    return round(
+        usage["prompt_tokens"] / 1000 * settings.LLM_COST_PER_1K_PROMPT_TOKENS
+        + usage["completion_tokens"] / 1000 * settings.LLM_COST_PER_1K_COMPLETION_TOKENS,
+        6,
+    )
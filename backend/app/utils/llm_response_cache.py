@@ -0,0 +1,235 @@
+"""
+Content-addressed LLM response cache.
+
+Responses are keyed by a SHA-256 of (provider, model, messages, temperature,
+max_tokens, routing options) and stored in two tiers:
+  - a bounded in-memory LRU (per process)
+  - a SQLite file shared by every process on the host (survives restarts)
+
+Both tiers honour the same TTL. Only deterministic calls are cached by
+default: UniversalLLMService.chat_completion bypasses the cache when
+temperature > 0 unless the caller forces it with cache=True.
+
+Public API consumed by universal_llm.py:
+  - LLMResponseCache.make_key(...) -> str
+  - LLMResponseCache.get(key) -> (response | None, tier | None)
+  - LLMResponseCache.put(key, response) -> None
+  - LLMResponseCache.stats() -> dict
+  - get_llm_response_cache() -> LLMResponseCache | None   (None when disabled)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """Two-tier (LRU + SQLite) cache of chat completion responses."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = "cache/llm_responses.sqlite3",
+        max_entries: int = 512,
+        ttl_seconds: float = 86400,
+    ) -> None:
+        self._db_path = Path(db_path) if db_path else None
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # key -> (stored_at epoch seconds, response JSON)
+        self._memory: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._disk_ready = False
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(
+        *,
+        provider: str,
+        model: Optional[str],
+        messages: list,
+        temperature: float,
+        max_tokens: Optional[int],
+        **options: Any,
+    ) -> str:
+        """Hash everything that determines the provider's answer (never the API key)."""
+        payload = {
+            "provider": provider,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "options": {k: v for k, v in sorted(options.items()) if v is not None},
+        }
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> tuple[Optional[dict], Optional[str]]:
+        """Return (response, tier) where tier is "memory" or "disk"; (None, None) on miss."""
+        now = time.time()
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                stored_at, raw = item
+                if now - stored_at <= self._ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return json.loads(raw), "memory"
+                del self._memory[key]
+
+        row = self._disk_get(key, now)
+        with self._lock:
+            if row is None:
+                self._counters["misses"] += 1
+                return None, None
+            self._remember(key, *row)
+            self._counters["disk_hits"] += 1
+        return json.loads(row[1]), "disk"
+
+    def put(self, key: str, response: dict) -> None:
+        """Store a successful response in both tiers."""
+        try:
+            raw = json.dumps(response, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return  # Not JSON-serialisable; skip caching
+        stored_at = time.time()
+        with self._lock:
+            self._remember(key, stored_at, raw)
+            self._counters["stores"] += 1
+        self._disk_put(key, stored_at, raw)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process."""
+        with self._lock:
+            counters = dict(self._counters)
+            counters["memory_entries"] = len(self._memory)
+        counters["hits"] = counters["memory_hits"] + counters["disk_hits"]
+        return counters
+
+    def clear(self) -> None:
+        """Drop every cached response (both tiers)."""
+        with self._lock:
+            self._memory.clear()
+        if self._db_path is None:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM llm_responses")
+        except sqlite3.Error as exc:
+            logger.debug("LLMResponseCache: swallowed clear error: %s", exc)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: str, stored_at: float, raw: str) -> None:
+        """Insert into the LRU (caller must hold the lock)."""
+        self._memory[key] = (stored_at, raw)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the SQLite file for one transaction; the connection is always closed."""
+        if not self._disk_ready:
+            try:
+                self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            except OSError as exc:
+                raise sqlite3.OperationalError(f"cannot create cache directory: {exc}") from exc
+        conn = sqlite3.connect(str(self._db_path), timeout=5)
+        try:
+            with conn:  # Commits on success, rolls back on error
+                if not self._disk_ready:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS llm_responses ("
+                        "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, response TEXT NOT NULL)"
+                    )
+                    self._disk_ready = True
+                yield conn
+        finally:
+            conn.close()
+
+    def _disk_get(self, key: str, now: float) -> Optional[tuple[float, str]]:
+        if self._db_path is None:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT stored_at, response FROM llm_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if now - row[0] > self._ttl_seconds:
+                    conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                    return None
+                return row[0], row[1]
+        except sqlite3.Error as exc:
+            logger.debug("LLMResponseCache: swallowed read error: %s", exc)
+            return None
+
+    def _disk_put(self, key: str, stored_at: float, raw: str) -> None:
+        if self._db_path is None:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, stored_at, response) VALUES (?, ?, ?)",
+                    (key, stored_at, raw),
+                )
+                conn.execute(
+                    "DELETE FROM llm_responses WHERE stored_at < ?",
+                    (stored_at - self._ttl_seconds,),
+                )
+        except sqlite3.Error as exc:
+            logger.debug("LLMResponseCache: swallowed write error: %s", exc)
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton (used by universal_llm.py)
+# ---------------------------------------------------------------------------
+
+_cache_instance: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache(force: bool = False) -> Optional[LLMResponseCache]:
+    """
+    Return the shared cache, or None when LLM_RESPONSE_CACHE_ENABLED is off.
+
+    force=True returns the cache regardless of the setting (per-call opt-in).
+    """
+    global _cache_instance
+
+    try:
+        from app.core.config import settings  # type: ignore
+
+        enabled = bool(getattr(settings, "LLM_RESPONSE_CACHE_ENABLED", False))
+        db_path = getattr(settings, "LLM_RESPONSE_CACHE_PATH", "cache/llm_responses.sqlite3")
+        max_entries = int(getattr(settings, "LLM_RESPONSE_CACHE_MAX_ENTRIES", 512))
+        ttl_seconds = float(getattr(settings, "LLM_RESPONSE_CACHE_TTL_SECONDS", 86400))
+    except Exception:  # settings unavailable (tests, CLI)
+        enabled, db_path, max_entries, ttl_seconds = False, None, 512, 86400.0
+
+    if not (enabled or force):
+        return None
+
+    with _cache_lock:
+        if _cache_instance is None:
+            _cache_instance = LLMResponseCache(
+                db_path=db_path or None, max_entries=max_entries, ttl_seconds=ttl_seconds
+            )
+        return _cache_instance
@@ -0,0 +1,86 @@
+"""
+Standalone execution worker.
+
+Claims queued test executions from the durable database queue and runs them,
+so browser execution can scale across processes and hosts independently of
+the API server:
+
+    EXECUTION_QUEUE_BACKEND=database python -m app.worker --concurrency 4
+
+Set RUN_QUEUE_WORKER_IN_API=false on the API to make it enqueue only.
+Schema migrations are applied by the API server at startup.
+"""
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+import threading
+
+from app.core.config import settings
+from app.services.durable_execution_queue import default_worker_id
+from app.services.execution_queue import get_execution_queue
+from app.services.queue_manager import start_queue_manager, stop_queue_manager
+
+logger = logging.getLogger("app.worker")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run queued test executions from the database queue.")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.MAX_CONCURRENT_EXECUTIONS,
+        help="Maximum executions this worker runs at once",
+    )
+    parser.add_argument(
+        "--worker-id", default=None,
+        help="Unique worker id (default: <hostname>:<pid>)",
+    )
+    parser.add_argument(
+        "--poll-interval", type=int, default=settings.QUEUE_CHECK_INTERVAL,
+        help="Seconds between checks for executions enqueued by other processes",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    if settings.EXECUTION_QUEUE_BACKEND != "database":
+        logger.error("app.worker requires EXECUTION_QUEUE_BACKEND=database")
+        return 2
+
+    # Playwright needs subprocess support on Windows
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+
+    worker_id = args.worker_id or default_worker_id()
+    get_execution_queue(max_concurrent=args.concurrency, worker_id=worker_id, dispatches=True)
+    start_queue_manager(max_concurrent=args.concurrency, check_interval=args.poll_interval)
+    logger.info(f"Worker {worker_id} running (concurrency={args.concurrency})")
+
+    stop = threading.Event()
+
+    def _handle_signal(signum, frame):
+        logger.info(f"Worker {worker_id} received signal {signum}, shutting down")
+        stop.set()
+
+    signal.signal(signal.SIGINT, _handle_signal)
+    signal.signal(signal.SIGTERM, _handle_signal)
+
+    while not stop.wait(1):
+        pass
+
+    # Running executions keep their leases until the process exits; anything
+    # unfinished is reclaimed by another worker once the lease expires.
+    stop_queue_manager()
+    get_execution_queue().stop_heartbeat()
+    logger.info(f"Worker {worker_id} stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
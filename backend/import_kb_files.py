@@ -4,19 +4,26 @@ Import orphaned KB files into the database.
 
 This script finds markdown files in uploads/kb/ that don't have
 corresponding database records and imports them.
+
+Text extraction runs in parallel across CPU cores (one process per worker,
+see KB_EXTRACTION_WORKERS); imported documents are indexed for KB search.
 """
 
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-import PyPDF2
 
 # Add backend directory to path
 backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
+from app.core.config import settings
 from app.db.session import SessionLocal
-from app.models.kb_document import KBDocument, KBCategory
+from app.models.kb_document import KBDocument, KBCategory, FileType
+from app.services.kb_extraction import extract_text_sync
+from app.services.kb_index import index_document
 
 def import_orphaned_files():
     """Import orphaned files from uploads/kb/ into the database."""
@@ -65,6 +72,7 @@ def import_orphaned_files():
         imported = 0
         skipped = 0
         
+        pending = []
         for file_path in supported_files:
             # Check if already in database
             # Use path relative to backend directory or just uploads/kb/filename
@@ -74,45 +82,38 @@ def import_orphaned_files():
                 print(f"  [SKIP] {file_path.name} - already in database")
                 skipped += 1
                 continue
-            
-            # Get file type from extension
-            file_ext = file_path.suffix.lower().lstrip('.')
-            
-            # Read file content and metadata
-            file_size = file_path.stat().st_size
-            
-            # For text-based files, read content
-            content = None
-            if file_ext in ['txt', 'md']:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        first_line = content.split('\n')[0] if content else ""
-                        # Extract title from markdown header (remove # and whitespace)
-                        title = first_line.replace('#', '').strip() if first_line.startswith('#') else file_path.stem
-                except Exception as e:
-                    print(f"  [WARN] Could not read {file_path.name}: {e}")
-                    title = file_path.stem
-                    content = None
-            elif file_ext == 'pdf':
-                # Extract text from PDF
+            pending.append(file_path)
+        
+        # Extract text from all new files in parallel
+        contents = {}
+        workers = settings.KB_EXTRACTION_WORKERS or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(extract_text_sync, str(file_path), file_path.suffix.lower().lstrip('.')): file_path
+                for file_path in pending
+            }
+            for future in as_completed(futures):
+                file_path = futures[future]
                 try:
-                    with open(file_path, 'rb') as f:
-                        pdf_reader = PyPDF2.PdfReader(f)
-                        text_parts = []
-                        for page in pdf_reader.pages:
-                            text_parts.append(page.extract_text())
-                        content = '\n\n'.join(text_parts)
-                        title = file_path.stem
-                        print(f"  [PDF] Extracted {len(content)} characters from {file_path.name}")
+                    contents[file_path] = future.result()
+                    print(f"  [EXTRACT] {len(contents[file_path] or '')} characters from {file_path.name}")
                 except Exception as e:
-                    print(f"  [WARN] Could not extract text from PDF {file_path.name}: {e}")
-                    title = file_path.stem
-                    content = None
-            else:
-                # For other file types (DOCX), just use filename as title
-                title = file_path.stem
-                content = None
+                    print(f"  [WARN] Could not extract text from {file_path.name}: {e}")
+                    contents[file_path] = None
+        
+        new_documents = []
+        for file_path in pending:
+            rel_path = f"uploads/kb/{file_path.name}"
+            file_type = FileType(file_path.suffix.lower().lstrip('.'))
+            file_size = file_path.stat().st_size
+            content = contents.get(file_path)
+            
+            # Extract title from markdown header (remove # and whitespace)
+            title = file_path.stem
+            if file_type in (FileType.TXT, FileType.MD) and content:
+                first_line = content.split('\n')[0]
+                if first_line.startswith('#'):
+                    title = first_line.replace('#', '').strip()
             
             # Create database record
             kb_doc = KBDocument(
@@ -120,23 +121,29 @@ def import_orphaned_files():
                 description=f"Imported from {file_path.name}",
                 filename=file_path.name,
                 file_path=rel_path,
-                file_type=file_ext,
+                file_type=file_type,
                 file_size=file_size,
                 category_id=test_category.id,
                 user_id=1,  # Admin user
-                content=content,  # Store FULL content for text files, None for binary
+                content=content,  # Store FULL extracted content
                 referenced_count=0,
                 created_at=datetime.utcnow(),
                 updated_at=datetime.utcnow()
             )
             
             db.add(kb_doc)
+            new_documents.append(kb_doc)
             print(f"  [+] {file_path.name} - '{title}' ({file_size} bytes)")
             imported += 1
         
         # Commit all changes
         db.commit()
         
+        # Chunk imported documents for KB search
+        for kb_doc in new_documents:
+            if kb_doc.content:
+                index_document(db, kb_doc)
+        
         print(f"\n[SUCCESS] Import complete!")
         print(f"  Imported: {imported}")
         print(f"  Skipped: {skipped}")
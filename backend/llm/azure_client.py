@@ -5,16 +5,17 @@ Uses your company's Azure OpenAI deployment (ChatGPT-UAT with GPT-4o)
 """
 
 import os
-import asyncio
 import logging
 from typing import Dict, List, Optional, Any
 import json
 
+from llm.client_factory import get_async_sdk_client, get_http_client
+
 logger = logging.getLogger(__name__)
 
 # Try to import Azure OpenAI SDK
 try:
-    from openai import AzureOpenAI
+    from openai import AsyncAzureOpenAI, AzureOpenAI
     AZURE_AVAILABLE = True
 except ImportError:
     AZURE_AVAILABLE = False
@@ -73,10 +74,13 @@ class AzureClient:
         if AZURE_AVAILABLE and self.api_key and self.endpoint:
             # Remove /openai/v1 suffix if present, SDK adds it automatically
             clean_endpoint = self.endpoint.replace("/openai/v1", "").replace("/openai", "")
+            self._azure_endpoint = clean_endpoint
+            self._api_version = api_version_to_use
             self.client = AzureOpenAI(
                 api_key=self.api_key,
                 api_version=api_version_to_use,
-                azure_endpoint=clean_endpoint
+                azure_endpoint=clean_endpoint,
+                http_client=get_http_client(clean_endpoint)
             )
             self.enabled = True
             logger.info(f"Azure OpenAI client initialized with deployment: {self.deployment}")
@@ -91,6 +95,22 @@ class AzureClient:
             elif not self.endpoint:
                 logger.warning("Azure OpenAI endpoint not provided - set AZURE_OPENAI_ENDPOINT")
     
+    @property
+    def async_client(self):
+        """AsyncAzureOpenAI on the shared pool of the running event loop (None if disabled)."""
+        if not self.enabled:
+            return None
+        return get_async_sdk_client(
+            ("azure", self._azure_endpoint, self.api_key, self._api_version),
+            self._azure_endpoint,
+            lambda http_client: AsyncAzureOpenAI(
+                api_key=self.api_key,
+                api_version=self._api_version,
+                azure_endpoint=self._azure_endpoint,
+                http_client=http_client
+            )
+        )
+    
     async def analyze_page_elements(
         self,
         html: str,
@@ -123,8 +143,7 @@ class AzureClient:
             )
             
             # Call Azure OpenAI
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
+            response = await self.async_client.chat.completions.create(
                 model=self.deployment,
                 messages=[
                     {
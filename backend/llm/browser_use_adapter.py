@@ -167,7 +167,8 @@ class AzureOpenAIAdapter:
     ):
         """
         Call Azure OpenAI chat completion and return the raw SDK response object.
-        Runs the synchronous SDK call in a thread-pool executor.
+        Uses the client's pooled async SDK client; clients without one fall back
+        to running the blocking SDK call in a worker thread.
         """
         if not self.azure_client or not getattr(self.azure_client, 'client', None):
             raise ValueError("LLM client not initialized / enabled")
@@ -182,11 +183,10 @@ class AzureOpenAIAdapter:
             # Force the model to produce valid JSON (Azure supports this)
             create_kwargs["response_format"] = {"type": "json_object"}
 
-        def _sync():
-            return self.azure_client.client.chat.completions.create(**create_kwargs)
-
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _sync)
+        async_client = getattr(self.azure_client, 'async_client', None)
+        if async_client is not None:
+            return await async_client.chat.completions.create(**create_kwargs)
+        return await asyncio.to_thread(self.azure_client.client.chat.completions.create, **create_kwargs)
 
     # ------------------------------------------------------------------
     # achat  -  simple text response
@@ -14,11 +14,15 @@ import logging
 from typing import Dict, List, Optional, Any
 import json
 
+from llm.client_factory import get_async_sdk_client, get_http_client
+
 logger = logging.getLogger(__name__)
 
+_BASE_URL = "https://api.cerebras.ai"
+
 # Try to import cerebras SDK, fallback to stub
 try:
-    from cerebras.cloud.sdk import Cerebras
+    from cerebras.cloud.sdk import AsyncCerebras, Cerebras
     CEREBRAS_AVAILABLE = True
 except ImportError:
     CEREBRAS_AVAILABLE = False
@@ -61,7 +65,7 @@ class CerebrasClient:
         self.max_tokens = max_tokens
         
         if CEREBRAS_AVAILABLE and self.api_key:
-            self.client = Cerebras(api_key=self.api_key)
+            self.client = Cerebras(api_key=self.api_key, http_client=get_http_client(_BASE_URL))
             self.enabled = True
             logger.info(f"Cerebras client initialized with model: {model}")
         else:
@@ -72,6 +76,17 @@ class CerebrasClient:
             elif not self.api_key:
                 logger.warning("Cerebras API key not provided - set CEREBRAS_API_KEY environment variable")
     
+    @property
+    def async_client(self):
+        """AsyncCerebras on the shared pool of the running event loop (None if disabled)."""
+        if not self.enabled:
+            return None
+        return get_async_sdk_client(
+            ("cerebras", _BASE_URL, self.api_key),
+            _BASE_URL,
+            lambda http_client: AsyncCerebras(api_key=self.api_key, http_client=http_client)
+        )
+    
     async def analyze_page_elements(
         self,
         html: str,
@@ -107,7 +122,7 @@ class CerebrasClient:
             )
             
             # Call Cerebras API
-            response = self.client.chat.completions.create(
+            response = await self.async_client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {
@@ -303,7 +318,7 @@ Output JSON:
 }}
 """
             
-            response = self.client.chat.completions.create(
+            response = await self.async_client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a test automation expert."},
@@ -11,6 +11,15 @@ Supported providers
   openrouter  — OpenRouterClient (uses OPENROUTER_API_KEY via openrouter.ai)
   local_vllm  — LocalVllmClient (on-premises vLLM OpenAI-compatible; no API key needed)
 
+Connection pooling
+------------------
+Client wrappers are cheap to build per agent; the SDK clients inside them share
+one HTTP connection pool per endpoint.  Sync SDK clients use a process-wide
+httpx.Client per endpoint (get_http_client).  Async SDK clients (the
+``async_client`` property of every wrapper) are pooled per event loop, since
+httpx connections cannot cross loops and queue workers run their own loops
+(get_async_sdk_client / get_async_http_client).
+
 Fallback behaviour
 ------------------
 If the requested provider is unrecognised, its required env key is absent, or its
@@ -19,14 +28,37 @@ default Azure deployment name.  Callers can always inspect client.enabled to dec
 whether to proceed or skip LLM-enhanced paths.
 """
 
+import asyncio
 import logging
-from typing import Optional
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import httpx
 
 logger = logging.getLogger(__name__)
 
 # Default Azure model used as fallback target
 _AZURE_DEFAULT_MODEL: str = "ChatGPT-UAT"
 
+# Per-endpoint connection pool size (shared by every client of that endpoint)
+_MAX_CONNECTIONS: int = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
+_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+_pool_lock = threading.Lock()
+# endpoint -> shared sync httpx.Client
+_http_clients: Dict[str, httpx.Client] = {}
+# event loop -> {endpoint: httpx.AsyncClient}
+_async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+# event loop -> {key: async SDK client}
+_async_sdk_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 def get_llm_client(
     provider: Optional[str],
@@ -127,3 +159,77 @@ def _get_local_vllm_client(
 ):
     from llm.local_vllm_client import LocalVllmClient
     return LocalVllmClient(model=model, endpoint=custom_endpoint, api_key=api_key)
+
+
+# ---------------------------------------------------------------------------
+# Shared connection pools
+# ---------------------------------------------------------------------------
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=_MAX_CONNECTIONS,
+        max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS,
+    )
+
+
+def get_http_client(endpoint: str) -> httpx.Client:
+    """Return the process-wide sync connection pool for an endpoint."""
+    key = endpoint.rstrip("/")
+    with _pool_lock:
+        client = _http_clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.Client(limits=_pool_limits(), timeout=_TIMEOUT, follow_redirects=True)
+            _http_clients[key] = client
+        return client
+
+
+def get_async_http_client(endpoint: str) -> httpx.AsyncClient:
+    """
+    Return the async connection pool for an endpoint on the running event loop.
+
+    Must be called from a coroutine.  Pools are dropped with their loop.
+    """
+    loop = asyncio.get_running_loop()
+    key = endpoint.rstrip("/")
+    with _pool_lock:
+        pools = _async_http_clients.setdefault(loop, {})
+        client = pools.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=_pool_limits(), timeout=_TIMEOUT, follow_redirects=True)
+            pools[key] = client
+        return client
+
+
+def get_async_sdk_client(
+    key: Hashable,
+    endpoint: str,
+    build: Callable[[httpx.AsyncClient], Any],
+):
+    """
+    Return a pooled async SDK client for the running event loop.
+
+    Args:
+        key: Identifies the SDK configuration (SDK, endpoint, credentials, api version)
+        endpoint: Endpoint whose async connection pool the client should use
+        build: Creates the SDK client given the shared httpx.AsyncClient
+    """
+    loop = asyncio.get_running_loop()
+    with _pool_lock:
+        clients = _async_sdk_clients.setdefault(loop, {})
+        client = clients.get(key)
+    if client is not None:
+        return client
+
+    client = build(get_async_http_client(endpoint))
+    with _pool_lock:
+        return _async_sdk_clients.setdefault(loop, {}).setdefault(key, client)
+
+
+async def aclose_async_clients() -> None:
+    """Close the running loop's async pools (call before closing a worker loop)."""
+    loop = asyncio.get_running_loop()
+    with _pool_lock:
+        pools = _async_http_clients.pop(loop, {})
+        _async_sdk_clients.pop(loop, None)
+    for client in pools.values():
+        await client.aclose()
@@ -15,12 +15,14 @@ import os
 import logging
 from typing import Optional
 
+from llm.client_factory import get_async_sdk_client, get_http_client
+
 logger = logging.getLogger(__name__)
 
 _BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
     _OPENAI_AVAILABLE = True
 except ImportError:
     _OPENAI_AVAILABLE = False
@@ -62,6 +64,7 @@ class GoogleClient:
             self.client = OpenAI(
                 api_key=self.api_key,
                 base_url=_BASE_URL,
+                http_client=get_http_client(_BASE_URL),
             )
             self.enabled = True
             logger.info(f"GoogleClient initialized with model: {self.model}")
@@ -72,3 +75,18 @@ class GoogleClient:
                 logger.warning("openai SDK not available — install with: pip install openai")
             else:
                 logger.warning("Google API key not provided — set GOOGLE_API_KEY")
+
+    @property
+    def async_client(self):
+        """AsyncOpenAI on the shared pool of the running event loop (None if disabled)."""
+        if not self.enabled:
+            return None
+        return get_async_sdk_client(
+            ("google", _BASE_URL, self.api_key),
+            _BASE_URL,
+            lambda http_client: AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=_BASE_URL,
+                http_client=http_client,
+            ),
+        )
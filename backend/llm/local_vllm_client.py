@@ -31,6 +31,8 @@ import os
 import logging
 from typing import Any, Dict, List, Optional
 
+from llm.client_factory import get_async_sdk_client, get_http_client
+
 logger = logging.getLogger(__name__)
 
 # Sprint 10.15 / 10.18: models that support chain-of-thought thinking via chat_template_kwargs.
@@ -65,7 +67,7 @@ _MODEL_API_KEY_ENV: dict = {
 }
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
     _OPENAI_AVAILABLE = True
 except ImportError:
     _OPENAI_AVAILABLE = False
@@ -104,6 +106,7 @@ class LocalVllmClient:
         endpoint (str): Base URL of the vLLM OpenAI-compatible endpoint.
         enabled (bool): True when openai SDK is available (no API key needed).
         client: openai.OpenAI instance or None.
+        async_client: openai.AsyncOpenAI for the running event loop, or None.
     """
 
     def __init__(
@@ -149,6 +152,7 @@ class LocalVllmClient:
             self.client = OpenAI(
                 api_key=self.api_key,
                 base_url=self.endpoint.rstrip("/"),
+                http_client=get_http_client(self.endpoint),
             )
             self.enabled = True
             logger.info(
@@ -162,6 +166,22 @@ class LocalVllmClient:
             self.enabled = False
             logger.warning("openai SDK not available — install with: pip install openai")
 
+    @property
+    def async_client(self):
+        """AsyncOpenAI on the shared pool of the running event loop (None if disabled)."""
+        if not self.enabled:
+            return None
+        base_url = self.endpoint.rstrip("/")
+        return get_async_sdk_client(
+            ("local_vllm", base_url, self.api_key),
+            base_url,
+            lambda http_client: AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=base_url,
+                http_client=http_client,
+            ),
+        )
+
     def chat_completion(
         self,
         messages: List[Dict[str, Any]],
@@ -171,6 +191,8 @@ class LocalVllmClient:
         """
         Send a chat completion request to the vLLM server via the OpenAI SDK.
 
+        Blocks the calling thread; coroutines should await achat_completion().
+
         Sprint 10.15: when self.enable_thinking is True (set only for thinking-capable
         models), injects extra_body={"chat_template_kwargs":{"enable_thinking":True}}
         into the SDK call so vLLM enables chain-of-thought reasoning.
@@ -186,6 +208,25 @@ class LocalVllmClient:
         Raises:
             RuntimeError: if the openai SDK is not available.
         """
+        kwargs = self._completion_kwargs(messages, temperature, max_tokens)
+        return self.client.chat.completions.create(**kwargs)
+
+    async def achat_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Async chat_completion() over the event loop's pooled AsyncOpenAI client."""
+        kwargs = self._completion_kwargs(messages, temperature, max_tokens)
+        return await self.async_client.chat.completions.create(**kwargs)
+
+    def _completion_kwargs(
+        self,
+        messages: List[Dict[str, Any]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+    ) -> Dict[str, Any]:
         if not self.enabled or self.client is None:
             raise RuntimeError(
                 "LocalVllmClient is not available — openai SDK missing or client not initialised."
@@ -203,4 +244,4 @@ class LocalVllmClient:
         if self.model in _THINKING_CAPABLE_MODELS:
             kwargs["extra_body"] = {"chat_template_kwargs": {"enable_thinking": self.enable_thinking}}
 
-        return self.client.chat.completions.create(**kwargs)
+        return kwargs
@@ -11,13 +11,15 @@ import os
 import logging
 from typing import Optional
 
+from llm.client_factory import get_async_sdk_client, get_http_client
+
 logger = logging.getLogger(__name__)
 
 _BASE_URL = "https://openrouter.ai/api/v1"
 _DEFAULT_MODEL = "meta-llama/llama-3.3-70b-instruct:free"
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
     _OPENAI_AVAILABLE = True
 except ImportError:
     _OPENAI_AVAILABLE = False
@@ -59,6 +61,7 @@ class OpenRouterClient:
             self.client = OpenAI(
                 api_key=self.api_key,
                 base_url=_BASE_URL,
+                http_client=get_http_client(_BASE_URL),
             )
             self.enabled = True
             logger.info(f"OpenRouterClient initialized with model: {self.model}")
@@ -69,3 +72,18 @@ class OpenRouterClient:
                 logger.warning("openai SDK not available — install with: pip install openai")
             else:
                 logger.warning("OpenRouter API key not provided — set OPENROUTER_API_KEY")
+
+    @property
+    def async_client(self):
+        """AsyncOpenAI on the shared pool of the running event loop (None if disabled)."""
+        if not self.enabled:
+            return None
+        return get_async_sdk_client(
+            ("openrouter", _BASE_URL, self.api_key),
+            _BASE_URL,
+            lambda http_client: AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=_BASE_URL,
+                http_client=http_client,
+            ),
+        )
@@ -0,0 +1,83 @@
+"""
+Migration: add durable queue lease columns to test_executions.
+
+Needed when EXECUTION_QUEUE_BACKEND=database: workers claim pending rows by
+writing lease_owner/lease_expires_at, renew them with heartbeats, and reclaim
+rows whose lease expired. Works on SQLite and Postgres.
+Safe to run multiple times (idempotent upgrade).
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings
+
+
+COLUMNS = [
+    ("lease_owner", "VARCHAR(128)"),
+    ("lease_expires_at", "TIMESTAMP"),
+    ("heartbeat_at", "TIMESTAMP"),
+    ("claim_count", "INTEGER DEFAULT 0"),
+    ("pinned_to_worker", "BOOLEAN DEFAULT FALSE"),
+    ("cancel_requested", "BOOLEAN DEFAULT FALSE"),
+]
+
+INDEXES = [
+    ("ix_test_executions_lease_owner", "lease_owner"),
+    ("ix_test_executions_lease_expires_at", "lease_expires_at"),
+]
+
+
+def upgrade() -> None:
+    """Add lease columns and indexes to test_executions."""
+    engine = create_engine(settings.DATABASE_URL)
+    inspector = inspect(engine)
+
+    if "test_executions" not in inspector.get_table_names():
+        print("⚠️  Table test_executions does not exist — skipping")
+        return
+
+    existing = {column["name"] for column in inspector.get_columns("test_executions")}
+    with engine.begin() as conn:
+        for name, ddl in COLUMNS:
+            if name in existing:
+                print(f"ℹ️  Column already exists: test_executions.{name}")
+                continue
+            conn.execute(text(f"ALTER TABLE test_executions ADD COLUMN {name} {ddl}"))
+            print(f"✅ Added column: test_executions.{name}")
+
+        for index_name, column in INDEXES:
+            conn.execute(
+                text(f"CREATE INDEX IF NOT EXISTS {index_name} ON test_executions ({column})")
+            )
+
+
+def downgrade() -> None:
+    """Drop lease columns (best-effort; older SQLite may not support DROP COLUMN)."""
+    engine = create_engine(settings.DATABASE_URL)
+    inspector = inspect(engine)
+    existing = {column["name"] for column in inspector.get_columns("test_executions")}
+    with engine.begin() as conn:
+        for index_name, _column in INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+        for name, _ddl in COLUMNS:
+            if name not in existing:
+                continue
+            try:
+                conn.execute(text(f"ALTER TABLE test_executions DROP COLUMN {name}"))
+                print(f"✅ Dropped column: test_executions.{name}")
+            except Exception as exc:
+                print(f"⚠️  Could not drop {name}: {exc}")
+
+
+def run_migration() -> None:
+    upgrade()
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,50 @@
+"""
+Migration: add the execution_stats_daily rollup table and backfill it.
+
+/executions/stats reads finished runs older than yesterday from this table
+instead of scanning test_executions. New runs are rolled up as they finish;
+this migration recomputes the rollup from existing history.
+Safe to run multiple times (the backfill rebuilds the table from scratch).
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings
+from app.db.base import Base
+import app.models  # noqa: F401  (register every table for FK resolution)
+from app.models.test_execution import ExecutionStatsDaily
+from app.crud.test_execution import rebuild_execution_stats
+
+
+def upgrade() -> None:
+    """Create execution_stats_daily and backfill it from test_executions."""
+    engine = create_engine(settings.DATABASE_URL)
+    Base.metadata.create_all(bind=engine, tables=[ExecutionStatsDaily.__table__])
+
+    db = sessionmaker(bind=engine)()
+    try:
+        rows = rebuild_execution_stats(db)
+    finally:
+        db.close()
+    print(f"✅ execution_stats_daily ready ({rows} rollup rows backfilled)")
+
+
+def downgrade() -> None:
+    """Drop the rollup table."""
+    engine = create_engine(settings.DATABASE_URL)
+    ExecutionStatsDaily.__table__.drop(bind=engine, checkfirst=True)
+
+
+def run_migration() -> None:
+    upgrade()
+
+
+if __name__ == "__main__":
+    run_migration()
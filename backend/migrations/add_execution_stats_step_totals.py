@@ -0,0 +1,63 @@
+"""
+Migration: add step totals to execution_stats_daily and rebuild it.
+
+The AnalysisAgent reads historical success rates (passed/total steps) from
+the rollup instead of aggregating test_executions once per scenario, so each
+bucket now also sums the step counts of its runs.
+Safe to run multiple times (idempotent upgrade; the rebuild recomputes every row).
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings
+
+COLUMNS = {
+    "step_runs": "INTEGER NOT NULL DEFAULT 0",
+    "passed_steps_total": "INTEGER NOT NULL DEFAULT 0",
+    "total_steps_total": "INTEGER NOT NULL DEFAULT 0",
+    "success_ratio_total": "FLOAT NOT NULL DEFAULT 0",
+}
+
+
+def upgrade() -> None:
+    """Add the step total columns and backfill them from test_executions."""
+    import app.models  # noqa: F401  (register all mappers)
+    from app.crud.test_execution import rebuild_execution_stats
+
+    engine = create_engine(settings.DATABASE_URL)
+    inspector = inspect(engine)
+
+    if "execution_stats_daily" not in inspector.get_table_names():
+        print("⚠️  Table execution_stats_daily does not exist — skipping")
+        return
+
+    existing = {column["name"] for column in inspector.get_columns("execution_stats_daily")}
+    for name, definition in COLUMNS.items():
+        if name in existing:
+            print(f"ℹ️  Column already exists: execution_stats_daily.{name}")
+            continue
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE execution_stats_daily ADD COLUMN {name} {definition}"))
+        print(f"✅ Added column: execution_stats_daily.{name}")
+
+    db = sessionmaker(bind=engine)()
+    try:
+        rows = rebuild_execution_stats(db)
+    finally:
+        db.close()
+    print(f"✅ execution_stats_daily rebuilt with step totals ({rows} rollup rows)")
+
+
+def run_migration() -> None:
+    upgrade()
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,76 @@
+"""
+Migration: add kb_chunks and its full-text index.
+
+KB documents are split into overlapping chunks that are searched through
+SQLite FTS5 (kb_chunks_fts + sync triggers) or a Postgres tsvector GIN index,
+so test generation can pull the passages relevant to a requirement instead of
+the newest documents. Existing documents are chunked (and embedded, if
+KB_EMBEDDING_MODEL is set) during the upgrade.
+Safe to run multiple times (idempotent upgrade).
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import load_only, sessionmaker
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings
+
+
+def upgrade() -> None:
+    """Create kb_chunks, its full-text index, and chunk existing documents."""
+    import app.models  # noqa: F401  (register all mappers)
+    from app.db.kb_search import ensure_kb_search_index
+    from app.models.kb_document import KBChunk, KBDocument
+    from app.services.kb_index import index_document
+
+    engine = create_engine(settings.DATABASE_URL)
+    if "kb_documents" not in inspect(engine).get_table_names():
+        print("⚠️  Table kb_documents does not exist — skipping")
+        return
+
+    KBChunk.__table__.create(bind=engine, checkfirst=True)
+    if ensure_kb_search_index(engine):
+        print(f"✅ Full-text index ready for kb_chunks ({engine.dialect.name})")
+    else:
+        print("ℹ️  No native full-text index on this database — KB search uses ILIKE")
+
+    db = sessionmaker(bind=engine)()
+    try:
+        # load_only: later migrations may add KBDocument columns this schema lacks yet
+        pending = db.query(KBDocument).options(
+            load_only(KBDocument.id, KBDocument.content)
+        ).filter(
+            KBDocument.content.isnot(None),
+            ~KBDocument.chunks.any(),
+        ).all()
+        for document in pending:
+            index_document(db, document)
+        if pending:
+            print(f"✅ Indexed {len(pending)} existing KB document(s)")
+        else:
+            print("ℹ️  No KB documents need indexing")
+    finally:
+        db.close()
+
+
+def downgrade() -> None:
+    """Drop kb_chunks and its full-text index."""
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.execute(text("DROP TABLE IF EXISTS kb_chunks_fts"))
+        conn.execute(text("DROP TABLE IF EXISTS kb_chunks"))
+    print("✅ Dropped kb_chunks")
+
+
+def run_migration() -> None:
+    upgrade()
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,56 @@
+"""
+Migration: add token_count to kb_chunks.
+
+KB context for test generation is packed into a token budget from the
+highest-scoring chunks; counting tokens once at upload keeps that packing
+free of re-tokenisation. Existing chunks are counted during the upgrade.
+Safe to run multiple times (idempotent upgrade).
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings
+
+
+def upgrade() -> None:
+    """Add kb_chunks.token_count and backfill it."""
+    from app.services.kb_index import count_tokens
+
+    engine = create_engine(settings.DATABASE_URL)
+    inspector = inspect(engine)
+
+    if "kb_chunks" not in inspector.get_table_names():
+        print("⚠️  Table kb_chunks does not exist — skipping")
+        return
+
+    existing = {column["name"] for column in inspector.get_columns("kb_chunks")}
+    if "token_count" not in existing:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE kb_chunks ADD COLUMN token_count INTEGER NOT NULL DEFAULT 0"))
+        print("✅ Added column: kb_chunks.token_count")
+    else:
+        print("ℹ️  Column already exists: kb_chunks.token_count")
+
+    with engine.begin() as conn:
+        rows = conn.execute(text("SELECT id, content FROM kb_chunks WHERE token_count = 0")).all()
+        for chunk_id, content in rows:
+            conn.execute(
+                text("UPDATE kb_chunks SET token_count = :tokens WHERE id = :id"),
+                {"tokens": count_tokens(content or ""), "id": chunk_id},
+            )
+    if rows:
+        print(f"✅ Counted tokens for {len(rows)} KB chunk(s)")
+
+
+def run_migration() -> None:
+    upgrade()
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,51 @@
+"""
+Migration: add extraction_status / extraction_progress to kb_documents.
+
+PDF/DOCX text extraction now runs as a background job after upload;
+these columns let clients poll a document until its text is available.
+Existing rows were extracted synchronously, so they default to
+'completed' / 100.
+Safe to run multiple times (idempotent upgrade).
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings
+
+COLUMNS = {
+    "extraction_status": "VARCHAR(32) NOT NULL DEFAULT 'completed'",
+    "extraction_progress": "INTEGER NOT NULL DEFAULT 100",
+}
+
+
+def upgrade() -> None:
+    """Add the extraction tracking columns to kb_documents."""
+    engine = create_engine(settings.DATABASE_URL)
+    inspector = inspect(engine)
+
+    if "kb_documents" not in inspector.get_table_names():
+        print("⚠️  Table kb_documents does not exist — skipping")
+        return
+
+    existing = {column["name"] for column in inspector.get_columns("kb_documents")}
+    for name, definition in COLUMNS.items():
+        if name in existing:
+            print(f"ℹ️  Column already exists: kb_documents.{name}")
+            continue
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE kb_documents ADD COLUMN {name} {definition}"))
+        print(f"✅ Added column: kb_documents.{name}")
+
+
+def run_migration() -> None:
+    upgrade()
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,44 @@
+"""
+Migration: add depends_on to test_suite_items.
+
+Parallel suite runs start a test only after the tests listed in its
+depends_on (test_case_ids of the same suite) have passed.
+Safe to run multiple times (idempotent upgrade).
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings
+
+
+def upgrade() -> None:
+    """Add the depends_on JSON column to test_suite_items."""
+    engine = create_engine(settings.DATABASE_URL)
+    inspector = inspect(engine)
+
+    if "test_suite_items" not in inspector.get_table_names():
+        print("⚠️  Table test_suite_items does not exist — skipping")
+        return
+
+    existing = {column["name"] for column in inspector.get_columns("test_suite_items")}
+    if "depends_on" in existing:
+        print("ℹ️  Column already exists: test_suite_items.depends_on")
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE test_suite_items ADD COLUMN depends_on JSON"))
+    print("✅ Added column: test_suite_items.depends_on")
+
+
+def run_migration() -> None:
+    upgrade()
+
+
+if __name__ == "__main__":
+    run_migration()
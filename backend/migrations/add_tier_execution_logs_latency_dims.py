@@ -0,0 +1,49 @@
+"""
+Migration: add tier_execution_logs.page_domain and tier_execution_logs.action.
+
+Adaptive tier timeouts keep latency histograms per (domain, action, tier);
+these columns let each process seed them from recent tier logs.
+Safe to run multiple times (idempotent upgrade).
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings
+
+COLUMNS = {
+    "page_domain": "VARCHAR(255)",
+    "action": "VARCHAR(50)",
+}
+
+
+def upgrade() -> None:
+    """Add the latency histogram dimension columns."""
+    engine = create_engine(settings.DATABASE_URL)
+    inspector = inspect(engine)
+
+    if "tier_execution_logs" not in inspector.get_table_names():
+        print("⚠️  Table tier_execution_logs does not exist — skipping")
+        return
+
+    existing = {column["name"] for column in inspector.get_columns("tier_execution_logs")}
+    for name, definition in COLUMNS.items():
+        if name in existing:
+            print(f"ℹ️  Column already exists: tier_execution_logs.{name}")
+            continue
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE tier_execution_logs ADD COLUMN {name} {definition}"))
+        print(f"✅ Added column: tier_execution_logs.{name}")
+
+
+def run_migration() -> None:
+    upgrade()
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,52 @@
+"""
+Migration: add tier_execution_logs.route_key.
+
+Tier logs are keyed by normalized page URL + instruction so the 3-Tier
+engine can start a step at the tier that last succeeded for it (learned
+tier routing). Existing rows have no key and are ignored by routing.
+Safe to run multiple times (idempotent upgrade).
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings
+
+INDEX_NAME = "ix_tier_execution_logs_route_key"
+
+
+def upgrade() -> None:
+    """Add the route_key column and its index."""
+    engine = create_engine(settings.DATABASE_URL)
+    inspector = inspect(engine)
+
+    if "tier_execution_logs" not in inspector.get_table_names():
+        print("⚠️  Table tier_execution_logs does not exist — skipping")
+        return
+
+    if "route_key" in {column["name"] for column in inspector.get_columns("tier_execution_logs")}:
+        print("ℹ️  Column already exists: tier_execution_logs.route_key")
+    else:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE tier_execution_logs ADD COLUMN route_key VARCHAR(64)"))
+        print("✅ Added column: tier_execution_logs.route_key")
+
+    if INDEX_NAME in {index["name"] for index in inspect(engine).get_indexes("tier_execution_logs")}:
+        print(f"ℹ️  Index already exists: {INDEX_NAME}")
+        return
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE INDEX {INDEX_NAME} ON tier_execution_logs (route_key)"))
+    print(f"✅ Created index: {INDEX_NAME}")
+
+
+def run_migration() -> None:
+    upgrade()
+
+
+if __name__ == "__main__":
+    run_migration()
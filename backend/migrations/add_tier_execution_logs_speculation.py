@@ -0,0 +1,53 @@
+"""
+Migration: add tier_execution_logs speculation columns.
+
+The race fallback strategy resolves Tier 2 XPaths speculatively while Tier 1
+runs; these columns record each speculation's outcome, its extraction time,
+the LLM tokens and estimated cost it spent and the latency it saved.
+Safe to run multiple times (idempotent upgrade).
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings
+
+COLUMNS = {
+    "speculation": "VARCHAR(20)",
+    "speculation_time_ms": "FLOAT",
+    "speculation_saved_ms": "FLOAT",
+    "speculation_tokens": "INTEGER",
+    "speculation_cost_usd": "FLOAT",
+}
+
+
+def upgrade() -> None:
+    """Add the speculative extraction accounting columns."""
+    engine = create_engine(settings.DATABASE_URL)
+    inspector = inspect(engine)
+
+    if "tier_execution_logs" not in inspector.get_table_names():
+        print("⚠️  Table tier_execution_logs does not exist — skipping")
+        return
+
+    existing = {column["name"] for column in inspector.get_columns("tier_execution_logs")}
+    for name, definition in COLUMNS.items():
+        if name in existing:
+            print(f"ℹ️  Column already exists: tier_execution_logs.{name}")
+            continue
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE tier_execution_logs ADD COLUMN {name} {definition}"))
+        print(f"✅ Added column: tier_execution_logs.{name}")
+
+
+def run_migration() -> None:
+    upgrade()
+
+
+if __name__ == "__main__":
+    run_migration()
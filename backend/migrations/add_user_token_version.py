@@ -0,0 +1,44 @@
+"""
+Migration: add users.token_version.
+
+Access tokens carry the version they were issued for ("ver" claim); bumping
+it on password change or deactivation revokes every earlier token, which
+lets authenticated users be cached in-process without outliving revocation.
+Safe to run multiple times (idempotent upgrade).
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings
+
+
+def upgrade() -> None:
+    """Add users.token_version (existing tokens have no claim and count as version 0)."""
+    engine = create_engine(settings.DATABASE_URL)
+    inspector = inspect(engine)
+
+    if "users" not in inspector.get_table_names():
+        print("⚠️  Table users does not exist — skipping")
+        return
+
+    if "token_version" in {column["name"] for column in inspector.get_columns("users")}:
+        print("ℹ️  Column already exists: users.token_version")
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE users ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0"))
+    print("✅ Added column: users.token_version")
+
+
+def run_migration() -> None:
+    upgrade()
+
+
+if __name__ == "__main__":
+    run_migration()
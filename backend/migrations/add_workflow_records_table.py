@@ -0,0 +1,43 @@
+"""
+Migration: add the workflow_records table.
+
+Backs WORKFLOW_STORE_BACKEND=database: API v2 workflow state, compressed
+results and cancel flags shared by every API process and kept across restarts.
+Safe to run multiple times (idempotent upgrade).
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings
+from app.models.workflow_record import WorkflowRecord
+
+
+def upgrade() -> None:
+    """Create workflow_records."""
+    engine = create_engine(settings.DATABASE_URL)
+    if "workflow_records" in inspect(engine).get_table_names():
+        print("ℹ️  Table already exists: workflow_records")
+        return
+    WorkflowRecord.__table__.create(bind=engine, checkfirst=True)
+    print("✅ Created table: workflow_records")
+
+
+def downgrade() -> None:
+    """Drop workflow_records."""
+    engine = create_engine(settings.DATABASE_URL)
+    WorkflowRecord.__table__.drop(bind=engine, checkfirst=True)
+    print("✅ Dropped table: workflow_records")
+
+
+def run_migration() -> None:
+    upgrade()
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,51 @@
+"""
+Migration: add xpath_cache.element_fingerprint and xpath_cache.page_fingerprint.
+
+Tier 2 stores a structural fingerprint of each cached XPath's target, and the
+DOM fingerprint of the page state it was cached on, so all cached XPaths for
+a page can be validated in one round-trip and entries whose element has
+changed are skipped before an action times out.
+Safe to run multiple times (idempotent upgrade).
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect, text
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import settings
+
+COLUMNS = {
+    "element_fingerprint": "VARCHAR(32)",
+    "page_fingerprint": "VARCHAR(32)",
+}
+
+
+def upgrade() -> None:
+    """Add the element and page fingerprint columns."""
+    engine = create_engine(settings.DATABASE_URL)
+    inspector = inspect(engine)
+
+    if "xpath_cache" not in inspector.get_table_names():
+        print("⚠️  Table xpath_cache does not exist — skipping")
+        return
+
+    existing = {column["name"] for column in inspector.get_columns("xpath_cache")}
+    for name, definition in COLUMNS.items():
+        if name in existing:
+            print(f"ℹ️  Column already exists: xpath_cache.{name}")
+            continue
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE xpath_cache ADD COLUMN {name} {definition}"))
+        print(f"✅ Added column: xpath_cache.{name}")
+
+
+def run_migration() -> None:
+    upgrade()
+
+
+if __name__ == "__main__":
+    run_migration()
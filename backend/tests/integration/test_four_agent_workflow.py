@@ -342,7 +342,7 @@ test('User Login - Happy Path', async ({ page }) => {
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 500
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         # Step 4: EvolutionAgent generates code with LLM
         evolution_task = TaskContext(
@@ -372,7 +372,7 @@ test('User Login - Happy Path', async ({ page }) => {
         assert "expect" in test_code or "assert" in test_code.lower()  # Should have assertions
         
         # Verify LLM was called
-        assert evolution_agent_with_llm.llm_client.client.chat.completions.create.called
+        assert evolution_agent_with_llm.llm_client.async_client.chat.completions.create.called
     
     @pytest.mark.asyncio
     async def test_caching_in_workflow(
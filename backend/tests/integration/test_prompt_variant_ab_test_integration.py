@@ -187,7 +187,7 @@ class TestPromptVariantABTestIntegration:
             
             return mock_response
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = MagicMock(side_effect=mock_llm_create)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(side_effect=mock_llm_create)
         
         # Run A/B test
         result = await evolution_agent_with_llm.run_ab_test(
@@ -263,7 +263,7 @@ class TestPromptVariantABTestIntegration:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 500
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = MagicMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         # Simulate execution results (some variants perform better)
         execution_results = {
@@ -345,7 +345,7 @@ class TestPromptVariantABTestIntegration:
             variant_num = ((call_count[0] - 1) // len(sample_scenarios_for_ab_test)) % 3 + 1
             return create_mock_response(variant_num)
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = MagicMock(side_effect=mock_llm_create)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(side_effect=mock_llm_create)
         
         # Run A/B test
         result = await evolution_agent_with_llm.run_ab_test(
@@ -0,0 +1,220 @@
+"""
+Unit tests for bounded LLM concurrency (BaseAgent.gather_bounded) and
+concurrent per-scenario generation in EvolutionAgent.
+"""
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from agents.base_agent import TaskContext
+from agents.evolution_agent import EvolutionAgent
+
+
+def _agent(**config) -> EvolutionAgent:
+    return EvolutionAgent(
+        agent_id="evo_concurrency",
+        agent_type="evolution",
+        priority=5,
+        message_queue=MagicMock(),
+        config={"use_llm": False, "cache_enabled": False, **config},
+    )
+
+
+def _scenario(i: int) -> dict:
+    return {
+        "scenario_id": f"REQ-{i:03d}",
+        "title": f"Scenario {i}",
+        "given": "Given user is on page",
+        "when": "When user performs action",
+        "then": "Then expected result is shown",
+        "priority": "medium",
+        "scenario_type": "functional",
+    }
+
+
+def test_llm_concurrency_uses_provider_default_and_config_override():
+    assert _agent(llm_provider="azure").llm_concurrency == 8
+    assert _agent(llm_provider="local_vllm").llm_concurrency == 2
+    assert _agent(llm_provider="unknown").llm_concurrency == 4
+    assert _agent(llm_provider="azure", llm_max_concurrency=3).llm_concurrency == 3
+
+
+@pytest.mark.asyncio
+async def test_semaphore_is_shared_per_provider_on_a_loop():
+    a = _agent(llm_provider="openrouter")
+    b = _agent(llm_provider="openrouter")
+    c = _agent(llm_provider="azure")
+    assert a.llm_semaphore() is b.llm_semaphore()
+    assert a.llm_semaphore() is not c.llm_semaphore()
+
+
+@pytest.mark.asyncio
+async def test_gather_bounded_keeps_order_and_respects_limit():
+    agent = _agent(llm_max_concurrency=2)
+    in_flight = 0
+    peak = 0
+    completed = []
+
+    async def worker(index, item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (5 - index))  # Later items finish first
+        in_flight -= 1
+        return item * 10
+
+    results = await agent.gather_bounded(
+        [1, 2, 3, 4, 5], worker, on_result=lambda i, r: completed.append(i)
+    )
+
+    assert results == [10, 20, 30, 40, 50]
+    assert peak == 2
+    assert sorted(completed) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_gather_bounded_skips_items_after_cancel():
+    agent = _agent(llm_max_concurrency=1)
+    started = []
+
+    async def worker(index, item):
+        started.append(index)
+        return item
+
+    results = await agent.gather_bounded(
+        ["a", "b", "c"], worker, cancel_check=lambda: len(started) >= 1
+    )
+
+    assert started == [0]
+    assert results == ["a", None, None]
+
+
+@pytest.mark.asyncio
+async def test_gather_bounded_propagates_worker_errors():
+    agent = _agent(llm_max_concurrency=2)
+
+    async def worker(index, item):
+        if index == 0:
+            raise ValueError("boom")
+        await asyncio.sleep(1)
+
+    with pytest.raises(ValueError):
+        await agent.gather_bounded([1, 2, 3], worker)
+
+
+@pytest.mark.asyncio
+async def test_evolution_generates_scenarios_concurrently_in_order():
+    agent = _agent(llm_max_concurrency=3)
+    agent.use_llm = True
+    agent.llm_client = MagicMock()
+    in_flight = 0
+    peak = 0
+
+    async def fake_generate(scenario, *args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        index = int(scenario["scenario_id"][-3:])
+        await asyncio.sleep(0.01 * (6 - index))
+        in_flight -= 1
+        return {
+            "steps": [f"step for {scenario['scenario_id']}"],
+            "confidence": 0.9,
+            "tokens_used": 10,
+        }
+
+    agent._generate_test_steps_with_llm = fake_generate
+    task = TaskContext(
+        task_id="task-concurrency",
+        task_type="test_generation",
+        payload={
+            "scenarios": [_scenario(i) for i in range(1, 6)],
+            "risk_scores": [],
+            "final_prioritization": [],
+            "page_context": {"url": "https://example.com"},
+            "test_data": [],
+        },
+        conversation_id="conv-concurrency",
+    )
+
+    result = await agent.execute_task(task)
+
+    assert result.success is True
+    assert peak == 3
+    assert [t["scenario_id"] for t in result.result["test_cases"]] == [
+        f"REQ-{i:03d}" for i in range(1, 6)
+    ]
+    assert result.result["test_count"] == 5
+
+
+@pytest.mark.asyncio
+async def test_evolution_generates_repeated_scenarios_once():
+    agent = _agent(cache_enabled=True)
+    agent.use_llm = True
+    agent.llm_client = MagicMock()
+    calls = []
+
+    async def fake_generate(scenario, *args, **kwargs):
+        calls.append(scenario["scenario_id"])
+        await asyncio.sleep(0.01)
+        return {"steps": [f"step for {scenario['scenario_id']}"], "confidence": 0.9, "tokens_used": 10}
+
+    agent._generate_test_steps_with_llm = fake_generate
+    scenarios = [_scenario(1), _scenario(2), _scenario(1)]
+    task = TaskContext(
+        task_id="task-duplicates",
+        task_type="test_generation",
+        payload={
+            "scenarios": scenarios,
+            "risk_scores": [],
+            "final_prioritization": [],
+            "page_context": {"url": "https://example.com"},
+            "test_data": [],
+        },
+        conversation_id="conv-duplicates",
+    )
+
+    result = await agent.execute_task(task)
+
+    assert sorted(calls) == ["REQ-001", "REQ-002"]
+    cases = result.result["test_cases"]
+    assert [(t["scenario_id"], t["from_cache"]) for t in cases] == [
+        ("REQ-001", False), ("REQ-002", False), ("REQ-001", True)
+    ]
+    assert cases[2]["steps"] == cases[0]["steps"]
+    assert result.result["cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_evolution_does_not_report_cancelled_scenarios_as_failed(caplog):
+    agent = _agent(llm_max_concurrency=2)
+    agent.use_llm = True
+    agent.llm_client = MagicMock()
+
+    async def fake_generate(scenario, *args, **kwargs):
+        if scenario["scenario_id"] == "REQ-001":
+            raise RuntimeError("provider down")
+        await asyncio.sleep(1)
+
+    agent._generate_test_steps_with_llm = fake_generate
+    task = TaskContext(
+        task_id="task-abort",
+        task_type="test_generation",
+        payload={
+            "scenarios": [_scenario(i) for i in range(1, 4)],
+            "risk_scores": [],
+            "final_prioritization": [],
+            "page_context": {"url": "https://example.com"},
+            "test_data": [],
+        },
+        conversation_id="conv-abort",
+    )
+
+    with caplog.at_level("INFO", logger="agents.evolution_agent"):
+        result = await agent.execute_task(task)
+        await asyncio.sleep(0)  # Let the cancelled items unwind
+
+    assert result.success is False
+    assert "Failed to generate steps" not in caplog.text
+    assert "Generation cancelled for scenario REQ-002" in caplog.text
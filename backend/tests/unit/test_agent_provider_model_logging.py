@@ -5,7 +5,7 @@ These tests ensure the runtime logs clearly show which configured provider/model
 verified from server logs.
 """
 
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
@@ -27,9 +27,9 @@ async def test_requirements_agent_logs_provider_model_for_scenario_generation(ca
     mock_llm_client = MagicMock()
     mock_llm_client.enabled = True
     mock_llm_client.deployment = "nvidia/nemotron-nano-9b-v2:free"
-    mock_llm_client.client.chat.completions.create.return_value = _mock_llm_response_json(
+    mock_llm_client.async_client.chat.completions.create = AsyncMock(return_value=_mock_llm_response_json(
         '{"scenarios": [{"scenario_id": "REQ-LLM-001", "title": "Login flow", "given": "User is on page", "when": "User clicks login", "then": "User logs in", "priority": "high", "scenario_type": "functional", "confidence": 0.91}]}'
-    )
+    ))
 
     with patch("agents.requirements_agent.get_llm_client", return_value=mock_llm_client):
         agent = RequirementsAgent(
@@ -61,9 +61,9 @@ async def test_evolution_agent_logs_provider_model_for_step_generation(caplog):
     mock_llm_client = MagicMock()
     mock_llm_client.enabled = True
     mock_llm_client.deployment = "llama3.1-8b"
-    mock_llm_client.client.chat.completions.create.return_value = _mock_llm_response_json(
+    mock_llm_client.async_client.chat.completions.create = AsyncMock(return_value=_mock_llm_response_json(
         '{"steps": ["Navigate to https://example.com/login", "Click Login", "Verify: Journey completes successfully"]}'
-    )
+    ))
 
     with patch("llm.client_factory.get_llm_client", return_value=mock_llm_client):
         agent = EvolutionAgent(
@@ -452,7 +452,7 @@ async def test_llm_integration_mocked(analysis_agent):
             }
         ]
     })
-    analysis_agent.llm_client.client.chat.completions.create = Mock(return_value=mock_response)
+    analysis_agent.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
     
     scenarios = [{"scenario_id": "REQ-001", "scenario_type": "functional", "priority": "high"}]
     historical_data = {"failure_rates": {}, "bug_frequency": {}, "time_to_fix": {}}
@@ -474,7 +474,7 @@ async def test_llm_fallback_to_heuristics(analysis_agent):
     analysis_agent.llm_client = Mock()
     analysis_agent.llm_client.enabled = True
     analysis_agent.llm_client.client = Mock()
-    analysis_agent.llm_client.client.chat.completions.create = Mock(side_effect=Exception("LLM error"))
+    analysis_agent.llm_client.async_client.chat.completions.create = AsyncMock(side_effect=Exception("LLM error"))
     
     scenarios = [{"scenario_id": "REQ-001", "priority": "critical", "scenario_type": "functional"}]
     historical_data = {"failure_rates": {}, "bug_frequency": {}, "time_to_fix": {}}
@@ -1168,3 +1168,65 @@ async def test_final_prioritization_ranking(analysis_agent, sample_scenarios):
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
+
+
+@pytest.fixture
+def history_db():
+    """In-memory database with a rolled-up execution history"""
+    from datetime import datetime
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from app.crud import test_execution as crud_execution
+    from app.db.base import Base
+    from app.models.test_case import TestCase, TestType, Priority, TestStatus
+    from app.models.test_execution import ExecutionResult
+    from app.models.user import User
+
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = User(email="a@example.com", username="a", hashed_password="hash", role="user", is_active=True)
+    db.add(user)
+    db.commit()
+    cases = [
+        TestCase(title=f"Case {i}", description="d", test_type=TestType.E2E, priority=Priority.MEDIUM,
+                 status=TestStatus.PENDING, steps=["Step 1"], expected_result="ok", user_id=user.id)
+        for i in range(2)
+    ]
+    db.add_all(cases)
+    db.commit()
+    # Case 0: flaky (1 of 2 runs fails), case 1: always passes
+    for test_case, outcome, passed in ((cases[0], "pass", 10), (cases[0], "fail", 4), (cases[1], "pass", 10)):
+        execution = crud_execution.create_execution(db, test_case.id, user.id)
+        crud_execution.complete_execution(db, execution.id, ExecutionResult(outcome), total_steps=10, passed_steps=passed)
+    yield db, [c.id for c in cases]
+    db.close()
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_historical_success_rates_use_one_rollup_query(mock_message_queue, history_db):
+    """All scenarios share one batched history query, resolved per test case"""
+    from sqlalchemy import event
+
+    db, (flaky_case, stable_case) = history_db
+    agent = AnalysisAgent("analysis_1", "analysis", 5, mock_message_queue, {"use_llm": False, "db": db})
+    scenarios = [
+        {"scenario_id": f"REQ-{i}", "scenario_type": "functional", "test_case_id": case_id}
+        for i, case_id in enumerate([flaky_case, stable_case] * 15)
+    ]
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+    historical = await agent._load_historical_data(scenarios)
+    success = await agent._analyze_execution_success(scenarios)
+
+    assert len(statements) == 1
+    assert "julianday" not in statements[0]
+    assert historical["failure_rates"]["functional"] == pytest.approx(1 / 3)
+    assert historical["scenario_failure_rates"]["REQ-0"] == 0.5
+    assert historical["scenario_failure_rates"]["REQ-1"] == 0.0
+    assert success[0]["success_rate"] == 0.7 and success[0]["reliability"] == "medium"
+    assert success[1]["success_rate"] == 1.0 and success[1]["total_steps"] == 10
+    assert all(s["source"] == "historical_data" for s in success)
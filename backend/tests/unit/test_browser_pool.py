@@ -0,0 +1,134 @@
+"""
+Unit tests for the warm browser pool (browser_pool.py) and ExecutionService leases.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.browser_pool import BrowserPool
+from app.services.execution_service import ExecutionService, ExecutionConfig
+
+
+def _make_browser():
+    browser = MagicMock()
+    browser.is_connected = MagicMock(return_value=True)
+    browser.close = AsyncMock()
+    context = AsyncMock()
+    context.set_default_timeout = MagicMock()
+    context.close = AsyncMock()
+    browser.new_context = AsyncMock(return_value=context)
+    return browser
+
+
+@pytest.fixture
+def mock_playwright():
+    """Patch async_playwright so each launch returns a fresh mock browser."""
+    pw = MagicMock()
+    pw.stop = AsyncMock()
+    pw.chromium.launch = AsyncMock(side_effect=lambda **kwargs: _make_browser())
+    starter = MagicMock()
+    starter.start = AsyncMock(return_value=pw)
+    with patch("app.services.browser_pool.async_playwright", return_value=starter):
+        yield pw
+
+
+@pytest.fixture
+def pool():
+    p = BrowserPool(size=2, max_uses=3, max_rss_mb=0)
+    yield p
+    p.shutdown()
+
+
+def test_acquire_launches_once_and_reuses_warm_browser(mock_playwright, pool):
+    lease = pool.acquire(headless=True)
+    first_browser = lease.browser
+    pool.release(lease)
+
+    lease = pool.acquire(headless=True)
+    assert lease.browser is first_browser
+    assert lease.uses == 2
+    assert mock_playwright.chromium.launch.await_count == 1
+    pool.release(lease)
+
+
+def test_each_slot_gets_its_own_cdp_port(mock_playwright, pool):
+    with patch("app.services.execution_service._find_free_port", side_effect=[41001, 41002]):
+        a = pool.acquire(headless=True)
+        b = pool.acquire(headless=True)
+
+    assert {a.cdp_port, b.cdp_port} == {41001, 41002}
+    launch_args = [c.kwargs["args"][0] for c in mock_playwright.chromium.launch.await_args_list]
+    assert sorted(launch_args) == ["--remote-debugging-port=41001", "--remote-debugging-port=41002"]
+    pool.release(a)
+    pool.release(b)
+
+
+def test_release_recycles_after_max_uses(mock_playwright, pool):
+    for _ in range(3):
+        lease = pool.acquire(headless=True)
+        browser = lease.browser
+        pool.release(lease)
+
+    browser.close.assert_awaited_once()
+    assert lease.browser is None
+    assert pool.get_statistics()["recycle_count"] == 1
+
+    lease = pool.acquire(headless=True)
+    assert lease.browser is not browser
+    assert lease.uses == 1
+    pool.release(lease)
+
+
+def test_disconnected_browser_is_relaunched_on_acquire(mock_playwright, pool):
+    lease = pool.acquire(headless=True)
+    dead = lease.browser
+    pool.release(lease)
+    dead.is_connected.return_value = False
+
+    lease = pool.acquire(headless=True)
+    assert lease.browser is not dead
+    assert mock_playwright.chromium.launch.await_count == 2
+    pool.release(lease)
+
+
+def test_headless_mismatch_relaunches(mock_playwright, pool):
+    lease = pool.acquire(headless=True)
+    pool.release(lease)
+
+    lease = pool.acquire(headless=False)
+    assert lease.headless is False
+    assert mock_playwright.chromium.launch.await_args.kwargs["headless"] is False
+    pool.release(lease)
+
+
+def test_release_recycles_when_rss_over_threshold(mock_playwright):
+    pool = BrowserPool(size=1, max_uses=0, max_rss_mb=100)
+    try:
+        lease = pool.acquire(headless=True)
+        browser = lease.browser
+        with patch.object(lease, "rss_bytes", return_value=200 * 1024 * 1024):
+            pool.release(lease)
+        browser.close.assert_awaited_once()
+    finally:
+        pool.shutdown()
+
+
+def test_execution_service_with_lease_keeps_browser_open(mock_playwright, pool):
+    lease = pool.acquire(headless=True)
+    browser = lease.browser
+    service = ExecutionService(ExecutionConfig(headless=True), browser_lease=lease)
+
+    async def run():
+        await service.initialize()
+        assert service.browser is browser
+        assert service._cdp_port == lease.cdp_port
+        context = await service.create_context()
+        await service.cleanup()
+        return context
+
+    context = lease.run(run())
+
+    context.close.assert_awaited_once()
+    browser.close.assert_not_awaited()
+    mock_playwright.stop.assert_not_awaited()
+    assert mock_playwright.chromium.launch.await_count == 1
+    pool.release(lease)
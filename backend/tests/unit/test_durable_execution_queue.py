@@ -0,0 +1,265 @@
+"""
+Unit tests for the durable DB-backed execution queue (leases, heartbeats, reclaim).
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.test_case import TestCase, TestType, Priority, TestStatus
+from app.models.test_execution import TestExecution, ExecutionStatus
+from app.models.user import User
+from app.services.durable_execution_queue import DatabaseExecutionQueue, InlineCredentialsRejected
+from app.services.execution_cancel_store import clear_cancel, is_cancel_requested
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    yield factory
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def test_case_id(session_factory) -> int:
+    db = session_factory()
+    user = User(email="w@example.com", username="w", hashed_password="hash", role="user", is_active=True)
+    db.add(user)
+    db.commit()
+    tc = TestCase(
+        title="Queue test",
+        description="desc",
+        test_type=TestType.E2E,
+        priority=Priority.MEDIUM,
+        status=TestStatus.PENDING,
+        steps=["Step 1"],
+        expected_result="ok",
+        user_id=user.id,
+    )
+    db.add(tc)
+    db.commit()
+    tc_id = tc.id
+    db.close()
+    return tc_id
+
+
+def _queue(session_factory, worker_id, **kwargs) -> DatabaseExecutionQueue:
+    return DatabaseExecutionQueue(
+        max_concurrent=2, worker_id=worker_id, session_factory=session_factory, **kwargs
+    )
+
+
+def _enqueue(queue: DatabaseExecutionQueue, test_case_id: int, priority: int = 5, **kwargs) -> int:
+    db: Session = queue._session_factory()
+    execution = TestExecution(test_case_id=test_case_id, user_id=1, status=ExecutionStatus.PENDING)
+    db.add(execution)
+    db.commit()
+    execution_id = execution.id
+    db.close()
+    queue.add_to_queue(execution_id, test_case_id, 1, priority=priority, **kwargs)
+    return execution_id
+
+
+def _row(session_factory, execution_id: int) -> TestExecution:
+    db = session_factory()
+    row = db.query(TestExecution).filter(TestExecution.id == execution_id).first()
+    db.expunge(row)
+    db.close()
+    return row
+
+
+def _expire(session_factory, execution_id: int):
+    db = session_factory()
+    db.query(TestExecution).filter(TestExecution.id == execution_id).update(
+        {TestExecution.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+    db.close()
+
+
+def test_claims_in_priority_then_fifo_order_with_positions(session_factory, test_case_id):
+    q = _queue(session_factory, "w1")
+    low = _enqueue(q, test_case_id, priority=10)
+    first = _enqueue(q, test_case_id, priority=5)
+    second = _enqueue(q, test_case_id, priority=5)
+    high = _enqueue(q, test_case_id, priority=1)
+
+    assert [q.get_queue_position(eid) for eid in (high, first, second, low)] == [1, 2, 3, 4]
+    assert q.get_queue_size() == 4
+
+    order = [q.get_next_execution().execution_id for _ in range(4)]
+    assert order == [high, first, second, low]
+    assert q.get_next_execution() is None
+
+    row = _row(session_factory, high)
+    assert row.status == ExecutionStatus.RUNNING
+    assert row.lease_owner == "w1"
+    assert row.claim_count == 1
+
+
+def test_row_is_claimed_by_only_one_worker(session_factory, test_case_id):
+    q1 = _queue(session_factory, "w1")
+    q2 = _queue(session_factory, "w2")
+    execution_id = _enqueue(q1, test_case_id)
+
+    assert q1.get_next_execution().execution_id == execution_id
+    assert q2.get_next_execution() is None
+
+
+def test_remove_from_queue_prevents_claim(session_factory, test_case_id):
+    q = _queue(session_factory, "w1")
+    execution_id = _enqueue(q, test_case_id)
+
+    assert q.remove_from_queue(execution_id) is True
+    assert q.remove_from_queue(execution_id) is False
+    assert q.get_next_execution() is None
+    assert _row(session_factory, execution_id).status == ExecutionStatus.CANCELLED
+
+
+def test_expired_lease_is_requeued_for_another_worker(session_factory, test_case_id):
+    dead = _queue(session_factory, "dead")
+    alive = _queue(session_factory, "alive")
+    execution_id = _enqueue(dead, test_case_id)
+    dead.get_next_execution()
+
+    assert alive.reclaim_expired() == {"requeued": 0, "failed": 0}
+    _expire(session_factory, execution_id)
+    assert alive.reclaim_expired() == {"requeued": 1, "failed": 0}
+
+    claimed = alive.get_next_execution()
+    assert claimed.execution_id == execution_id
+    row = _row(session_factory, execution_id)
+    assert row.lease_owner == "alive"
+    assert row.claim_count == 2
+
+
+def test_expired_lease_fails_after_max_claims(session_factory, test_case_id):
+    q = _queue(session_factory, "w1", max_claims=1)
+    execution_id = _enqueue(q, test_case_id)
+    q.get_next_execution()
+    _expire(session_factory, execution_id)
+
+    assert q.reclaim_expired() == {"requeued": 0, "failed": 1}
+    assert _row(session_factory, execution_id).status == ExecutionStatus.FAILED
+
+
+def test_inline_credentials_pin_run_to_enqueuing_worker(session_factory, test_case_id):
+    owner = _queue(session_factory, "owner")
+    other = _queue(session_factory, "other")
+    creds = {"username": "u", "password": "p"}
+    execution_id = _enqueue(owner, test_case_id, login_credentials=creds)
+
+    assert other.get_next_execution() is None
+    claimed = owner.get_next_execution()
+    assert claimed.login_credentials == creds
+
+    # Credentials are never written to the row
+    row = _row(session_factory, execution_id)
+    assert "p" not in (row.trigger_details or "")
+    assert row.pinned_to_worker is True
+
+
+def test_pinned_run_fails_when_its_worker_dies(session_factory, test_case_id):
+    owner = _queue(session_factory, "owner")
+    other = _queue(session_factory, "other")
+    execution_id = _enqueue(owner, test_case_id, http_credentials={"username": "u", "password": "p"})
+    _expire(session_factory, execution_id)
+
+    assert other.reclaim_expired() == {"requeued": 0, "failed": 1}
+    row = _row(session_factory, execution_id)
+    assert row.status == ExecutionStatus.FAILED
+    assert "owner" in row.error_message
+
+
+def test_enqueue_only_process_rejects_inline_credentials(session_factory, test_case_id):
+    api = _queue(session_factory, "api", dispatches=False)
+
+    with pytest.raises(InlineCredentialsRejected):
+        _enqueue(api, test_case_id, login_credentials={"username": "u", "password": "p"})
+
+    db = session_factory()
+    row = db.query(TestExecution).one()
+    db.close()
+    assert row.status == ExecutionStatus.FAILED
+    assert row.lease_owner is None and row.queued_at is None
+    assert "RUN_QUEUE_WORKER_IN_API" in row.error_message
+    # Runs without ephemeral credentials are still queued for the workers
+    assert _row(session_factory, _enqueue(api, test_case_id)).status == ExecutionStatus.PENDING
+
+
+def test_heartbeat_only_renews_rows_the_worker_runs_or_holds(session_factory, test_case_id):
+    q = _queue(session_factory, "w1")
+    held = _enqueue(q, test_case_id, http_credentials={"username": "u", "password": "p"})
+    stray = _enqueue(q, test_case_id)
+    _expire(session_factory, held)
+    # A pending row leased to this worker it does not hold credentials for
+    db = session_factory()
+    db.query(TestExecution).filter(TestExecution.id == stray).update(
+        {TestExecution.lease_owner: "w1", TestExecution.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+    db.close()
+
+    q.heartbeat()
+
+    assert _row(session_factory, held).lease_expires_at > datetime.utcnow()
+    assert _row(session_factory, stray).lease_expires_at < datetime.utcnow()
+
+
+def test_heartbeat_renews_lease_and_propagates_cancel(session_factory, test_case_id):
+    q = _queue(session_factory, "w1", lease_seconds=30)
+    execution_id = _enqueue(q, test_case_id)
+    q.mark_as_active(q.get_next_execution())
+    _expire(session_factory, execution_id)
+
+    db = session_factory()
+    db.query(TestExecution).filter(TestExecution.id == execution_id).update(
+        {TestExecution.cancel_requested: True}
+    )
+    db.commit()
+    db.close()
+
+    clear_cancel(execution_id)
+    assert q.heartbeat() == []
+    assert _row(session_factory, execution_id).lease_expires_at > datetime.utcnow()
+    assert is_cancel_requested(execution_id)
+    clear_cancel(execution_id)
+
+
+def test_lost_lease_cancels_local_run(session_factory, test_case_id):
+    q = _queue(session_factory, "w1")
+    execution_id = _enqueue(q, test_case_id)
+    q.mark_as_active(q.get_next_execution())
+
+    db = session_factory()
+    db.query(TestExecution).filter(TestExecution.id == execution_id).update(
+        {TestExecution.lease_owner: "w2"}
+    )
+    db.commit()
+    db.close()
+
+    clear_cancel(execution_id)
+    assert q.heartbeat() == [execution_id]
+    assert is_cancel_requested(execution_id)
+    clear_cancel(execution_id)
+
+
+def test_mark_as_complete_releases_lease(session_factory, test_case_id):
+    q = _queue(session_factory, "w1")
+    execution_id = _enqueue(q, test_case_id)
+    q.mark_as_active(q.get_next_execution())
+    assert q.get_active_count() == 1
+    assert q.get_queue_status()["active"][0]["worker_id"] == "w1"
+
+    assert q.mark_as_complete(execution_id) is True
+    assert q.get_active_count() == 0
+    assert _row(session_factory, execution_id).lease_owner is None
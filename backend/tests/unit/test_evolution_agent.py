@@ -142,7 +142,7 @@ class TestEvolutionAgentCodeGeneration:
         mock_response.usage.total_tokens = 500
 
         import asyncio as _asyncio
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = MagicMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
 
         result = await evolution_agent_with_llm._generate_test_steps_with_llm(
             sample_bdd_scenario,
@@ -223,7 +223,7 @@ class TestEvolutionAgentCaching:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 500
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         result1 = await evolution_agent_with_llm.execute_task(sample_task_context)
         assert result1.success is True
@@ -237,7 +237,7 @@ class TestEvolutionAgentCaching:
         assert result2.result["cache_misses"] == 0
         
         # LLM should not be called on second run
-        assert evolution_agent_with_llm.llm_client.client.chat.completions.create.call_count == 1
+        assert evolution_agent_with_llm.llm_client.async_client.chat.completions.create.call_count == 1
 
 
 class TestEvolutionAgentExecuteTask:
@@ -252,7 +252,7 @@ class TestEvolutionAgentExecuteTask:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 500
 
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = MagicMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
 
         result = await evolution_agent_with_llm.execute_task(sample_task_context)
 
@@ -281,7 +281,7 @@ class TestEvolutionAgentExecuteTask:
     @pytest.mark.asyncio
     async def test_execute_task_llm_failure_fallback(self, evolution_agent_with_llm, sample_task_context):
         """Test fallback to template when LLM fails"""
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = MagicMock(side_effect=Exception("LLM error"))
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(side_effect=Exception("LLM error"))
 
         result = await evolution_agent_with_llm.execute_task(sample_task_context)
 
@@ -183,7 +183,7 @@ class TestEvolutionAgentStepGeneration:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 500
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = MagicMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         result = await evolution_agent_with_llm._generate_test_steps_with_llm(
             sample_bdd_scenario,
@@ -219,7 +219,7 @@ class TestEvolutionAgentStepGeneration:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 400
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = MagicMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         result = await evolution_agent_with_llm._generate_test_steps_with_llm(
             sample_bdd_scenario,
@@ -239,7 +239,7 @@ class TestEvolutionAgentStepGeneration:
     @pytest.mark.asyncio
     async def test_generate_steps_llm_fallback_to_template(self, evolution_agent_with_llm, sample_bdd_scenario):
         """Test fallback to template when LLM fails"""
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = MagicMock(side_effect=Exception("LLM error"))
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(side_effect=Exception("LLM error"))
         
         result = await evolution_agent_with_llm._generate_test_steps_with_llm(
             sample_bdd_scenario,
@@ -266,7 +266,7 @@ class TestEvolutionAgentStepGeneration:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 200
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = MagicMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         result = await evolution_agent_with_llm._generate_test_steps_with_llm(
             sample_bdd_scenario,
@@ -380,7 +380,7 @@ class TestEvolutionAgentCaching:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 500
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = MagicMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         # First generation (cache miss)
         result1 = await evolution_agent_with_llm.execute_task(sample_task_context)
@@ -395,7 +395,7 @@ class TestEvolutionAgentCaching:
         assert result2.result["cache_misses"] == 0
         
         # LLM should only be called once
-        assert evolution_agent_with_llm.llm_client.client.chat.completions.create.call_count == 1
+        assert evolution_agent_with_llm.llm_client.async_client.chat.completions.create.call_count == 1
     
     def test_cache_disabled(self, evolution_agent_no_llm, sample_bdd_scenario):
         """Test that cache is not used when disabled"""
@@ -455,7 +455,7 @@ class TestEvolutionAgentDatabaseStorage:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 300
         
-        evolution_agent_with_db.llm_client.client.chat.completions.create = MagicMock(return_value=mock_response)
+        evolution_agent_with_db.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         # Mock TestCase model (imported inside the method)
         with patch('app.models.test_case.TestCase') as MockTestCase:
@@ -551,7 +551,7 @@ class TestEvolutionAgentExecuteTask:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 400
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = MagicMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         result = await evolution_agent_with_llm.execute_task(sample_task_context)
         
@@ -618,7 +618,7 @@ class TestEvolutionAgentExecuteTask:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 300
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = MagicMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         result = await evolution_agent_with_llm.execute_task(task)
         
@@ -675,7 +675,7 @@ class TestEvolutionAgentErrorHandling:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 200
         
-        evolution_agent_with_db.llm_client.client.chat.completions.create = MagicMock(return_value=mock_response)
+        evolution_agent_with_db.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         # Make database commit fail
         mock_db_session.commit.side_effect = Exception("Database error")
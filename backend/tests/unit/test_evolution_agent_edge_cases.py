@@ -70,7 +70,7 @@ class TestEvolutionAgentEdgeCases:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 200
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         task = TaskContext(
             conversation_id="test-large",
@@ -112,7 +112,7 @@ class TestEvolutionAgentEdgeCases:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 200
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         task = TaskContext(
             conversation_id="test-special",
@@ -155,7 +155,7 @@ class TestEvolutionAgentEdgeCases:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 200
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         task = TaskContext(
             conversation_id="test-long",
@@ -216,7 +216,7 @@ class TestEvolutionAgentEdgeCases:
         }
         
         # Mock LLM to raise network error
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = AsyncMock(
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(
             side_effect=Exception("Network timeout")
         )
         
@@ -269,7 +269,7 @@ class TestEvolutionAgentPerformance:
         mock_response.usage = MagicMock()
         mock_response.usage.total_tokens = 200
         
-        evolution_agent_with_llm.llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        evolution_agent_with_llm.llm_client.async_client.chat.completions.create = AsyncMock(return_value=mock_response)
         
         task = TaskContext(
             conversation_id="test-concurrent",
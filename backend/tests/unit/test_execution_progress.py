@@ -0,0 +1,188 @@
+"""
+Unit tests for the v1 execution progress stream (callback, DB catch-up, SSE generator).
+"""
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.v1.endpoints.executions import _execution_event_stream
+from app.crud import test_execution as crud
+from app.db.base import Base
+from app.models.test_case import TestCase, TestType, Priority, TestStatus
+from app.models.test_execution import ExecutionResult
+from app.models.user import User
+from app.services import progress_tracker as progress_module
+from app.services.execution_progress import execution_progress_callback, execution_snapshot_events
+from app.services.execution_service import ExecutionService
+from app.services.progress_tracker import ProgressTracker, TERMINAL_EXECUTION_EVENTS
+from app.services.three_tier_execution_service import ThreeTierExecutionService
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = ProgressTracker(terminal_events=TERMINAL_EXECUTION_EVENTS)
+    monkeypatch.setattr(progress_module, "_execution_tracker", tracker)
+    return tracker
+
+
+@pytest.fixture
+def execution(db):
+    user = User(email="u@example.com", username="u", hashed_password="hash", role="user", is_active=True)
+    db.add(user)
+    db.commit()
+    case = TestCase(
+        title="Case",
+        description="desc",
+        test_type=TestType.E2E,
+        priority=Priority.MEDIUM,
+        status=TestStatus.PENDING,
+        steps=["Step 1", "Step 2", "Step 3"],
+        expected_result="ok",
+        user_id=user.id,
+    )
+    db.add(case)
+    db.commit()
+    execution = crud.create_execution(db, case.id, user.id)
+    for number in (1, 2):
+        crud.create_execution_step(
+            db, execution.id, number, f"Step {number}",
+            screenshot_path=f"shots/{number}.png" if number == 2 else None,
+            duration_seconds=1.5,
+        )
+    return execution
+
+
+async def _collect(tracker, key, keepalive_interval=0.05):
+    return [event async for event in tracker.subscribe(key, keepalive_interval=keepalive_interval)]
+
+
+@pytest.mark.asyncio
+async def test_callback_emits_typed_events(tracker):
+    callback = execution_progress_callback(7)
+
+    await callback({"status": "running", "message": "Starting test execution"})
+    await callback({"event": "step_started", "step": 1, "total_steps": 2})
+    await callback({"status": "completed", "result": "pass"})
+    events = await _collect(tracker, "7")
+
+    assert [e["event"] for e in events] == ["execution_started", "step_started", "execution_finished"]
+    assert "event" not in events[1]["data"]
+    assert events[1]["data"]["step"] == 1
+
+
+def test_snapshot_respects_from_step_and_status(db, execution):
+    events = execution_snapshot_events(db, execution, from_step=1)
+
+    assert [(e["event"], e["data"]["step"]) for e in events] == [("screenshot_ready", 2), ("step_finished", 2)]
+    assert events[0]["data"]["screenshot_path"] == "shots/2.png"
+    assert events[1]["data"]["result"] == "pass"
+
+    crud.complete_execution(db, execution.id, ExecutionResult.PASS, total_steps=2, passed_steps=2)
+    events = execution_snapshot_events(db, execution, from_step=2)
+
+    assert [e["event"] for e in events] == ["execution_finished"]
+    assert events[0]["data"]["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_emit_from_worker_thread_wakes_subscriber(tracker):
+    subscriber = asyncio.create_task(_collect(tracker, "9", keepalive_interval=5))
+    await asyncio.sleep(0.01)
+
+    def worker():
+        callback = execution_progress_callback(9)
+        asyncio.run(callback({"event": "execution_finished", "status": "completed"}))
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    events = await asyncio.wait_for(subscriber, timeout=1)
+
+    assert [e["event"] for e in events] == ["execution_finished"]
+
+
+@pytest.mark.asyncio
+async def test_stream_skips_live_steps_already_in_snapshot(db, execution, tracker):
+    callback = execution_progress_callback(execution.id)
+    await callback({"event": "step_finished", "step": 2, "result": "pass"})
+    await callback({"event": "step_started", "step": 3})
+    await callback({"event": "execution_finished", "status": "completed"})
+    snapshot = execution_snapshot_events(db, execution)
+
+    chunks = [
+        chunk.decode()
+        async for chunk in _execution_event_stream(execution.id, tracker, snapshot, 0, 0, follow=True)
+    ]
+
+    assert [c.split("event: ")[1].split("\n")[0] for c in chunks] == [
+        "step_finished", "screenshot_ready", "step_finished", "step_started", "execution_finished",
+    ]
+    assert not chunks[0].startswith("id:")
+    assert chunks[3].startswith("id: 2\n")
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_tier_fallback_with_its_step_number(db, execution, tracker):
+    callback = execution_progress_callback(execution.id)
+    service = ThreeTierExecutionService.__new__(ThreeTierExecutionService)
+
+    async def on_tier_fallback(info):
+        await callback({"event": "tier_fallback", "execution_id": execution.id, **info})
+
+    service.on_tier_fallback = on_tier_fallback
+    # Step 3 runs with the 0-based step_index 2, as ExecutionService passes it
+    await callback({"event": "step_started", "step": 3})
+    await service._notify_tier_fallback(2, 1, 2, "Timeout after 5000ms")
+    await callback({"event": "execution_finished", "status": "completed"})
+    snapshot = execution_snapshot_events(db, execution)
+
+    chunks = [
+        chunk.decode()
+        async for chunk in _execution_event_stream(execution.id, tracker, snapshot, 0, 0, follow=True)
+    ]
+    live = {
+        c.split("event: ")[1].split("\n")[0]: c for c in chunks if c.startswith("id:")
+    }
+
+    assert list(live) == ["step_started", "tier_fallback", "execution_finished"]
+    assert '"step": 3' in live["step_started"]
+    assert '"step": 3' in live["tier_fallback"]
+
+
+@pytest.mark.asyncio
+async def test_report_step_finished_payload():
+    updates = []
+
+    async def callback(update):
+        updates.append(update)
+
+    service = ExecutionService.__new__(ExecutionService)
+    await service._report_step_finished(
+        callback, 5, 3, ExecutionResult.FAIL, 2.34567, "shots/3.png", error="not found", tier=2,
+    )
+
+    assert updates == [
+        {"event": "screenshot_ready", "execution_id": 5, "step": 3, "screenshot_path": "shots/3.png"},
+        {
+            "event": "step_finished", "execution_id": 5, "step": 3, "result": "fail",
+            "duration_seconds": 2.346, "error": "not found", "tier": 2,
+        },
+    ]
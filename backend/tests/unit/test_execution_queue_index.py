@@ -0,0 +1,143 @@
+"""
+Unit tests for the indexed ExecutionQueue (heap + id index with lazy deletion).
+"""
+import random
+
+from app.services.execution_queue import ExecutionQueue
+
+
+def _fill(q, items):
+    """items: list of (execution_id, priority)."""
+    return [q.add_to_queue(eid, test_case_id=eid, user_id=1, priority=p) for eid, p in items]
+
+
+def test_add_returns_real_positions_by_priority_then_fifo():
+    q = ExecutionQueue()
+    positions = _fill(q, [(1, 5), (2, 5), (3, 1), (4, 10), (5, 5)])
+
+    # 3 jumps ahead of the two medium runs; 5 lands behind 1, 2 and 3 but ahead of 4
+    assert positions == [1, 2, 1, 4, 4]
+    assert [q.get_queue_position(eid) for eid in (3, 1, 2, 5, 4)] == [1, 2, 3, 4, 5]
+
+
+def test_get_next_execution_is_priority_ordered_and_fifo_within_priority():
+    q = ExecutionQueue()
+    _fill(q, [(1, 5), (2, 1), (3, 5), (4, 1)])
+
+    order = [q.get_next_execution().execution_id for _ in range(4)]
+    assert order == [2, 4, 1, 3]
+    assert q.get_next_execution() is None
+
+
+def test_remove_from_queue_is_lazy_and_updates_positions():
+    q = ExecutionQueue()
+    _fill(q, [(1, 5), (2, 5), (3, 5)])
+
+    assert q.remove_from_queue(2) is True
+    assert q.remove_from_queue(2) is False
+    assert q.get_queue_size() == 2
+    assert q.get_queue_position(2) is None
+    assert q.get_queue_position(3) == 2
+
+    assert [q.get_next_execution().execution_id for _ in range(2)] == [1, 3]
+    assert q.get_next_execution() is None
+
+
+def test_re_adding_queued_execution_replaces_old_entry():
+    q = ExecutionQueue()
+    _fill(q, [(1, 5), (2, 5)])
+    assert q.add_to_queue(1, test_case_id=1, user_id=1, priority=1) == 1
+
+    assert q.get_queue_size() == 2
+    assert [q.get_next_execution().execution_id for _ in range(2)] == [1, 2]
+    assert q.get_next_execution() is None
+
+
+def test_queue_status_lists_items_in_order_without_draining():
+    q = ExecutionQueue()
+    _fill(q, [(1, 10), (2, 5), (3, 1)])
+
+    status = q.get_queue_status()
+    assert status["queued_count"] == 3
+    assert [(i["execution_id"], i["queue_position"]) for i in status["queue"]] == [
+        (3, 1), (2, 2), (1, 3)
+    ]
+    assert q.get_queue_size() == 3
+
+    limited = q.get_queue_status(limit=2)
+    assert [i["execution_id"] for i in limited["queue"]] == [3, 2]
+    assert limited["queued_count"] == 3
+
+
+def test_heap_is_compacted_after_many_cancels():
+    q = ExecutionQueue()
+    _fill(q, [(eid, 5) for eid in range(1000)])
+    for eid in range(999):
+        q.remove_from_queue(eid)
+
+    assert len(q._heap) < 100
+    assert len(q._lanes[5].seqs) < 100
+    assert q.get_queue_position(999) == 1
+    assert q.get_next_execution().execution_id == 999
+    assert q._lanes == {}
+
+
+def test_positions_match_a_naive_queue_under_random_churn():
+    rng = random.Random(7)
+    q = ExecutionQueue()
+    expected = []  # [(priority, execution_id)] in queue order
+
+    for eid in range(2000):
+        op = rng.random()
+        if op < 0.5 or not expected:
+            priority = rng.choice((1, 5, 10))
+            q.add_to_queue(eid, test_case_id=eid, user_id=1, priority=priority)
+            expected.append((priority, eid))
+            expected.sort(key=lambda item: item[0])  # stable: FIFO within priority
+        elif op < 0.8:
+            _, victim = rng.choice(expected)
+            assert q.remove_from_queue(victim) is True
+            expected = [item for item in expected if item[1] != victim]
+        else:
+            assert q.get_next_execution().execution_id == expected.pop(0)[1]
+
+        if eid % 100 == 0:
+            assert [q.get_queue_position(e) for _, e in expected] == list(
+                range(1, len(expected) + 1)
+            )
+
+    status = q.get_queue_status()
+    assert [i["execution_id"] for i in status["queue"]] == [e for _, e in expected]
+
+
+def test_clear_queue_resets_index():
+    q = ExecutionQueue()
+    _fill(q, [(1, 5), (2, 1)])
+    assert q.clear_queue() == 2
+    assert q.get_queue_position(1) is None
+    assert q.get_next_execution() is None
+    assert q.add_to_queue(3, test_case_id=3, user_id=1) == 1
+
+
+def test_clear_queue_notifies_finish_listeners():
+    q = ExecutionQueue()
+    finished = []
+    q.add_finish_listener(finished.append)
+    _fill(q, [(1, 5), (2, 1)])
+
+    q.clear_queue()
+
+    assert sorted(finished) == [1, 2]
+
+
+def test_re_queueing_keeps_original_queued_at():
+    q = ExecutionQueue()
+    _fill(q, [(1, 5)])
+    first_queued_at = q.get_next_execution().queued_at
+
+    # A dispatcher that fails to start the run hands back its enqueue time
+    q.add_to_queue(1, test_case_id=1, user_id=1, queued_at=first_queued_at)
+    # Replacing a still-queued entry keeps it too
+    q.add_to_queue(1, test_case_id=1, user_id=1, priority=1)
+
+    assert q.get_next_execution().queued_at == first_queued_at
@@ -0,0 +1,187 @@
+"""
+Unit tests for the execution_stats_daily rollup behind /executions/stats.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.crud import test_case as crud_test_case
+from app.crud import test_execution as crud
+from app.db.base import Base
+from app.models.test_case import TestCase, TestType, Priority, TestStatus
+from app.models.test_execution import ExecutionStatsDaily, ExecutionResult, TestExecution
+from app.models.user import User
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def ids(db):
+    users = [
+        User(email=f"u{i}@example.com", username=f"u{i}", hashed_password="hash", role="user", is_active=True)
+        for i in range(2)
+    ]
+    db.add_all(users)
+    db.commit()
+    cases = [
+        TestCase(
+            title=f"Case {i}",
+            description="desc",
+            test_type=TestType.E2E,
+            priority=Priority.MEDIUM,
+            status=TestStatus.PENDING,
+            steps=["Step 1"],
+            expected_result="ok",
+            user_id=users[0].id,
+        )
+        for i in range(2)
+    ]
+    db.add_all(cases)
+    db.commit()
+    return [u.id for u in users], [c.id for c in cases]
+
+
+def _run(db, test_case_id, user_id, days_ago=0, browser="chromium", outcome="pass", duration=10):
+    execution = crud.create_execution(db, test_case_id, user_id, browser=browser)
+    execution.created_at = datetime.utcnow() - timedelta(days=days_ago)
+    execution.started_at = datetime.utcnow() - timedelta(seconds=duration)
+    db.commit()
+    if outcome == "pending":
+        return execution.id
+    if outcome == "error":
+        crud.fail_execution(db, execution.id, "boom")
+    else:
+        crud.complete_execution(db, execution.id, ExecutionResult(outcome), total_steps=1)
+    return execution.id
+
+
+def _history(db, ids):
+    (alice, bob), (case_a, case_b) = ids
+    _run(db, case_a, alice, days_ago=40)
+    _run(db, case_a, alice, days_ago=20, outcome="fail")
+    _run(db, case_b, alice, days_ago=5, browser="firefox")
+    _run(db, case_a, bob, days_ago=3, outcome="error")
+    _run(db, case_b, bob, days_ago=0)
+    _run(db, case_a, alice, days_ago=60, outcome="pending")
+
+
+def test_stats_match_expected_totals(db, ids):
+    _history(db, ids)
+    stats = crud.get_execution_statistics(db)
+
+    assert stats["total_executions"] == 6
+    assert stats["by_status"] == {"pending": 1, "running": 0, "completed": 4, "failed": 1, "cancelled": 0}
+    assert stats["by_result"] == {"pass": 3, "fail": 1, "error": 1, "skip": 0}
+    assert stats["by_browser"] == {"chromium": 5, "firefox": 1}
+    assert stats["by_environment"] == {"dev": 6}
+    assert stats["pass_rate"] == 75.0
+    assert stats["average_duration_seconds"] == pytest.approx(10.0, abs=0.5)
+    assert stats["executions_last_24h"] == 1
+    assert stats["executions_last_7d"] == 3
+    assert stats["executions_last_30d"] == 4
+    assert stats["most_executed_tests"][0] == {"test_case_id": ids[1][0], "execution_count": 4}
+
+
+def test_stats_use_two_queries_regardless_of_history(db, ids):
+    _history(db, ids)
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+    crud.get_execution_statistics(db)
+
+    assert len(statements) == 2
+
+
+def test_user_filter_applies_to_rollup_and_live_rows(db, ids):
+    _history(db, ids)
+    (alice, bob), _ = ids
+
+    assert crud.get_execution_statistics(db, user_id=alice)["total_executions"] == 4
+    bob_stats = crud.get_execution_statistics(db, user_id=bob)
+    assert bob_stats["total_executions"] == 2
+    assert bob_stats["by_result"]["error"] == 1
+
+
+def test_incremental_rollup_matches_rebuild(db, ids):
+    (alice, _), (case_a, _) = ids
+    for days_ago, outcome in ((10, "pass"), (10, "fail"), (9, "pass")):
+        execution = crud.create_execution(db, case_a, alice)
+        execution.created_at = datetime.utcnow() - timedelta(days=days_ago)
+        db.commit()
+        crud.complete_execution(db, execution.id, ExecutionResult(outcome))
+
+    incremental = sorted(
+        (r.day, r.status, r.result, r.execution_count) for r in db.query(ExecutionStatsDaily)
+    )
+    crud.rebuild_execution_stats(db)
+    rebuilt = sorted(
+        (r.day, r.status, r.result, r.execution_count) for r in db.query(ExecutionStatsDaily)
+    )
+
+    assert incremental == rebuilt
+    assert sum(row[3] for row in rebuilt) == 3
+
+
+def test_refinishing_moves_bucket_instead_of_double_counting(db, ids):
+    (alice, _), (case_a, _) = ids
+    execution = crud.create_execution(db, case_a, alice)
+    execution.created_at = datetime.utcnow() - timedelta(days=10)
+    db.commit()
+
+    crud.cancel_execution(db, execution.id)
+    crud.complete_execution(db, execution.id, ExecutionResult.PASS)
+
+    stats = crud.get_execution_statistics(db)
+    assert stats["total_executions"] == 1
+    assert stats["by_status"]["cancelled"] == 0
+    assert stats["by_result"]["pass"] == 1
+
+
+def test_deletes_remove_rollup_counts(db, ids):
+    _history(db, ids)
+    (_, _), (case_a, case_b) = ids
+    old_b = db.query(TestExecution).filter(TestExecution.test_case_id == case_b).order_by(TestExecution.id).first()
+
+    crud.delete_execution(db, old_b.id)
+    assert crud.get_execution_statistics(db)["total_executions"] == 5
+
+    crud_test_case.delete_test_case(db, case_a)
+    stats = crud.get_execution_statistics(db)
+    assert stats["total_executions"] == 1
+    assert db.query(ExecutionStatsDaily).filter(ExecutionStatsDaily.test_case_id == case_a).count() == 0
+
+
+def test_history_sums_steps_per_test_case_and_matches_rebuild(db, ids):
+    (alice, _), (case_a, case_b) = ids
+    for test_case_id, outcome, passed in ((case_a, "pass", 4), (case_a, "fail", 1), (case_b, "pass", 2)):
+        execution = crud.create_execution(db, test_case_id, alice)
+        crud.complete_execution(db, execution.id, ExecutionResult(outcome), total_steps=4, passed_steps=passed)
+    old = crud.create_execution(db, case_b, alice)
+    old.created_at = datetime.utcnow() - timedelta(days=120)
+    db.commit()
+    crud.complete_execution(db, old.id, ExecutionResult.FAIL, total_steps=4)
+
+    history = crud.get_execution_history(db, days=90)
+    crud.rebuild_execution_stats(db)
+
+    assert crud.get_execution_history(db, days=90) == history
+    assert history[case_a]["test_type"] == "e2e"
+    assert (history[case_a]["executions"], history[case_a]["failures"]) == (2, 1)
+    assert (history[case_a]["passed_steps"], history[case_a]["total_steps"]) == (5, 8)
+    assert history[case_a]["success_ratio_total"] == pytest.approx(1.25)
+    assert (history[case_b]["executions"], history[case_b]["failures"]) == (1, 0)  # 120-day-old run excluded
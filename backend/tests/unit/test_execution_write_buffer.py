@@ -0,0 +1,132 @@
+"""
+Unit tests for the per-execution write-behind buffer (steps, tier logs, snapshots).
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.execution_settings import TierExecutionLog
+from app.models.test_execution import ExecutionResult, StepSessionSnapshot, TestExecutionStep
+from app.services.execution_service import ExecutionService
+from app.services.execution_write_buffer import ExecutionWriteBuffer
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _step(buffer, number, result=ExecutionResult.PASS):
+    buffer.add_step(
+        step_number=number,
+        step_description=f"Step {number}",
+        result=result,
+        duration_seconds=0.1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_rows_are_buffered_until_close(db):
+    buffer = ExecutionWriteBuffer.for_session(db, execution_id=7, flush_interval=60, batch_size=100)
+    _step(buffer, 1)
+    _step(buffer, 2, ExecutionResult.FAIL)
+    buffer.add_tier_log(step_index=1, fallback_strategy="option_c", final_tier=1, success=True,
+                        tiers_attempted=json.dumps([1]), total_execution_time_ms=12.0)
+    buffer.add_snapshot(step_number=1, page_url="https://example.com", session_data={"cookies": []})
+
+    assert db.query(TestExecutionStep).count() == 0
+    await buffer.close()
+
+    steps = db.query(TestExecutionStep).order_by(TestExecutionStep.step_number).all()
+    assert [(s.execution_id, s.step_number, s.result) for s in steps] == [
+        (7, 1, ExecutionResult.PASS),
+        (7, 2, ExecutionResult.FAIL),
+    ]
+    assert steps[0].retry_count == 0
+    assert db.query(TierExecutionLog).one().execution_id == 7
+    snapshot = db.query(StepSessionSnapshot).one()
+    assert json.loads(snapshot.session_data) == {"cookies": []}
+    assert buffer.flush_count == 1
+    assert buffer.rows_written == 4
+
+
+@pytest.mark.asyncio
+async def test_batch_size_triggers_flush_without_waiting_for_interval(db):
+    buffer = ExecutionWriteBuffer.for_session(db, execution_id=1, flush_interval=60, batch_size=3)
+    for number in range(1, 4):
+        _step(buffer, number)
+    await asyncio.sleep(0.05)
+
+    assert db.query(TestExecutionStep).count() == 3
+    await buffer.close()
+    assert buffer.flush_count == 1
+
+
+@pytest.mark.asyncio
+async def test_background_flush_runs_on_interval(db):
+    buffer = ExecutionWriteBuffer.for_session(db, execution_id=1, flush_interval=0.01, batch_size=100)
+    _step(buffer, 1)
+    await asyncio.sleep(0.1)
+
+    assert db.query(TestExecutionStep).count() == 1
+    assert buffer.pending_count == 0
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_rows_for_retry(db):
+    buffer = ExecutionWriteBuffer.for_session(db, execution_id=1, flush_interval=60, batch_size=100)
+    _step(buffer, 1)
+    real_write = buffer._write
+    calls = []
+
+    def flaky_write(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        real_write(batch)
+
+    with patch.object(buffer, "_write", side_effect=flaky_write):
+        assert await buffer.flush() == 0
+        assert buffer.pending_count == 1
+        _step(buffer, 2)
+        await buffer.close()
+
+    assert calls == [1, 2]
+    assert db.query(TestExecutionStep).count() == 2
+
+
+@pytest.mark.asyncio
+async def test_execution_service_routes_steps_and_snapshots_through_buffer(db):
+    svc = ExecutionService()
+    svc._write_buffer = ExecutionWriteBuffer.for_session(db, execution_id=3, flush_interval=60)
+    svc.export_profile_session = AsyncMock(return_value={"cookies": [{"name": "sid"}]})
+    page = MagicMock(url="https://example.com/cart")
+
+    with patch("app.services.execution_service.crud_execution.create_execution_step") as direct, \
+            patch("app.services.execution_service.save_step_session_snapshot") as direct_snapshot:
+        svc._record_step(db=db, execution_id=3, step_number=1, step_description="Click",
+                         result=ExecutionResult.PASS)
+        await svc._save_step_snapshot(db=db, execution_id=3, step_number=1, page=page)
+        direct.assert_not_called()
+        direct_snapshot.assert_not_called()
+
+    await svc._close_write_buffer()
+    assert svc._write_buffer is None
+    assert db.query(TestExecutionStep).count() == 1
+    assert db.query(StepSessionSnapshot).one().page_url == "https://example.com/cart"
@@ -0,0 +1,172 @@
+"""
+Unit tests for streamed KB uploads and process-pool text extraction.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from PyPDF2 import PdfWriter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.kb_document import ExtractionStatus, FileType, KBCategory, KBChunk, KBDocument
+from app.models.user import User
+from app.services import file_upload, kb_extraction
+from app.services.file_upload import FileUploadService
+
+
+def _upload(content: bytes, filename: str, size=None) -> MagicMock:
+    upload = MagicMock(spec=["filename", "read", "seek", "size"])
+    upload.filename = filename
+    upload.size = size
+    stream = BytesIO(content)
+    upload.read = AsyncMock(side_effect=stream.read)
+    upload.seek = AsyncMock(side_effect=stream.seek)
+    return upload
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = FileUploadService()
+    service.upload_dir = tmp_path
+    return service
+
+
+@pytest.mark.asyncio
+async def test_save_file_streams_in_blocks(service):
+    content = b"0123456789" * 300
+    upload = _upload(content, "manual.txt", size=len(content))
+
+    with patch.object(file_upload, "UPLOAD_CHUNK_BYTES", 1000):
+        path, file_type, size = await service.save_file(upload)
+
+    assert (file_type, size) == (FileType.TXT, len(content))
+    with open(path, "rb") as f:
+        assert f.read() == content
+    assert {call.args for call in upload.read.call_args_list} == {(1000,)}
+
+
+@pytest.mark.asyncio
+async def test_save_file_enforces_limit_while_streaming(service):
+    service.max_size = 2500
+    upload = _upload(b"x" * 3000, "manual.pdf", size=100)  # size understated by the client
+
+    with patch.object(file_upload, "UPLOAD_CHUNK_BYTES", 1000), pytest.raises(HTTPException) as exc_info:
+        await service.save_file(upload)
+
+    assert exc_info.value.status_code == 400
+    assert list(service.upload_dir.iterdir()) == []  # partial file removed
+
+
+@pytest.mark.asyncio
+async def test_pdf_pages_are_extracted_in_batches_with_progress():
+    pages = [f"page {i}" for i in range(20)]
+    calls = []
+
+    def fake_extract(path, start, stop):
+        calls.append((start, stop))
+        return pages[start:stop]
+
+    progress = []
+    with ThreadPoolExecutor(max_workers=3) as pool, \
+            patch.object(kb_extraction, "get_extraction_pool", return_value=pool), \
+            patch.object(kb_extraction, "count_pdf_pages", return_value=len(pages)), \
+            patch.object(kb_extraction, "extract_pdf_pages", side_effect=fake_extract), \
+            patch.object(kb_extraction, "PDF_PAGES_PER_TASK", 8):
+        text = await kb_extraction.extract_text("manual.pdf", FileType.PDF, lambda done, total: progress.append((done, total)))
+
+    assert text == "\n\n".join(pages)
+    assert sorted(calls) == [(0, 8), (8, 16), (16, 20)]
+    assert progress[0] == (0, 20) and progress[-1] == (20, 20)
+    assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+
+
+@pytest.mark.asyncio
+async def test_extraction_runs_in_worker_processes(tmp_path):
+    writer = PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(width=200, height=200)
+    pdf_path = tmp_path / "blank.pdf"
+    with open(pdf_path, "wb") as f:
+        writer.write(f)
+
+    try:
+        progress = []
+        text = await kb_extraction.extract_text(str(pdf_path), FileType.PDF, lambda *p: progress.append(p))
+    finally:
+        kb_extraction.shutdown_extraction_pool()
+
+    assert text == ""  # blank pages
+    assert progress[-1] == (3, 3)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    yield factory
+    engine.dispose()
+
+
+def _pending_document(db, file_path, file_type=FileType.PDF):
+    user = User(email="kb@example.com", username="kb", hashed_password="hash", role="user", is_active=True)
+    category = KBCategory(name="System Guide")
+    db.add_all([user, category])
+    db.commit()
+    document = KBDocument(
+        title="Manual", category_id=category.id, filename="manual", file_path=str(file_path),
+        file_type=file_type, file_size=1, user_id=user.id, referenced_count=0,
+        extraction_status=ExtractionStatus.PENDING, extraction_progress=0,
+    )
+    db.add(document)
+    db.commit()
+    return document.id
+
+
+@pytest.mark.asyncio
+async def test_background_job_extracts_indexes_and_reports_progress(session_factory, service):
+    db = session_factory()
+    document_id = _pending_document(db, "manual.pdf")
+    seen_progress = []
+
+    async def fake_extract(path, file_type, progress):
+        for done in range(0, 11):
+            progress(done, 10)
+            seen_progress.append(db.get(KBDocument, document_id).extraction_progress)
+            await asyncio.sleep(0)
+        return "Checkout requires a verified email address."
+
+    with patch.object(kb_extraction, "extract_text", side_effect=fake_extract):
+        await service.process_document(document_id, session_factory=session_factory)
+
+    db.expire_all()
+    document = db.get(KBDocument, document_id)
+    assert document.extraction_status == ExtractionStatus.COMPLETED
+    assert document.extraction_progress == 100
+    assert document.content.startswith("Checkout")
+    assert db.query(KBChunk).filter(KBChunk.document_id == document_id).count() == 1
+    assert 50 in seen_progress
+
+
+@pytest.mark.asyncio
+async def test_background_job_marks_failed_extraction(session_factory, service):
+    db = session_factory()
+    document_id = _pending_document(db, "missing.pdf")
+
+    with patch.object(kb_extraction, "extract_text", side_effect=ValueError("corrupt PDF")):
+        await service.process_document(document_id, session_factory=session_factory)
+
+    db.expire_all()
+    document = db.get(KBDocument, document_id)
+    assert document.extraction_status == ExtractionStatus.FAILED
+    assert document.content is None
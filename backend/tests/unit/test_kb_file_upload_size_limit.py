@@ -17,12 +17,12 @@ EXPECTED_MAX_BYTES = EXPECTED_MAX_MB * MB
 
 
 def _make_upload_file(size_bytes: int, filename: str = "test.pdf") -> MagicMock:
-    """Return a mock UploadFile whose read() returns `size_bytes` bytes."""
-    mock = MagicMock()
+    """Return a mock UploadFile streaming `size_bytes` bytes (size unknown up front)."""
+    mock = MagicMock(spec=["filename", "read", "seek"])
     mock.filename = filename
-    content = b"x" * size_bytes
-    mock.read = AsyncMock(return_value=content)
-    mock.seek = AsyncMock()
+    stream = BytesIO(b"x" * size_bytes)
+    mock.read = AsyncMock(side_effect=stream.read)
+    mock.seek = AsyncMock(side_effect=stream.seek)
     return mock
 
 
@@ -0,0 +1,253 @@
+"""
+Unit tests for KB chunking, full-text passage search and token-budgeted KB context.
+"""
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.crud import kb_document as crud
+from app.db import kb_search
+from app.db.base import Base
+from app.models.kb_document import FileType, KBCategory, KBChunk, KBDocument
+from app.models.user import User
+from app.services import kb_context, kb_index
+from app.services.kb_context import KBContextService
+
+LOGIN_GUIDE = (
+    "The CRM home page lists recent customers.\n\n"
+    "To sign in, open the login page and enter the username and password. "
+    "The Sign In button stays disabled until both fields are filled.\n\n"
+    "Reports are exported from the Analytics tab as CSV."
+)
+BILLING_GUIDE = (
+    "Invoices are generated on the first day of each month. "
+    "Refunds require approval from a billing supervisor."
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_context_cache():
+    kb_context.clear_context_cache()
+    yield
+    kb_context.clear_context_cache()
+
+
+@pytest.fixture(autouse=True)
+def _char_estimate_tokens():
+    # Budgets below are sized for the chars-per-token estimate, whether or not tiktoken loads
+    with patch.object(kb_index, "_encoding", None), patch.object(kb_index, "_encoding_loaded", True):
+        yield
+
+
+@pytest.fixture(params=["fts", "like"])
+def db(request):
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    if request.param == "fts":
+        assert kb_search.ensure_kb_search_index(engine) is True
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def documents(db):
+    user = User(email="kb@example.com", username="kb", hashed_password="hash", role="user", is_active=True)
+    guides = KBCategory(name="System Guide")
+    billing = KBCategory(name="Billing")
+    db.add_all([user, guides, billing])
+    db.commit()
+
+    created = {}
+    for title, category, content in [
+        ("CRM User Guide", guides, LOGIN_GUIDE),
+        ("Billing Policy", billing, BILLING_GUIDE),
+    ]:
+        document = KBDocument(
+            title=title,
+            category_id=category.id,
+            filename=f"{title}.txt",
+            file_path=f"uploads/kb/{title}.txt",
+            file_type=FileType.TXT,
+            file_size=len(content),
+            content=content,
+            user_id=user.id,
+            referenced_count=0,
+        )
+        db.add(document)
+        db.commit()
+        with patch.object(kb_index.settings, "KB_CHUNK_SIZE_CHARS", 120), \
+                patch.object(kb_index.settings, "KB_CHUNK_OVERLAP_CHARS", 20):
+            kb_index.index_document(db, document)
+        created[title] = document
+    return created
+
+
+def test_chunk_text_overlaps_and_breaks_on_boundaries():
+    chunks = kb_index.chunk_text(LOGIN_GUIDE, chunk_size=120, overlap=20)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert LOGIN_GUIDE[chunk["start_char"]:].startswith(chunk["content"])
+        assert len(chunk["content"]) <= 120
+    assert chunks[0]["content"].endswith("username and password.")  # sentence end, not mid-word
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current["start_char"] < previous["start_char"] + len(previous["content"]) + 2
+    assert chunks[-1]["content"].endswith("as CSV.")
+
+
+def test_search_passages_ranks_the_matching_chunk_first(db, documents):
+    passages = kb_index.search_passages(db, "Verify login with username and password", top_k=2)
+
+    assert passages[0].document_title == "CRM User Guide"
+    assert "login page" in passages[0].content
+    assert all("Invoices" not in p.content for p in passages)
+
+
+def test_search_passages_respects_category_and_empty_queries(db, documents):
+    billing_id = documents["Billing Policy"].category_id
+
+    assert kb_index.search_passages(db, "login password", category_id=billing_id) == []
+    assert kb_index.search_passages(db, "the of and") == []
+    assert kb_index.search_passages(db, "refund approval", category_id=billing_id)[0].document_title == "Billing Policy"
+
+
+def test_chunks_follow_document_reindex_and_delete(db, documents):
+    document = documents["Billing Policy"]
+    document.content = "Disputes are escalated to the finance team."
+    db.commit()
+    kb_index.index_document(db, document)
+
+    assert kb_index.search_passages(db, "refunds") == []
+    assert kb_index.search_passages(db, "disputes")[0].document_id == document.id
+
+    crud.delete_document(db, document.id)
+    assert db.query(KBChunk).filter(KBChunk.document_id == document.id).count() == 0
+    assert kb_index.search_passages(db, "disputes") == []
+
+
+def test_document_search_uses_chunk_index(db, documents):
+    results = crud.get_documents(db, search_query="analytics CSV")
+
+    assert [d.title for d in results] == ["CRM User Guide"]
+    assert crud.get_document_count(db, search_query="analytics invoices") == 0
+    assert crud.get_document_count(db, search_query="Billing") == 1  # title match
+
+
+@pytest.mark.asyncio
+async def test_kb_context_uses_requirement_passages(db, documents):
+    service = KBContextService()
+
+    context = await service.get_category_context(db, query="Refund approval workflow")
+    relevant = await service.get_relevant_documents(db, "Refund approval workflow", max_docs=1)
+
+    assert "[Document 1: Billing Policy]" in context
+    assert "CRM User Guide" not in context
+    assert [d.title for d in relevant] == ["Billing Policy"]
+
+
+@pytest.mark.asyncio
+async def test_kb_context_falls_back_to_recent_documents_without_matches(db, documents):
+    service = KBContextService()
+
+    context = await service.get_category_context(db, query="zebra", max_docs=5)
+
+    assert "[Document 1: Billing Policy]" in context
+    assert "[Document 2: CRM User Guide]" in context
+
+
+def test_embeddings_rerank_full_text_candidates(db, documents):
+    guide = documents["CRM User Guide"]
+    vectors = {"home page": [1.0, 0.0], "button": [0.0, 1.0], "Analytics": [0.6, 0.8]}
+
+    def fake_embed(texts):
+        return [next((v for marker, v in vectors.items() if marker in text), [0.0, 1.0]) for text in texts]
+
+    with patch.object(kb_index.settings, "KB_EMBEDDING_MODEL", "fake-model"), \
+            patch.object(kb_index.settings, "KB_CHUNK_SIZE_CHARS", 120), \
+            patch.object(kb_index.settings, "KB_CHUNK_OVERLAP_CHARS", 20), \
+            patch.object(kb_index, "embed_texts", side_effect=fake_embed):
+        kb_index.index_document(db, guide)
+        chunk_ids = [c.id for c in db.query(KBChunk).filter(KBChunk.document_id == guide.id).order_by(KBChunk.chunk_index)]
+        lexical = [(chunk_id, 3.0 - i) for i, chunk_id in enumerate(chunk_ids)]
+        with patch.object(kb_index, "search_chunks", return_value=lexical) as search:
+            passages = kb_index.search_passages(db, "button state", top_k=2)
+
+    assert len(chunk_ids) == 3
+    assert search.call_args.kwargs["limit"] == 2 * kb_index.RERANK_CANDIDATE_FACTOR
+    # Lexical order 0,1,2 fused with semantic order 1,2,0
+    assert [p.chunk_index for p in passages] == [1, 0]
+
+
+def _passage(document_id, chunk_index, tokens):
+    return kb_index.KBPassage(document_id, f"Doc {document_id}", "Guide", chunk_index, "x", 0.0, tokens)
+
+
+def test_pack_passages_fills_budget_best_first():
+    ranked = [_passage(1, 0, 50), _passage(2, 0, 80), _passage(1, 1, 30), _passage(3, 0, 10)]
+
+    packed = kb_index.pack_passages(ranked, token_budget=99, overhead_per_document=5)
+
+    # 55 (doc 1 + header), 85 doesn't fit, 30 fits, then 10 + header overruns by one
+    assert [(p.document_id, p.chunk_index) for p in packed] == [(1, 0), (1, 1)]
+    assert kb_index.pack_passages(ranked, token_budget=0) == []
+
+
+def test_chunks_store_token_counts(db, documents):
+    chunks = db.query(KBChunk).all()
+
+    assert chunks
+    assert all(chunk.token_count == kb_index.count_tokens(chunk.content) > 0 for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_kb_context_respects_token_budget(db, documents):
+    service = KBContextService()
+    requirement = "Open the login page, enter username and password, then export reports as CSV"
+
+    small = await service.get_category_context(db, query=requirement, token_budget=180)
+    large = await service.get_category_context(db, query=requirement, token_budget=2000)
+
+    assert kb_index.count_tokens(small) <= 180
+    assert "login page" in small
+    assert "as CSV" not in small
+    assert "login page" in large and "as CSV" in large
+
+
+@pytest.mark.asyncio
+async def test_kb_context_without_query_interleaves_leading_chunks(db, documents):
+    service = KBContextService()
+
+    context = await service.get_category_context(db, token_budget=260)
+
+    assert "Invoices are generated" in context  # Billing Policy (newest) first chunk
+    assert "The CRM home page" in context  # CRM User Guide first chunk
+    assert "as CSV" not in context
+
+
+@pytest.mark.asyncio
+async def test_kb_context_is_cached_until_documents_change(db, documents):
+    service = KBContextService()
+
+    with patch.object(kb_context, "search_passages", wraps=kb_index.search_passages) as search:
+        first = await service.get_category_context(db, query="refund approval")
+        second = await service.get_category_context(db, query="refund approval")
+        assert first == second
+        assert search.call_count == 1
+
+        billing = documents["Billing Policy"]
+        billing.content = "Refund approval is automatic below 50 EUR."
+        db.commit()
+        kb_index.index_document(db, billing)
+        third = await service.get_category_context(db, query="refund approval")
+
+    assert search.call_count == 2
+    assert "automatic below 50 EUR" in third
@@ -0,0 +1,78 @@
+"""
+Unit tests for pooled LLM SDK clients (shared connection pools per endpoint / event loop).
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
+
+import pytest
+
+import llm.client_factory as cf
+from llm.browser_use_adapter import AzureOpenAIAdapter
+from llm.local_vllm_client import LocalVllmClient
+
+
+def test_sync_clients_share_one_pool_per_endpoint():
+    deepseek = LocalVllmClient(model="DeepSeek-V4-Flash-4bit")
+    mlx = LocalVllmClient(model="Qwen3.6-35B-A3B-MLX-8bit")  # same server, other token
+    gpt_oss = LocalVllmClient(model="openai/gpt-oss-20b")
+
+    assert deepseek.endpoint == mlx.endpoint
+    assert deepseek.client._client is mlx.client._client
+    assert deepseek.client._client is not gpt_oss.client._client
+
+
+@pytest.mark.asyncio
+async def test_async_client_is_pooled_per_loop_and_endpoint():
+    first = LocalVllmClient(model="DeepSeek-V4-Flash-4bit")
+    second = LocalVllmClient(model="DeepSeek-V4-Flash-4bit")
+    mlx = LocalVllmClient(model="Qwen3.6-35B-A3B-MLX-8bit")
+
+    assert first.async_client is second.async_client
+    assert first.async_client is not mlx.async_client  # different credentials
+    assert first.async_client._client is mlx.async_client._client  # same connection pool
+
+    other_loop_client = await asyncio.to_thread(lambda: asyncio.run(_async_client_of(first)))
+    assert other_loop_client is not first.async_client
+
+    await cf.aclose_async_clients()
+    assert first.async_client._client.is_closed is False  # fresh pool after close
+
+
+async def _async_client_of(client):
+    return client.async_client
+
+
+def test_async_client_requires_enabled_client():
+    client = LocalVllmClient(model="DeepSeek-V4-Flash-4bit")
+    client.enabled = False
+    assert client.async_client is None
+
+
+@pytest.mark.asyncio
+async def test_local_vllm_achat_completion_uses_async_sdk():
+    client = LocalVllmClient(model="Qwen3.6-35B-A3B-MLX-8bit", enable_thinking=True)
+    sdk = MagicMock()
+    sdk.chat.completions.create = AsyncMock(return_value="response")
+
+    with patch.object(LocalVllmClient, "async_client", new_callable=PropertyMock, return_value=sdk):
+        assert await client.achat_completion([{"role": "user", "content": "hi"}], max_tokens=5) == "response"
+
+    kwargs = sdk.chat.completions.create.call_args.kwargs
+    assert kwargs["max_tokens"] == 5
+    assert kwargs["extra_body"] == {"chat_template_kwargs": {"enable_thinking": True}}
+
+
+@pytest.mark.asyncio
+async def test_browser_use_adapter_awaits_async_client_without_executor():
+    llm_client = MagicMock(enabled=True, deployment="ChatGPT-UAT")
+    llm_client.async_client.chat.completions.create = AsyncMock(return_value="response")
+    adapter = AzureOpenAIAdapter(azure_client=llm_client)
+
+    with patch("asyncio.to_thread") as to_thread:
+        result = await adapter._call_azure([{"role": "user", "content": "hi"}], force_json=True)
+
+    assert result == "response"
+    to_thread.assert_not_called()
+    llm_client.client.chat.completions.create.assert_not_called()
+    kwargs = llm_client.async_client.chat.completions.create.call_args.kwargs
+    assert kwargs["response_format"] == {"type": "json_object"}
@@ -0,0 +1,171 @@
+"""
+Unit tests for the content-addressed LLM response cache.
+"""
+import json
+import sqlite3
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.universal_llm import UniversalLLMService
+from app.utils.llm_response_cache import LLMResponseCache
+
+MESSAGES = [{"role": "user", "content": "Generate test steps"}]
+
+
+def _response(content: str = "ok") -> dict:
+    return {
+        "choices": [{"message": {"role": "assistant", "content": content}}],
+        "usage": {"total_tokens": 42},
+    }
+
+
+def _key(**overrides) -> str:
+    params = dict(provider="openrouter", model="m", messages=MESSAGES, temperature=0, max_tokens=100)
+    params.update(overrides)
+    return LLMResponseCache.make_key(**params)
+
+
+# ---------------------------------------------------------------------------
+# LLMResponseCache
+# ---------------------------------------------------------------------------
+
+
+def test_key_changes_with_any_request_parameter():
+    base = _key()
+    assert base == _key()
+    assert base != _key(model="other")
+    assert base != _key(temperature=0.2)
+    assert base != _key(max_tokens=200)
+    assert base != _key(messages=[{"role": "user", "content": "different"}])
+    assert base != _key(azure_endpoint="https://x")
+
+
+def test_memory_then_disk_tier(tmp_path):
+    path = tmp_path / "llm.sqlite3"
+    cache = LLMResponseCache(db_path=str(path), max_entries=10, ttl_seconds=60)
+    cache.put("k", _response("cached"))
+    assert cache.get("k") == (_response("cached"), "memory")
+
+    # A new process (fresh LRU) still finds it on disk, then serves from memory
+    other = LLMResponseCache(db_path=str(path), max_entries=10, ttl_seconds=60)
+    assert other.get("k") == (_response("cached"), "disk")
+    assert other.get("k")[1] == "memory"
+    assert other.stats()["hits"] == 2
+
+
+def test_disk_tier_creates_missing_directory_and_closes_connections(tmp_path):
+    path = tmp_path / "cache" / "nested" / "llm.sqlite3"
+    opened = []
+    real_connect = sqlite3.connect
+
+    def connect(*args, **kwargs):
+        conn = real_connect(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    with patch("app.utils.llm_response_cache.sqlite3.connect", side_effect=connect):
+        LLMResponseCache(db_path=str(path)).put("k", _response("cached"))
+        assert LLMResponseCache(db_path=str(path)).get("k") == (_response("cached"), "disk")
+
+    assert path.exists()
+    assert len(opened) == 2
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):  # Closed
+            conn.execute("SELECT 1")
+
+
+def test_lru_is_bounded_and_ttl_expires(tmp_path):
+    cache = LLMResponseCache(db_path=None, max_entries=2, ttl_seconds=60)
+    for key in ("a", "b", "c"):
+        cache.put(key, _response(key))
+    assert cache.get("a") == (None, None)
+    assert cache.get("c")[0] == _response("c")
+
+    expiring = LLMResponseCache(db_path=str(tmp_path / "t.sqlite3"), ttl_seconds=0)
+    expiring.put("k", _response())
+    time.sleep(0.01)
+    assert expiring.get("k") == (None, None)
+    assert expiring.stats()["misses"] == 1
+
+
+# ---------------------------------------------------------------------------
+# UniversalLLMService.chat_completion integration
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def service(tmp_path):
+    svc = UniversalLLMService()
+    svc._call_openrouter = AsyncMock(side_effect=lambda *a, **k: _response("fresh"))
+    svc._write_llm_log = AsyncMock()
+    cache = LLMResponseCache(db_path=str(tmp_path / "llm.sqlite3"))
+    with patch("app.utils.llm_response_cache.get_llm_response_cache") as get_cache:
+        get_cache.side_effect = lambda force=False: cache
+        yield svc, get_cache
+
+
+@pytest.mark.asyncio
+async def test_deterministic_call_is_served_from_cache(service):
+    svc, _ = service
+    first = await svc.chat_completion(MESSAGES, provider="openrouter", model="m", temperature=0)
+    second = await svc.chat_completion(MESSAGES, provider="openrouter", model="m", temperature=0)
+
+    assert first == second == _response("fresh")
+    assert svc._call_openrouter.await_count == 1
+
+    log_calls = svc._write_llm_log.await_args_list
+    assert log_calls[0].kwargs["cache_status"] == "miss"
+    assert log_calls[1].kwargs["cache_status"] == "hit_memory"
+    assert log_calls[1].kwargs["cache_stats"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sampling_calls_bypass_cache_unless_forced(service):
+    svc, get_cache = service
+    for _ in range(2):
+        await svc.chat_completion(MESSAGES, provider="openrouter", model="m", temperature=0.7)
+    assert svc._call_openrouter.await_count == 2
+    get_cache.assert_not_called()
+
+    for _ in range(2):
+        await svc.chat_completion(MESSAGES, provider="openrouter", model="m", temperature=0.7, cache=True)
+    assert svc._call_openrouter.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_false_and_failures_are_not_cached(service):
+    svc, _ = service
+    await svc.chat_completion(MESSAGES, provider="openrouter", model="m", temperature=0, cache=False)
+    svc._call_openrouter.side_effect = RuntimeError("boom")
+    with pytest.raises(RuntimeError):
+        await svc.chat_completion(MESSAGES, provider="openrouter", model="m", temperature=0)
+    assert svc._call_openrouter.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_log_entry_includes_cache_counters(tmp_path):
+    svc = UniversalLLMService()
+    written = []
+
+    async def capture(entry):
+        written.append(entry)
+
+    with patch("app.utils.llm_response_logger.llm_logger.write", side_effect=capture):
+        await svc._write_llm_log(
+            messages=MESSAGES,
+            provider="openrouter",
+            model="m",
+            response=_response(),
+            error=None,
+            elapsed_ms=0.2,
+            caller="chat_completion",
+            cache_status="hit_disk",
+            cache_stats={"hits": 3, "misses": 1},
+        )
+
+    assert written[0]["cache"] == "hit_disk"
+    assert written[0]["cache_hits"] == 3
+    assert written[0]["cache_misses"] == 1
+    json.dumps(written[0], default=str)
@@ -0,0 +1,83 @@
+"""
+Unit tests for observe() memoization by DOM fingerprint (Tier 2 XPath extraction).
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services import xpath_extractor as xpath_extractor_module
+from app.services.observe_memo import ObserveMemo, dom_fingerprint, match_candidate
+from app.services.xpath_extractor import XPathExtractor
+
+URL = "https://shop.example.com/signup"
+CANDIDATES = [
+    {"selector": "xpath=/html/body/form/input[1]", "description": "Full name input field", "method": "fill"},
+    {"selector": "xpath=/html/body/form/input[2]", "description": "Email address input", "method": "fill"},
+    {"selector": "xpath=/html/body/form/input[3]", "description": "Phone number input", "method": "fill"},
+    {"selector": "xpath=/html/body/form/button", "description": "Create account button", "method": "click"},
+]
+
+
+def test_match_candidate_requires_a_clear_winner():
+    assert match_candidate("Fill the email address with 'a@b.com'", CANDIDATES, 0.75) is CANDIDATES[1]
+    assert match_candidate("Click Create account", CANDIDATES, 0.75) is CANDIDATES[3]
+    # "number" alone covers half of "Phone number input"
+    assert match_candidate("Type the order number", CANDIDATES, 0.75) is None
+    assert match_candidate("Click the button", CANDIDATES, 0.75) is None
+    # Every description word matches, but "company" is not covered by the description
+    names = [{"selector": "a", "description": "Name input field"}, {"selector": "b", "description": "Email address input"}]
+    assert match_candidate('Fill company name with "Acme"', names, 0.75) is None
+    assert match_candidate('Fill name with "Acme"', names, 0.75) is names[0]
+    twins = [{"selector": "a", "description": "Email"}, {"selector": "b", "description": "Email"}]
+    assert match_candidate("Fill email", twins, 0.75) is None
+
+
+@pytest.mark.asyncio
+async def test_fingerprint_is_none_when_page_cannot_evaluate():
+    page = MagicMock()
+    page.evaluate = AsyncMock(side_effect=RuntimeError("page closed"))
+    assert await dom_fingerprint(page) is None
+
+    page.evaluate = AsyncMock(return_value="12-1f3a")
+    assert await dom_fingerprint(page) == "12-1f3a"
+
+
+def _extractor(monkeypatch, memo, fingerprint):
+    monkeypatch.setattr(xpath_extractor_module, "get_observe_memo", lambda: memo)
+    page = MagicMock()
+    page.url = URL
+    page.title = AsyncMock(return_value="Sign up")
+    page.evaluate = AsyncMock(side_effect=lambda script: fingerprint[0])
+    stagehand = MagicMock()
+    stagehand.page.url = URL
+    stagehand.page.observe = AsyncMock(return_value=CANDIDATES)
+    return XPathExtractor(stagehand=stagehand), page, stagehand.page.observe
+
+
+@pytest.mark.asyncio
+async def test_same_fingerprint_reuses_observed_candidates(monkeypatch):
+    fingerprint = ["4-abc"]
+    extractor, page, observe = _extractor(monkeypatch, ObserveMemo(enabled=True, max_pages=8, min_score=0.75), fingerprint)
+
+    first = await extractor.extract_xpath_with_page(page, "Fill the full name field")
+    second = await extractor.extract_xpath_with_page(page, "Fill the email address with 'a@b.com'")
+
+    assert (first["xpath"], first["memo_hit"]) == ("/html/body/form/input[1]", False)
+    assert (second["xpath"], second["memo_hit"]) == ("/html/body/form/input[2]", True)
+    assert observe.await_count == 1
+
+    await extractor.extract_xpath_with_page(page, "Click the terms checkbox")  # No candidate matches
+    fingerprint[0] = "5-def"  # Page structure changed
+    await extractor.extract_xpath_with_page(page, "Fill the phone number")
+    assert observe.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_disabled_memo_always_observes(monkeypatch):
+    extractor, page, observe = _extractor(monkeypatch, ObserveMemo(enabled=False, max_pages=8), ["4-abc"])
+
+    await extractor.extract_xpath_with_page(page, "Fill the full name field")
+    await extractor.extract_xpath_with_page(page, "Fill the email address")
+
+    assert observe.await_count == 2
+    page.evaluate.assert_not_awaited()
@@ -0,0 +1,139 @@
+"""
+Unit tests for ProgressTracker ring buffers, fan-out, replay and pub/sub delivery.
+"""
+import asyncio
+
+import pytest
+
+from app.api.v2.endpoints.sse_stream import _event_generator
+from app.services import progress_tracker as progress_module
+from app.services.progress_tracker import ProgressTracker
+
+
+async def _collect(tracker, workflow_id, **kwargs):
+    return [event async for event in tracker.subscribe(workflow_id, keepalive_interval=0.05, **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_multiple_subscribers_receive_every_event():
+    tracker = ProgressTracker(buffer_size=100)
+    first = asyncio.create_task(_collect(tracker, "wf"))
+    second = asyncio.create_task(_collect(tracker, "wf"))
+    await asyncio.sleep(0)
+
+    await tracker.emit("wf", "agent_started", {"agent": "observation"})
+    await tracker.emit("wf", "agent_progress", {"progress": 0.5})
+    await tracker.emit("wf", "workflow_completed", {})
+
+    for events in await asyncio.gather(first, second):
+        assert [e["event"] for e in events] == ["agent_started", "agent_progress", "workflow_completed"]
+        assert [e["id"] for e in events] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_events_after_last_event_id():
+    tracker = ProgressTracker(buffer_size=100)
+    for i in range(5):
+        await tracker.emit("wf", "agent_progress", {"step": i})
+    await tracker.emit("wf", "workflow_completed", {})
+
+    events = await _collect(tracker, "wf", last_event_id=3)
+
+    assert [e["id"] for e in events] == [4, 5, 6]
+    assert events[-1]["event"] == "workflow_completed"
+
+
+@pytest.mark.asyncio
+async def test_buffer_is_bounded():
+    tracker = ProgressTracker(buffer_size=3)
+    for i in range(10):
+        await tracker.emit("wf", "agent_progress", {"step": i})
+    await tracker.emit("wf", "workflow_completed", {})
+
+    events = await _collect(tracker, "wf")
+
+    assert [e["id"] for e in events] == [9, 10, 11]
+
+
+@pytest.mark.asyncio
+async def test_idle_workflows_are_evicted_but_watched_ones_kept(monkeypatch):
+    tracker = ProgressTracker(idle_ttl_seconds=10)
+    clock = [1000.0]
+    monkeypatch.setattr(progress_module.time, "monotonic", lambda: clock[0])
+    await tracker.emit("idle", "agent_started", {})
+    await tracker.emit("watched", "agent_started", {})
+    watcher = tracker.subscribe("watched", keepalive_interval=0.01)
+    await watcher.__anext__()
+
+    clock[0] += 11
+    tracker._evict_idle(force=True)
+
+    assert set(tracker._channels) == {"watched"}
+    await watcher.aclose()
+
+
+class _LoopbackBackend:
+    """In-memory stand-in for Redis pub/sub shared by several trackers."""
+
+    def __init__(self):
+        self.listeners = []
+
+    async def publish(self, workflow_id, event):
+        for queue in self.listeners:
+            queue.put_nowait((workflow_id, dict(event)))
+
+    async def listen(self):
+        queue = asyncio.Queue()
+        self.listeners.append(queue)
+        while True:
+            yield await queue.get()
+
+
+@pytest.mark.asyncio
+async def test_backend_delivers_events_to_another_process():
+    backend = _LoopbackBackend()
+    worker = ProgressTracker(backend=backend)
+    api = ProgressTracker(backend=backend)
+    worker._ensure_listener()  # Worker also hears its own events echoed back
+    subscriber = asyncio.create_task(_collect(api, "wf"))
+    await asyncio.sleep(0.01)
+
+    await worker.emit("wf", "agent_started", {"agent": "analysis"})
+    await worker.emit("wf", "workflow_completed", {})
+    events = await asyncio.wait_for(subscriber, timeout=1)
+
+    assert [(e["id"], e["event"]) for e in events] == [(1, "agent_started"), (2, "workflow_completed")]
+    assert "origin" not in events[0]
+    assert len(worker._channels["wf"].events) == 2  # Own events not buffered twice
+    await worker.close()
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_started_tracker_replays_events_published_before_first_subscribe():
+    backend = _LoopbackBackend()
+    worker = ProgressTracker(backend=backend)
+    api = ProgressTracker(backend=backend)
+    api.start()
+    await asyncio.sleep(0.01)
+
+    await worker.emit("wf", "agent_started", {"agent": "analysis"})
+    await worker.emit("wf", "workflow_completed", {})
+    await asyncio.sleep(0.01)
+    events = await asyncio.wait_for(_collect(api, "wf", last_event_id=1), timeout=1)
+
+    assert [(e["id"], e["event"]) for e in events] == [(2, "workflow_completed")]
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_sse_messages_carry_event_ids():
+    tracker = ProgressTracker()
+    await tracker.emit("wf", "agent_started", {"agent": "observation"})
+    await tracker.emit("wf", "workflow_completed", {})
+
+    chunks = [chunk.decode() async for chunk in _event_generator("wf", tracker, None, last_event_id=1)]
+
+    assert chunks == [chunk for chunk in chunks if chunk.startswith("id: 2\nevent: workflow_completed\n")]
+    assert len(chunks) == 1
+    assert "wf" in tracker._channels  # Left for other subscribers / reconnects
@@ -0,0 +1,110 @@
+"""
+Unit tests for event-driven queue dispatch (ExecutionQueue wake-ups + QueueManager).
+"""
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.execution_queue import ExecutionQueue
+from app.services.queue_manager import QueueManager
+
+
+@pytest.fixture
+def manager():
+    """QueueManager on a private queue with DB lookups and thread start mocked."""
+    with (
+        patch("app.services.queue_manager.SessionLocal"),
+        patch("app.services.queue_manager.crud_execution") as mock_crud,
+    ):
+        mock_crud.get_execution.return_value = None
+        m = QueueManager(max_concurrent=3, check_interval=60)
+        m.queue = ExecutionQueue(max_concurrent=3)
+        m._start_execution_async = MagicMock()
+        yield m
+        if m._running:
+            m.stop()
+
+
+def test_wait_for_changes_returns_immediately_after_enqueue():
+    q = ExecutionQueue(max_concurrent=1)
+    q.add_to_queue(1, test_case_id=1, user_id=1)
+    start = time.monotonic()
+    assert q.wait_for_changes(timeout=5) is True
+    assert time.monotonic() - start < 0.5
+
+
+def test_wait_for_changes_times_out_without_changes():
+    q = ExecutionQueue(max_concurrent=1)
+    assert q.wait_for_changes(timeout=0.05) is False
+
+
+def test_mark_as_complete_wakes_waiter():
+    q = ExecutionQueue(max_concurrent=1)
+    q.add_to_queue(1, test_case_id=1, user_id=1)
+    q.mark_as_active(q.get_next_execution())
+    q.wait_for_changes(timeout=0)  # consume the enqueue signal
+
+    woke = []
+    waiter = threading.Thread(target=lambda: woke.append(q.wait_for_changes(timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    q.mark_as_complete(1)
+    waiter.join(timeout=1)
+    assert woke == [True]
+
+
+def test_dispatch_fills_every_free_slot_in_one_pass(manager):
+    for eid in range(1, 6):
+        manager.queue.add_to_queue(eid, test_case_id=eid, user_id=1)
+
+    manager._running = True
+    started = manager._dispatch_available()
+    manager._running = False
+
+    assert started == 3
+    assert manager._start_execution_async.call_count == 3
+    assert manager.queue.get_queue_size() == 2
+
+
+def test_dispatch_skips_cancelled_and_continues(manager):
+    from app.models.test_execution import ExecutionStatus
+
+    cancelled = MagicMock(id=1, status=ExecutionStatus.CANCELLED)
+    with patch("app.services.queue_manager.crud_execution") as mock_crud:
+        mock_crud.get_execution.side_effect = lambda db, eid: cancelled if eid == 1 else None
+        manager.queue.add_to_queue(1, test_case_id=1, user_id=1, priority=1)
+        manager.queue.add_to_queue(2, test_case_id=2, user_id=1, priority=5)
+        manager._running = True
+        started = manager._dispatch_available()
+        manager._running = False
+
+    assert started == 1
+    started_ids = [c.args[0].execution_id for c in manager._start_execution_async.call_args_list]
+    assert started_ids == [2]
+
+
+def test_loop_dispatches_on_enqueue_without_waiting_for_interval(manager):
+    manager.start()
+    time.sleep(0.05)
+    manager.queue.add_to_queue(7, test_case_id=7, user_id=1)
+
+    deadline = time.monotonic() + 2
+    while not manager._start_execution_async.called and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert manager._start_execution_async.called
+
+
+def test_dispatch_latency_is_reported(manager):
+    manager.queue.add_to_queue(1, test_case_id=1, user_id=1)
+    manager._running = True
+    manager._dispatch_available()
+    manager._running = False
+
+    stats = manager.get_statistics()["dispatch_latency"]
+    assert stats["total_dispatched"] == 1
+    assert stats["sample_size"] == 1
+    assert stats["p50_ms"] >= 0
+    assert stats["max_ms"] >= stats["avg_ms"]
@@ -0,0 +1,238 @@
+"""
+Unit tests for queue-driven suite execution (fan-out, dependencies, stop_on_failure).
+"""
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.crud import crud_test_suite
+from app.crud import test_execution as crud_executions
+from app.db.base import Base
+from app.models.test_case import TestCase, TestType, Priority, TestStatus
+from app.models.test_execution import ExecutionResult, ExecutionStatus, TestExecution
+from app.models.user import User
+from app.schemas.test_suite import TestSuiteCreate
+from app.services import suite_execution_service
+from app.services.execution_queue import ExecutionQueue
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def user_id(db):
+    user = User(email="suite@example.com", username="suite", hashed_password="hash", role="user", is_active=True)
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def _cases(db, user_id, titles):
+    cases = [
+        TestCase(
+            title=title,
+            description="Open https://example.com",
+            test_type=TestType.E2E,
+            priority=Priority.MEDIUM,
+            status=TestStatus.PENDING,
+            steps=["Step 1"],
+            expected_result="ok",
+            user_id=user_id,
+        )
+        for title in titles
+    ]
+    db.add_all(cases)
+    db.commit()
+    return [c.id for c in cases]
+
+
+def _suite(db, user_id, case_ids, dependencies=None):
+    suite = crud_test_suite.create_test_suite(
+        db,
+        TestSuiteCreate(name="Regression", test_case_ids=case_ids, dependencies=dependencies),
+        user_id,
+    )
+    return suite.id
+
+
+class FakeWorker:
+    """Runs queued executions on the event loop like QueueManager would."""
+
+    def __init__(self, db, queue, failing_cases=(), duration=0.05):
+        self.db = db
+        self.queue = queue
+        self.failing_cases = set(failing_cases)
+        self.duration = duration
+        self.started = []
+        self.active = 0
+        self.peak = 0
+        self._task = None
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._dispatch())
+        return self
+
+    def __exit__(self, *exc_info):
+        self._task.cancel()
+
+    async def _dispatch(self):
+        while True:
+            while self.queue.is_under_limit():
+                queued = self.queue.get_next_execution()
+                if queued is None:
+                    break
+                self.queue.mark_as_active(queued)
+                asyncio.get_running_loop().create_task(self._run(queued))
+            await asyncio.sleep(0.005)
+
+    async def _run(self, queued):
+        self.started.append(queued.test_case_id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.duration)
+        result = ExecutionResult.FAIL if queued.test_case_id in self.failing_cases else ExecutionResult.PASS
+        crud_executions.complete_execution(self.db, queued.execution_id, result, total_steps=1)
+        self.active -= 1
+        self.queue.mark_as_complete(queued.execution_id)
+
+
+async def _run_suite(db, user_id, suite_id, queue, worker, **kwargs):
+    kwargs.setdefault("stop_on_failure", False)
+    kwargs.setdefault("parallel", True)
+    with patch.object(suite_execution_service, "get_execution_queue", return_value=queue), worker:
+        return await suite_execution_service.execute_test_suite(
+            db, suite_id, user_id, browser="chromium", environment="dev", **kwargs
+        )
+
+
+@pytest.mark.asyncio
+async def test_parallel_suite_fans_out_up_to_max_parallel(db, user_id):
+    case_ids = _cases(db, user_id, [f"T{i}" for i in range(6)])
+    suite_id = _suite(db, user_id, case_ids)
+    queue = ExecutionQueue(max_concurrent=5)
+    worker = FakeWorker(db, queue, duration=0.2)
+
+    start = time.monotonic()
+    response = await _run_suite(db, user_id, suite_id, queue, worker, max_parallel=2)
+    elapsed = time.monotonic() - start
+
+    assert worker.peak == 2
+    assert len(response.queued_executions) == 6
+    assert elapsed < 6 * 0.2  # a one-at-a-time run needs at least 1.2s
+    suite_execution = crud_test_suite.get_suite_execution(db, response.id)
+    assert (suite_execution.passed_tests, suite_execution.failed_tests, suite_execution.skipped_tests) == (6, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_parallel_suite_without_cap_is_limited_by_queue(db, user_id):
+    case_ids = _cases(db, user_id, [f"T{i}" for i in range(5)])
+    suite_id = _suite(db, user_id, case_ids)
+    queue = ExecutionQueue(max_concurrent=3)
+    worker = FakeWorker(db, queue)
+
+    await _run_suite(db, user_id, suite_id, queue, worker)
+
+    assert worker.peak == 3
+    assert sorted(worker.started) == sorted(case_ids)
+
+
+@pytest.mark.asyncio
+async def test_sequential_suite_runs_in_execution_order(db, user_id):
+    case_ids = _cases(db, user_id, ["A", "B", "C"])
+    suite_id = _suite(db, user_id, case_ids)
+    queue = ExecutionQueue(max_concurrent=5)
+    worker = FakeWorker(db, queue, duration=0.01)
+
+    await _run_suite(db, user_id, suite_id, queue, worker, parallel=False)
+
+    assert worker.peak == 1
+    assert worker.started == case_ids
+
+
+@pytest.mark.asyncio
+async def test_dependencies_gate_start_and_skip_after_failure(db, user_id):
+    a, b, c, d = _cases(db, user_id, ["Login", "Checkout", "Invoice", "Search"])
+    suite_id = _suite(db, user_id, [c, b, a, d], dependencies={b: [a], c: [b]})
+    queue = ExecutionQueue(max_concurrent=5)
+
+    worker = FakeWorker(db, queue, duration=0.01)
+    await _run_suite(db, user_id, suite_id, queue, worker)
+    assert worker.started.index(a) < worker.started.index(b) < worker.started.index(c)
+
+    worker = FakeWorker(db, queue, failing_cases={a}, duration=0.01)
+    response = await _run_suite(db, user_id, suite_id, queue, worker)
+    assert sorted(worker.started) == sorted([a, d])
+    suite_execution = crud_test_suite.get_suite_execution(db, response.id)
+    assert (suite_execution.passed_tests, suite_execution.failed_tests, suite_execution.skipped_tests) == (1, 1, 2)
+
+
+@pytest.mark.asyncio
+async def test_dependency_cycle_is_skipped_instead_of_hanging(db, user_id):
+    a, b, c = _cases(db, user_id, ["A", "B", "C"])
+    suite_id = _suite(db, user_id, [a, b, c], dependencies={a: [b], b: [a]})
+    queue = ExecutionQueue(max_concurrent=5)
+    worker = FakeWorker(db, queue, duration=0.01)
+
+    response = await asyncio.wait_for(_run_suite(db, user_id, suite_id, queue, worker), timeout=5)
+
+    assert worker.started == [c]
+    assert crud_test_suite.get_suite_execution(db, response.id).skipped_tests == 2
+
+
+@pytest.mark.asyncio
+async def test_stop_on_failure_cancels_queued_siblings(db, user_id):
+    case_ids = _cases(db, user_id, ["Fails", "Queued 1", "Queued 2", "Queued 3"])
+    suite_id = _suite(db, user_id, case_ids)
+    queue = ExecutionQueue(max_concurrent=1)
+    worker = FakeWorker(db, queue, failing_cases={case_ids[0]})
+
+    response = await _run_suite(db, user_id, suite_id, queue, worker, stop_on_failure=True)
+
+    # The freed slot may pick up the next test before the suite hears of the
+    # failure; that one finishes, everything still queued is cancelled
+    assert worker.started[0] == case_ids[0]
+    assert len(worker.started) <= 2
+    assert queue.get_queue_size() == 0
+    executions = [db.get(TestExecution, execution_id) for execution_id in response.queued_executions]
+    cancelled = [e for e in executions if e.test_case_id not in worker.started]
+    assert len(cancelled) >= 2
+    assert all(e.status == ExecutionStatus.CANCELLED for e in cancelled)
+    suite_execution = crud_test_suite.get_suite_execution(db, response.id)
+    assert suite_execution.failed_tests == 1
+    assert suite_execution.skipped_tests == len(cancelled)
+
+
+def test_queue_notifies_finish_listeners_on_complete_and_remove():
+    queue = ExecutionQueue(max_concurrent=1)
+    seen = []
+    queue.add_finish_listener(seen.append)
+    queue.add_finish_listener(lambda execution_id: 1 / 0)  # errors are logged, not raised
+
+    queue.add_to_queue(1, test_case_id=1, user_id=1)
+    queue.add_to_queue(2, test_case_id=2, user_id=1)
+    queue.mark_as_active(queue.get_next_execution())
+    queue.mark_as_complete(1)
+    assert queue.remove_from_queue(2) is True
+    assert queue.remove_from_queue(2) is False
+
+    queue.remove_finish_listener(seen.append)
+    queue.add_to_queue(3, test_case_id=3, user_id=1)
+    queue.remove_from_queue(3)
+
+    assert seen == [1, 2]
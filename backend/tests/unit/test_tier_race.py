@@ -0,0 +1,180 @@
+"""
+Unit tests for the race fallback strategy (speculative Tier 2 XPath extraction).
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.crud.execution_settings import get_race_speculation_stats
+from app.db.base import Base
+from app.models.execution_settings import ExecutionSettings, TierExecutionLog
+from app.schemas.execution_settings import RaceSpeculationStats
+from app.services import stagehand_service as stagehand_module
+from app.services.stagehand_service import StagehandExecutionService
+from app.services.three_tier_execution_service import ThreeTierExecutionService
+from app.services.xpath_cache_service import invalidate_memory_cache
+from app.utils.llm_execution_context import record_llm_usage
+
+URL = "https://shop.example.com/signup"
+STEP = {"action": "click", "instruction": "Click the submit button"}
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    invalidate_memory_cache()
+    yield session
+    invalidate_memory_cache()
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _service(db, tier1_success, tier1_seconds, extraction_seconds):
+    settings = ExecutionSettings()
+    settings.fallback_strategy = "race"
+    settings.timeout_per_tier_seconds = 30
+    settings.track_strategy_effectiveness = True
+    page = MagicMock()
+    page.url = URL
+    service = ThreeTierExecutionService(db=db, page=page, user_settings=settings)
+    service.tier_router.enabled = False
+
+    async def tier1(page, step):
+        await asyncio.sleep(tier1_seconds)
+        return {"success": tier1_success, "tier": 1, "execution_time_ms": tier1_seconds * 1000,
+                "error": None if tier1_success else "selector not found"}
+
+    async def extract(page, instruction):
+        record_llm_usage(1200, 300, None)  # The observe() call
+        await asyncio.sleep(extraction_seconds)
+        return {"success": True, "xpath": "//button[@type='submit']", "page_title": "Sign up"}
+
+    async def tier2(page, step):
+        cached = service.xpath_cache_service.get_cached_xpath(page.url, step["instruction"])
+        return {"success": cached is not None, "tier": 2, "execution_time_ms": 5, "cache_hit": cached is not None,
+                "error": None if cached else "cache miss"}
+
+    service.tier1_executor.execute_step = AsyncMock(side_effect=tier1)
+    service.xpath_extractor = MagicMock()
+    service.xpath_extractor.extract_xpath_with_page = AsyncMock(side_effect=extract)
+    service.tier2_executor = MagicMock()
+    service.tier2_executor.execute_step = AsyncMock(side_effect=tier2)
+    return service
+
+
+async def _run(service):
+    with patch(
+        "app.services.three_tier_execution_service.wait_for_step_boundary_readiness", AsyncMock()
+    ):
+        return await service.execute_step(dict(STEP), execution_id=1, step_index=1)
+
+
+@pytest.mark.asyncio
+async def test_tier1_failure_uses_xpath_resolved_during_tier1(db, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.LLM_COST_PER_1K_PROMPT_TOKENS", 0.005)
+    monkeypatch.setattr("app.core.config.settings.LLM_COST_PER_1K_COMPLETION_TOKENS", 0.015)
+    service = _service(db, tier1_success=False, tier1_seconds=0.1, extraction_seconds=0.05)
+
+    result = await _run(service)
+
+    assert result["success"] is True and result["tier"] == 2
+    assert result["cache_hit"] is True
+    service.xpath_extractor.extract_xpath_with_page.assert_awaited_once()
+    log = db.query(TierExecutionLog).one()
+    assert log.speculation == "used"
+    assert log.speculation_saved_ms == pytest.approx(log.speculation_time_ms, abs=20)
+    assert (log.speculation_tokens, log.speculation_cost_usd) == (1500, pytest.approx(0.0105))
+
+
+@pytest.mark.asyncio
+async def test_tier1_success_cancels_speculation_as_wasted(db):
+    service = _service(db, tier1_success=True, tier1_seconds=0.01, extraction_seconds=1)
+
+    result = await _run(service)
+
+    assert result["success"] is True and result["tier"] == 1
+    service.tier2_executor.execute_step.assert_not_awaited()
+    assert service.xpath_cache_service.get_cached_xpath(URL, STEP["instruction"]) is None
+    log = db.query(TierExecutionLog).one()
+    assert (log.speculation, log.speculation_saved_ms) == ("wasted", 0.0)
+    assert log.speculation_tokens == 1500  # Spent before the extraction was cancelled
+
+
+@pytest.mark.asyncio
+async def test_extraction_cancelled_mid_call_still_counts_its_prompt(db, monkeypatch):
+    service = _service(db, tier1_success=True, tier1_seconds=0.05, extraction_seconds=0)
+    monkeypatch.setattr(stagehand_module.llm_logger, "write", AsyncMock())
+
+    async def create_response(*, messages, model=None, function_name=None, **kwargs):
+        await asyncio.sleep(5)  # Still waiting on the provider when Tier 1 wins
+        return {"usage": {"prompt_tokens": 1000, "completion_tokens": 50, "total_tokens": 1050}}
+
+    stagehand = StagehandExecutionService.__new__(StagehandExecutionService)
+    stagehand._stagehand_provider_name, stagehand._stagehand_model_name = "openrouter", "model"
+    stagehand.stagehand = SimpleNamespace(llm=SimpleNamespace(create_response=create_response))
+    stagehand._instrument_stagehand_llm()
+
+    async def extract(page, instruction):
+        await stagehand.stagehand.llm.create_response(messages=[{"role": "user", "content": "x" * 4000}])
+
+    service.xpath_extractor.extract_xpath_with_page = AsyncMock(side_effect=extract)
+
+    await _run(service)
+
+    log = db.query(TierExecutionLog).one()
+    assert log.speculation == "wasted"
+    assert log.speculation_tokens == 1000  # The prompt sent before the call was cancelled
+
+
+@pytest.mark.asyncio
+async def test_cached_xpath_skips_speculative_extraction(db):
+    service = _service(db, tier1_success=False, tier1_seconds=0.01, extraction_seconds=0)
+    service.xpath_cache_service.cache_xpath(URL, STEP["instruction"], "//button")
+
+    await _run(service)
+
+    service.xpath_extractor.extract_xpath_with_page.assert_not_awaited()
+    log = db.query(TierExecutionLog).one()
+    assert (log.speculation, log.speculation_tokens) == ("cache_hit", 0)
+
+
+def test_race_speculation_stats(db):
+    for outcome, time_ms, saved_ms, tokens, cost in [
+        ("used", 800.0, 600.0, 1500, 0.01),
+        ("wasted", 300.0, 0.0, 1000, 0.004),
+        ("cache_hit", 0.0, 0.0, 0, 0.0),
+    ]:
+        db.add(TierExecutionLog(
+            execution_id=1,
+            step_index=1,
+            fallback_strategy="race",
+            final_tier=1,
+            success=True,
+            tiers_attempted="[1]",
+            total_execution_time_ms=10.0,
+            speculation=outcome,
+            speculation_time_ms=time_ms,
+            speculation_saved_ms=saved_ms,
+            speculation_tokens=tokens,
+            speculation_cost_usd=cost,
+        ))
+    db.commit()
+
+    stats = RaceSpeculationStats(**get_race_speculation_stats(db))
+
+    assert (stats.total_steps, stats.used, stats.wasted, stats.cache_hit) == (3, 1, 1, 1)
+    assert stats.extraction_calls == 2
+    assert (stats.extraction_time_ms, stats.wasted_time_ms, stats.latency_saved_ms) == (1100.0, 300.0, 600.0)
+    assert (stats.extraction_tokens, stats.wasted_tokens) == (2500, 1000)
+    assert (stats.extraction_cost_usd, stats.wasted_cost_usd) == (0.014, 0.004)
@@ -0,0 +1,149 @@
+"""
+Unit tests for learned tier routing (TierRouter + ThreeTierExecutionService).
+"""
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.execution_settings import ExecutionSettings, TierExecutionLog
+from app.services.three_tier_execution_service import ThreeTierExecutionService
+from app.services.tier_router import RouteRun, TierRouter, choose_start_tier
+
+URL = "https://shop.example.com/cart?session=1"
+STEP = {"action": "click", "instruction": "Click the checkout button"}
+
+
+def _runs(*specs):
+    """RouteRun per (success, final_tier, tiers_attempted), newest first."""
+    return [RouteRun(success, final_tier, tuple(tiers)) for success, final_tier, tiers in specs]
+
+
+def _choose(history, strategy="option_c"):
+    return choose_start_tier(history, strategy, probe_interval=3, min_tier1_failures=2)
+
+
+def test_tier1_kept_without_enough_evidence():
+    assert _choose([]) == 1
+    assert _choose(_runs((True, 2, [1, 2]))) == 1
+    assert _choose(_runs((True, 2, [1, 2]), (True, 1, [1]))) == 1
+
+
+def test_repeated_tier1_failures_route_to_last_successful_tier():
+    history = _runs((True, 3, [1, 2, 3]), (True, 2, [1, 2]))
+
+    assert _choose(history) == 3
+    assert _choose(history, "option_a") == 2
+    assert _choose(history, "option_b") == 3
+    assert _choose(_runs((False, 0, [1, 2, 3]), (False, 0, [1, 2, 3]))) == 1  # Nothing to route to
+
+
+def test_probe_retries_tier1_after_interval():
+    failures = _runs((True, 2, [1, 2]), (True, 2, [1, 2]))
+    routed = _runs((True, 2, [2]))
+
+    assert _choose(routed * 2 + failures) == 2
+    assert _choose(routed * 3 + failures) == 1
+    # A successful probe (or Tier 1 recovering after a routed failure) ends routing
+    assert _choose(_runs((True, 1, [2, 1])) + routed + failures) == 1
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _log(db, route_key, success, final_tier, tiers):
+    db.add(TierExecutionLog(
+        execution_id=1,
+        step_index=1,
+        route_key=route_key,
+        fallback_strategy="option_c",
+        final_tier=final_tier,
+        success=success,
+        tiers_attempted=json.dumps(tiers),
+        total_execution_time_ms=10.0,
+    ))
+    db.commit()
+
+
+def _service(db):
+    settings = ExecutionSettings()
+    settings.fallback_strategy = "option_c"
+    settings.timeout_per_tier_seconds = 30
+    settings.track_strategy_effectiveness = True
+    page = MagicMock()
+    page.url = URL
+    service = ThreeTierExecutionService(db=db, page=page, user_settings=settings)
+    service.tier1_executor.execute_step = AsyncMock(
+        return_value={"success": True, "tier": 1, "execution_time_ms": 5, "error": None}
+    )
+    service.tier2_executor = MagicMock()
+    service.tier2_executor.execute_step = AsyncMock(
+        return_value={"success": True, "tier": 2, "execution_time_ms": 50, "error": None}
+    )
+    return service
+
+
+def test_history_is_newest_first_per_route(db):
+    key = TierRouter.route_key(URL, STEP["instruction"])
+    _log(db, key, True, 2, [1, 2])
+    _log(db, "other", True, 1, [1])
+    _log(db, key, True, 3, [1, 2, 3])
+
+    history = TierRouter(db, probe_interval=5, min_tier1_failures=2).history(key)
+
+    assert history == _runs((True, 3, [1, 2, 3]), (True, 2, [1, 2]))
+    assert TierRouter.route_key(None, "x") is None
+
+
+@pytest.mark.asyncio
+async def test_execute_step_starts_at_learned_tier(db):
+    key = TierRouter.route_key(URL, STEP["instruction"])
+    _log(db, key, True, 2, [1, 2])
+    _log(db, key, True, 2, [1, 2])
+    service = _service(db)
+
+    with patch(
+        "app.services.three_tier_execution_service.wait_for_step_boundary_readiness", AsyncMock()
+    ):
+        result = await service.execute_step(dict(STEP), execution_id=1, step_index=1)
+
+    assert result["success"] is True and result["tier"] == 2
+    service.tier1_executor.execute_step.assert_not_awaited()
+    latest = db.query(TierExecutionLog).order_by(TierExecutionLog.id.desc()).first()
+    assert (latest.route_key, latest.tiers_attempted) == (key, "[2]")
+
+
+@pytest.mark.asyncio
+async def test_routed_failure_falls_back_to_tier1(db):
+    key = TierRouter.route_key(URL, STEP["instruction"])
+    _log(db, key, True, 3, [1, 2, 3])
+    _log(db, key, True, 3, [1, 2, 3])
+    service = _service(db)
+    service.tier3_executor = MagicMock()
+    service.tier3_executor.execute_step = AsyncMock(
+        return_value={"success": False, "tier": 3, "execution_time_ms": 80, "error": "not found"}
+    )
+
+    with patch(
+        "app.services.three_tier_execution_service.wait_for_step_boundary_readiness", AsyncMock()
+    ):
+        result = await service.execute_step(dict(STEP), execution_id=1, step_index=1)
+
+    assert result["success"] is True and result["tier"] == 1
+    service.tier2_executor.execute_step.assert_not_awaited()
+    assert [entry["tier"] for entry in result["execution_history"]] == [3, 1]
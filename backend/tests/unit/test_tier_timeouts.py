@@ -0,0 +1,258 @@
+"""
+Unit tests for adaptive per-tier timeouts (latency histograms -> timeouts).
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.execution_settings import ExecutionSettings, TierExecutionLog
+from app.schemas.execution_settings import TierTimeoutStats
+from app.services import tier_timeouts
+from app.services.three_tier_execution_service import ThreeTierExecutionService
+from app.services.tier_timeouts import LatencyHistogram, TierTimeoutModel, step_timeout_key
+
+
+def _model(**kwargs):
+    options = dict(enabled=True, safety_factor=3.0, min_seconds=0.5, min_samples=20)
+    options.update(kwargs)
+    return TierTimeoutModel(**options)
+
+
+def test_histogram_percentiles_and_decay(monkeypatch):
+    histogram = LatencyHistogram()
+    for _ in range(98):
+        histogram.add(100)
+    histogram.add(5000)
+    histogram.add(5000)
+
+    assert 100 <= histogram.percentile(0.5) < 120
+    assert 5000 <= histogram.percentile(0.99) < 6000
+
+    monkeypatch.setattr(tier_timeouts, "HISTOGRAM_MAX_SAMPLES", 50)
+    histogram.add(100)
+    assert histogram.total == pytest.approx(50.5)
+
+
+def test_timeout_is_p99_times_factor_clamped_to_bounds():
+    model = _model()
+    for _ in range(19):
+        model.observe("shop.example.com", "click", 1, 200)
+    assert model.timeout_ms("shop.example.com", "click", 1, 30000) == 30000  # Not enough samples
+
+    model.observe("shop.example.com", "click", 1, 200)
+    timeout = model.timeout_ms("shop.example.com", "CLICK", 1, 30000)
+    assert 600 <= timeout < 750
+
+    for _ in range(20):
+        model.observe("shop.example.com", "fill", 1, 50)
+        model.observe("shop.example.com", "click", 3, 20000)
+    assert model.timeout_ms("shop.example.com", "fill", 1, 30000) == 500  # Floor
+    assert model.timeout_ms("shop.example.com", "click", 3, 30000) == 30000  # User ceiling
+    assert model.timeout_ms(None, "click", 1, 30000) == 30000
+    assert _model(enabled=False).timeout_ms("shop.example.com", "click", 1, 30000) == 30000
+
+
+def test_step_timeout_key_uses_navigation_target_and_skips_timed_waits():
+    page = "https://shop.example.com/cart"
+    assert step_timeout_key({"action": "Click"}, page) == ("shop.example.com", "click")
+    assert step_timeout_key({"action": "navigate", "value": "https://pay.example.net/x"}, page) == (
+        "pay.example.net", "navigate"
+    )
+    assert step_timeout_key({"action": "navigate", "value": "/checkout"}, page) == ("shop.example.com", "navigate")
+    assert step_timeout_key({"action": "wait", "value": "2000"}, page) == (None, "wait")
+    assert step_timeout_key({"action": "wait"}, page) == (None, "wait")
+    assert step_timeout_key({"action": "wait", "selector": "#spinner"}, page) == ("shop.example.com", "wait")
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_seed_reads_successful_final_tier_latencies(db):
+    for success, final_tier in [(True, 1), (True, 2), (False, 0)]:
+        db.add(TierExecutionLog(
+            execution_id=1,
+            step_index=1,
+            page_domain="shop.example.com",
+            action="click",
+            fallback_strategy="option_c",
+            final_tier=final_tier,
+            success=success,
+            tiers_attempted="[1, 2]",
+            total_execution_time_ms=1000.0,
+            tier1_time_ms=150.0,
+            tier2_time_ms=900.0,
+        ))
+    db.commit()
+    db.add(TierExecutionLog(
+        execution_id=1,
+        step_index=2,
+        page_domain="shop.example.com",
+        action="click",
+        fallback_strategy="option_c",
+        final_tier=2,
+        success=True,
+        tiers_attempted="[1, 2]",
+        total_execution_time_ms=1500.0,
+        tier1_time_ms=600.0,
+        tier2_time_ms=900.0,
+        tier1_error="Timeout after 600ms: locator.click",
+    ))
+    # A missing element: every tier timed out, which says nothing about latency
+    db.add(TierExecutionLog(
+        execution_id=1,
+        step_index=3,
+        page_domain="shop.example.com",
+        action="click",
+        fallback_strategy="option_c",
+        final_tier=0,
+        success=False,
+        tiers_attempted="[1, 2]",
+        total_execution_time_ms=60000.0,
+        tier1_time_ms=30000.0,
+        tier2_time_ms=30000.0,
+        tier1_error="Timeout after 30000ms: locator.click",
+        tier2_error="Timeout after 30000ms: locator.click",
+    ))
+    db.commit()
+    model = _model(min_samples=1)
+
+    assert model.seed(db) == 5
+    stats = {entry["tier"]: entry for entry in model.snapshot(max_ms=30000)}
+
+    # One success plus the slow step's timeout as a censored sample (failed steps add nothing)
+    assert stats[1]["samples"] == 2 and 150 <= stats[1]["p50_ms"] < 180
+    assert 600 <= stats[1]["p99_ms"] < 720
+    assert stats[2]["samples"] == 2 and 900 <= stats[2]["p99_ms"] < 1100
+    assert TierTimeoutStats(**stats[2]).adaptive is True
+
+
+@pytest.mark.asyncio
+async def test_execute_step_applies_and_learns_tier_timeouts(db):
+    settings = ExecutionSettings()
+    settings.fallback_strategy = "option_c"
+    settings.timeout_per_tier_seconds = 30
+    settings.track_strategy_effectiveness = False
+    page = MagicMock()
+    page.url = "https://shop.example.com/cart"
+    service = ThreeTierExecutionService(db=db, page=page, user_settings=settings)
+    service.tier_timeouts = model = _model(min_samples=3)
+    applied = []
+
+    async def tier1(page, step):
+        applied.append(service.tier1_executor.timeout_ms)
+        return {"success": True, "tier": 1, "execution_time_ms": 120, "error": None}
+
+    service.tier1_executor.execute_step = AsyncMock(side_effect=tier1)
+    step = {"action": "click", "instruction": "Click checkout"}
+    with patch(
+        "app.services.three_tier_execution_service.wait_for_step_boundary_readiness", AsyncMock()
+    ):
+        for index in range(4):
+            await service.execute_step(dict(step), execution_id=1, step_index=index)
+
+    assert applied[:3] == [30000, 30000, 30000]
+    assert applied[3] == 500
+    assert model.snapshot(max_ms=30000)[0]["samples"] == 4
+
+
+@pytest.mark.asyncio
+async def test_timeouts_grow_back_after_a_latency_regression(db):
+    settings = ExecutionSettings()
+    settings.fallback_strategy = "option_c"
+    settings.timeout_per_tier_seconds = 30
+    settings.track_strategy_effectiveness = False
+    page = MagicMock()
+    page.url = "https://shop.example.com/cart"
+    service = ThreeTierExecutionService(db=db, page=page, user_settings=settings)
+    service.tier_router.enabled = False
+    service.tier_timeouts = model = _model(min_samples=3)
+    for _ in range(20):
+        model.observe("shop.example.com", "click", 1, 200)
+    applied = []
+
+    async def tier1(page, step):
+        # The page got slower: every Tier 1 attempt now hits its timeout
+        timeout = service.tier1_executor.timeout_ms
+        applied.append(timeout)
+        return {"success": False, "tier": 1, "execution_time_ms": timeout,
+                "error": f"Timeout after {timeout}ms", "error_type": "timeout"}
+
+    async def tier2(page, step):
+        return {"success": True, "tier": 2, "execution_time_ms": 900, "error": None}
+
+    service.tier1_executor.execute_step = AsyncMock(side_effect=tier1)
+    service.tier2_executor = MagicMock()
+    service.tier2_executor.execute_step = AsyncMock(side_effect=tier2)
+    step = {"action": "click", "instruction": "Click checkout"}
+    with patch(
+        "app.services.three_tier_execution_service.wait_for_step_boundary_readiness", AsyncMock()
+    ):
+        for index in range(3):
+            await service.execute_step(dict(step), execution_id=1, step_index=index)
+
+    assert applied[0] < 750
+    assert applied[0] < applied[1] < applied[2] <= 30000
+
+
+@pytest.mark.asyncio
+async def test_timeouts_of_failed_steps_do_not_inflate_the_learned_timeout(db):
+    settings = ExecutionSettings()
+    settings.fallback_strategy = "option_c"
+    settings.timeout_per_tier_seconds = 30
+    settings.track_strategy_effectiveness = False
+    page = MagicMock()
+    page.url = "https://shop.example.com/cart"
+    service = ThreeTierExecutionService(db=db, page=page, user_settings=settings)
+    service.tier_router.enabled = False
+    service.tier_timeouts = model = _model(min_samples=3)
+    applied = []
+
+    def timed_out(tier, timeout):
+        return {"success": False, "tier": tier, "execution_time_ms": timeout,
+                "error": f"Timeout after {timeout}ms: locator.click", "error_type": "timeout"}
+
+    async def tier1(page, step):
+        timeout = service.tier1_executor.timeout_ms
+        applied.append(timeout)
+        if step["instruction"] == "Click missing":
+            return timed_out(1, timeout)
+        return {"success": True, "tier": 1, "execution_time_ms": 150, "error": None}
+
+    async def tier2(page, step):
+        return timed_out(2, service.tier2_executor.timeout_ms)
+
+    async def tier3(step):
+        return timed_out(3, 30000)
+
+    service.tier1_executor.execute_step = AsyncMock(side_effect=tier1)
+    service.tier2_executor = MagicMock(timeout_ms=30000)
+    service.tier2_executor.execute_step = AsyncMock(side_effect=tier2)
+    service.tier3_executor = MagicMock()
+    service.tier3_executor.execute_step = AsyncMock(side_effect=tier3)
+    with patch(
+        "app.services.three_tier_execution_service.wait_for_step_boundary_readiness", AsyncMock()
+    ):
+        # One step in ten fails on a selector that is not on the page
+        for index in range(60):
+            instruction = "Click missing" if index % 10 == 9 else "Click checkout"
+            await service.execute_step(
+                {"action": "click", "instruction": instruction}, execution_id=1, step_index=index
+            )
+
+    assert max(applied[10:]) < 750
+    assert model.snapshot(max_ms=30000)[0]["p99_ms"] < 200
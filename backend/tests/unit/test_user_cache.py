@@ -0,0 +1,129 @@
+"""
+Unit tests for the cached user lookup behind get_current_user / get_current_identity.
+"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import deps
+from app.core import user_cache as user_cache_module
+from app.core.security import create_access_token
+from app.core.user_cache import UserCache, user_cache
+from app.crud.user import update_user, update_user_password
+from app.db.base import Base
+from app.models.user import User
+from app.schemas.user import UserUpdate
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def session_factory(engine, monkeypatch):
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(deps, "SessionLocal", factory)
+    user_cache.clear()
+    yield factory
+    user_cache.clear()
+
+
+@pytest.fixture
+def user_id(session_factory):
+    with session_factory() as db:
+        user = User(email="a@example.com", username="alice", hashed_password="hash", role="user", is_active=True)
+        db.add(user)
+        db.commit()
+        return user.id
+
+
+def _token(user_id, version=0):
+    return create_access_token({"sub": str(user_id), "ver": version})
+
+
+def _count_user_queries(engine):
+    statements = []
+
+    def before(conn, cursor, statement, *args):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before)
+    return statements
+
+
+def test_current_user_is_served_from_cache(engine, session_factory, user_id):
+    token = _token(user_id)
+    with session_factory() as db:
+        deps.get_current_user(db, token)
+    queries = _count_user_queries(engine)
+
+    with session_factory() as db:
+        user = deps.get_current_user(db, token)
+        assert (user.id, user.role) == (user_id, "user")
+        assert user in db
+        assert queries == []
+        assert user.hashed_password == "hash"  # Uncached columns load on access
+
+
+def test_identity_skips_database_session(session_factory, user_id, monkeypatch):
+    token = _token(user_id)
+    assert deps.get_current_identity(token).username == "alice"
+
+    def no_session():
+        raise AssertionError("database session opened")
+
+    monkeypatch.setattr(deps, "SessionLocal", no_session)
+    identity = deps.get_current_identity(token)
+
+    assert (identity.id, identity.role, identity.is_active) == (user_id, "user", True)
+
+
+def test_update_invalidates_cached_user(session_factory, user_id):
+    token = _token(user_id)
+    assert deps.get_current_identity(token).role == "user"
+
+    with session_factory() as db:
+        update_user(db, user_id, UserUpdate(role="admin"))
+
+    assert deps.get_current_identity(token).role == "admin"
+
+
+@pytest.mark.parametrize("change", ["password", "deactivate"])
+def test_revocation_rejects_older_tokens(session_factory, user_id, change):
+    old_token = _token(user_id)
+    deps.get_current_identity(old_token)
+
+    with session_factory() as db:
+        if change == "password":
+            update_user_password(db, user_id, "new-password")
+        else:
+            update_user(db, user_id, UserUpdate(is_active=False))
+
+    with pytest.raises(HTTPException) as exc:
+        deps.get_current_identity(old_token)
+    assert exc.value.status_code == 401
+    assert deps.get_current_identity(_token(user_id, version=1)).id == user_id
+
+
+def test_entries_expire(session_factory, user_id, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(user_cache_module.time, "monotonic", lambda: clock[0])
+    cache = UserCache(ttl_seconds=30, max_entries=10)
+    with session_factory() as db:
+        cache.put(db.get(User, user_id))
+
+    assert cache.get(user_id, 0) is not None
+    assert cache.get(user_id, 1) is None
+    clock[0] += 31
+    assert cache.get(user_id, 0) is None
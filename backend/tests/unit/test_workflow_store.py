@@ -1,8 +1,18 @@
 """
 Unit tests for workflow_store (API v2).
-Tests get_state, set_state, request_cancel, is_cancel_requested.
+Tests get_state, set_state, request_cancel, is_cancel_requested and the
+memory / database backends.
 """
+import time
+
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.workflow_record import WorkflowRecord
+from app.services import workflow_store
 from app.services.workflow_store import (
     get_state,
     set_state,
@@ -10,6 +20,9 @@ from app.services.workflow_store import (
     delete_state,
     request_cancel,
     is_cancel_requested,
+    configure_store,
+    DatabaseWorkflowStore,
+    MemoryWorkflowStore,
 )
 
 
@@ -84,3 +97,91 @@ def test_is_cancel_requested_false_for_unknown():
 def test_is_cancel_requested_false_when_not_set():
     set_state("wf-test-1", {"workflow_id": "wf-test-1", "status": "pending"})
     assert is_cancel_requested("wf-test-1") is False
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture(params=["memory", "database"])
+def store(request, session_factory):
+    backend = MemoryWorkflowStore() if request.param == "memory" else DatabaseWorkflowStore(session_factory)
+    configure_store(backend)
+    yield backend
+    configure_store(None)
+
+
+def test_backends_share_the_module_api(store):
+    set_state("wf-b", {"workflow_id": "wf-b", "status": "running", "result": {"test_count": 3}})
+    update_state("wf-b", status="completed", total_progress=1.0)
+
+    state = get_state("wf-b")
+    assert state["status"] == "completed"
+    assert state["total_progress"] == 1.0
+    assert state["result"] == {"test_count": 3}
+    assert "result" not in get_state("wf-b", include_result=False)
+
+    assert request_cancel("wf-b") is True
+    set_state("wf-b", {"workflow_id": "wf-b", "status": "cancelled"})
+    assert is_cancel_requested("wf-b") is True  # set_state keeps a pending cancel
+
+    assert delete_state("wf-b") is True
+    assert get_state("wf-b") is None
+    assert request_cancel("wf-b") is False
+
+
+def test_database_store_compresses_results_and_shares_cancel(session_factory):
+    api, worker = DatabaseWorkflowStore(session_factory), DatabaseWorkflowStore(session_factory)
+    result = {"evolution_result": {"steps": ["Click the checkout button"] * 500}}
+    worker.set("wf-db", {"workflow_id": "wf-db", "status": "running", "result": result})
+
+    api.request_cancel("wf-db")
+
+    assert worker.is_cancel_requested("wf-db") is True
+    assert api.get("wf-db")["result"] == result
+    with session_factory() as db:
+        record = db.get(WorkflowRecord, "wf-db")
+        assert record.status == "running"
+        assert "result" not in record.state
+        assert len(record.result) < len(str(result)) / 10
+
+
+def test_database_store_purges_expired_workflows(session_factory, monkeypatch):
+    store = DatabaseWorkflowStore(session_factory, ttl_seconds=0)
+    store.set("wf-old", {"workflow_id": "wf-old"})
+    monkeypatch.setattr(workflow_store, "PURGE_INTERVAL_SECONDS", 0)
+    time.sleep(0.01)
+
+    store.set("wf-new", {"workflow_id": "wf-new"})
+
+    assert store.get("wf-old") is None
+    assert store.get("wf-new") is not None
+
+
+def test_memory_store_evicts_least_recently_used_and_expired(monkeypatch):
+    store = MemoryWorkflowStore(max_entries=2, ttl_seconds=10)
+    clock = [100.0]
+    monkeypatch.setattr(workflow_store.time, "monotonic", lambda: clock[0])
+    store.set("a", {"status": "running"})
+    store.set("b", {"status": "running"})
+    store.get("a")  # a is now most recently used
+    store.set("c", {"status": "running"})
+
+    assert store.get("b") is None
+    assert store.get("a") is not None
+
+    clock[0] += 11
+    assert store.get("a") is None
+    assert store.get("c") is None
@@ -0,0 +1,174 @@
+"""
+Unit tests for element-fingerprint validation of cached XPaths (Tier 2).
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.execution_settings import XPathCache as XPathCacheModel
+from app.services import xpath_cache_service as cache_module
+from app.services.tier2_hybrid import Tier2HybridExecutor
+from app.services.xpath_cache_service import XPathCacheService, invalidate_memory_cache
+from app.services.xpath_fingerprint import (
+    CACHE_FINGERPRINTS_SCRIPT,
+    VALIDATE_FINGERPRINTS_SCRIPT,
+    cache_fingerprints,
+    validate_fingerprints,
+)
+
+URL = "https://shop.example.com/signup"
+EMAIL = "Fill the email field"
+PHONE = "Fill the phone field"
+COMPANY = "Fill the company field"
+# DOM fingerprints of the signup form before and after "I am a business" is ticked
+FORM = "12-1a2b3c"
+BUSINESS_FORM = "15-4d5e6f"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    invalidate_memory_cache()
+    with patch.object(cache_module._memory_cache, "_ensure_flusher"):
+        yield session
+    invalidate_memory_cache()
+    cache_module._memory_cache.drain_pending()
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _prefetched_service(db):
+    seed = XPathCacheService(db)
+    seed.cache_xpath(URL, EMAIL, "/html/body/form/input[2]", element_fingerprint="fp-email", page_fingerprint=FORM)
+    seed.cache_xpath(URL, PHONE, "/html/body/form/input[3]", element_fingerprint="fp-phone", page_fingerprint=FORM)
+    seed.cache_xpath(
+        URL, COMPANY, "/html/body/form/input[4]", element_fingerprint="fp-company", page_fingerprint=BUSINESS_FORM
+    )
+    seed.cache_xpath("https://shop.example.com/cart", "Click checkout", "//button", element_fingerprint="fp-cart")
+    seed.cache_xpath(URL, "Click submit", "//button[@type='submit']")  # Cached before fingerprints
+    invalidate_memory_cache()
+    service = XPathCacheService(db)
+    service.prefetch([EMAIL, PHONE, COMPANY, "Click checkout", "Click submit"])
+    return service
+
+
+def test_fingerprinted_entries_and_stale_marking(db):
+    service = _prefetched_service(db)
+    email_key = service.generate_cache_key(URL, EMAIL)
+    phone_key = service.generate_cache_key(URL, PHONE)
+    company_key = service.generate_cache_key(URL, COMPANY)
+
+    assert service.fingerprinted_entries(URL) == {
+        email_key: ("/html/body/form/input[2]", "fp-email", FORM),
+        phone_key: ("/html/body/form/input[3]", "fp-phone", FORM),
+        company_key: ("/html/body/form/input[4]", "fp-company", BUSINESS_FORM),
+    }
+    assert service.get_cached_xpath(URL, PHONE)["page_fingerprint"] == FORM
+
+    service.mark_stale(phone_key)
+    assert service.get_cached_xpath(URL, PHONE) is None
+    assert phone_key not in service.fingerprinted_entries(URL)
+
+    # Re-caching the entry makes it usable again
+    service.cache_xpath(URL, PHONE, "/html/body/form/input[5]", element_fingerprint="fp-phone-2", page_fingerprint=FORM)
+    assert service.get_cached_xpath(URL, PHONE)["element_fingerprint"] == "fp-phone-2"
+
+
+@pytest.mark.asyncio
+async def test_cache_fingerprints_is_one_round_trip():
+    page = MagicMock()
+    page.evaluate = AsyncMock(return_value={"element": "fp-email", "page": FORM})
+
+    assert await cache_fingerprints(page, "/html/body/form/input[2]") == ("fp-email", FORM)
+    page.evaluate.assert_awaited_once_with(CACHE_FINGERPRINTS_SCRIPT, "/html/body/form/input[2]")
+    page.evaluate = AsyncMock(return_value={"element": None, "page": FORM})
+    assert await cache_fingerprints(page, "/missing") == (None, FORM)
+    page.evaluate = AsyncMock(side_effect=RuntimeError("page closed"))
+    assert await cache_fingerprints(page, "/x") == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_validate_fingerprints_is_one_round_trip():
+    page = MagicMock()
+    page.evaluate = AsyncMock(return_value={"page": FORM, "statuses": {"a": "ok", "b": "changed"}})
+
+    result = await validate_fingerprints(page, {"a": ("/x", "f1"), "b": ("/y", "f2")})
+
+    assert result == (FORM, {"a": "ok", "b": "changed"})
+    page.evaluate.assert_awaited_once_with(VALIDATE_FINGERPRINTS_SCRIPT, {"a": ["/x", "f1"], "b": ["/y", "f2"]})
+    page.evaluate = AsyncMock(side_effect=RuntimeError("page closed"))
+    assert await validate_fingerprints(page, {"a": ("/x", "f1")}) == (None, {})
+
+
+@pytest.mark.asyncio
+async def test_changed_cached_element_is_re_extracted_without_probing(db):
+    service = _prefetched_service(db)
+    email_key = service.generate_cache_key(URL, EMAIL)
+    phone_key = service.generate_cache_key(URL, PHONE)
+    company_key = service.generate_cache_key(URL, COMPANY)
+    validated = []
+
+    async def evaluate(script, arg):
+        if script == VALIDATE_FINGERPRINTS_SCRIPT:
+            validated.append(sorted(arg))
+            return {"page": FORM, "statuses": {key: "changed" for key in arg}}
+        assert script == CACHE_FINGERPRINTS_SCRIPT
+        return {"element": "fp-email-2", "page": FORM}
+
+    page = MagicMock()
+    page.url = URL
+    page.evaluate = AsyncMock(side_effect=evaluate)
+    extractor = MagicMock()
+    extractor.extract_xpath_with_page = AsyncMock(
+        return_value={"success": True, "xpath": "/html/body/form/input[3]", "page_title": "Sign up"}
+    )
+    executor = Tier2HybridExecutor(db=db, xpath_extractor=extractor, cache_service=service)
+    executor._execute_action_with_xpath = AsyncMock()
+
+    result = await executor.execute_step(page, {"action": "fill", "instruction": EMAIL, "value": "a@b.com"})
+
+    assert result["success"] is True and result["cache_hit"] is False
+    assert validated == [sorted([email_key, phone_key, company_key])]  # One round-trip for the page
+    page.locator.assert_not_called()  # No live probe of the stale XPath
+    extractor.extract_xpath_with_page.assert_awaited_once()
+    # The phone entry was cached on this same form, so its change is real
+    assert service.get_cached_xpath(URL, PHONE) is None
+    # The company field belongs to a later state of the form: not judged yet
+    assert service.get_cached_xpath(URL, COMPANY)["xpath"] == "/html/body/form/input[4]"
+    entry = db.query(XPathCacheModel).filter_by(cache_key=email_key).one()
+    assert (entry.xpath, entry.element_fingerprint, entry.page_fingerprint) == (
+        "/html/body/form/input[3]", "fp-email-2", FORM
+    )
+
+
+@pytest.mark.asyncio
+async def test_unchanged_cached_element_skips_the_live_probe(db):
+    service = _prefetched_service(db)
+    page = MagicMock()
+    page.url = URL
+    page.evaluate = AsyncMock(return_value={
+        "page": FORM,
+        "statuses": {key: "ok" for key in service.fingerprinted_entries(URL)},
+    })
+    extractor = MagicMock()
+    extractor.extract_xpath_with_page = AsyncMock()
+    executor = Tier2HybridExecutor(db=db, xpath_extractor=extractor, cache_service=service)
+    executor._execute_action_with_xpath = AsyncMock()
+
+    result = await executor.execute_step(page, {"action": "fill", "instruction": EMAIL, "value": "a@b.com"})
+
+    assert result["success"] is True and result["cache_hit"] is True
+    page.evaluate.assert_awaited_once()  # The batch check is the only round-trip
+    page.locator.assert_not_called()
+    extractor.extract_xpath_with_page.assert_not_awaited()
+    executor._execute_action_with_xpath.assert_awaited_once()
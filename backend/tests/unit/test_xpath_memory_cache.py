@@ -0,0 +1,175 @@
+"""
+Unit tests for the in-process LRU in front of the xpath_cache table.
+"""
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.execution_settings import XPathCache as XPathCacheModel
+from app.services import xpath_cache_service as cache_module
+from app.services.xpath_cache_service import (
+    XPathCacheService,
+    flush_hit_counts,
+    invalidate_memory_cache,
+)
+
+URL = "https://example.com/checkout"
+INSTRUCTION = "Step 1: click Submit"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    invalidate_memory_cache()
+    cache_module._memory_cache.drain_pending()
+    # Flush explicitly in tests instead of from the background thread
+    with patch.object(cache_module._memory_cache, "_ensure_flusher"):
+        yield session
+    invalidate_memory_cache()
+    cache_module._memory_cache.drain_pending()
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _count_statements(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *a: statements.append(a[2]))
+    return statements
+
+
+def test_repeat_hits_are_served_from_memory_without_sql(db):
+    svc = XPathCacheService(db)
+    svc.cache_xpath(URL, INSTRUCTION, "//button[@id='submit']")
+
+    statements = _count_statements(db)
+    results = [svc.get_cached_xpath(URL, INSTRUCTION) for _ in range(3)]
+
+    assert statements == []
+    assert [r["hit_count"] for r in results] == [1, 2, 3]
+    assert results[0]["xpath"] == "//button[@id='submit']"
+
+
+def test_cold_lookup_populates_lru_from_db(db):
+    XPathCacheService(db).cache_xpath(URL, INSTRUCTION, "//a")
+    invalidate_memory_cache()
+
+    svc = XPathCacheService(db)
+    statements = _count_statements(db)
+    assert svc.get_cached_xpath(URL, INSTRUCTION)["xpath"] == "//a"
+    queries = len(statements)
+    assert svc.get_cached_xpath(URL, INSTRUCTION)["xpath"] == "//a"
+    assert len(statements) == queries
+
+
+def test_hit_counts_are_flushed_in_one_batch(db):
+    svc = XPathCacheService(db)
+    svc.cache_xpath(URL, INSTRUCTION, "//a")
+    for _ in range(5):
+        svc.get_cached_xpath(URL, INSTRUCTION)
+
+    assert db.query(XPathCacheModel).one().hit_count == 0
+    assert flush_hit_counts(db) == 1
+    db.expire_all()
+    assert db.query(XPathCacheModel).one().hit_count == 5
+
+    # Cached count stays consistent after the flush
+    assert svc.get_cached_xpath(URL, INSTRUCTION)["hit_count"] == 6
+    assert flush_hit_counts(db) == 1
+    assert flush_hit_counts(db) == 0
+
+
+def test_invalidation_propagates_to_lru(db):
+    svc = XPathCacheService(db)
+    svc.cache_xpath(URL, INSTRUCTION, "//a")
+    for _ in range(3):
+        svc.invalidate_cache(URL, INSTRUCTION, "not found")
+
+    assert svc.get_cached_xpath(URL, INSTRUCTION) is None
+
+
+def test_failed_validation_evicts_and_recache_replaces_lru_entry(db):
+    svc = XPathCacheService(db)
+    svc.cache_xpath(URL, INSTRUCTION, "//old")
+    svc.get_cached_xpath(URL, INSTRUCTION)
+    for _ in range(3):
+        svc.validate_and_update(URL, INSTRUCTION, is_valid=False)
+    assert svc.get_cached_xpath(URL, INSTRUCTION) is None
+
+    svc.cache_xpath(URL, INSTRUCTION, "//new")
+    assert svc.get_cached_xpath(URL, INSTRUCTION)["xpath"] == "//new"
+
+
+def test_successful_validation_is_buffered(db):
+    svc = XPathCacheService(db)
+    svc.cache_xpath(URL, INSTRUCTION, "//a")
+    svc.get_cached_xpath(URL, INSTRUCTION)
+
+    statements = _count_statements(db)
+    svc.validate_and_update(URL, INSTRUCTION, is_valid=True)
+    assert statements == []
+
+    flush_hit_counts(db)
+    db.expire_all()
+    assert db.query(XPathCacheModel).one().last_validated is not None
+
+
+def test_lru_evicts_least_recently_used(db):
+    cache = cache_module._XPathMemoryCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", {"hit_count": 0})
+    cache.put("b", {"hit_count": 0})
+    cache.get("a")
+    cache.put("c", {"hit_count": 0})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_lru_entries_expire_after_ttl(db):
+    cache = cache_module._XPathMemoryCache(max_entries=2, ttl_seconds=0)
+    cache.put("a", {"hit_count": 0})
+    assert cache.get("a") is None
+
+
+def test_prefetch_loads_all_steps_in_one_query_and_serves_run_from_memory(db):
+    writer = XPathCacheService(db)
+    writer.cache_xpath(URL, "Step A", "//a")
+    writer.cache_xpath("https://example.com/next", "Step B", "//b")
+    writer.cache_xpath(URL, "Unrelated", "//x")
+    invalidate_memory_cache()
+
+    svc = XPathCacheService(db)
+    statements = _count_statements(db)
+    assert svc.prefetch(["Step A", "Step B", "Step C", "Step A"]) == 2
+    assert len(statements) == 1
+
+    assert svc.get_cached_xpath(URL, "Step A")["xpath"] == "//a"
+    assert svc.get_cached_xpath("https://example.com/next", "Step B")["xpath"] == "//b"
+    # Prefetched instructions with no row (or on another page) miss without SQL
+    assert svc.get_cached_xpath(URL, "Step C") is None
+    assert svc.get_cached_xpath(URL, "Step B") is None
+    assert len(statements) == 1
+
+
+def test_prefetched_entry_survives_single_failure_and_drops_when_invalid(db):
+    XPathCacheService(db).cache_xpath(URL, INSTRUCTION, "//a")
+    invalidate_memory_cache()
+
+    svc = XPathCacheService(db)
+    svc.prefetch([INSTRUCTION])
+    svc.invalidate_cache(URL, INSTRUCTION, "not found")
+    assert svc.get_cached_xpath(URL, INSTRUCTION)["xpath"] == "//a"
+
+    svc.invalidate_cache(URL, INSTRUCTION, "not found")
+    svc.invalidate_cache(URL, INSTRUCTION, "not found")
+    assert svc.get_cached_xpath(URL, INSTRUCTION) is None
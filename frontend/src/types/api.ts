@@ -441,7 +441,7 @@ export interface StagehandProviderHealth {
 }
 
 // Sprint 5.5: 3-Tier Execution Engine types
-export type FallbackStrategy = 'option_a' | 'option_b' | 'option_c';
+export type FallbackStrategy = 'option_a' | 'option_b' | 'option_c' | 'race';
 
 export interface ExecutionSettings {
   id: number;
@@ -23,7 +23,7 @@ const readFallbackStrategy = (
   value: unknown,
   fallback: FallbackStrategy = 'option_c',
 ): FallbackStrategy => {
-  if (value === 'option_a' || value === 'option_b' || value === 'option_c') {
+  if (value === 'option_a' || value === 'option_b' || value === 'option_c' || value === 'race') {
     return value;
   }
   return fallback;